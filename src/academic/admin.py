@@ -1,6 +1,17 @@
 from django.contrib import admin
+from django.http import StreamingHttpResponse
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.html import format_html
+
+from core.admin_mixins import (
+    ConsultaOtimizadaMixin,
+    InlineOtimizadoMixin,
+    PaginacaoKeysetMixin,
+    SemIconesRelacionaisMixin,
+)
+from people.admin_mixins import BuscaPorPerfilAdminMixin
 
-from core.admin_mixins import SemIconesRelacionaisMixin
 from .forms import (
     AnoLetivoForm,
     DisciplinaForm,
@@ -18,22 +29,19 @@ from .models import (
     AlunoTurma,
     Matricula,
     MovimentacaoAluno,
+    ArquivoMovimentacao,
 )
+from .repositories import MovimentacaoAlunoRepository
+from .services import ExportacaoTurmaService
+from .services.exportacao_turma_service import TIPOS_CONTEUDO
 
 
 # ───────────────────────────────────────────────
 # Inlines
 # ───────────────────────────────────────────────
 
-class AlunoTurmaInline(SemIconesRelacionaisMixin, admin.TabularInline):
-    """Permite matricular alunos diretamente na tela da Turma."""
-    model = AlunoTurma
-    form = AlunoTurmaForm
-    extra = 1
-    autocomplete_fields = ('aluno',)
-
-
-class ProfessorDisciplinaInline(SemIconesRelacionaisMixin, admin.TabularInline):
+class ProfessorDisciplinaInline(SemIconesRelacionaisMixin, InlineOtimizadoMixin,
+                                admin.TabularInline):
     """Permite vincular professores diretamente na tela da Disciplina."""
     model = ProfessorDisciplina
     form = ProfessorDisciplinaForm
@@ -41,7 +49,8 @@ class ProfessorDisciplinaInline(SemIconesRelacionaisMixin, admin.TabularInline):
     autocomplete_fields = ('professor', 'ano_letivo')
 
 
-class MovimentacaoAlunoInline(SemIconesRelacionaisMixin, admin.TabularInline):
+class MovimentacaoAlunoInline(SemIconesRelacionaisMixin, InlineOtimizadoMixin,
+                              admin.TabularInline):
     """Mostra movimentacoes vinculadas a uma matricula."""
     model = MovimentacaoAluno
     form = MovimentacaoAlunoForm
@@ -56,19 +65,48 @@ class MovimentacaoAlunoInline(SemIconesRelacionaisMixin, admin.TabularInline):
         return False
 
 
-class MatriculaInlineParaTurma(SemIconesRelacionaisMixin, admin.TabularInline):
-    """Mostra matriculas na tela da Turma."""
-    model = Matricula
-    form = MatriculaForm
-    extra = 0
-    readonly_fields = ('aluno', 'data_matricula', 'tipo', 'status')
-    autocomplete_fields = ('aluno', 'ano_letivo')
+# ───────────────────────────────────────────────
+# Filtros
+# ───────────────────────────────────────────────
 
-    def has_add_permission(self, request, obj=None):
-        return False
+class AnoMovimentacaoFilter(admin.SimpleListFilter):
+    """
+    Filtra movimentacoes por ano — por padrao, o ano atual.
 
-    def has_delete_permission(self, request, obj=None):
-        return False
+    O filtro usa o intervalo de datas do ano, entao no PostgreSQL so a
+    particao do ano e lida. 'Todos' le o historico inteiro.
+    """
+    title = 'ano'
+    parameter_name = 'ano'
+    anos_listados = 5
+    todos = 'todos'
+
+    def lookups(self, request, model_admin):
+        ano_atual = timezone.localdate().year
+        anos = [
+            (str(ano), str(ano))
+            for ano in range(ano_atual, ano_atual - self.anos_listados, -1)
+        ]
+        return anos + [(self.todos, 'Todos')]
+
+    def value(self):
+        return super().value() or str(timezone.localdate().year)
+
+    def choices(self, changelist):
+        for valor, titulo in self.lookup_choices:
+            yield {
+                'selected': self.value() == valor,
+                'query_string': changelist.get_query_string(
+                    {self.parameter_name: valor},
+                ),
+                'display': titulo,
+            }
+
+    def queryset(self, request, queryset):
+        valor = self.value()
+        if not valor.isdigit():
+            return queryset
+        return MovimentacaoAlunoRepository.filtrar_ano(queryset, int(valor))
 
 
 # ───────────────────────────────────────────────
@@ -76,7 +114,8 @@ class MatriculaInlineParaTurma(SemIconesRelacionaisMixin, admin.TabularInline):
 # ───────────────────────────────────────────────
 
 @admin.register(AnoLetivo)
-class AnoLetivoAdmin(SemIconesRelacionaisMixin, admin.ModelAdmin):
+class AnoLetivoAdmin(SemIconesRelacionaisMixin, ConsultaOtimizadaMixin,
+                     admin.ModelAdmin):
     form = AnoLetivoForm
     list_display = ('nome', 'data_inicio', 'data_fim', 'ativo')
     list_filter = ('ativo',)
@@ -97,7 +136,8 @@ class AnoLetivoAdmin(SemIconesRelacionaisMixin, admin.ModelAdmin):
 
 
 @admin.register(Disciplina)
-class DisciplinaAdmin(SemIconesRelacionaisMixin, admin.ModelAdmin):
+class DisciplinaAdmin(SemIconesRelacionaisMixin, ConsultaOtimizadaMixin,
+                      admin.ModelAdmin):
     form = DisciplinaForm
     list_display = ('nome', 'codigo', 'carga_horaria', 'ativa')
     list_filter = ('ativa',)
@@ -119,15 +159,19 @@ class DisciplinaAdmin(SemIconesRelacionaisMixin, admin.ModelAdmin):
 
 
 @admin.register(Turma)
-class TurmaAdmin(SemIconesRelacionaisMixin, admin.ModelAdmin):
+class TurmaAdmin(SemIconesRelacionaisMixin, ConsultaOtimizadaMixin,
+                 admin.ModelAdmin):
     form = TurmaForm
-    list_display = ('nome', 'ano_letivo', 'escola', 'ativa')
+    list_display = ('nome', 'ano_letivo', 'escola', 'ativa', 'visao_geral')
     list_filter = ('ativa', 'ano_letivo', 'escola')
     search_fields = ('nome', 'ano_letivo__nome')
     list_editable = ('ativa',)
     list_per_page = 25
     autocomplete_fields = ('ano_letivo', 'escola')
-    inlines = [AlunoTurmaInline, MatriculaInlineParaTurma]
+    # Alunos e matriculas ficam na visao geral (academic.views.turma_views),
+    # paginada; inlines aqui renderizavam um formulario por aluno
+    readonly_fields = ('visao_geral',)
+    actions = ['exportar_alunos_csv', 'exportar_alunos_xlsx']
     fieldsets = (
         ('Identificacao', {
             'fields': ('nome',),
@@ -138,11 +182,45 @@ class TurmaAdmin(SemIconesRelacionaisMixin, admin.ModelAdmin):
         ('Status', {
             'fields': ('ativa',),
         }),
+        ('Alunos e matriculas', {
+            'fields': ('visao_geral',),
+        }),
     )
 
+    @admin.display(description='visao geral')
+    def visao_geral(self, obj):
+        if obj is None or obj.pk is None:
+            return '—'
+        return format_html(
+            '<a href="{}">Alunos, matriculas e historico</a>',
+            reverse('academic:visao_geral_turma', args=[obj.pk]),
+        )
+
+    def _exportar_alunos(self, queryset, formato):
+        turmas = queryset.select_related('escola', 'ano_letivo').order_by(
+            'escola__nome', 'nome',
+        )
+        resposta = StreamingHttpResponse(
+            ExportacaoTurmaService.exportar_turmas(turmas.iterator(), formato),
+            content_type=TIPOS_CONTEUDO['zip'],
+        )
+        resposta['Content-Disposition'] = (
+            f'attachment; filename="turmas-{formato}.zip"'
+        )
+        return resposta
+
+    @admin.action(description='Exportar lista de alunos (CSV)')
+    def exportar_alunos_csv(self, request, queryset):
+        return self._exportar_alunos(queryset, 'csv')
+
+    @admin.action(description='Exportar lista de alunos (XLSX)')
+    def exportar_alunos_xlsx(self, request, queryset):
+        return self._exportar_alunos(queryset, 'xlsx')
+
 
 @admin.register(ProfessorDisciplina)
-class ProfessorDisciplinaAdmin(SemIconesRelacionaisMixin, admin.ModelAdmin):
+class ProfessorDisciplinaAdmin(SemIconesRelacionaisMixin, ConsultaOtimizadaMixin,
+                               admin.ModelAdmin):
     form = ProfessorDisciplinaForm
     list_display = ('professor', 'disciplina', 'ano_letivo')
     list_filter = ('ano_letivo', 'disciplina')
@@ -155,7 +233,8 @@ class ProfessorDisciplinaAdmin(SemIconesRelacionaisMixin, admin.ModelAdmin):
 
 
 @admin.register(AlunoTurma)
-class AlunoTurmaAdmin(SemIconesRelacionaisMixin, admin.ModelAdmin):
+class AlunoTurmaAdmin(SemIconesRelacionaisMixin, ConsultaOtimizadaMixin,
+                      BuscaPorPerfilAdminMixin, admin.ModelAdmin):
     form = AlunoTurmaForm
     list_display = ('aluno', 'turma', 'data_matricula', 'ativo')
     list_filter = ('ativo', 'turma__ano_letivo', 'turma')
@@ -164,6 +243,7 @@ class AlunoTurmaAdmin(SemIconesRelacionaisMixin, admin.ModelAdmin):
         'aluno__matricula',
         'turma__nome',
     )
+    perfis_busca = ('aluno',)
     autocomplete_fields = ('aluno', 'turma')
     list_editable = ('ativo',)
     list_per_page = 25
@@ -178,7 +258,9 @@ class AlunoTurmaAdmin(SemIconesRelacionaisMixin, admin.ModelAdmin):
 
 
 @admin.register(Matricula)
-class MatriculaAdmin(SemIconesRelacionaisMixin, admin.ModelAdmin):
+class MatriculaAdmin(SemIconesRelacionaisMixin, PaginacaoKeysetMixin,
+                     ConsultaOtimizadaMixin, BuscaPorPerfilAdminMixin,
+                     admin.ModelAdmin):
     form = MatriculaForm
     list_display = ('aluno', 'turma', 'ano_letivo', 'data_matricula',
                     'tipo', 'status')
@@ -188,8 +270,11 @@ class MatriculaAdmin(SemIconesRelacionaisMixin, admin.ModelAdmin):
         'aluno__matricula',
         'turma__nome',
     )
+    perfis_busca = ('aluno',)
     autocomplete_fields = ('aluno', 'turma', 'ano_letivo')
     list_per_page = 25
+    # Cursor da paginacao keyset (indice matricula_data_id_idx)
+    ordering = ('-data_matricula', '-id')
     inlines = [MovimentacaoAlunoInline]
     fieldsets = (
         ('Aluno e turma', {
@@ -206,16 +291,21 @@ class MatriculaAdmin(SemIconesRelacionaisMixin, admin.ModelAdmin):
 
 
 @admin.register(MovimentacaoAluno)
-class MovimentacaoAlunoAdmin(SemIconesRelacionaisMixin, admin.ModelAdmin):
+class MovimentacaoAlunoAdmin(SemIconesRelacionaisMixin, PaginacaoKeysetMixin,
+                             ConsultaOtimizadaMixin, BuscaPorPerfilAdminMixin,
+                             admin.ModelAdmin):
     form = MovimentacaoAlunoForm
     list_display = ('aluno', 'tipo_evento', 'data', 'matricula')
-    list_filter = ('tipo_evento',)
+    list_filter = (AnoMovimentacaoFilter, 'tipo_evento')
     search_fields = (
         'aluno__pessoa__nome',
         'descricao',
     )
+    perfis_busca = ('aluno',)
     autocomplete_fields = ('aluno', 'matricula')
     list_per_page = 25
+    # Cursor da paginacao keyset (indice movimentacao_data_id_idx)
+    ordering = ('-data', '-id')
     readonly_fields = ('aluno', 'tipo_evento', 'data', 'descricao', 'matricula')
     fieldsets = (
         (None, {
@@ -229,5 +319,29 @@ class MovimentacaoAlunoAdmin(SemIconesRelacionaisMixin, admin.ModelAdmin):
     def has_add_permission(self, request):
         return False
 
+    def has_change_permission(self, request, obj=None):
+        # Historico append-only: somente visualizacao
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ArquivoMovimentacao)
+class ArquivoMovimentacaoAdmin(SemIconesRelacionaisMixin,
+                               ConsultaOtimizadaMixin, admin.ModelAdmin):
+    """Anos do historico arquivados por arquivar_movimentacoes (somente leitura)."""
+    list_display = ('ano', 'linhas', 'tamanho_bytes', 'arquivo', 'criado_em')
+    list_per_page = 25
+    readonly_fields = (
+        'ano', 'arquivo', 'linhas', 'tamanho_bytes', 'sha256', 'criado_em',
+    )
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
     def has_delete_permission(self, request, obj=None):
         return False
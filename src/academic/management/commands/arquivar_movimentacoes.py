@@ -0,0 +1,172 @@
+"""
+Management command para as particoes e o arquivo do historico de
+movimentacoes (MovimentacaoAluno).
+
+Uso:
+    python manage.py arquivar_movimentacoes --listar
+    python manage.py arquivar_movimentacoes --criar-particoes 2027
+    python manage.py arquivar_movimentacoes --ate-ano 2019
+    python manage.py arquivar_movimentacoes --consultar 2018 --aluno 42
+    python manage.py arquivar_movimentacoes --restaurar 2018
+
+--criar-particoes cria as particoes anuais ate o ano informado (rodar
+antes de cada virada de ano; sem particao, as datas caem na particao
+padrao e as consultas do ano deixam de ler uma so particao).
+
+--ate-ano arquiva todos os anos ainda no banco ate o ano informado: a
+particao de cada ano e desanexada, gravada em
+ARQUIVO_MOVIMENTACOES_DIR/<ano>.csv.gz e apagada (ver
+HistoricoMovimentacaoService).
+
+Caracteristicas:
+    - Arquivos compactados consultaveis sob demanda (--consultar), sem
+      restaurar; --restaurar devolve o ano ao banco
+    - Retomavel: um ano interrompido no meio e concluido na proxima
+      execucao
+    - No SQLite (sem particoes) as linhas arquivadas sao removidas com
+      DELETE e --criar-particoes nao faz nada
+"""
+
+import csv
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from academic.models import ArquivoMovimentacao
+from academic.services import HistoricoMovimentacaoService
+from academic.services.historico_movimentacao_service import COLUNAS, TABELA
+from core.particoes import listar_particoes
+
+
+class Command(BaseCommand):
+    help = (
+        'Gerencia as particoes anuais do historico de movimentacoes e '
+        'arquiva/consulta/restaura anos antigos em arquivos compactados.'
+    )
+
+    def add_arguments(self, parser):
+        acao = parser.add_mutually_exclusive_group(required=True)
+        acao.add_argument(
+            '--listar',
+            action='store_true',
+            help='Lista os anos no banco, as particoes e os anos arquivados.',
+        )
+        acao.add_argument(
+            '--criar-particoes',
+            type=int,
+            metavar='ANO',
+            help='Cria as particoes anuais que faltam ate ANO.',
+        )
+        acao.add_argument(
+            '--ate-ano',
+            type=int,
+            metavar='ANO',
+            help='Arquiva todos os anos ainda no banco ate ANO (inclusive).',
+        )
+        acao.add_argument(
+            '--consultar',
+            type=int,
+            metavar='ANO',
+            help='Imprime (CSV) as movimentacoes de um ano arquivado.',
+        )
+        acao.add_argument(
+            '--restaurar',
+            type=int,
+            metavar='ANO',
+            help='Devolve ao banco as movimentacoes de um ano arquivado.',
+        )
+        parser.add_argument(
+            '--aluno',
+            type=int,
+            help='Com --consultar: apenas as movimentacoes deste aluno (ID).',
+        )
+
+    def handle(self, *args, **options):
+        if options['listar']:
+            self._listar()
+        elif options['criar_particoes']:
+            criados = HistoricoMovimentacaoService.garantir_particoes(
+                options['criar_particoes'],
+            )
+            self.stdout.write(self.style.SUCCESS(
+                f'{len(criados)} particao(oes) criada(s)'
+                f'{": " + ", ".join(map(str, criados)) if criados else "."}'
+            ))
+        elif options['ate_ano']:
+            self._arquivar(options['ate_ano'])
+        elif options['consultar']:
+            self._consultar(options['consultar'], options['aluno'])
+        else:
+            self._restaurar(options['restaurar'])
+
+    def _listar(self):
+        particoes = listar_particoes(connection, TABELA)
+        self.stdout.write('--- Anos no banco ---')
+        for ano, quantidade in sorted(
+            HistoricoMovimentacaoService.anos_no_banco().items(),
+        ):
+            particao = particoes.get(ano, 'particao padrao' if particoes else '')
+            self.stdout.write(
+                f'  {ano}: {quantidade} movimentacao(oes)'
+                f'{f" ({particao})" if particao else ""}'
+            )
+        if particoes:
+            self.stdout.write(
+                f'\nParticoes anuais: {", ".join(map(str, sorted(particoes)))}'
+            )
+
+        self.stdout.write('\n--- Anos arquivados ---')
+        for registro in ArquivoMovimentacao.objects.order_by('ano'):
+            self.stdout.write(
+                f'  {registro.ano}: {registro.linhas} linha(s), '
+                f'{registro.tamanho_bytes} bytes — {registro.arquivo}'
+            )
+
+    def _arquivar(self, ate_ano):
+        if ate_ano >= timezone.localdate().year:
+            raise CommandError(
+                'So anos anteriores ao atual podem ser arquivados.'
+            )
+        anos = [
+            ano for ano in HistoricoMovimentacaoService.anos_no_banco()
+            if ano <= ate_ano
+        ]
+        if not anos:
+            self.stdout.write(f'Nenhum ano ate {ate_ano} no banco.')
+            return
+
+        for ano in sorted(anos):
+            try:
+                registro = HistoricoMovimentacaoService.arquivar(ano)
+            except ValidationError as e:
+                raise CommandError(e.messages[0])
+            self.stdout.write(self.style.SUCCESS(
+                f'  {ano}: {registro.linhas} movimentacao(oes) arquivada(s) '
+                f'em {registro.arquivo} ({registro.tamanho_bytes} bytes)'
+            ))
+
+    def _consultar(self, ano, aluno_id):
+        try:
+            movimentacoes = HistoricoMovimentacaoService.ler_arquivo(
+                ano, aluno_id=aluno_id,
+            )
+        except ArquivoMovimentacao.DoesNotExist:
+            raise CommandError(f'O ano {ano} nao esta arquivado.')
+
+        escritor = csv.writer(self.stdout, delimiter=';', lineterminator='\n')
+        escritor.writerow(COLUNAS)
+        for movimentacao in movimentacoes:
+            escritor.writerow(
+                getattr(movimentacao, coluna) for coluna in COLUNAS
+            )
+
+    def _restaurar(self, ano):
+        try:
+            restauradas = HistoricoMovimentacaoService.restaurar(ano)
+        except ArquivoMovimentacao.DoesNotExist:
+            raise CommandError(f'O ano {ano} nao esta arquivado.')
+        self.stdout.write(self.style.SUCCESS(
+            f'{restauradas} movimentacao(oes) de {ano} restaurada(s).'
+        ))
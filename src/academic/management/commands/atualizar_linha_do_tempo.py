@@ -0,0 +1,67 @@
+"""
+Management command para reconstruir a linha do tempo dos alunos.
+
+Uso:
+    python manage.py atualizar_linha_do_tempo
+    python manage.py atualizar_linha_do_tempo --aluno 42 --aluno 43
+    python manage.py atualizar_linha_do_tempo --lote 1000
+
+A projecao aluno_linha_do_tempo (LinhaDoTempoAluno) e mantida pelos
+services a cada operacao. Este comando a reconstroi a partir das tabelas
+de origem — depois de seeds, importacoes ou edicoes feitas fora dos
+services (ver LinhaDoTempoService).
+
+Caracteristicas:
+    - Em lotes de alunos, um por transacao: leitores nunca sao
+      bloqueados e continuam vendo a versao anterior ate cada commit
+    - Idempotente: pode rodar varias vezes, inclusive com o sistema em uso
+    - Preserva os eventos de movimentacoes de anos ja arquivados
+      (arquivar_movimentacoes), que nao estao mais na tabela de origem
+"""
+
+from django.core.management.base import BaseCommand
+
+from academic.services import LinhaDoTempoService
+from academic.services.linha_do_tempo_service import TAMANHO_LOTE
+
+
+class Command(BaseCommand):
+    help = (
+        'Reconstroi a linha do tempo (projecao de matriculas, movimentacoes, '
+        'turmas, emprestimos e responsaveis) dos alunos.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--aluno',
+            action='append',
+            type=int,
+            help='ID do aluno a reconstruir (repetivel; padrao: todos).',
+        )
+        parser.add_argument(
+            '--lote',
+            type=int,
+            default=TAMANHO_LOTE,
+            help=f'Alunos por transacao (padrao: {TAMANHO_LOTE}).',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write('Reconstruindo a linha do tempo dos alunos...\n')
+
+        def progresso(resumo):
+            self.stdout.write(
+                f'  Lote {resumo["lotes"]} concluido — acumulado: '
+                f'{resumo["alunos"]} aluno(s), {resumo["eventos"]} evento(s)'
+            )
+
+        resumo = LinhaDoTempoService.reconstruir(
+            aluno_ids=options['aluno'],
+            tamanho_lote=options['lote'],
+            ao_concluir_lote=progresso,
+        )
+
+        self.stdout.write('')
+        self.stdout.write(self.style.SUCCESS(
+            f'{resumo["alunos"]} aluno(s) e {resumo["eventos"]} evento(s) '
+            f'em {resumo["lotes"]} lote(s).'
+        ))
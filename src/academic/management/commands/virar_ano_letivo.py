@@ -0,0 +1,184 @@
+"""
+Management command para a virada do ano letivo.
+
+Uso:
+    python manage.py virar_ano_letivo --par 1:3 --par 2:4 --dry-run
+    python manage.py virar_ano_letivo --mapa turmas.csv
+    python manage.py virar_ano_letivo --mapa turmas.csv --lote 1000 \\
+        --data-encerramento 2025-12-19 --data-matricula 2026-02-02
+
+O mapeamento liga cada turma de origem (ano que termina) a uma turma de
+destino (ano seguinte), por ID. No arquivo --mapa, cada linha traz
+"id_origem;id_destino" (linhas que nao comecam com numero, como um
+cabecalho, sao ignoradas).
+
+Para cada matricula ativa nas turmas de origem: rematricula o aluno na
+turma de destino e encerra a matricula antiga, com as movimentacoes
+correspondentes (ver ViradaAnoLetivoService).
+
+Caracteristicas:
+    - Set-based: gravacoes em massa, um lote por transacao
+    - Retomavel: se interrompido, basta rodar de novo com o mesmo mapa
+    - --dry-run apenas conta as matriculas e reporta os conflitos
+    - Datas padrao: fim do ano de origem e inicio do ano de destino
+"""
+
+import argparse
+import csv
+from datetime import date
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from academic.models import Turma
+from academic.services import ViradaAnoLetivoService
+from academic.services.matricula_service import TAMANHO_LOTE
+
+
+def _par(valor):
+    try:
+        origem, destino = valor.split(':')
+        return int(origem), int(destino)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f'Par invalido: {valor} (use ORIGEM:DESTINO).'
+        )
+
+
+class Command(BaseCommand):
+    help = (
+        'Encerra as matriculas ativas das turmas de origem e rematricula '
+        'os alunos nas turmas de destino do ano letivo seguinte.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--par',
+            action='append',
+            type=_par,
+            default=[],
+            metavar='ORIGEM:DESTINO',
+            help='IDs da turma de origem e da turma de destino (repetivel).',
+        )
+        parser.add_argument(
+            '--mapa',
+            help='Arquivo CSV com linhas "id_origem;id_destino".',
+        )
+        parser.add_argument(
+            '--data-encerramento',
+            type=date.fromisoformat,
+            help='Data do encerramento (padrao: fim do ano letivo de origem).',
+        )
+        parser.add_argument(
+            '--data-matricula',
+            type=date.fromisoformat,
+            help='Data das novas matriculas (padrao: inicio do ano de destino).',
+        )
+        parser.add_argument(
+            '--lote',
+            type=int,
+            default=TAMANHO_LOTE,
+            help=f'Matriculas por transacao (padrao: {TAMANHO_LOTE}).',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Apenas conta as matriculas e reporta conflitos, sem gravar.',
+        )
+
+    def handle(self, *args, **options):
+        pares = list(options['par'])
+        if options['mapa']:
+            pares.extend(self._ler_mapa(options['mapa']))
+        if not pares:
+            raise CommandError('Informe o mapeamento com --par ou --mapa.')
+
+        mapeamento = self._montar_mapeamento(pares)
+        try:
+            ano_origem, ano_destino = ViradaAnoLetivoService.validar_mapeamento(
+                mapeamento,
+            )
+        except ValidationError as e:
+            raise CommandError(e.messages[0])
+
+        data_encerramento = options['data_encerramento'] or ano_origem.data_fim
+        data_matricula = options['data_matricula'] or ano_destino.data_inicio
+        dry_run = options['dry_run']
+
+        self.stdout.write(
+            f'Virada do ano letivo {ano_origem} -> {ano_destino} '
+            f'({len(mapeamento)} turma(s)'
+            f'{", dry-run" if dry_run else ""})...\n'
+        )
+
+        def progresso(resumo):
+            self.stdout.write(
+                f'  Lote {resumo["lotes"]} concluido — acumulado: '
+                f'{resumo["processadas"]} matricula(s), '
+                f'{resumo["rematriculadas"]} rematricula(s), '
+                f'{len(resumo["conflitos"])} conflito(s)'
+            )
+
+        resumo = ViradaAnoLetivoService.virar(
+            mapeamento,
+            data_encerramento=data_encerramento,
+            data_matricula=data_matricula,
+            tamanho_lote=options['lote'],
+            dry_run=dry_run,
+            ao_concluir_lote=progresso,
+        )
+
+        if resumo['conflitos']:
+            self.stdout.write('\nConflitos:')
+            for conflito in resumo['conflitos']:
+                self.stdout.write(self.style.WARNING(
+                    f'  {conflito["matricula"].aluno} '
+                    f'({conflito["matricula"].turma} -> '
+                    f'{conflito["turma_destino"]}): {conflito["erro"]}'
+                ))
+
+        self.stdout.write('')
+        if dry_run:
+            self.stdout.write(
+                f'{resumo["rematriculadas"]} aluno(s) seriam rematriculado(s), '
+                f'{len(resumo["conflitos"])} conflito(s) (dry-run, nada gravado).'
+            )
+            return
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{resumo["rematriculadas"]} aluno(s) rematriculado(s) em '
+            f'{resumo["lotes"]} lote(s), {len(resumo["conflitos"])} conflito(s).'
+        ))
+
+    def _ler_mapa(self, caminho):
+        try:
+            with open(caminho, newline='', encoding='utf-8-sig') as arquivo:
+                linhas = list(csv.reader(arquivo, delimiter=';'))
+        except OSError as e:
+            raise CommandError(f'Nao foi possivel ler {caminho}: {e}')
+
+        pares = []
+        for numero, linha in enumerate(linhas, start=1):
+            if not linha or not linha[0].strip().isdigit():
+                continue
+            if len(linha) < 2 or not linha[1].strip().isdigit():
+                raise CommandError(f'{caminho}, linha {numero}: destino invalido.')
+            pares.append((int(linha[0]), int(linha[1])))
+        return pares
+
+    def _montar_mapeamento(self, pares):
+        ids = {pk for par in pares for pk in par}
+        turmas = Turma.objects.select_related('ano_letivo').in_bulk(ids)
+        faltando = sorted(ids - turmas.keys())
+        if faltando:
+            raise CommandError(
+                f'Turma(s) nao encontrada(s): {", ".join(map(str, faltando))}.'
+            )
+
+        mapeamento = {}
+        for origem_id, destino_id in pares:
+            origem = turmas[origem_id]
+            if origem in mapeamento and mapeamento[origem] != turmas[destino_id]:
+                raise CommandError(f'Turma de origem repetida: {origem}.')
+            mapeamento[origem] = turmas[destino_id]
+        return mapeamento
@@ -0,0 +1,54 @@
+# Generated by Django 6.0.2 on 2026-10-18 11:35
+
+from django.db import migrations, models
+
+from core.particoes import converter_em_particionada, converter_em_tabela_simples
+
+
+TABELA = 'academic_movimentacaoaluno'
+
+
+def particionar(apps, schema_editor):
+    """No PostgreSQL, converte o historico em tabela particionada por ano."""
+    converter_em_particionada(schema_editor, TABELA, 'data')
+
+
+def desparticionar(apps, schema_editor):
+    converter_em_tabela_simples(schema_editor, TABELA)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academic', '0002_etapa3_operacional'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArquivoMovimentacao',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('criado_em', models.DateTimeField(auto_now_add=True, verbose_name='criado em')),
+                ('atualizado_em', models.DateTimeField(auto_now=True, verbose_name='atualizado em')),
+                ('ano', models.PositiveIntegerField(unique=True, verbose_name='ano')),
+                ('arquivo', models.CharField(max_length=500, verbose_name='arquivo')),
+                ('linhas', models.PositiveIntegerField(verbose_name='linhas')),
+                ('tamanho_bytes', models.PositiveBigIntegerField(verbose_name='tamanho (bytes)')),
+                ('sha256', models.CharField(max_length=64, verbose_name='SHA-256')),
+            ],
+            options={
+                'verbose_name': 'arquivo de movimentacoes',
+                'verbose_name_plural': 'arquivos de movimentacoes',
+                'ordering': ['-ano'],
+            },
+        ),
+        migrations.AlterModelOptions(
+            name='movimentacaoaluno',
+            options={'ordering': ['-data', '-id'], 'verbose_name': 'movimentacao do aluno', 'verbose_name_plural': 'movimentacoes de alunos'},
+        ),
+        migrations.AddIndex(
+            model_name='movimentacaoaluno',
+            index=models.Index(fields=['aluno', '-data'], name='movimentacao_aluno_data_idx'),
+        ),
+        migrations.RunPython(particionar, desparticionar),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 6.0.2 on 2026-10-18 11:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academic', '0003_movimentacao_particionada'),
+        ('people', '0003_pessoa_chaves_busca'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LinhaDoTempoAluno',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('criado_em', models.DateTimeField(auto_now_add=True, verbose_name='criado em')),
+                ('atualizado_em', models.DateTimeField(auto_now=True, verbose_name='atualizado em')),
+                ('data', models.DateField(verbose_name='data')),
+                ('tipo', models.CharField(choices=[('responsavel', 'Responsavel'), ('matricula', 'Matricula'), ('turma', 'Turma'), ('movimentacao', 'Movimentacao'), ('emprestimo', 'Emprestimo'), ('devolucao', 'Devolucao')], max_length=20, verbose_name='tipo')),
+                ('titulo', models.CharField(max_length=300, verbose_name='titulo')),
+                ('detalhes', models.TextField(blank=True, verbose_name='detalhes')),
+                ('origem_id', models.PositiveBigIntegerField(verbose_name='id de origem')),
+                ('aluno', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='linha_do_tempo', to='people.aluno', verbose_name='aluno')),
+            ],
+            options={
+                'verbose_name': 'evento da linha do tempo',
+                'verbose_name_plural': 'linha do tempo dos alunos',
+                'db_table': 'aluno_linha_do_tempo',
+                'ordering': ['aluno', '-data', '-id'],
+                'indexes': [models.Index(fields=['aluno', 'data', 'id'], name='linha_tempo_aluno_data_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 6.0.2 on 2026-10-18 11:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academic', '0004_linha_do_tempo_aluno'),
+        ('core', '0001_initial'),
+        ('people', '0004_indices_acesso'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='alunoturma',
+            index=models.Index(condition=models.Q(('ativo', True)), fields=['turma', 'aluno'], name='alunoturma_turma_ativo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='alunoturma',
+            index=models.Index(condition=models.Q(('ativo', True)), fields=['aluno', 'turma'], name='alunoturma_aluno_ativo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='matricula',
+            index=models.Index(condition=models.Q(('status', 'ativa')), fields=['turma', 'aluno'], name='matricula_turma_ativa_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='matricula',
+            index=models.Index(fields=['aluno', '-data_matricula'], name='matricula_aluno_data_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='professordisciplina',
+            index=models.Index(fields=['ano_letivo', 'professor', 'disciplina'], name='profdisc_ano_prof_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='turma',
+            index=models.Index(condition=models.Q(('ativa', True)), fields=['ano_letivo', 'nome'], name='turma_ano_ativa_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='turma',
+            index=models.Index(condition=models.Q(('ativa', True)), fields=['escola', 'ano_letivo', 'nome'], name='turma_escola_ativa_idx'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 6.0.2 on 2026-10-18 12:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academic', '0005_indices_acesso'),
+        ('people', '0005_perfil_nome_ordenacao'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='matricula',
+            index=models.Index(fields=['-data_matricula', '-id'], name='matricula_data_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='movimentacaoaluno',
+            index=models.Index(fields=['-data', '-id'], name='movimentacao_data_id_idx'),
+        ),
+    ]
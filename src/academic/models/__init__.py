@@ -5,6 +5,8 @@ from .professor_disciplina import ProfessorDisciplina
 from .aluno_turma import AlunoTurma
 from .matricula import Matricula
 from .movimentacao_aluno import MovimentacaoAluno
+from .arquivo_movimentacao import ArquivoMovimentacao
+from .linha_do_tempo_aluno import LinhaDoTempoAluno
 
 __all__ = [
     'AnoLetivo',
@@ -14,4 +16,6 @@ __all__ = [
     'AlunoTurma',
     'Matricula',
     'MovimentacaoAluno',
+    'ArquivoMovimentacao',
+    'LinhaDoTempoAluno',
 ]
@@ -32,6 +32,9 @@ class AlunoTurma(ModeloBase):
     data_matricula = models.DateField('data de matricula')
     ativo = models.BooleanField('ativo', default=True)
 
+    # FKs usadas no __str__ (ver ConsultaOtimizadaMixin)
+    relacionados_str = ('aluno', 'turma')
+
     class Meta:
         verbose_name = 'aluno-turma'
         verbose_name_plural = 'alunos-turmas'
@@ -42,6 +45,19 @@ class AlunoTurma(ModeloBase):
                 name='unique_aluno_turma',
             ),
         ]
+        indexes = [
+            # listar_por_turma / listar_por_aluno (vinculos ativos)
+            models.Index(
+                fields=['turma', 'aluno'],
+                condition=models.Q(ativo=True),
+                name='alunoturma_turma_ativo_idx',
+            ),
+            models.Index(
+                fields=['aluno', 'turma'],
+                condition=models.Q(ativo=True),
+                name='alunoturma_aluno_ativo_idx',
+            ),
+        ]
 
     def __str__(self):
         return f'{self.aluno} — {self.turma}'
@@ -0,0 +1,33 @@
+"""
+academic.models.arquivo_movimentacao
+
+Modelo da entidade ArquivoMovimentacao.
+"""
+
+from django.db import models
+
+from core.models import ModeloBase
+
+
+class ArquivoMovimentacao(ModeloBase):
+    """
+    Ano de MovimentacaoAluno arquivado fora do banco.
+
+    As movimentacoes do ano foram gravadas em um arquivo CSV compactado
+    (gzip) e removidas da tabela (no PostgreSQL, a particao do ano foi
+    desanexada e apagada). O arquivo continua consultavel sob demanda e
+    pode ser restaurado (ver HistoricoMovimentacaoService).
+    """
+    ano = models.PositiveIntegerField('ano', unique=True)
+    arquivo = models.CharField('arquivo', max_length=500)
+    linhas = models.PositiveIntegerField('linhas')
+    tamanho_bytes = models.PositiveBigIntegerField('tamanho (bytes)')
+    sha256 = models.CharField('SHA-256', max_length=64)
+
+    class Meta:
+        verbose_name = 'arquivo de movimentacoes'
+        verbose_name_plural = 'arquivos de movimentacoes'
+        ordering = ['-ano']
+
+    def __str__(self):
+        return f'Movimentacoes de {self.ano} ({self.linhas} linhas)'
@@ -0,0 +1,66 @@
+"""
+academic.models.linha_do_tempo_aluno
+
+Modelo da entidade LinhaDoTempoAluno.
+"""
+
+from django.db import models
+
+from core.models import ModeloBase
+
+
+class LinhaDoTempoAluno(ModeloBase):
+    """
+    Projecao (read model) da trajetoria de um aluno.
+
+    Cada linha e um evento ja formatado, derivado de Matricula,
+    MovimentacaoAluno, AlunoTurma, Emprestimo ou AlunoResponsavel. A
+    trajetoria inteira de um aluno sai de uma unica leitura pelo indice
+    (aluno, data, id), sem juntar as cinco tabelas.
+
+    Regras:
+    - Nunca editar diretamente: mantida pelo LinhaDoTempoService, chamado
+      por MatriculaService, BibliotecaService e pelo admin dos vinculos
+      com responsaveis
+    - Pode ser reconstruida a qualquer momento (atualizar_linha_do_tempo)
+    """
+
+    class Tipo(models.TextChoices):
+        RESPONSAVEL = 'responsavel', 'Responsavel'
+        MATRICULA = 'matricula', 'Matricula'
+        TURMA = 'turma', 'Turma'
+        MOVIMENTACAO = 'movimentacao', 'Movimentacao'
+        EMPRESTIMO = 'emprestimo', 'Emprestimo'
+        DEVOLUCAO = 'devolucao', 'Devolucao'
+
+    aluno = models.ForeignKey(
+        'people.Aluno',
+        on_delete=models.CASCADE,
+        related_name='linha_do_tempo',
+        verbose_name='aluno',
+        # Coberto pelo indice (aluno, data, id)
+        db_index=False,
+    )
+    data = models.DateField('data')
+    tipo = models.CharField('tipo', max_length=20, choices=Tipo.choices)
+    titulo = models.CharField('titulo', max_length=300)
+    detalhes = models.TextField('detalhes', blank=True)
+    origem_id = models.PositiveBigIntegerField('id de origem')
+
+    # FKs usadas no __str__ (ver ConsultaOtimizadaMixin)
+    relacionados_str = ('aluno',)
+
+    class Meta:
+        db_table = 'aluno_linha_do_tempo'
+        verbose_name = 'evento da linha do tempo'
+        verbose_name_plural = 'linha do tempo dos alunos'
+        ordering = ['aluno', '-data', '-id']
+        indexes = [
+            models.Index(
+                fields=['aluno', 'data', 'id'],
+                name='linha_tempo_aluno_data_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.aluno} — {self.data:%d/%m/%Y} {self.titulo}'
@@ -68,6 +68,9 @@ class Matricula(ModeloBase):
     )
     observacao = models.TextField('observacao', blank=True)
 
+    # FKs usadas no __str__ (ver ConsultaOtimizadaMixin)
+    relacionados_str = ('aluno', 'turma')
+
     class Meta:
         verbose_name = 'matricula'
         verbose_name_plural = 'matriculas'
@@ -79,6 +82,24 @@ class Matricula(ModeloBase):
                 name='unique_matricula_ativa_por_ano',
             ),
         ]
+        indexes = [
+            # MatriculaRepository.listar_por_turma (matriculas ativas)
+            models.Index(
+                fields=['turma', 'aluno'],
+                condition=models.Q(status='ativa'),
+                name='matricula_turma_ativa_idx',
+            ),
+            # MatriculaRepository.listar_por_aluno (mais recentes primeiro)
+            models.Index(
+                fields=['aluno', '-data_matricula'],
+                name='matricula_aluno_data_idx',
+            ),
+            # Paginacao keyset do admin (mais recentes primeiro)
+            models.Index(
+                fields=['-data_matricula', '-id'],
+                name='matricula_data_id_idx',
+            ),
+        ]
 
     def __str__(self):
         return f'{self.aluno} — {self.turma} ({self.get_status_display()})'
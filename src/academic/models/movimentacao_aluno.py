@@ -17,9 +17,15 @@ class MovimentacaoAluno(ModeloBase):
     transferencia, encerramento, remanejamento ou cancelamento.
 
     Regras:
-    - Historico nunca deve ser apagado
+    - Historico nunca deve ser apagado nem alterado (append-only)
     - Deve refletir fielmente a trajetoria do aluno na escola
     - Criado automaticamente pelo service de matricula
+
+    Armazenamento: no PostgreSQL a tabela e particionada por ano da data
+    (ver core.particoes); consultas filtradas por periodo leem so as
+    particoes envolvidas. Anos antigos podem ser arquivados em arquivos
+    compactados (ver HistoricoMovimentacaoService). No SQLite a tabela
+    e simples.
     """
 
     class TipoEvento(models.TextChoices):
@@ -52,10 +58,24 @@ class MovimentacaoAluno(ModeloBase):
         verbose_name='matricula relacionada',
     )
 
+    # FKs usadas no __str__ (ver ConsultaOtimizadaMixin)
+    relacionados_str = ('aluno',)
+
     class Meta:
         verbose_name = 'movimentacao do aluno'
         verbose_name_plural = 'movimentacoes de alunos'
-        ordering = ['-data', 'aluno']
+        ordering = ['-data', '-id']
+        indexes = [
+            models.Index(
+                fields=['aluno', '-data'],
+                name='movimentacao_aluno_data_idx',
+            ),
+            # Ordenacao padrao: paginacao keyset do admin
+            models.Index(
+                fields=['-data', '-id'],
+                name='movimentacao_data_id_idx',
+            ),
+        ]
 
     def __str__(self):
         return f'{self.aluno} — {self.get_tipo_evento_display()} ({self.data})'
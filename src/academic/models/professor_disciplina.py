@@ -36,6 +36,9 @@ class ProfessorDisciplina(ModeloBase):
         verbose_name='ano letivo',
     )
 
+    # FKs usadas no __str__ (ver ConsultaOtimizadaMixin)
+    relacionados_str = ('professor', 'disciplina', 'ano_letivo')
+
     class Meta:
         verbose_name = 'professor-disciplina'
         verbose_name_plural = 'professores-disciplinas'
@@ -46,6 +49,13 @@ class ProfessorDisciplina(ModeloBase):
                 name='unique_prof_disc_ano',
             ),
         ]
+        indexes = [
+            # ProfessorDisciplinaRepository.listar_por_ano_letivo (e ordering)
+            models.Index(
+                fields=['ano_letivo', 'professor', 'disciplina'],
+                name='profdisc_ano_prof_idx',
+            ),
+        ]
 
     def __str__(self):
         return f'{self.professor} — {self.disciplina} ({self.ano_letivo})'
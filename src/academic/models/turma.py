@@ -31,6 +31,9 @@ class Turma(ModeloBase):
     )
     ativa = models.BooleanField('ativa', default=True)
 
+    # FKs usadas no __str__ (ver ConsultaOtimizadaMixin)
+    relacionados_str = ('ano_letivo',)
+
     class Meta:
         verbose_name = 'turma'
         verbose_name_plural = 'turmas'
@@ -41,6 +44,19 @@ class Turma(ModeloBase):
                 name='unique_turma_ano_escola',
             ),
         ]
+        indexes = [
+            # TurmaRepository.listar_por_ano_letivo / listar_por_escola
+            models.Index(
+                fields=['ano_letivo', 'nome'],
+                condition=models.Q(ativa=True),
+                name='turma_ano_ativa_idx',
+            ),
+            models.Index(
+                fields=['escola', 'ano_letivo', 'nome'],
+                condition=models.Q(ativa=True),
+                name='turma_escola_ativa_idx',
+            ),
+        ]
 
     def __str__(self):
         return f'{self.nome} — {self.ano_letivo}'
@@ -5,6 +5,7 @@ from .professor_disciplina_repository import ProfessorDisciplinaRepository
 from .aluno_turma_repository import AlunoTurmaRepository
 from .matricula_repository import MatriculaRepository
 from .movimentacao_aluno_repository import MovimentacaoAlunoRepository
+from .linha_do_tempo_repository import LinhaDoTempoRepository
 
 __all__ = [
     'AnoLetivoRepository',
@@ -14,4 +15,5 @@ __all__ = [
     'AlunoTurmaRepository',
     'MatriculaRepository',
     'MovimentacaoAlunoRepository',
+    'LinhaDoTempoRepository',
 ]
@@ -4,19 +4,41 @@ academic.repositories.aluno_turma_repository
 Acesso a dados da entidade AlunoTurma.
 """
 
+from django.db.models import Prefetch
+
 from academic.models import AlunoTurma
+from core.replicas import para_leitura
+from people.models import AlunoResponsavel
 
 
 class AlunoTurmaRepository:
 
     @staticmethod
     def listar_por_turma(turma):
-        return AlunoTurma.objects.filter(
+        return para_leitura(AlunoTurma).filter(
             turma=turma, ativo=True,
         ).select_related('aluno__pessoa')
 
     @staticmethod
     def listar_por_aluno(aluno):
-        return AlunoTurma.objects.filter(
+        return para_leitura(AlunoTurma).filter(
             aluno=aluno, ativo=True,
         ).select_related('turma__ano_letivo')
+
+    @staticmethod
+    def listar_para_exportacao(turma):
+        """Alunos ativos da turma com responsaveis, na ordem da lista de chamada.
+
+        Pensado para .iterator(chunk_size=...): os responsaveis sao
+        carregados por prefetch a cada lote.
+        """
+        return para_leitura(AlunoTurma).filter(
+            turma=turma, ativo=True,
+        ).select_related('aluno__pessoa').prefetch_related(
+            Prefetch(
+                'aluno__responsaveis',
+                queryset=AlunoResponsavel.objects.select_related(
+                    'responsavel__pessoa',
+                ).order_by('-responsavel_principal', 'responsavel__pessoa__nome'),
+            ),
+        ).order_by('aluno__pessoa__nome', 'pk')
@@ -4,15 +4,25 @@ academic.repositories.ano_letivo_repository
 Acesso a dados da entidade AnoLetivo.
 """
 
+from asgiref.sync import sync_to_async
+
 from academic.models import AnoLetivo
+from core.dados_referencia import dado_de_referencia
+from core.replicas import para_leitura
 
 
 class AnoLetivoRepository:
 
     @staticmethod
+    @dado_de_referencia(AnoLetivo)
     def obter_ativo():
-        return AnoLetivo.objects.filter(ativo=True).first()
+        return para_leitura(AnoLetivo).filter(ativo=True).first()
+
+    @staticmethod
+    async def aobter_ativo():
+        # O cache de referencia e sincrono (LRU + cache compartilhado)
+        return await sync_to_async(AnoLetivoRepository.obter_ativo)()
 
     @staticmethod
     def listar_todos():
-        return AnoLetivo.objects.all()
+        return para_leitura(AnoLetivo).all()
@@ -5,14 +5,17 @@ Acesso a dados da entidade Disciplina.
 """
 
 from academic.models import Disciplina
+from core.dados_referencia import dado_de_referencia
+from core.replicas import para_leitura
 
 
 class DisciplinaRepository:
 
     @staticmethod
+    @dado_de_referencia(Disciplina)
     def listar_ativas():
-        return Disciplina.objects.filter(ativa=True)
+        return para_leitura(Disciplina).filter(ativa=True)
 
     @staticmethod
     def buscar_por_codigo(codigo):
-        return Disciplina.objects.filter(codigo=codigo).first()
+        return para_leitura(Disciplina).filter(codigo=codigo).first()
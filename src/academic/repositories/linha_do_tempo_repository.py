@@ -0,0 +1,21 @@
+"""
+academic.repositories.linha_do_tempo_repository
+
+Acesso a dados da projecao LinhaDoTempoAluno.
+"""
+
+from academic.models import LinhaDoTempoAluno
+from core.replicas import para_leitura
+
+
+class LinhaDoTempoRepository:
+
+    @staticmethod
+    def listar_por_aluno(aluno, limite=None):
+        """Trajetoria do aluno, do evento mais recente ao mais antigo."""
+        eventos = para_leitura(LinhaDoTempoAluno).filter(
+            aluno=aluno,
+        ).order_by('-data', '-id')
+        if limite is not None:
+            eventos = eventos[:limite]
+        return eventos
@@ -5,19 +5,20 @@ Acesso a dados da entidade Matricula.
 """
 
 from academic.models import Matricula
+from core.replicas import para_leitura
 
 
 class MatriculaRepository:
 
     @staticmethod
     def listar_por_aluno(aluno):
-        return Matricula.objects.filter(
+        return para_leitura(Matricula).filter(
             aluno=aluno,
         ).select_related('turma', 'ano_letivo').order_by('-data_matricula')
 
     @staticmethod
     def buscar_ativa_por_aluno_e_ano(aluno, ano_letivo):
-        return Matricula.objects.filter(
+        return para_leitura(Matricula).filter(
             aluno=aluno,
             ano_letivo=ano_letivo,
             status='ativa',
@@ -25,7 +26,16 @@ class MatriculaRepository:
 
     @staticmethod
     def listar_por_turma(turma):
-        return Matricula.objects.filter(
+        return para_leitura(Matricula).filter(
             turma=turma,
             status='ativa',
         ).select_related('aluno__pessoa')
+
+    @staticmethod
+    def listar_historico_por_turma(turma_id):
+        """Matriculas encerradas e canceladas da turma (ordenar na chamada)."""
+        return para_leitura(Matricula).filter(
+            turma_id=turma_id,
+        ).exclude(
+            status=Matricula.Status.ATIVA,
+        ).select_related('aluno__pessoa')
@@ -5,12 +5,29 @@ Acesso a dados da entidade MovimentacaoAluno.
 """
 
 from academic.models import MovimentacaoAluno
+from core.particoes import limites_ano
+from core.replicas import para_leitura
 
 
 class MovimentacaoAlunoRepository:
 
     @staticmethod
-    def listar_por_aluno(aluno):
-        return MovimentacaoAluno.objects.filter(
-            aluno=aluno,
-        ).select_related('matricula').order_by('-data')
+    def listar_por_aluno(aluno, ano=None):
+        """
+        Historico do aluno, do mais recente ao mais antigo.
+
+        Com ano, filtra pelo intervalo de datas do ano — no PostgreSQL
+        so a particao do ano e lida.
+        """
+        movimentacoes = para_leitura(MovimentacaoAluno).filter(aluno=aluno)
+        if ano is not None:
+            movimentacoes = MovimentacaoAlunoRepository.filtrar_ano(
+                movimentacoes, ano,
+            )
+        return movimentacoes.select_related('matricula').order_by('-data', '-id')
+
+    @staticmethod
+    def filtrar_ano(queryset, ano):
+        """Restringe ao ano por intervalo de datas (permite partition pruning)."""
+        inicio, fim = limites_ano(ano)
+        return queryset.filter(data__gte=inicio, data__lt=fim)
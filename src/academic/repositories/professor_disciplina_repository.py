@@ -5,18 +5,19 @@ Acesso a dados da entidade ProfessorDisciplina.
 """
 
 from academic.models import ProfessorDisciplina
+from core.replicas import para_leitura
 
 
 class ProfessorDisciplinaRepository:
 
     @staticmethod
     def listar_por_ano_letivo(ano_letivo):
-        return ProfessorDisciplina.objects.filter(
+        return para_leitura(ProfessorDisciplina).filter(
             ano_letivo=ano_letivo,
         ).select_related('professor__pessoa', 'disciplina')
 
     @staticmethod
     def listar_por_professor(professor):
-        return ProfessorDisciplina.objects.filter(
+        return para_leitura(ProfessorDisciplina).filter(
             professor=professor,
         ).select_related('disciplina', 'ano_letivo')
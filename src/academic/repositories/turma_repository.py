@@ -4,19 +4,74 @@ academic.repositories.turma_repository
 Acesso a dados da entidade Turma.
 """
 
-from academic.models import Turma
+from django.db.models import Count, OuterRef, Prefetch, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from academic.models import AlunoTurma, Matricula, Turma
+from core.replicas import para_leitura
+
+
+def _contagem_por_turma(queryset):
+    """Subconsulta com a quantidade de linhas do queryset por turma."""
+    return Coalesce(
+        Subquery(
+            queryset.filter(turma=OuterRef('pk')).order_by()
+            .values('turma').annotate(total=Count('pk')).values('total'),
+        ),
+        Value(0),
+    )
 
 
 class TurmaRepository:
 
     @staticmethod
     def listar_por_ano_letivo(ano_letivo):
-        return Turma.objects.filter(
+        return para_leitura(Turma).filter(
             ano_letivo=ano_letivo, ativa=True,
         ).select_related('escola', 'ano_letivo')
 
     @staticmethod
     def listar_por_escola(escola):
-        return Turma.objects.filter(
+        return para_leitura(Turma).filter(
             escola=escola, ativa=True,
         ).select_related('ano_letivo')
+
+    @staticmethod
+    def existe(turma_id):
+        return para_leitura(Turma).filter(pk=turma_id).exists()
+
+    @staticmethod
+    def buscar_visao_geral(turma_id, faixa_alunos, faixa_matriculas):
+        """Turma com totais e uma pagina dos alunos e das matriculas ativas.
+
+        Tres consultas, qualquer que seja o tamanho da turma: a turma
+        (totais em subconsultas, total_alunos / total_matriculas) e um
+        prefetch fatiado por lista, em ordem alfabetica dos alunos
+        (to_attr alunos_pagina / matriculas_pagina). As faixas sao
+        (inicio, fim) dos slices. None se a turma nao existe.
+        """
+        alunos = AlunoTurma.objects.filter(ativo=True).select_related(
+            'aluno__pessoa',
+        ).order_by('aluno__nome_ordenacao', 'pk')
+        matriculas = Matricula.objects.filter(
+            status=Matricula.Status.ATIVA,
+        ).select_related('aluno__pessoa').order_by('aluno__nome_ordenacao', 'pk')
+        return para_leitura(Turma).filter(pk=turma_id).select_related(
+            'escola', 'ano_letivo',
+        ).annotate(
+            total_alunos=_contagem_por_turma(AlunoTurma.objects.filter(ativo=True)),
+            total_matriculas=_contagem_por_turma(
+                Matricula.objects.filter(status=Matricula.Status.ATIVA),
+            ),
+        ).prefetch_related(
+            Prefetch(
+                'alunos_matriculados',
+                queryset=alunos[slice(*faixa_alunos)],
+                to_attr='alunos_pagina',
+            ),
+            Prefetch(
+                'matriculas',
+                queryset=matriculas[slice(*faixa_matriculas)],
+                to_attr='matriculas_pagina',
+            ),
+        ).first()
@@ -1,3 +1,13 @@
 from .matricula_service import MatriculaService
+from .exportacao_turma_service import ExportacaoTurmaService
+from .virada_ano_letivo_service import ViradaAnoLetivoService
+from .historico_movimentacao_service import HistoricoMovimentacaoService
+from .linha_do_tempo_service import LinhaDoTempoService
 
-__all__ = ['MatriculaService']
+__all__ = [
+    'MatriculaService',
+    'ExportacaoTurmaService',
+    'ViradaAnoLetivoService',
+    'HistoricoMovimentacaoService',
+    'LinhaDoTempoService',
+]
@@ -0,0 +1,112 @@
+"""
+academic.services.exportacao_turma_service
+
+Exportacao das listas de alunos (rosters) por turma, em CSV ou XLSX.
+
+As exportacoes sao geradores de bytes: os alunos sao lidos do banco em
+lotes (QuerySet.iterator) e cada linha e escrita assim que lida, entao
+o consumo de memoria nao cresce com o numero de turmas ou de alunos.
+Usado pelas views de exportacao e pelo comando exportar_turmas.
+"""
+
+from django.core.exceptions import ValidationError
+from django.utils.text import slugify
+
+from academic.repositories import AlunoTurmaRepository, TurmaRepository
+from core.exportacao import stream_csv, stream_xlsx, stream_zip
+
+
+# Alunos lidos do banco por lote
+TAMANHO_CHUNK = 500
+
+FORMATOS = ('csv', 'xlsx')
+
+TIPOS_CONTEUDO = {
+    'csv': 'text/csv; charset=utf-8',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'zip': 'application/zip',
+}
+
+CABECALHO_ROSTER = [
+    'Turma',
+    'Aluno',
+    'Matricula',
+    'Data de matricula',
+    'Responsaveis',
+    'Telefones dos responsaveis',
+]
+
+
+class ExportacaoTurmaService:
+
+    @staticmethod
+    def linhas_turma(turma):
+        """Gera as linhas do roster da turma (sem cabecalho)."""
+        alunos_turma = AlunoTurmaRepository.listar_para_exportacao(turma)
+        for aluno_turma in alunos_turma.iterator(chunk_size=TAMANHO_CHUNK):
+            aluno = aluno_turma.aluno
+            vinculos = aluno.responsaveis.all()
+            yield [
+                turma.nome,
+                aluno.pessoa.nome,
+                aluno.matricula,
+                aluno_turma.data_matricula.strftime('%d/%m/%Y'),
+                '; '.join(
+                    f'{vinculo.responsavel.pessoa.nome} '
+                    f'({vinculo.get_tipo_vinculo_display()}'
+                    f'{", principal" if vinculo.responsavel_principal else ""})'
+                    for vinculo in vinculos
+                ),
+                '; '.join(
+                    vinculo.responsavel.pessoa.telefone
+                    for vinculo in vinculos
+                    if vinculo.responsavel.pessoa.telefone
+                ),
+            ]
+
+    @staticmethod
+    def exportar_turma(turma, formato='csv'):
+        """Gera os bytes do roster de uma turma no formato pedido."""
+        ExportacaoTurmaService._validar_formato(formato)
+        linhas = ExportacaoTurmaService.linhas_turma(turma)
+        if formato == 'xlsx':
+            return stream_xlsx(CABECALHO_ROSTER, linhas, nome_planilha=turma.nome)
+        return stream_csv(CABECALHO_ROSTER, linhas)
+
+    @staticmethod
+    def exportar_turmas(turmas, formato='csv'):
+        """Gera um ZIP com um arquivo por turma."""
+        ExportacaoTurmaService._validar_formato(formato)
+        return stream_zip(
+            (
+                ExportacaoTurmaService.nome_arquivo(turma, formato),
+                ExportacaoTurmaService.exportar_turma(turma, formato),
+            )
+            for turma in turmas
+        )
+
+    @staticmethod
+    def exportar_ano_letivo(ano_letivo, formato='csv'):
+        """Gera um ZIP com os rosters de todas as turmas ativas do ano letivo."""
+        turmas = TurmaRepository.listar_por_ano_letivo(ano_letivo).order_by(
+            'escola__nome', 'nome',
+        )
+        return ExportacaoTurmaService.exportar_turmas(turmas.iterator(), formato)
+
+    @staticmethod
+    def nome_arquivo(turma, formato):
+        """Nome do arquivo do roster (unico por escola, ano letivo e turma)."""
+        nome = slugify(f'{turma.escola.nome} {turma.ano_letivo.nome} {turma.nome}')
+        return f'{nome}.{formato}'
+
+    @staticmethod
+    def nome_arquivo_ano_letivo(ano_letivo, formato):
+        return f'turmas-{slugify(ano_letivo.nome)}-{formato}.zip'
+
+    @staticmethod
+    def _validar_formato(formato):
+        if formato not in FORMATOS:
+            raise ValidationError(
+                f'Formato de exportacao invalido: {formato}. '
+                f'Use um de: {", ".join(FORMATOS)}.'
+            )
@@ -0,0 +1,293 @@
+"""
+academic.services.historico_movimentacao_service
+
+Armazenamento do historico de MovimentacaoAluno por ano.
+
+O historico so cresce (nunca e apagado nem alterado). No PostgreSQL a
+tabela e particionada por ano da data (ver core.particoes):
+
+- garantir_particoes cria as particoes dos proximos anos (rodar antes
+  da virada do ano; datas sem particao caem na particao padrao)
+- arquivar desanexa a particao de um ano antigo, grava as linhas em um
+  CSV compactado (gzip) e apaga a particao; o ano fica registrado em
+  ArquivoMovimentacao
+- ler_arquivo consulta um ano arquivado sob demanda, sem restaura-lo
+- restaurar devolve as linhas de um ano arquivado ao banco
+
+No SQLite a tabela e simples: arquivar grava o arquivo e remove as
+linhas do ano com DELETE.
+
+O arquivamento e retomavel: se interrompido depois de desanexar a
+particao, a tabela desanexada continua no banco e a proxima execucao
+continua dela.
+"""
+
+import csv
+import gzip
+import hashlib
+import os
+from datetime import date, datetime, timezone as dt_timezone
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from academic.models import ArquivoMovimentacao, MovimentacaoAluno
+from core.particoes import (
+    criar_particao_anual,
+    desanexar_particao,
+    limites_ano,
+    listar_particoes,
+    nome_particao,
+    particionada,
+    tabela_existe,
+)
+
+
+TABELA = MovimentacaoAluno._meta.db_table
+
+COLUNAS = [
+    'id', 'aluno_id', 'matricula_id', 'tipo_evento', 'data', 'descricao',
+    'criado_em', 'atualizado_em',
+]
+
+# Linhas lidas/gravadas por vez ao arquivar e restaurar
+TAMANHO_LOTE = 2000
+
+
+def _texto(valor):
+    if valor is None:
+        return ''
+    if isinstance(valor, (date, datetime)):
+        return valor.isoformat()
+    return str(valor)
+
+
+def _data_hora(valor):
+    data_hora = datetime.fromisoformat(valor)
+    if timezone.is_naive(data_hora):
+        data_hora = data_hora.replace(tzinfo=dt_timezone.utc)
+    return data_hora
+
+
+def _converter_linha(linha):
+    """Linha do CSV (dict) -> valores tipados por coluna."""
+    return {
+        'id': int(linha['id']),
+        'aluno_id': int(linha['aluno_id']),
+        'matricula_id': int(linha['matricula_id']) if linha['matricula_id'] else None,
+        'tipo_evento': linha['tipo_evento'],
+        'data': date.fromisoformat(linha['data']),
+        'descricao': linha['descricao'],
+        'criado_em': _data_hora(linha['criado_em']),
+        'atualizado_em': _data_hora(linha['atualizado_em']),
+    }
+
+
+class HistoricoMovimentacaoService:
+    """Particoes anuais e arquivamento do historico de movimentacoes."""
+
+    @staticmethod
+    def diretorio():
+        return Path(settings.ARQUIVO_MOVIMENTACOES_DIR)
+
+    @staticmethod
+    def anos_no_banco():
+        """{ano: quantidade de movimentacoes} dos anos ainda no banco."""
+        contagem = {}
+        for data in MovimentacaoAluno.objects.dates('data', 'year'):
+            inicio, fim = limites_ano(data.year)
+            contagem[data.year] = MovimentacaoAluno.objects.filter(
+                data__gte=inicio, data__lt=fim,
+            ).count()
+        return contagem
+
+    @staticmethod
+    @transaction.atomic
+    def garantir_particoes(ate_ano):
+        """
+        Cria as particoes anuais que faltam ate `ate_ano` (PostgreSQL).
+
+        Comeca no ano seguinte a ultima particao existente. Linhas que ja
+        estejam na particao padrao sao movidas. Retorna os anos criados.
+        """
+        if not particionada(connection, TABELA):
+            return []
+        existentes = listar_particoes(connection, TABELA)
+        arquivados = set(
+            ArquivoMovimentacao.objects.values_list('ano', flat=True)
+        )
+        inicio = max(existentes, default=timezone.localdate().year - 1) + 1
+        return [
+            ano for ano in range(inicio, ate_ano + 1)
+            if ano not in arquivados
+            and criar_particao_anual(connection, TABELA, 'data', ano)
+        ]
+
+    @staticmethod
+    def arquivar(ano):
+        """
+        Arquiva as movimentacoes de um ano em <diretorio>/<ano>.csv.gz.
+
+        Retorna o ArquivoMovimentacao criado.
+
+        Raises:
+            ValidationError: se o ano nao for anterior ao atual ou ja
+                estiver arquivado.
+        """
+        if ano >= timezone.localdate().year:
+            raise ValidationError(
+                f'So anos anteriores ao atual podem ser arquivados ({ano}).'
+            )
+        if ArquivoMovimentacao.objects.filter(ano=ano).exists():
+            raise ValidationError(f'O ano {ano} ja esta arquivado.')
+
+        origem = HistoricoMovimentacaoService._separar_ano(ano)
+
+        diretorio = HistoricoMovimentacaoService.diretorio()
+        diretorio.mkdir(parents=True, exist_ok=True)
+        caminho = diretorio / f'{ano}.csv.gz'
+        temporario = caminho.with_name(f'{caminho.name}.tmp')
+        linhas = HistoricoMovimentacaoService._gravar_arquivo(
+            origem, ano, temporario,
+        )
+        os.replace(temporario, caminho)
+
+        sha256 = hashlib.sha256()
+        with open(caminho, 'rb') as arquivo:
+            for pedaco in iter(lambda: arquivo.read(1024 * 1024), b''):
+                sha256.update(pedaco)
+
+        with transaction.atomic():
+            registro = ArquivoMovimentacao.objects.create(
+                ano=ano,
+                arquivo=str(caminho),
+                linhas=linhas,
+                tamanho_bytes=caminho.stat().st_size,
+                sha256=sha256.hexdigest(),
+            )
+            with connection.cursor() as cursor:
+                q = connection.ops.quote_name
+                if origem == TABELA:
+                    inicio, fim = limites_ano(ano)
+                    cursor.execute(
+                        f'DELETE FROM {q(TABELA)} WHERE {q("data")} >= %s '
+                        f'AND {q("data")} < %s',
+                        [inicio, fim],
+                    )
+                else:
+                    cursor.execute(f'DROP TABLE {q(origem)}')
+        return registro
+
+    @staticmethod
+    def ler_arquivo(ano, aluno_id=None):
+        """
+        Le as movimentacoes de um ano arquivado, sem restaura-las.
+
+        Retorna um iterador de instancias de MovimentacaoAluno (nao
+        salvas), na ordem de gravacao, opcionalmente so as de um aluno.
+
+        Raises:
+            ArquivoMovimentacao.DoesNotExist: se o ano nao esta arquivado.
+        """
+        registro = ArquivoMovimentacao.objects.get(ano=ano)
+        return HistoricoMovimentacaoService._iterar_arquivo(
+            registro.arquivo, aluno_id,
+        )
+
+    @staticmethod
+    @transaction.atomic
+    def restaurar(ano):
+        """
+        Devolve ao banco as movimentacoes de um ano arquivado.
+
+        Preserva ids e datas de criacao. O arquivo e mantido em disco; o
+        registro em ArquivoMovimentacao e removido. Retorna o numero de
+        linhas restauradas.
+        """
+        registro = ArquivoMovimentacao.objects.select_for_update().get(ano=ano)
+        if particionada(connection, TABELA):
+            criar_particao_anual(connection, TABELA, 'data', ano)
+
+        ops = connection.ops
+        q = ops.quote_name
+        sql = (
+            f'INSERT INTO {q(TABELA)} ({", ".join(q(c) for c in COLUNAS)}) '
+            f'VALUES ({", ".join(["%s"] * len(COLUNAS))})'
+        )
+        restauradas = 0
+        with gzip.open(registro.arquivo, 'rt', newline='', encoding='utf-8') as arquivo, \
+                connection.cursor() as cursor:
+            lote = []
+            for linha in csv.DictReader(arquivo):
+                valores = _converter_linha(linha)
+                valores['data'] = ops.adapt_datefield_value(valores['data'])
+                for campo in ('criado_em', 'atualizado_em'):
+                    valores[campo] = ops.adapt_datetimefield_value(valores[campo])
+                lote.append([valores[c] for c in COLUNAS])
+                if len(lote) == TAMANHO_LOTE:
+                    cursor.executemany(sql, lote)
+                    restauradas += len(lote)
+                    lote = []
+            if lote:
+                cursor.executemany(sql, lote)
+                restauradas += len(lote)
+
+        registro.delete()
+        return restauradas
+
+    @staticmethod
+    def _iterar_arquivo(caminho, aluno_id):
+        with gzip.open(caminho, 'rt', newline='', encoding='utf-8') as arquivo:
+            for linha in csv.DictReader(arquivo):
+                if aluno_id is not None and int(linha['aluno_id']) != aluno_id:
+                    continue
+                yield MovimentacaoAluno(**_converter_linha(linha))
+
+    @staticmethod
+    def _separar_ano(ano):
+        """
+        Isola as linhas do ano e retorna a tabela de onde le-las.
+
+        PostgreSQL: garante a particao do ano e a desanexa (ou reaproveita
+        uma desanexada por execucao interrompida). Outros bancos: a
+        propria tabela (as linhas sao filtradas pela data).
+        """
+        if not particionada(connection, TABELA):
+            return TABELA
+        particao = nome_particao(TABELA, ano)
+        if ano not in listar_particoes(connection, TABELA) and tabela_existe(
+            connection, particao,
+        ):
+            return particao
+        with transaction.atomic():
+            criar_particao_anual(connection, TABELA, 'data', ano)
+            return desanexar_particao(connection, TABELA, ano)
+
+    @staticmethod
+    def _gravar_arquivo(origem, ano, caminho):
+        """Grava as linhas do ano (lidas em lotes por id) em CSV gzip."""
+        q = connection.ops.quote_name
+        inicio, fim = limites_ano(ano)
+        sql = (
+            f'SELECT {", ".join(q(c) for c in COLUNAS)} FROM {q(origem)} '
+            f'WHERE {q("data")} >= %s AND {q("data")} < %s AND {q("id")} > %s '
+            f'ORDER BY {q("id")} LIMIT {TAMANHO_LOTE}'
+        )
+        linhas = 0
+        ultimo_id = 0
+        with gzip.open(caminho, 'wt', newline='', encoding='utf-8') as arquivo, \
+                connection.cursor() as cursor:
+            escritor = csv.writer(arquivo)
+            escritor.writerow(COLUNAS)
+            while True:
+                cursor.execute(sql, [inicio, fim, ultimo_id])
+                lote = cursor.fetchall()
+                if not lote:
+                    break
+                escritor.writerows([_texto(v) for v in linha] for linha in lote)
+                linhas += len(lote)
+                ultimo_id = lote[-1][0]
+        return linhas
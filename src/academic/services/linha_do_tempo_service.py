@@ -0,0 +1,299 @@
+"""
+academic.services.linha_do_tempo_service
+
+Manutencao da projecao LinhaDoTempoAluno (tabela aluno_linha_do_tempo).
+
+A trajetoria de um aluno esta espalhada por Matricula, MovimentacaoAluno,
+AlunoTurma, Emprestimo e AlunoResponsavel. Este service monta os eventos
+de um conjunto de alunos com uma consulta por tabela de origem e regrava
+a linha do tempo desses alunos (DELETE + bulk_create) na transacao de
+quem chamou.
+
+Quem altera as tabelas de origem chama atualizar_alunos com os alunos
+afetados: MatriculaService, ViradaAnoLetivoService e o admin dos
+vinculos aluno-responsavel. Emprestimos e devolucoes sao muito mais
+frequentes: o BibliotecaService chama registrar_emprestimos e
+registrar_devolucoes, que regravam so os eventos daqueles emprestimos.
+Alteracoes feitas por outros caminhos (seeds, edicao direta no admin)
+sao corrigidas por reconstruir() — comando atualizar_linha_do_tempo.
+
+Movimentacoes de anos arquivados (ArquivoMovimentacao) nao estao mais
+na tabela de origem: a regravacao preserva os eventos ja projetados
+desses anos.
+
+Os eventos de cada aluno sao gravados em ordem cronologica, entao o
+indice (aluno, data, id) devolve a trajetoria ja ordenada; eventos
+registrados depois (emprestimos, devolucoes) entram no fim do seu dia.
+"""
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from academic.models import (
+    AlunoTurma,
+    ArquivoMovimentacao,
+    LinhaDoTempoAluno,
+    Matricula,
+    MovimentacaoAluno,
+)
+from core.particoes import limites_ano
+from library.models import Emprestimo
+from people.models import Aluno, AlunoResponsavel
+
+
+# Alunos por transacao na reconstrucao completa
+TAMANHO_LOTE = 500
+
+Tipo = LinhaDoTempoAluno.Tipo
+
+# Ordem dos eventos de um mesmo dia
+PRIORIDADE = {tipo: ordem for ordem, tipo in enumerate(Tipo.values)}
+
+
+class LinhaDoTempoService:
+    """Mantem a projecao da trajetoria dos alunos."""
+
+    @staticmethod
+    @transaction.atomic
+    def atualizar_alunos(aluno_ids):
+        """
+        Regrava a linha do tempo dos alunos informados.
+
+        Bloqueia as linhas dos alunos (SELECT ... FOR UPDATE) para que
+        duas atualizacoes do mesmo aluno nao se intercalem. Leitores nao
+        sao bloqueados: ate o commit continuam vendo a versao anterior.
+
+        Retorna o numero de eventos gravados.
+        """
+        aluno_ids = sorted({pk for pk in aluno_ids if pk is not None})
+        if not aluno_ids:
+            return 0
+
+        LinhaDoTempoService._bloquear_alunos(aluno_ids)
+        eventos = LinhaDoTempoService.montar_eventos(aluno_ids)
+        LinhaDoTempoAluno.objects.filter(aluno__in=aluno_ids).exclude(
+            LinhaDoTempoService._movimentacoes_arquivadas(),
+        ).delete()
+        LinhaDoTempoAluno.objects.bulk_create(eventos, batch_size=TAMANHO_LOTE)
+        return len(eventos)
+
+    @staticmethod
+    def registrar_emprestimos(emprestimo_ids):
+        """
+        Grava o evento de emprestimo dos emprestimos informados.
+
+        Usado pelo BibliotecaService no lugar de atualizar_alunos: so os
+        eventos desses emprestimos sao regravados. Retorna o numero de
+        eventos gravados.
+        """
+        return LinhaDoTempoService._regravar_emprestimos(
+            emprestimo_ids, Tipo.EMPRESTIMO,
+        )
+
+    @staticmethod
+    def registrar_devolucoes(emprestimo_ids):
+        """
+        Grava o evento de devolucao dos emprestimos informados.
+
+        Como registrar_emprestimos; o evento de emprestimo nao e tocado.
+        """
+        return LinhaDoTempoService._regravar_emprestimos(
+            emprestimo_ids, Tipo.DEVOLUCAO,
+        )
+
+    @staticmethod
+    def reconstruir(aluno_ids=None, tamanho_lote=TAMANHO_LOTE,
+                    ao_concluir_lote=None):
+        """
+        Reconstroi a projecao de todos os alunos (ou dos informados).
+
+        Processa os alunos em lotes por pk crescente, cada lote na sua
+        propria transacao: leitores nunca ficam bloqueados e uma falha
+        preserva os lotes ja gravados.
+
+        Retorna um dict com 'lotes', 'alunos' e 'eventos'.
+        """
+        alunos = Aluno.objects.order_by('pk')
+        if aluno_ids is not None:
+            alunos = alunos.filter(pk__in=aluno_ids)
+
+        resumo = {'lotes': 0, 'alunos': 0, 'eventos': 0}
+        ultimo_pk = 0
+        while True:
+            lote = list(
+                alunos.filter(pk__gt=ultimo_pk)
+                .values_list('pk', flat=True)[:tamanho_lote]
+            )
+            if not lote:
+                break
+            ultimo_pk = lote[-1]
+            resumo['eventos'] += LinhaDoTempoService.atualizar_alunos(lote)
+            resumo['lotes'] += 1
+            resumo['alunos'] += len(lote)
+            if ao_concluir_lote is not None:
+                ao_concluir_lote(resumo)
+        return resumo
+
+    @staticmethod
+    def montar_eventos(aluno_ids):
+        """
+        Monta (sem gravar) os eventos dos alunos, em ordem cronologica.
+
+        Uma consulta por tabela de origem, qualquer que seja o numero de
+        alunos.
+        """
+        eventos = []
+
+        for vinculo in AlunoResponsavel.objects.filter(
+            aluno__in=aluno_ids,
+        ).select_related('responsavel__pessoa'):
+            detalhes = [
+                texto for marcado, texto in (
+                    (vinculo.responsavel_principal, 'Responsavel principal'),
+                    (vinculo.autorizado_retirar_aluno, 'Autorizado a retirar o aluno'),
+                ) if marcado
+            ]
+            eventos.append(LinhaDoTempoAluno(
+                aluno_id=vinculo.aluno_id,
+                data=timezone.localdate(vinculo.criado_em),
+                tipo=Tipo.RESPONSAVEL,
+                titulo=(
+                    f'Responsavel: {vinculo.responsavel.pessoa.nome} '
+                    f'({vinculo.get_tipo_vinculo_display()})'
+                ),
+                detalhes='; '.join(detalhes),
+                origem_id=vinculo.pk,
+            ))
+
+        for matricula in Matricula.objects.filter(
+            aluno__in=aluno_ids,
+        ).select_related('turma', 'ano_letivo'):
+            eventos.append(LinhaDoTempoAluno(
+                aluno_id=matricula.aluno_id,
+                data=matricula.data_matricula,
+                tipo=Tipo.MATRICULA,
+                titulo=(
+                    f'Matricula ({matricula.get_tipo_display()}) na turma '
+                    f'{matricula.turma.nome} — {matricula.ano_letivo.nome}'
+                ),
+                detalhes=(
+                    f'Situacao: {matricula.get_status_display()}.'
+                    f'{" " + matricula.observacao if matricula.observacao else ""}'
+                ),
+                origem_id=matricula.pk,
+            ))
+
+        for vinculo in AlunoTurma.objects.filter(
+            aluno__in=aluno_ids,
+        ).select_related('turma__ano_letivo'):
+            eventos.append(LinhaDoTempoAluno(
+                aluno_id=vinculo.aluno_id,
+                data=vinculo.data_matricula,
+                tipo=Tipo.TURMA,
+                titulo=f'Entrada na turma {vinculo.turma}',
+                detalhes='Vinculo ativo' if vinculo.ativo else 'Vinculo encerrado',
+                origem_id=vinculo.pk,
+            ))
+
+        for movimentacao in MovimentacaoAluno.objects.filter(
+            aluno__in=aluno_ids,
+        ):
+            eventos.append(LinhaDoTempoAluno(
+                aluno_id=movimentacao.aluno_id,
+                data=movimentacao.data,
+                tipo=Tipo.MOVIMENTACAO,
+                titulo=movimentacao.get_tipo_evento_display(),
+                detalhes=movimentacao.descricao,
+                origem_id=movimentacao.pk,
+            ))
+
+        for emprestimo in Emprestimo.objects.filter(
+            aluno__in=aluno_ids,
+        ).select_related('exemplar__obra'):
+            eventos.extend(LinhaDoTempoService._eventos_emprestimo(emprestimo))
+
+        eventos.sort(key=lambda e: (
+            e.aluno_id, e.data, PRIORIDADE[e.tipo], e.origem_id,
+        ))
+        return eventos
+
+    @staticmethod
+    def _eventos_emprestimo(emprestimo):
+        """Eventos de emprestimo e, se houver, de devolucao."""
+        exemplar = emprestimo.exemplar
+        eventos = [LinhaDoTempoAluno(
+            aluno_id=emprestimo.aluno_id,
+            data=emprestimo.data_emprestimo,
+            tipo=Tipo.EMPRESTIMO,
+            titulo=f'Emprestimo: {exemplar.obra.titulo}',
+            detalhes=(
+                f'Exemplar {exemplar.codigo_patrimonio}; devolucao prevista '
+                f'em {emprestimo.data_prevista_devolucao:%d/%m/%Y}.'
+            ),
+            origem_id=emprestimo.pk,
+        )]
+        if emprestimo.data_devolucao:
+            eventos.append(LinhaDoTempoAluno(
+                aluno_id=emprestimo.aluno_id,
+                data=emprestimo.data_devolucao,
+                tipo=Tipo.DEVOLUCAO,
+                titulo=f'Devolucao: {exemplar.obra.titulo}',
+                detalhes=f'Exemplar {exemplar.codigo_patrimonio}.',
+                origem_id=emprestimo.pk,
+            ))
+        return eventos
+
+    @staticmethod
+    @transaction.atomic
+    def _regravar_emprestimos(emprestimo_ids, tipo):
+        """
+        Regrava os eventos de um tipo dos emprestimos informados.
+
+        Uma consulta para os emprestimos, um DELETE restrito aos alunos
+        envolvidos (pelo indice (aluno, data, id)) e um bulk_create, com
+        os alunos bloqueados como em atualizar_alunos.
+        """
+        emprestimos = list(
+            Emprestimo.objects.filter(
+                pk__in=emprestimo_ids, aluno__isnull=False,
+            ).select_related('exemplar__obra')
+        )
+        if not emprestimos:
+            return 0
+
+        aluno_ids = sorted({e.aluno_id for e in emprestimos})
+        LinhaDoTempoService._bloquear_alunos(aluno_ids)
+        eventos = sorted(
+            (
+                evento
+                for emprestimo in emprestimos
+                for evento in LinhaDoTempoService._eventos_emprestimo(emprestimo)
+                if evento.tipo == tipo
+            ),
+            key=lambda e: (e.aluno_id, e.data, e.origem_id),
+        )
+        LinhaDoTempoAluno.objects.filter(
+            aluno__in=aluno_ids,
+            tipo=tipo,
+            origem_id__in=[e.pk for e in emprestimos],
+        ).delete()
+        LinhaDoTempoAluno.objects.bulk_create(eventos, batch_size=TAMANHO_LOTE)
+        return len(eventos)
+
+    @staticmethod
+    def _bloquear_alunos(aluno_ids):
+        """SELECT ... FOR UPDATE dos alunos, em ordem de pk."""
+        list(
+            Aluno.objects.select_for_update()
+            .filter(pk__in=aluno_ids).order_by('pk').values_list('pk', flat=True)
+        )
+
+    @staticmethod
+    def _movimentacoes_arquivadas():
+        """Filtro dos eventos de movimentacao dos anos arquivados."""
+        filtro = Q(pk__in=[])
+        for ano in ArquivoMovimentacao.objects.values_list('ano', flat=True):
+            inicio, fim = limites_ano(ano)
+            filtro |= Q(data__gte=inicio, data__lt=fim)
+        return filtro & Q(tipo=Tipo.MOVIMENTACAO)
@@ -12,6 +12,17 @@ from django.core.exceptions import ValidationError
 from django.db import transaction
 
 from academic.models import AlunoTurma, Matricula, MovimentacaoAluno
+from academic.services.linha_do_tempo_service import LinhaDoTempoService
+
+
+# Tamanho dos lotes de INSERT usados nas operacoes em massa
+TAMANHO_LOTE = 500
+
+TIPO_EVENTO_POR_TIPO_MATRICULA = {
+    Matricula.Tipo.INICIAL: MovimentacaoAluno.TipoEvento.MATRICULA_INICIAL,
+    Matricula.Tipo.TRANSFERENCIA: MovimentacaoAluno.TipoEvento.TRANSFERENCIA_ENTRADA,
+    Matricula.Tipo.REMANEJAMENTO: MovimentacaoAluno.TipoEvento.REMANEJAMENTO,
+}
 
 
 class MatriculaService:
@@ -65,26 +76,136 @@ class MatriculaService:
         )
 
         # Registra movimentacao
-        tipo_evento_map = {
-            Matricula.Tipo.INICIAL: MovimentacaoAluno.TipoEvento.MATRICULA_INICIAL,
-            Matricula.Tipo.TRANSFERENCIA: MovimentacaoAluno.TipoEvento.TRANSFERENCIA_ENTRADA,
-            Matricula.Tipo.REMANEJAMENTO: MovimentacaoAluno.TipoEvento.REMANEJAMENTO,
+        MovimentacaoAluno.objects.create(
+            **MatriculaService._dados_movimentacao_entrada(matricula)
+        )
+
+        LinhaDoTempoService.atualizar_alunos([aluno.pk])
+
+        return matricula
+
+    @staticmethod
+    @transaction.atomic
+    def matricular_em_lote(entradas):
+        """
+        Matricula varios alunos de uma vez (ex: inicio do ano letivo).
+
+        Cada entrada e um dict com as mesmas chaves de matricular_aluno:
+        aluno, turma, ano_letivo, data_matricula e, opcionalmente, tipo e
+        observacao.
+
+        Aplica as mesmas regras do fluxo individual, mas de forma
+        set-based: os conflitos de matricula ativa sao verificados com
+        uma unica consulta e Matricula, AlunoTurma e MovimentacaoAluno
+        sao gravados com bulk_create dentro de uma so transacao.
+        A constraint unique_matricula_ativa_por_ano continua valendo
+        no banco como ultima barreira.
+
+        Retorna uma lista (na ordem das entradas) de dicts com as chaves:
+            linha: indice da entrada (a partir de 0)
+            aluno: aluno da entrada
+            matricula: Matricula criada, ou None em caso de conflito
+            erro: mensagem do conflito, ou '' em caso de sucesso
+        """
+        entradas = list(entradas)
+        if not entradas:
+            return []
+
+        # Conflitos com matriculas ativas ja gravadas — uma unica consulta
+        ativas = {
+            (m.aluno_id, m.ano_letivo_id): m
+            for m in Matricula.objects.filter(
+                aluno__in={e['aluno'].pk for e in entradas},
+                ano_letivo__in={e['ano_letivo'].pk for e in entradas},
+                status=Matricula.Status.ATIVA,
+            ).select_related('turma__ano_letivo')
         }
 
-        MovimentacaoAluno.objects.create(
-            aluno=aluno,
-            tipo_evento=tipo_evento_map.get(
-                tipo, MovimentacaoAluno.TipoEvento.MATRICULA_INICIAL
+        relatorio = []
+        novas = []
+        for linha, entrada in enumerate(entradas):
+            aluno = entrada['aluno']
+            ano_letivo = entrada['ano_letivo']
+            chave = (aluno.pk, ano_letivo.pk)
+            item = {'linha': linha, 'aluno': aluno, 'matricula': None, 'erro': ''}
+            relatorio.append(item)
+
+            existente = ativas.get(chave)
+            if existente is not None:
+                item['erro'] = (
+                    f'O aluno {aluno} ja possui matricula ativa no ano letivo '
+                    f'{ano_letivo} (turma: {existente.turma}).'
+                )
+                continue
+
+            matricula = Matricula(
+                aluno=aluno,
+                turma=entrada['turma'],
+                ano_letivo=ano_letivo,
+                data_matricula=entrada['data_matricula'],
+                tipo=entrada.get('tipo', Matricula.Tipo.INICIAL),
+                status=Matricula.Status.ATIVA,
+                observacao=entrada.get('observacao', ''),
+            )
+            # Repetir o aluno/ano no mesmo lote tambem e conflito
+            ativas[chave] = matricula
+            item['matricula'] = matricula
+            novas.append(matricula)
+
+        if not novas:
+            return relatorio
+
+        Matricula.objects.bulk_create(novas, batch_size=TAMANHO_LOTE)
+
+        # Estado atual (AlunoTurma) — upsert pelo par unico aluno/turma
+        vinculos = {
+            (m.aluno.pk, m.turma.pk): AlunoTurma(
+                aluno=m.aluno,
+                turma=m.turma,
+                data_matricula=m.data_matricula,
+                ativo=True,
+            )
+            for m in novas
+        }
+        AlunoTurma.objects.bulk_create(
+            vinculos.values(),
+            batch_size=TAMANHO_LOTE,
+            update_conflicts=True,
+            unique_fields=['aluno', 'turma'],
+            update_fields=['data_matricula', 'ativo', 'atualizado_em'],
+        )
+
+        MovimentacaoAluno.objects.bulk_create(
+            [
+                MovimentacaoAluno(
+                    **MatriculaService._dados_movimentacao_entrada(m)
+                )
+                for m in novas
+            ],
+            batch_size=TAMANHO_LOTE,
+        )
+
+        LinhaDoTempoService.atualizar_alunos(m.aluno.pk for m in novas)
+
+        return relatorio
+
+    @staticmethod
+    def _dados_movimentacao_entrada(matricula):
+        """Monta os campos da movimentacao que registra uma nova matricula."""
+        observacao = matricula.observacao
+        return {
+            'aluno': matricula.aluno,
+            'tipo_evento': TIPO_EVENTO_POR_TIPO_MATRICULA.get(
+                matricula.tipo, MovimentacaoAluno.TipoEvento.MATRICULA_INICIAL
             ),
-            data=data_matricula,
-            descricao=(
-                f'Matricula {tipo} na turma {turma} — {ano_letivo}.'
+            'data': matricula.data_matricula,
+            'descricao': (
+                f'Matricula {matricula.tipo} na turma {matricula.turma} '
+                f'— {matricula.ano_letivo}.'
                 f'{" " + observacao if observacao else ""}'
             ),
-            matricula=matricula,
-        )
-
-        return matricula
+            'matricula': matricula,
+        }
 
     @staticmethod
     @transaction.atomic
@@ -127,6 +248,8 @@ class MatriculaService:
             matricula=matricula,
         )
 
+        LinhaDoTempoService.atualizar_alunos([matricula.aluno_id])
+
     @staticmethod
     @transaction.atomic
     def transferir_aluno(matricula_atual, nova_turma, data, observacao=''):
@@ -212,4 +335,6 @@ class MatriculaService:
             matricula=nova_matricula,
         )
 
+        LinhaDoTempoService.atualizar_alunos([aluno.pk])
+
         return nova_matricula
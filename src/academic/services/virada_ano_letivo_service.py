@@ -0,0 +1,246 @@
+"""
+academic.services.virada_ano_letivo_service
+
+Virada do ano letivo: encerra as matriculas ativas das turmas de origem
+e rematricula os alunos nas turmas de destino do ano seguinte.
+
+Equivale a chamar MatriculaService.encerrar_matricula e
+matricular_aluno para cada aluno, mas de forma set-based:
+
+- As matriculas sao processadas em lotes (por pk crescente), cada lote
+  na sua propria transacao — uma falha no meio preserva os lotes ja
+  gravados
+- A rematricula usa MatriculaService.matricular_em_lote (mesmas regras
+  e mesmos conflitos do fluxo individual); so as matriculas rematriculadas
+  com sucesso sao encerradas
+- Encerramento, AlunoTurma e MovimentacaoAluno sao gravados com UPDATE
+  e bulk_create por lote
+- Retomavel: matriculas ja viradas ficam encerradas e nao sao
+  selecionadas de novo; basta rodar outra vez com o mesmo mapeamento
+"""
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+
+from academic.models import AlunoTurma, Matricula, MovimentacaoAluno
+from academic.services.linha_do_tempo_service import LinhaDoTempoService
+from academic.services.matricula_service import MatriculaService, TAMANHO_LOTE
+
+
+class ViradaAnoLetivoService:
+    """Promove as turmas de um ano letivo para o ano seguinte."""
+
+    @staticmethod
+    def validar_mapeamento(mapeamento):
+        """
+        Valida o mapeamento {turma_origem: turma_destino}.
+
+        Todas as origens devem ser do mesmo ano letivo, todos os destinos
+        de um mesmo ano letivo diferente, e os destinos devem estar ativos.
+
+        Retorna (ano_origem, ano_destino).
+
+        Raises:
+            ValidationError: se o mapeamento for invalido.
+        """
+        if not mapeamento:
+            raise ValidationError('Informe ao menos um par de turmas.')
+
+        anos_origem = {t.ano_letivo for t in mapeamento}
+        anos_destino = {t.ano_letivo for t in mapeamento.values()}
+        if len(anos_origem) > 1:
+            raise ValidationError(
+                'As turmas de origem devem ser do mesmo ano letivo '
+                f'(encontrados: {", ".join(sorted(str(a) for a in anos_origem))}).'
+            )
+        if len(anos_destino) > 1:
+            raise ValidationError(
+                'As turmas de destino devem ser do mesmo ano letivo '
+                f'(encontrados: {", ".join(sorted(str(a) for a in anos_destino))}).'
+            )
+
+        ano_origem, ano_destino = anos_origem.pop(), anos_destino.pop()
+        if ano_origem == ano_destino:
+            raise ValidationError(
+                f'O ano letivo de destino deve ser diferente do de origem '
+                f'({ano_origem}).'
+            )
+
+        inativas = [t for t in mapeamento.values() if not t.ativa]
+        if inativas:
+            raise ValidationError(
+                'Turmas de destino inativas: '
+                f'{", ".join(str(t) for t in inativas)}.'
+            )
+
+        return ano_origem, ano_destino
+
+    @staticmethod
+    def virar(mapeamento, data_encerramento, data_matricula,
+              tamanho_lote=TAMANHO_LOTE, dry_run=False, ao_concluir_lote=None):
+        """
+        Executa (ou simula, com dry_run) a virada do ano letivo.
+
+        Args:
+            mapeamento: dict {turma_origem: turma_destino}.
+            data_encerramento: data das movimentacoes de encerramento.
+            data_matricula: data das novas matriculas.
+            tamanho_lote: matriculas por lote (uma transacao por lote).
+            dry_run: apenas conta e reporta conflitos, sem gravar.
+            ao_concluir_lote: callable opcional chamado com o resumo
+                parcial apos cada lote (para relatorio de progresso).
+
+        Retorna um dict com:
+            lotes: numero de lotes processados
+            processadas: matriculas ativas encontradas nas turmas de origem
+            rematriculadas: alunos rematriculados (ou que seriam, no dry-run)
+            conflitos: lista de dicts {matricula, turma_destino, erro}
+
+        Raises:
+            ValidationError: se o mapeamento for invalido.
+        """
+        ano_origem, ano_destino = ViradaAnoLetivoService.validar_mapeamento(
+            mapeamento,
+        )
+        destino_por_origem = {
+            origem.pk: destino for origem, destino in mapeamento.items()
+        }
+        origem_por_pk = {origem.pk: origem for origem in mapeamento}
+        resumo = {
+            'lotes': 0,
+            'processadas': 0,
+            'rematriculadas': 0,
+            'conflitos': [],
+        }
+
+        ultimo_pk = 0
+        while True:
+            with transaction.atomic():
+                pendentes = Matricula.objects.filter(
+                    turma__in=list(destino_por_origem),
+                    ano_letivo=ano_origem,
+                    status=Matricula.Status.ATIVA,
+                    pk__gt=ultimo_pk,
+                ).select_related('aluno__pessoa').order_by('pk')
+                if not dry_run:
+                    pendentes = pendentes.select_for_update(of=('self',))
+                lote = list(pendentes[:tamanho_lote])
+                if not lote:
+                    break
+                ultimo_pk = lote[-1].pk
+                for matricula in lote:
+                    matricula.turma = origem_por_pk[matricula.turma_id]
+
+                if dry_run:
+                    viradas, conflitos = ViradaAnoLetivoService._simular_lote(
+                        lote, destino_por_origem, ano_destino,
+                    )
+                else:
+                    viradas, conflitos = ViradaAnoLetivoService._virar_lote(
+                        lote, destino_por_origem, ano_origem, ano_destino,
+                        data_encerramento, data_matricula,
+                    )
+
+            resumo['lotes'] += 1
+            resumo['processadas'] += len(lote)
+            resumo['rematriculadas'] += viradas
+            resumo['conflitos'].extend(conflitos)
+            if ao_concluir_lote is not None:
+                ao_concluir_lote(resumo)
+
+        return resumo
+
+    @staticmethod
+    def _simular_lote(lote, destino_por_origem, ano_destino):
+        """Conta as viradas do lote e os conflitos, sem gravar."""
+        ja_matriculados = set(
+            Matricula.objects.filter(
+                aluno__in=[m.aluno_id for m in lote],
+                ano_letivo=ano_destino,
+                status=Matricula.Status.ATIVA,
+            ).values_list('aluno_id', flat=True)
+        )
+        conflitos = []
+        for matricula in lote:
+            if matricula.aluno_id in ja_matriculados:
+                conflitos.append({
+                    'matricula': matricula,
+                    'turma_destino': destino_por_origem[matricula.turma_id],
+                    'erro': (
+                        f'O aluno {matricula.aluno} ja possui matricula ativa '
+                        f'no ano letivo {ano_destino}.'
+                    ),
+                })
+        return len(lote) - len(conflitos), conflitos
+
+    @staticmethod
+    def _virar_lote(lote, destino_por_origem, ano_origem, ano_destino,
+                    data_encerramento, data_matricula):
+        """Rematricula e encerra as matriculas de um lote."""
+        observacao = (
+            f'Rematricula na virada do ano letivo {ano_origem} -> {ano_destino}.'
+        )
+        relatorio = MatriculaService.matricular_em_lote(
+            {
+                'aluno': matricula.aluno,
+                'turma': destino_por_origem[matricula.turma_id],
+                'ano_letivo': ano_destino,
+                'data_matricula': data_matricula,
+                'observacao': observacao,
+            }
+            for matricula in lote
+        )
+
+        conflitos = []
+        viradas = []
+        for matricula, item in zip(lote, relatorio):
+            if item['erro']:
+                conflitos.append({
+                    'matricula': matricula,
+                    'turma_destino': destino_por_origem[matricula.turma_id],
+                    'erro': item['erro'],
+                })
+            else:
+                viradas.append(matricula)
+
+        if not viradas:
+            return 0, conflitos
+
+        agora = timezone.now()
+        Matricula.objects.filter(pk__in=[m.pk for m in viradas]).update(
+            status=Matricula.Status.ENCERRADA,
+            atualizado_em=agora,
+        )
+
+        alunos_por_turma = {}
+        for matricula in viradas:
+            alunos_por_turma.setdefault(matricula.turma_id, []).append(
+                matricula.aluno_id
+            )
+        for turma_id, aluno_ids in alunos_por_turma.items():
+            AlunoTurma.objects.filter(
+                turma_id=turma_id, aluno_id__in=aluno_ids,
+            ).update(ativo=False, atualizado_em=agora)
+
+        MovimentacaoAluno.objects.bulk_create(
+            [
+                MovimentacaoAluno(
+                    aluno_id=matricula.aluno_id,
+                    tipo_evento=MovimentacaoAluno.TipoEvento.ENCERRAMENTO,
+                    data=data_encerramento,
+                    descricao=(
+                        f'Encerramento da matricula na turma {matricula.turma} '
+                        f'— {ano_origem}. Motivo: virada do ano letivo '
+                        f'(destino: {destino_por_origem[matricula.turma_id]}).'
+                    ),
+                    matricula=matricula,
+                )
+                for matricula in viradas
+            ],
+            batch_size=TAMANHO_LOTE,
+        )
+
+        LinhaDoTempoService.atualizar_alunos(m.aluno_id for m in viradas)
+
+        return len(viradas), conflitos
@@ -0,0 +1,28 @@
+from django.urls import path
+
+from . import views
+
+app_name = 'academic'
+
+urlpatterns = [
+    path(
+        'turmas/<int:turma_id>/',
+        views.visao_geral_turma,
+        name='visao_geral_turma',
+    ),
+    path(
+        'turmas/<int:turma_id>/historico/',
+        views.historico_turma,
+        name='historico_turma',
+    ),
+    path(
+        'turmas/<int:turma_id>/alunos.<str:formato>',
+        views.exportar_turma,
+        name='exportar_turma',
+    ),
+    path(
+        'anos-letivos/<int:ano_letivo_id>/turmas.<str:formato>.zip',
+        views.exportar_ano_letivo,
+        name='exportar_ano_letivo',
+    ),
+]
@@ -0,0 +1,9 @@
+from .exportacao_views import exportar_ano_letivo, exportar_turma
+from .turma_views import historico_turma, visao_geral_turma
+
+__all__ = [
+    'exportar_ano_letivo',
+    'exportar_turma',
+    'historico_turma',
+    'visao_geral_turma',
+]
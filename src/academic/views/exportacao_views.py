@@ -0,0 +1,48 @@
+"""
+academic.views.exportacao_views
+
+Exportacao em streaming das listas de alunos por turma e por ano letivo.
+"""
+
+from django.contrib.admin.views.decorators import staff_member_required
+from django.contrib.auth.decorators import permission_required
+from django.http import Http404, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+
+from academic.models import AnoLetivo, Turma
+from academic.services import ExportacaoTurmaService
+from academic.services.exportacao_turma_service import FORMATOS, TIPOS_CONTEUDO
+
+
+def _resposta_arquivo(conteudo, nome_arquivo, tipo_conteudo):
+    resposta = StreamingHttpResponse(conteudo, content_type=tipo_conteudo)
+    resposta['Content-Disposition'] = f'attachment; filename="{nome_arquivo}"'
+    return resposta
+
+
+@staff_member_required
+@permission_required('academic.view_turma', raise_exception=True)
+def exportar_turma(request, turma_id, formato):
+    if formato not in FORMATOS:
+        raise Http404
+    turma = get_object_or_404(
+        Turma.objects.select_related('escola', 'ano_letivo'), pk=turma_id,
+    )
+    return _resposta_arquivo(
+        ExportacaoTurmaService.exportar_turma(turma, formato),
+        ExportacaoTurmaService.nome_arquivo(turma, formato),
+        TIPOS_CONTEUDO[formato],
+    )
+
+
+@staff_member_required
+@permission_required('academic.view_turma', raise_exception=True)
+def exportar_ano_letivo(request, ano_letivo_id, formato):
+    if formato not in FORMATOS:
+        raise Http404
+    ano_letivo = get_object_or_404(AnoLetivo, pk=ano_letivo_id)
+    return _resposta_arquivo(
+        ExportacaoTurmaService.exportar_ano_letivo(ano_letivo, formato),
+        ExportacaoTurmaService.nome_arquivo_ano_letivo(ano_letivo, formato),
+        TIPOS_CONTEUDO['zip'],
+    )
@@ -0,0 +1,123 @@
+"""
+academic.views.turma_views
+
+Visao geral da turma no admin (somente leitura): alunos e matriculas
+ativas paginados, e o historico de matriculas carregado sob demanda.
+
+Substitui os inlines da tela de edicao da Turma, que renderizavam um
+formulario por aluno e por matricula (inclusive as antigas). Aqui a
+pagina faz sempre as mesmas consultas — a turma com os totais e uma
+pagina de cada lista (TurmaRepository.buscar_visao_geral) —, qualquer
+que seja o tamanho da turma.
+"""
+
+from math import ceil
+
+from django.contrib import admin
+from django.contrib.admin.views.decorators import staff_member_required
+from django.contrib.auth.decorators import permission_required
+from django.http import Http404, HttpResponseBadRequest
+from django.template.response import TemplateResponse
+from django.urls import reverse
+
+from academic.models import Turma
+from academic.repositories import MatriculaRepository, TurmaRepository
+from academic.services.exportacao_turma_service import FORMATOS
+from core.paginacao import CursorInvalido, paginar
+
+
+# Itens por pagina em cada secao da visao geral
+TAMANHO_PAGINA = 50
+# Limite do ?alunos= / ?matriculas= (evita OFFSET fora do intervalo do banco)
+PAGINA_MAXIMA = 10_000
+# Matriculas por carga do historico
+TAMANHO_HISTORICO = 25
+ORDENACAO_HISTORICO = ('-data_matricula', '-id')
+
+
+def _numero_pagina(request, parametro):
+    try:
+        numero = int(request.GET.get(parametro, 1))
+    except ValueError:
+        return 1
+    return min(max(1, numero), PAGINA_MAXIMA)
+
+
+def _faixa(numero):
+    inicio = (numero - 1) * TAMANHO_PAGINA
+    return inicio, inicio + TAMANHO_PAGINA
+
+
+def _navegacao(request, parametro, numero, total):
+    """Numero, total de paginas e links anterior/proxima de uma secao."""
+    paginas = max(1, ceil(total / TAMANHO_PAGINA))
+
+    def url(outro):
+        parametros = request.GET.copy()
+        parametros[parametro] = outro
+        return f'?{parametros.urlencode()}#{parametro}'
+
+    return {
+        'numero': numero,
+        'paginas': paginas,
+        'total': total,
+        # Pagina alem do fim (?alunos= digitado): volta para a ultima
+        'anterior': url(min(numero - 1, paginas)) if numero > 1 else None,
+        'proxima': url(numero + 1) if numero < paginas else None,
+    }
+
+
+@staff_member_required
+@permission_required('academic.view_turma', raise_exception=True)
+def visao_geral_turma(request, turma_id):
+    pagina_alunos = _numero_pagina(request, 'alunos')
+    pagina_matriculas = _numero_pagina(request, 'matriculas')
+    turma = TurmaRepository.buscar_visao_geral(
+        turma_id, _faixa(pagina_alunos), _faixa(pagina_matriculas),
+    )
+    if turma is None:
+        raise Http404('Turma nao encontrada.')
+    return TemplateResponse(request, 'admin/academic/turma/visao_geral.html', {
+        **admin.site.each_context(request),
+        'title': f'Visao geral: {turma}',
+        'opts': Turma._meta,
+        'turma': turma,
+        'alunos': _navegacao(request, 'alunos', pagina_alunos, turma.total_alunos),
+        'matriculas': _navegacao(
+            request, 'matriculas', pagina_matriculas, turma.total_matriculas,
+        ),
+        'exportacoes': [
+            (formato, reverse('academic:exportar_turma', args=[turma.pk, formato]))
+            for formato in FORMATOS
+        ],
+        'historico_url': reverse('academic:historico_turma', args=[turma.pk]),
+    })
+
+
+@staff_member_required
+@permission_required('academic.view_turma', raise_exception=True)
+def historico_turma(request, turma_id):
+    """Fragmento HTML com matriculas encerradas/canceladas (por cursor)."""
+    if not TurmaRepository.existe(turma_id):
+        raise Http404('Turma nao encontrada.')
+    try:
+        pagina = paginar(
+            MatriculaRepository.listar_historico_por_turma(turma_id),
+            ORDENACAO_HISTORICO,
+            request.GET.get('cursor'),
+            TAMANHO_HISTORICO,
+            lambda matricula: [matricula.data_matricula, matricula.pk],
+        )
+    except CursorInvalido as erro:
+        return HttpResponseBadRequest(str(erro))
+    proxima = None
+    if pagina.proximo_cursor:
+        proxima = '{}?cursor={}'.format(
+            reverse('academic:historico_turma', args=[turma_id]),
+            pagina.proximo_cursor,
+        )
+    return TemplateResponse(request, 'admin/academic/turma/historico.html', {
+        'matriculas': pagina.itens,
+        'proxima': proxima,
+        'primeira_carga': not request.GET.get('cursor'),
+    })
@@ -1,12 +1,13 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 
-from core.admin_mixins import SemIconesRelacionaisMixin
+from core.admin_mixins import ConsultaOtimizadaMixin, SemIconesRelacionaisMixin
 from .models import Usuario
 
 
 @admin.register(Usuario)
-class UsuarioAdmin(SemIconesRelacionaisMixin, UserAdmin):
+class UsuarioAdmin(SemIconesRelacionaisMixin, ConsultaOtimizadaMixin,
+                   UserAdmin):
     list_display = ('username', 'get_full_name', 'email', 'papel', 'is_active', 'is_staff')
     list_filter = ('papel', 'is_active', 'is_staff', 'groups')
     search_fields = ('username', 'first_name', 'last_name', 'email')
@@ -0,0 +1,19 @@
+# Generated by Django 6.0.2 on 2026-10-18 11:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('people', '0004_indices_acesso'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='usuario',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['papel'], name='usuario_papel_ativo_idx'),
+        ),
+    ]
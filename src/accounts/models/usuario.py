@@ -45,6 +45,14 @@ class Usuario(AbstractUser):
     class Meta:
         verbose_name = 'usuário'
         verbose_name_plural = 'usuários'
+        indexes = [
+            # UsuarioRepository.listar_por_papel (usuarios ativos)
+            models.Index(
+                fields=['papel'],
+                condition=models.Q(is_active=True),
+                name='usuario_papel_ativo_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.get_full_name() or self.username
@@ -5,14 +5,15 @@ Acesso a dados da entidade Usuario.
 """
 
 from accounts.models import Usuario
+from core.replicas import para_leitura
 
 
 class UsuarioRepository:
 
     @staticmethod
     def listar_por_papel(papel):
-        return Usuario.objects.filter(papel=papel, is_active=True)
+        return para_leitura(Usuario).filter(papel=papel, is_active=True)
 
     @staticmethod
     def buscar_por_username(username):
-        return Usuario.objects.filter(username=username).first()
+        return para_leitura(Usuario).filter(username=username).first()
@@ -5,6 +5,7 @@ ERP Escolar - Gestão Educacional
 Django 6.0 | Python 3.12
 """
 
+import os
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent.parent  # raiz do projeto
@@ -29,6 +30,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 
     # Apps do projeto
     'core',
@@ -45,11 +47,14 @@ INSTALLED_APPS = [
 # ───────────────────────────────────────────────
 
 MIDDLEWARE = [
+    'core.middleware.MetricasBancoMiddleware',
+    'core.profiling.PerfilMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.ReplicaLeituraMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -103,6 +108,73 @@ DATABASES = {
 # }
 
 
+# ───────────────────────────────────────────────
+# Pool de conexoes
+# ───────────────────────────────────────────────
+# No PostgreSQL as conexoes vem de um pool do psycopg (psycopg_pool, via
+# OPTIONS['pool'] do Django): cada request pega uma conexao aberta do
+# pool e a devolve ao terminar. CONN_HEALTH_CHECKS faz o pool testar a
+# conexao antes de entrega-la (descarta conexoes derrubadas pelo
+# servidor). Configuravel por ambiente:
+#
+#   AQNUS_DB_POOL=0            desliga o pool (usa CONN_MAX_AGE)
+#   AQNUS_DB_POOL_MIN=2        conexoes mantidas abertas por processo
+#   AQNUS_DB_POOL_MAX=10       limite de conexoes por processo
+#   AQNUS_DB_POOL_TIMEOUT=10   segundos esperando uma conexao livre
+#   AQNUS_DB_CONN_MAX_AGE=60   sem pool: segundos de reuso da conexao
+#
+# Com varios processos (gunicorn), o total e workers x AQNUS_DB_POOL_MAX:
+# manter abaixo do max_connections do servidor.
+
+DB_POOL = os.environ.get('AQNUS_DB_POOL', '1') != '0'
+
+if DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql':
+    DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+    if DB_POOL:
+        DATABASES['default']['OPTIONS'] = {
+            'pool': {
+                'min_size': int(os.environ.get('AQNUS_DB_POOL_MIN', 2)),
+                'max_size': int(os.environ.get('AQNUS_DB_POOL_MAX', 10)),
+                'timeout': float(os.environ.get('AQNUS_DB_POOL_TIMEOUT', 10)),
+                'max_idle': 300,
+            },
+        }
+    else:
+        DATABASES['default']['CONN_MAX_AGE'] = int(
+            os.environ.get('AQNUS_DB_CONN_MAX_AGE', 60)
+        )
+
+
+# ───────────────────────────────────────────────
+# Replica de leitura
+# ───────────────────────────────────────────────
+# Com o alias REPLICA_ALIAS em DATABASES, changelists/autocompletes do
+# admin e as consultas dos repositories leem da replica (core.replicas).
+# Escritas e transacoes ficam no primario; depois de uma escrita o
+# usuario le do primario por REPLICA_JANELA_APOS_ESCRITA segundos.
+# Sem o alias, tudo continua no 'default'.
+#
+# DATABASES['replica'] = {
+#     **DATABASES['default'],
+#     'HOST': 'replica.local',
+#     'TEST': {'MIRROR': 'default'},
+# }
+#
+# Teste local com dois SQLite (a replica e uma copia do arquivo):
+#     cp db.sqlite3 db_replica.sqlite3
+# DATABASES['replica'] = {
+#     'ENGINE': 'django.db.backends.sqlite3',
+#     'NAME': BASE_DIR / 'db_replica.sqlite3',
+#     'TEST': {'MIRROR': 'default'},
+# }
+
+REPLICA_ALIAS = 'replica'
+
+REPLICA_JANELA_APOS_ESCRITA = 5
+
+DATABASE_ROUTERS = ['core.replicas.RoteadorReplica']
+
+
 # ───────────────────────────────────────────────
 # Autenticação
 # ───────────────────────────────────────────────
@@ -146,3 +218,106 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 # ───────────────────────────────────────────────
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+
+# ───────────────────────────────────────────────
+# Arquivo do historico
+# ───────────────────────────────────────────────
+# Diretorio dos anos de MovimentacaoAluno arquivados (CSV gzip) pelo
+# comando arquivar_movimentacoes.
+
+ARQUIVO_MOVIMENTACOES_DIR = BASE_DIR / 'arquivo' / 'movimentacoes'
+
+
+# ───────────────────────────────────────────────
+# Cache
+# ───────────────────────────────────────────────
+# Duas camadas (ver core.cache):
+# - 'local' (L1): memoria do processo, entradas curtas (CACHE_L1_TIMEOUT)
+# - 'default' (L2): compartilhado entre os processos — arquivos em
+#   CACHE_DIR, ou Redis se AQNUS_REDIS_URL estiver definida (requer o
+#   pacote redis). Tambem guarda as sessoes (cached_db) e os dados de
+#   referencia.
+
+CACHE_DIR = BASE_DIR / 'cache'
+
+REDIS_URL = os.environ.get('AQNUS_REDIS_URL')
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+    } if REDIS_URL else {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': CACHE_DIR,
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+    'local': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'aqnus-l1',
+        'OPTIONS': {'MAX_ENTRIES': 1000},
+    },
+}
+
+CACHE_L1 = 'local'
+CACHE_L2 = 'default'
+CACHE_L1_TIMEOUT = 30
+CACHE_TIMEOUT_PADRAO = 300
+# Segundos que um processo espera outro carregar a mesma chave
+CACHE_ESPERA_MAXIMA = 5
+
+# Sessoes lidas do cache, gravadas tambem no banco
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+
+# ───────────────────────────────────────────────
+# Dados de referencia
+# ───────────────────────────────────────────────
+# Cache de tabelas pequenas e estaveis (ano letivo ativo, escolas,
+# disciplinas, assuntos, editoras) — ver core.dados_referencia.
+# DADOS_REFERENCIA_CACHE: alias em CACHES compartilhado entre os
+# processos (invalidacao imediata em todos; aqui, o L2). Com None, cada
+# processo tem o seu e so enxerga alteracoes de outros apos o TTL.
+
+DADOS_REFERENCIA_CACHE = 'default'
+DADOS_REFERENCIA_TTL = 300
+DADOS_REFERENCIA_TAMANHO = 256
+
+
+# ───────────────────────────────────────────────
+# Logging
+# ───────────────────────────────────────────────
+# Com ADMIN_PLANO_CONSULTA_DEBUG = True, o plano de select_related/
+# prefetch_related derivado pelo ConsultaOtimizadaMixin para cada admin
+# e exibido no console.
+
+ADMIN_PLANO_CONSULTA_DEBUG = False
+
+# Headers Server-Timing/X-DB-Consultas com as metricas de banco de cada
+# request (core.metricas); os acumulados por view ficam sempre em
+# /admin/metricas/banco/.
+METRICAS_BANCO_HEADERS = DEBUG
+
+# Perfil de SQL por request (core.profiling), visto em /admin/perfil/.
+# PERFIL_AMOSTRAGEM e a fracao dos requests perfilados: 0 desliga,
+# 1 perfila todos (so para investigacao; o perfil custa uma inspecao de
+# pilha por consulta). O buffer guarda os PERFIL_CAPACIDADE ultimos.
+PERFIL_AMOSTRAGEM = 0.0
+PERFIL_CAPACIDADE = 200
+PERFIL_CONSULTAS_LENTAS = 10
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'core.admin_mixins': {
+            'handlers': ['console'],
+            'level': 'DEBUG' if ADMIN_PLANO_CONSULTA_DEBUG else 'WARNING',
+        },
+    },
+}
@@ -7,6 +7,10 @@ admin.site.site_title = 'AQNUS'
 admin.site.index_title = 'Painel Administrativo'
 
 urlpatterns = [
+    path('admin/', include('core.urls')),
     path('admin/', admin.site.urls),
+    path('academic/', include('academic.urls')),
+    path('people/', include('people.urls')),
+    path('api/acervo/', include('library.urls')),
     path('', include('web.urls')),
 ]
@@ -1,12 +1,13 @@
 from django.contrib import admin
 
-from .admin_mixins import SemIconesRelacionaisMixin
+from .admin_mixins import ConsultaOtimizadaMixin, SemIconesRelacionaisMixin
 from .forms import EscolaForm
 from .models import Escola
 
 
 @admin.register(Escola)
-class EscolaAdmin(SemIconesRelacionaisMixin, admin.ModelAdmin):
+class EscolaAdmin(SemIconesRelacionaisMixin, ConsultaOtimizadaMixin,
+                  admin.ModelAdmin):
     form = EscolaForm
     list_display = ('nome', 'cnpj', 'telefone', 'email', 'ativo')
     list_filter = ('ativo',)
@@ -17,9 +17,44 @@ DEPOIS de chamar formfield_for_foreignkey. Se sobrescrevessemos apenas
 formfield_for_foreignkey, as flags seriam definidas no widget interno
 (ex: AutocompleteSelect) e entao sobrescritas pelo wrapper.
 Interceptando formfield_for_dbfield, capturamos o widget ja encapsulado.
+
+ConsultaOtimizadaMixin
+──────────────────────
+Deriva automaticamente o select_related/prefetch_related das changelists
+a partir do list_display e do atributo relacionados_str dos models (as
+FKs que cada __str__ segue), evitando N+1 nas listas, nos filtros
+laterais e nos autocompletes. InlineOtimizadoMixin faz o mesmo nos
+inlines dos formularios de edicao (linhas, selects e autocompletes).
+
+PaginacaoKeysetMixin
+────────────────────
+Para changelists de historico (milhoes de linhas): pagina por cursor
+em vez de OFFSET e estima o total pelas estatisticas do planner em vez
+do COUNT(*), de modo que a pagina N custa o mesmo que a pagina 1.
 """
 
-from django.contrib.admin.widgets import RelatedFieldWidgetWrapper
+import logging
+
+from django.contrib import admin
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.utils import get_fields_from_path
+from django.contrib.admin.views.main import ALL_VAR, ORDER_VAR, ChangeList
+from django.contrib.admin.widgets import AutocompleteSelect, RelatedFieldWidgetWrapper
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.core.paginator import Paginator
+from django.utils.functional import cached_property
+
+from core.paginacao import (
+    CursorInvalido,
+    estimar_contagem,
+    paginar,
+    paginar_anterior,
+)
+
+logger = logging.getLogger(__name__)
+
+# Limite ao seguir relacionados_str em cadeia (protege contra ciclos)
+PROFUNDIDADE_MAXIMA_STR = 4
 
 
 class SemIconesRelacionaisMixin:
@@ -45,3 +80,462 @@ class SemIconesRelacionaisMixin:
                 widget.can_delete_related = False
                 widget.can_view_related = False
         return formfield
+
+
+# ───────────────────────────────────────────────
+# Consultas otimizadas
+# ───────────────────────────────────────────────
+
+def caminhos_str(model, prefixo='', profundidade=0):
+    """Caminhos de select_related necessarios para str() de um model.
+
+    Segue o atributo relacionados_str do model e, recursivamente, o dos
+    models relacionados. Ex: AlunoTurma -> aluno, aluno__pessoa, turma,
+    turma__ano_letivo.
+    """
+    if profundidade >= PROFUNDIDADE_MAXIMA_STR:
+        return []
+    caminhos = []
+    for nome in getattr(model, 'relacionados_str', ()):
+        caminho = f'{prefixo}{nome}'
+        caminhos.append(caminho)
+        caminhos.extend(caminhos_str(
+            model._meta.get_field(nome).related_model,
+            f'{caminho}__',
+            profundidade + 1,
+        ))
+    return caminhos
+
+
+def _prefixo_relacional(model, caminho):
+    """Maior prefixo de FKs/O2Os de um caminho ORM e o model onde termina.
+
+    Ex: 'exemplar__obra__titulo' -> ('exemplar__obra', Obra).
+    Retorna ('', model) se o caminho nao comeca por uma FK ou O2O.
+    """
+    partes = []
+    for nome in caminho.split('__'):
+        try:
+            campo = model._meta.get_field(nome)
+        except FieldDoesNotExist:
+            break
+        if not (campo.many_to_one or campo.one_to_one):
+            break
+        partes.append(nome)
+        model = campo.related_model
+    return '__'.join(partes), model
+
+
+class ChangeListOtimizada(ChangeList):
+    """ChangeList que aplica o plano de consulta completo.
+
+    O ChangeList padrao so aplica list_select_related quando o queryset
+    ainda nao tem select_related — o que o get_queryset do
+    ConsultaOtimizadaMixin ja define. Aqui os caminhos sao somados, e o
+    prefetch_related do plano tambem e aplicado.
+    """
+
+    def get_queryset(self, request, *args, **kwargs):
+        qs = super().get_queryset(request, *args, **kwargs)
+        if self.list_select_related and self.list_select_related is not True:
+            qs = qs.select_related(*self.list_select_related)
+        prefetch = self.model_admin.plano_consulta(self.list_display)[
+            'prefetch_related'
+        ]
+        return qs.prefetch_related(*prefetch) if prefetch else qs
+
+
+class FiltroRelacionadoOtimizado(admin.RelatedFieldListFilter):
+    """Filtro lateral de FK que carrega as opcoes com select_related.
+
+    O filtro padrao chama str() em cada opcao sem select_related; para
+    models cujo __str__ segue FKs (ex: Turma -> ano letivo), isso gera
+    uma consulta por opcao.
+    """
+
+    def field_choices(self, field, request, model_admin):
+        model = field.related_model
+        opcoes = model._default_manager.complex_filter(
+            field.get_limit_choices_to(),
+        ).select_related(*caminhos_str(model))
+        ordering = self.field_admin_ordering(field, request, model_admin)
+        if ordering:
+            opcoes = opcoes.order_by(*ordering)
+        campo_valor = field.remote_field.get_related_field().attname
+        return [(getattr(opcao, campo_valor), str(opcao)) for opcao in opcoes]
+
+
+class ConsultaOtimizadaMixin:
+    """Deriva select_related/prefetch_related do admin automaticamente.
+
+    Para cada item do list_display:
+        - FK/O2O: select_related do campo e das FKs do __str__ do
+          model relacionado (relacionados_str, recursivamente)
+        - M2M: prefetch_related
+        - metodos com @admin.display(ordering='a__b__campo'): select_related
+          do prefixo relacional da ordenacao ('a__b')
+        - '__str__': FKs do __str__ do proprio model
+
+    Tambem aplica o select_related do __str__ do proprio model no
+    get_queryset (autocomplete, formularios) e troca filtros laterais de
+    FK pelo FiltroRelacionadoOtimizado quando o __str__ do alvo segue FKs.
+
+    Um list_select_related declarado explicitamente no admin prevalece.
+    consulta_relacionados acrescenta caminhos que nao podem ser
+    deduzidos (ex: metodos sem ordering que seguem FKs).
+
+    Com ADMIN_PLANO_CONSULTA_DEBUG = True nas settings, o plano derivado
+    de cada admin e registrado no log (logger core.admin_mixins).
+    """
+    consulta_relacionados = ()
+
+    def plano_consulta(self, list_display):
+        """Retorna {'select_related': (...), 'prefetch_related': (...)}."""
+        chave = tuple(list_display)
+        planos = self.__dict__.setdefault('_planos_consulta', {})
+        if chave in planos:
+            return planos[chave]
+
+        select, prefetch = [], []
+
+        def incluir(caminho, model):
+            if caminho:
+                select.append(caminho)
+                select.extend(caminhos_str(model, f'{caminho}__'))
+
+        for item in list_display:
+            if item == '__str__':
+                select.extend(caminhos_str(self.model))
+                continue
+            if not callable(item):
+                try:
+                    campo = self.model._meta.get_field(item)
+                except FieldDoesNotExist:
+                    campo = None
+                if campo is not None:
+                    if campo.many_to_many or campo.one_to_many:
+                        prefetch.append(item)
+                        prefetch.extend(
+                            f'{item}__{caminho}'
+                            for caminho in caminhos_str(campo.related_model)
+                        )
+                    elif campo.is_relation:
+                        incluir(item, campo.related_model)
+                    continue
+                item = getattr(self, item, None) or getattr(self.model, item, None)
+            ordenacao = getattr(item, 'admin_order_field', None)
+            if isinstance(ordenacao, str):
+                incluir(*_prefixo_relacional(self.model, ordenacao.lstrip('-')))
+
+        for caminho in self.consulta_relacionados:
+            incluir(*_prefixo_relacional(self.model, caminho))
+
+        plano = {
+            'select_related': tuple(dict.fromkeys(select)),
+            'prefetch_related': tuple(dict.fromkeys(prefetch)),
+        }
+        logger.debug(
+            'Plano de consulta de %s: select_related=%s prefetch_related=%s',
+            type(self).__name__,
+            plano['select_related'],
+            plano['prefetch_related'],
+        )
+        planos[chave] = plano
+        return plano
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        caminhos = caminhos_str(self.model)
+        return queryset.select_related(*caminhos) if caminhos else queryset
+
+    def get_list_select_related(self, request):
+        if self.list_select_related is not False:
+            return self.list_select_related
+        plano = self.plano_consulta(self.get_list_display(request))
+        return plano['select_related'] or False
+
+    def get_changelist(self, request, **kwargs):
+        return ChangeListOtimizada
+
+    def get_list_filter(self, request):
+        filtros = []
+        for filtro in super().get_list_filter(request):
+            if isinstance(filtro, str):
+                campo = get_fields_from_path(self.model, filtro)[-1]
+                if (
+                    (campo.many_to_one or campo.one_to_one)
+                    and caminhos_str(campo.related_model)
+                ):
+                    filtro = (filtro, FiltroRelacionadoOtimizado)
+            filtros.append(filtro)
+        return filtros
+
+
+class AutocompleteSelectCarregado(AutocompleteSelect):
+    """AutocompleteSelect que exibe o objeto ja carregado pela linha.
+
+    O AutocompleteSelect padrao consulta o valor selecionado a cada
+    renderizacao — num inline, uma consulta por linha. O formset do
+    InlineOtimizadoMixin entrega ao widget de cada linha o objeto que o
+    select_related ja trouxe (atributo objeto); se o valor exibido for
+    outro (ex: POST com erro), vale o comportamento padrao.
+    """
+    objeto = None
+
+    def optgroups(self, name, value, attr=None):
+        objeto = self.objeto
+        if (
+            objeto is None
+            or not self.field.target_field.primary_key
+            or [str(v) for v in value] != [str(objeto.pk)]
+        ):
+            return super().optgroups(name, value, attr)
+        opcoes = []
+        if not self.is_required:
+            opcoes.append(self.create_option(name, '', '', False, 0))
+        opcoes.append(self.create_option(
+            name,
+            objeto.pk,
+            self.choices.field.label_from_instance(objeto),
+            {str(objeto.pk)},
+            len(opcoes),
+        ))
+        return [(None, opcoes, 0)]
+
+
+class _FormSetOtimizadoMixin:
+    """Passa aos autocompletes de cada linha o objeto relacionado em cache."""
+
+    def _construct_form(self, i, **kwargs):
+        form = super()._construct_form(i, **kwargs)
+        if form.instance.pk is None:
+            return form
+        for nome, campo in form.fields.items():
+            widget = getattr(campo.widget, 'widget', campo.widget)
+            if not isinstance(widget, AutocompleteSelectCarregado):
+                continue
+            relacao = form.instance._meta.get_field(nome)
+            if relacao.is_cached(form.instance):
+                widget.objeto = relacao.get_cached_value(form.instance)
+        return form
+
+
+class InlineOtimizadoMixin:
+    """Aplica o plano de consulta aos inlines (sem N+1 por linha).
+
+    - get_queryset: select_related das FKs do model do inline (exceto a
+      que aponta para o pai) e das FKs do __str__ delas e do proprio
+      model (relacionados_str)
+    - autocomplete_fields: AutocompleteSelectCarregado, que exibe o
+      objeto ja carregado em vez de consultar linha a linha
+    - FKs em select: opcoes carregadas com o select_related do __str__
+      do model relacionado
+
+    Usar junto com SemIconesRelacionaisMixin:
+
+        class MeuInline(SemIconesRelacionaisMixin, InlineOtimizadoMixin,
+                        admin.TabularInline):
+            ...
+    """
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        caminhos = caminhos_str(self.model)
+        for campo in self.model._meta.concrete_fields:
+            if (
+                (campo.many_to_one or campo.one_to_one)
+                and campo.related_model is not self.parent_model
+            ):
+                caminhos.append(campo.name)
+                caminhos.extend(caminhos_str(campo.related_model, f'{campo.name}__'))
+        return queryset.select_related(*dict.fromkeys(caminhos)) if caminhos else queryset
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        db = kwargs.get('using')
+        if 'queryset' not in kwargs:
+            caminhos = caminhos_str(db_field.related_model)
+            if caminhos:
+                queryset = self.get_field_queryset(db, db_field, request)
+                if queryset is None:
+                    queryset = db_field.related_model._default_manager.using(db)
+                kwargs['queryset'] = queryset.select_related(*caminhos)
+        if (
+            'widget' not in kwargs
+            and db_field.name in self.get_autocomplete_fields(request)
+        ):
+            kwargs['widget'] = AutocompleteSelectCarregado(
+                db_field, self.admin_site, using=db,
+            )
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+    def get_formset(self, request, obj=None, **kwargs):
+        formset = super().get_formset(request, obj, **kwargs)
+        return type(formset.__name__, (_FormSetOtimizadoMixin, formset), {})
+
+
+# ───────────────────────────────────────────────
+# Paginacao keyset
+# ───────────────────────────────────────────────
+
+# Parametros da changelist com os cursores (core.paginacao)
+APOS_VAR = 'apos'
+ANTES_VAR = 'antes'
+PARAMETROS_CURSOR = (APOS_VAR, ANTES_VAR)
+
+# Ate quantas linhas (estimadas) a changelist ainda faz o COUNT(*) exato
+CONTAGEM_EXATA_ATE = 10000
+
+
+class PaginatorEstimado(Paginator):
+    """Paginator cujo count vem do planner acima de contagem_exata_ate.
+
+    Abaixo do limite (ou fora do PostgreSQL) faz o COUNT(*) normal.
+    `estimado` indica se count e uma estimativa.
+    """
+
+    def __init__(self, *args, contagem_exata_ate=CONTAGEM_EXATA_ATE, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.contagem_exata_ate = contagem_exata_ate
+        self.estimado = False
+
+    @cached_property
+    def count(self):
+        estimativa = estimar_contagem(self.object_list)
+        if estimativa is not None and estimativa > self.contagem_exata_ate:
+            self.estimado = True
+            return estimativa
+        return super().count
+
+
+class ChangeListKeyset(ChangeListOtimizada):
+    """ChangeList paginada por cursor na ordenacao padrao do admin.
+
+    Enquanto a lista estiver na ordenacao do ModelAdmin.ordering, as
+    paginas sao lidas com WHERE (campos) < (cursor) ... LIMIT n — links
+    "anterior"/"proxima" em vez de numeros de pagina. Ordenando por
+    outra coluna (ou "mostrar tudo") volta a paginacao padrao por OFFSET.
+    """
+
+    def get_filters_params(self, params=None):
+        parametros = super().get_filters_params(params)
+        for nome in PARAMETROS_CURSOR:
+            parametros.pop(nome, None)
+        return parametros
+
+    def get_query_string(self, new_params=None, remove=None):
+        # Filtros, busca e ordenacao sempre voltam ao inicio da lista
+        novos = {nome: None for nome in PARAMETROS_CURSOR}
+        novos.update(new_params or {})
+        return super().get_query_string(novos, remove)
+
+    def campos_keyset(self, request):
+        """Campos do cursor, ou None quando a lista usa OFFSET."""
+        if ORDER_VAR in self.params or ALL_VAR in self.params:
+            return None
+        return self.model_admin.ordenacao_keyset(request)
+
+    def get_results(self, request):
+        campos = self.campos_keyset(request)
+        self.keyset = None
+        if campos is None:
+            super().get_results(request)
+        else:
+            self._resultados_keyset(request, campos)
+        self.contagem_estimada = self.paginator.estimado
+        # Os cursores nao entram no formulario de busca (cl.params)
+        for nome in PARAMETROS_CURSOR:
+            self.params.pop(nome, None)
+
+    def _resultados_keyset(self, request, campos):
+        def valores_do_item(obj):
+            return [getattr(obj, campo.lstrip('-')) for campo in campos]
+
+        apos, antes = request.GET.get(APOS_VAR), request.GET.get(ANTES_VAR)
+        try:
+            if antes:
+                pagina = paginar_anterior(
+                    self.queryset, campos, antes, self.list_per_page,
+                    valores_do_item,
+                )
+            else:
+                pagina = paginar(
+                    self.queryset, campos, apos, self.list_per_page,
+                    valores_do_item,
+                )
+        except CursorInvalido:
+            raise IncorrectLookupParameters
+
+        self.paginator = self.model_admin.get_paginator(
+            request, self.queryset, self.list_per_page,
+        )
+        self.result_count = self.paginator.count
+        self.show_full_result_count = self.model_admin.show_full_result_count
+        self.full_result_count = (
+            self.root_queryset.count() if self.show_full_result_count else None
+        )
+        self.show_admin_actions = (
+            not self.show_full_result_count or bool(self.full_result_count)
+        )
+        self.result_list = pagina.itens
+        self.can_show_all = self.result_count <= self.list_max_show_all
+        self.multi_page = bool(pagina.proximo_cursor or pagina.anterior_cursor)
+        self.keyset = {
+            'primeira': (apos or antes) and self.get_query_string(),
+            'anterior': pagina.anterior_cursor and self.get_query_string(
+                {ANTES_VAR: pagina.anterior_cursor},
+            ),
+            'proxima': pagina.proximo_cursor and self.get_query_string(
+                {APOS_VAR: pagina.proximo_cursor},
+            ),
+        }
+
+
+class PaginacaoKeysetMixin:
+    """Changelist paginada por cursor, com total estimado.
+
+    Usar antes do ConsultaOtimizadaMixin (a ChangeListKeyset estende a
+    ChangeListOtimizada):
+
+        class MovimentacaoAlunoAdmin(SemIconesRelacionaisMixin,
+                                     PaginacaoKeysetMixin,
+                                     ConsultaOtimizadaMixin, admin.ModelAdmin):
+            ordering = ('-data', '-id')
+
+    O cursor segue o `ordering` do admin, que deve ter apenas campos
+    nao nulos do proprio model e terminar na pk (com um indice na mesma
+    ordem). Acima de contagem_exata_ate linhas o total exibido e a
+    estimativa do planner (PostgreSQL); show_full_result_count fica
+    desligado para evitar o COUNT(*) sem filtros.
+    """
+    contagem_exata_ate = CONTAGEM_EXATA_ATE
+    show_full_result_count = False
+
+    def ordenacao_keyset(self, request):
+        campos = tuple(self.get_ordering(request))
+        opts = self.model._meta
+        if not campos or campos[-1].lstrip('-') not in ('pk', opts.pk.name):
+            raise ImproperlyConfigured(
+                f'{type(self).__name__}.ordering deve terminar na pk '
+                f'para a paginacao keyset.'
+            )
+        for campo in campos[:-1]:
+            try:
+                field = opts.get_field(campo.lstrip('-'))
+            except FieldDoesNotExist:
+                field = None
+            if field is None or field.null or field.is_relation:
+                raise ImproperlyConfigured(
+                    f'{type(self).__name__}.ordering: {campo!r} nao serve '
+                    f'para a paginacao keyset (campo nao nulo do model).'
+                )
+        return campos
+
+    def get_paginator(self, request, queryset, per_page, orphans=0,
+                      allow_empty_first_page=True):
+        return PaginatorEstimado(
+            queryset, per_page, orphans, allow_empty_first_page,
+            contagem_exata_ate=self.contagem_exata_ate,
+        )
+
+    def get_changelist(self, request, **kwargs):
+        return ChangeListKeyset
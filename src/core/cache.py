@@ -0,0 +1,194 @@
+"""
+core.cache
+
+Cache em duas camadas para consultas (repositories) e fragmentos de
+template.
+
+- L1 (CACHE_L1, locmem): por processo, sem I/O; as entradas vivem no
+  maximo CACHE_L1_TIMEOUT segundos, o que limita quanto tempo um
+  processo continua vendo um valor ja invalidado por outro
+- L2 (CACHE_L2): compartilhado entre os processos — arquivos em disco
+  por padrao, Redis com AQNUS_REDIS_URL (ver settings)
+
+Uma falta nas duas camadas carrega o valor uma unica vez entre todos os
+processos (protecao contra stampede): quem consegue a trava no L2
+(cache.add) carrega e grava; os demais esperam o valor aparecer por ate
+CACHE_ESPERA_MAXIMA segundos e so entao carregam por conta propria. Os
+timeouts do L2 recebem uma variacao aleatoria de ate 10% para que
+entradas criadas juntas nao expirem juntas.
+
+Acertos e faltas de cada camada sao contados por processo
+(estatisticas()) e expostos em /admin/metricas/cache/.
+
+Uso:
+    cached_query('escolas:ativas', lambda: Escola.objects.filter(...), 600)
+    cached_fragment('menu', lambda: render_to_string(...), 300, (usuario.pk,))
+
+Nos templates: {% load core_cache %} e
+{% cached_fragment "nome" 300 var1 var2 %}...{% endcached_fragment %}.
+"""
+
+import hashlib
+import random
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import QuerySet
+from django.utils.safestring import mark_safe
+
+
+PREFIXO = 'core-cache'
+
+_FALTANDO = object()
+
+_trava_contadores = threading.Lock()
+_contadores = Counter()
+
+
+def _contar(evento):
+    with _trava_contadores:
+        _contadores[evento] += 1
+
+
+def estatisticas():
+    """Acertos/faltas por camada, carregamentos e esperas (deste processo)."""
+    with _trava_contadores:
+        contadores = dict(_contadores)
+    resumo = {}
+    for camada in ('l1', 'l2'):
+        acertos = contadores.get(f'{camada}_acertos', 0)
+        faltas = contadores.get(f'{camada}_faltas', 0)
+        resumo[camada] = {
+            'acertos': acertos,
+            'faltas': faltas,
+            'taxa_acerto': round(acertos / (acertos + faltas), 3)
+            if acertos + faltas else None,
+        }
+    resumo['carregamentos'] = contadores.get('carregamentos', 0)
+    resumo['esperas'] = contadores.get('esperas', 0)
+    return resumo
+
+
+def zerar_estatisticas():
+    with _trava_contadores:
+        _contadores.clear()
+
+
+def _l1():
+    return caches[getattr(settings, 'CACHE_L1', 'local')]
+
+
+def _l2():
+    return caches[getattr(settings, 'CACHE_L2', 'default')]
+
+
+def _timeout(timeout):
+    return timeout if timeout is not None else getattr(
+        settings, 'CACHE_TIMEOUT_PADRAO', 300,
+    )
+
+
+def _timeout_l1(timeout):
+    return min(timeout, getattr(settings, 'CACHE_L1_TIMEOUT', 30))
+
+
+def _com_variacao(timeout):
+    return int(timeout * random.uniform(0.9, 1.0)) or 1
+
+
+def _carregar_uma_vez(chave, carregar, timeout):
+    """Carrega com trava no L2; quem nao tem a trava espera o valor."""
+    l2 = _l2()
+    trava = f'{chave}:trava'
+    espera = getattr(settings, 'CACHE_ESPERA_MAXIMA', 5)
+    tem_trava = l2.add(trava, 1, timeout=int(espera * 2) or 1)
+    if not tem_trava:
+        _contar('esperas')
+        prazo = time.monotonic() + espera
+        while time.monotonic() < prazo:
+            time.sleep(0.05)
+            valor = l2.get(chave, _FALTANDO)
+            if valor is not _FALTANDO:
+                return valor
+        # Quem tinha a trava demorou demais (ou falhou): carrega tambem
+
+    try:
+        _contar('carregamentos')
+        valor = carregar()
+        if isinstance(valor, QuerySet):
+            valor = list(valor)
+        l2.set(chave, valor, timeout=_com_variacao(timeout))
+    finally:
+        if tem_trava:
+            l2.delete(trava)
+    return valor
+
+
+def cached_query(chave, carregar, timeout=None):
+    """
+    Valor de `chave`, carregado com `carregar()` em caso de falta.
+
+    Querysets sao materializados em lista. `timeout` em segundos
+    (padrao CACHE_TIMEOUT_PADRAO); o L1 guarda por no maximo
+    CACHE_L1_TIMEOUT.
+    """
+    timeout = _timeout(timeout)
+    chave = f'{PREFIXO}:{chave}'
+    l1 = _l1()
+
+    valor = l1.get(chave, _FALTANDO)
+    if valor is not _FALTANDO:
+        _contar('l1_acertos')
+        return valor
+    _contar('l1_faltas')
+
+    valor = _l2().get(chave, _FALTANDO)
+    if valor is not _FALTANDO:
+        _contar('l2_acertos')
+    else:
+        _contar('l2_faltas')
+        valor = _carregar_uma_vez(chave, carregar, timeout)
+
+    l1.set(chave, valor, timeout=_timeout_l1(timeout))
+    return valor
+
+
+def chave_fragmento(nome, variaveis=()):
+    """Chave de um fragmento: nome + hash das variaveis que o alteram."""
+    resumo = hashlib.md5(
+        ':'.join(str(variavel) for variavel in variaveis).encode(),
+        usedforsecurity=False,
+    ).hexdigest()
+    return f'fragmento:{nome}:{resumo}'
+
+
+def cached_fragment(nome, renderizar, timeout=None, variaveis=()):
+    """
+    HTML de um fragmento, renderizado com `renderizar()` em caso de falta.
+
+    `variaveis` sao os valores dos quais o fragmento depende (ids,
+    datas de atualizacao, idioma): cada combinacao tem a sua entrada.
+    """
+    html = cached_query(
+        chave_fragmento(nome, variaveis), lambda: str(renderizar()), timeout,
+    )
+    return mark_safe(html)
+
+
+def invalidar(chave):
+    """
+    Remove uma chave de cached_query do L2 e do L1 deste processo.
+
+    Os outros processos deixam de ve-la quando a entrada do L1 deles
+    expira (CACHE_L1_TIMEOUT).
+    """
+    chave = f'{PREFIXO}:{chave}'
+    _l2().delete(chave)
+    _l1().delete(chave)
+
+
+def invalidar_fragmento(nome, variaveis=()):
+    invalidar(chave_fragmento(nome, variaveis))
@@ -0,0 +1,197 @@
+"""
+core.dados_referencia
+
+Cache de dados de referencia: tabelas pequenas, lidas o tempo todo e
+quase nunca alteradas (ano letivo ativo, escolas, disciplinas,
+assuntos, editoras).
+
+Os metodos de repository marcados com @dado_de_referencia(Model, ...)
+guardam o resultado (querysets viram listas) em dois niveis:
+
+- LRU por processo (DADOS_REFERENCIA_TAMANHO entradas): acerto sem
+  nenhuma consulta ao banco
+- cache compartilhado opcional (alias DADOS_REFERENCIA_CACHE em
+  CACHES): um processo reaproveita o que outro ja carregou
+
+Invalidacao: cada model registrado tem um contador de versao,
+incrementado pelos sinais post_save/post_delete (na hora e de novo no
+commit da transacao). A versao faz parte da chave, entao uma alteracao
+invalida as entradas de todos os processos:
+
+- com cache compartilhado, as versoes ficam nele — cada leitura confere
+  as versoes (um get_many no cache, nenhuma consulta ao banco)
+- sem cache compartilhado, as versoes sao do processo: outros processos
+  so enxergam a alteracao quando a entrada expira (DADOS_REFERENCIA_TTL)
+
+Dentro de transacoes o cache e lido, mas nao recebe valores novos (o
+carregado pode ter alteracoes que um rollback desfaz).
+
+Alteracoes que nao disparam sinais (QuerySet.update, bulk_create, SQL
+direto) devem chamar invalidar(Model).
+
+Os objetos devolvidos sao compartilhados entre as chamadas: nao alterar;
+para editar, buscar a instancia no banco.
+"""
+
+import functools
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save
+
+from core.replicas import primario
+
+
+PREFIXO = 'dados-referencia'
+
+_trava = threading.Lock()
+_lru = OrderedDict()
+_versoes_locais = {}
+
+
+def _cache_compartilhado():
+    alias = getattr(settings, 'DADOS_REFERENCIA_CACHE', None)
+    return caches[alias] if alias else None
+
+
+def _ttl():
+    return getattr(settings, 'DADOS_REFERENCIA_TTL', 300)
+
+
+def _grupo(model):
+    return model._meta.label_lower
+
+
+def _chave_versao(grupo):
+    return f'{PREFIXO}:versao:{grupo}'
+
+
+def versoes(grupos):
+    """Versao atual de cada grupo (tupla, na ordem dos grupos)."""
+    compartilhado = _cache_compartilhado()
+    if compartilhado is None:
+        with _trava:
+            return tuple(_versoes_locais.get(grupo, 0) for grupo in grupos)
+    chaves = [_chave_versao(grupo) for grupo in grupos]
+    encontradas = compartilhado.get_many(chaves)
+    return tuple(encontradas.get(chave, 0) for chave in chaves)
+
+
+def invalidar(*models):
+    """Invalida as entradas que dependem dos models (todos os processos)."""
+    compartilhado = _cache_compartilhado()
+    for model in models:
+        grupo = _grupo(model)
+        with _trava:
+            _versoes_locais[grupo] = _versoes_locais.get(grupo, 0) + 1
+        if compartilhado is not None:
+            chave = _chave_versao(grupo)
+            try:
+                compartilhado.incr(chave)
+            except ValueError:
+                # Contador ausente (expirou ou cache reiniciado)
+                compartilhado.set(chave, int(time.time()), timeout=None)
+
+
+def limpar():
+    """Esvazia o LRU do processo (o cache compartilhado nao e alterado)."""
+    with _trava:
+        _lru.clear()
+
+
+def _ao_alterar(sender, **kwargs):
+    invalidar(sender)
+    # Leitores que recarregaram antes do commit viram os dados antigos
+    transaction.on_commit(lambda: invalidar(sender))
+
+
+_registrados = set()
+
+
+def registrar(model):
+    """Conecta os sinais que invalidam o model (idempotente)."""
+    grupo = _grupo(model)
+    if grupo in _registrados:
+        return
+    _registrados.add(grupo)
+    post_save.connect(
+        _ao_alterar, sender=model, weak=False,
+        dispatch_uid=f'{PREFIXO}-save-{grupo}',
+    )
+    post_delete.connect(
+        _ao_alterar, sender=model, weak=False,
+        dispatch_uid=f'{PREFIXO}-delete-{grupo}',
+    )
+
+
+def obter(chave, models, carregar):
+    """
+    Valor de `chave` (dependente de `models`), carregando com `carregar()`
+    em caso de falta. Querysets sao materializados em lista.
+    """
+    grupos = [_grupo(model) for model in models]
+    versao = versoes(grupos)
+    agora = time.monotonic()
+
+    with _trava:
+        entrada = _lru.get(chave)
+        if entrada is not None and entrada[0] == versao and entrada[1] > agora:
+            _lru.move_to_end(chave)
+            return entrada[2]
+
+    compartilhado = _cache_compartilhado()
+    chave_compartilhada = f'{PREFIXO}:{chave}:{":".join(map(str, versao))}'
+    faltando = object()
+    valor = faltando
+    if compartilhado is not None:
+        valor = compartilhado.get(chave_compartilhada, faltando)
+    if valor is faltando:
+        # Carrega do primario: uma replica atrasada gravaria dados antigos
+        # sob a versao nova
+        with primario():
+            valor = carregar()
+            if isinstance(valor, QuerySet):
+                valor = list(valor)
+        # Dentro de uma transacao o valor pode conter alteracoes ainda nao
+        # confirmadas (e desfeitas num rollback): nao guarda
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return valor
+        if compartilhado is not None:
+            compartilhado.set(chave_compartilhada, valor, timeout=_ttl())
+
+    with _trava:
+        _lru[chave] = (versao, agora + _ttl(), valor)
+        _lru.move_to_end(chave)
+        while len(_lru) > getattr(settings, 'DADOS_REFERENCIA_TAMANHO', 256):
+            _lru.popitem(last=False)
+    return valor
+
+
+def dado_de_referencia(*models):
+    """
+    Decorator para metodos de repository que leem dados de referencia.
+
+    A chave e o nome qualificado da funcao mais os argumentos (que devem
+    ter repr estavel: ids, textos). Usar abaixo de @staticmethod.
+    """
+    for model in models:
+        registrar(model)
+
+    def decorator(funcao):
+        nome = f'{funcao.__module__}.{funcao.__qualname__}'
+
+        @functools.wraps(funcao)
+        def wrapper(*args, **kwargs):
+            chave = nome
+            if args or kwargs:
+                chave = f'{nome}:{args!r}:{sorted(kwargs.items())!r}'
+            return obter(chave, models, lambda: funcao(*args, **kwargs))
+
+        return wrapper
+
+    return decorator
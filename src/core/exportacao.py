@@ -0,0 +1,179 @@
+"""
+core.exportacao
+
+Geradores de arquivos em streaming (CSV, XLSX e ZIP).
+
+Todos recebem iteraveis de linhas (ou de pedacos de bytes) e devolvem
+geradores de bytes, prontos para StreamingHttpResponse ou para gravar
+em disco. Nada e acumulado em memoria alem da linha corrente e do
+buffer interno de compressao — o consumo fica constante, independente
+do tamanho da exportacao.
+
+O XLSX e montado diretamente (planilha unica, celulas de texto inline),
+sem dependencias externas.
+"""
+
+import csv
+import re
+import time
+import zipfile
+from xml.sax.saxutils import escape
+
+# Caracteres de controle nao permitidos em XML 1.0
+_CONTROLE_XML = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+# Numero de linhas acumuladas antes de emitir um pedaco de bytes
+LINHAS_POR_PEDACO = 200
+
+
+class _Eco:
+    """Pseudo-arquivo que devolve o que recebe (para csv.writer)."""
+
+    def write(self, valor):
+        return valor
+
+
+class _SaidaStream:
+    """Pseudo-arquivo nao posicionavel que acumula bytes ate serem lidos."""
+
+    def __init__(self):
+        self._partes = []
+
+    def write(self, dados):
+        self._partes.append(bytes(dados))
+        return len(dados)
+
+    def flush(self):
+        pass
+
+    def esvaziar(self):
+        dados = b''.join(self._partes)
+        self._partes.clear()
+        return dados
+
+
+def _em_pedacos(textos):
+    """Agrupa strings em pedacos de bytes UTF-8."""
+    buffer = []
+    for texto in textos:
+        buffer.append(texto)
+        if len(buffer) >= LINHAS_POR_PEDACO:
+            yield ''.join(buffer).encode('utf-8')
+            buffer.clear()
+    if buffer:
+        yield ''.join(buffer).encode('utf-8')
+
+
+def stream_csv(cabecalho, linhas):
+    """
+    Gera um CSV (UTF-8 com BOM, separador ';', como o Excel em pt-BR espera).
+    """
+    escritor = csv.writer(_Eco(), delimiter=';')
+
+    def textos():
+        yield '\ufeff'
+        yield escritor.writerow(cabecalho)
+        for linha in linhas:
+            yield escritor.writerow(linha)
+
+    yield from _em_pedacos(textos())
+
+
+def _linha_xlsx(valores):
+    celulas = ''.join(
+        '<c t="inlineStr"><is><t xml:space="preserve">'
+        f'{escape(_CONTROLE_XML.sub("", str(valor)))}'
+        '</t></is></c>'
+        for valor in valores
+    )
+    return f'<row>{celulas}</row>'
+
+
+_XLSX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" '
+    'ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '</Types>'
+)
+
+_XLSX_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+
+_XLSX_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '</Relationships>'
+)
+
+
+def _xlsx_workbook(nome_planilha):
+    # Nomes de planilha: ate 31 caracteres, sem []:*?/\
+    nome = re.sub(r'[\[\]:*?/\\]', ' ', nome_planilha)[:31] or 'Planilha1'
+    nome = escape(nome, {'"': '&quot;'})
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        f'<sheets><sheet name="{nome}" sheetId="1" r:id="rId1"/></sheets>'
+        '</workbook>'
+    )
+
+
+def stream_xlsx(cabecalho, linhas, nome_planilha='Planilha1'):
+    """Gera um XLSX de uma planilha, com todas as celulas como texto."""
+
+    def planilha():
+        yield (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+            '<sheetData>'
+        )
+        yield _linha_xlsx(cabecalho)
+        for linha in linhas:
+            yield _linha_xlsx(linha)
+        yield '</sheetData></worksheet>'
+
+    yield from stream_zip([
+        ('[Content_Types].xml', [_XLSX_CONTENT_TYPES.encode('utf-8')]),
+        ('_rels/.rels', [_XLSX_RELS.encode('utf-8')]),
+        ('xl/workbook.xml', [_xlsx_workbook(nome_planilha).encode('utf-8')]),
+        ('xl/_rels/workbook.xml.rels', [_XLSX_WORKBOOK_RELS.encode('utf-8')]),
+        ('xl/worksheets/sheet1.xml', _em_pedacos(planilha())),
+    ])
+
+
+def stream_zip(arquivos):
+    """
+    Gera um ZIP a partir de pares (nome, iteravel de bytes).
+
+    Os arquivos sao consumidos um por vez e comprimidos conforme chegam;
+    o ZIP usa descritores de dados, dispensando saida posicionavel.
+    """
+    saida = _SaidaStream()
+    data_hora = time.localtime()[:6]
+    with zipfile.ZipFile(saida, 'w', zipfile.ZIP_DEFLATED) as arquivo_zip:
+        for nome, conteudo in arquivos:
+            info = zipfile.ZipInfo(nome, date_time=data_hora)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            with arquivo_zip.open(info, 'w', force_zip64=True) as destino:
+                for pedaco in conteudo:
+                    destino.write(pedaco)
+                    dados = saida.esvaziar()
+                    if dados:
+                        yield dados
+    yield saida.esvaziar()
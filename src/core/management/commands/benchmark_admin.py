@@ -0,0 +1,426 @@
+"""
+Management command para medir consultas SQL e tempo das telas do admin.
+
+Uso:
+    python manage.py benchmark_admin
+    python manage.py benchmark_admin --linhas-base 5 --linhas 60 \\
+        --repeticoes 5 --saida relatorio-admin.json
+    python manage.py benchmark_admin --somente academic.alunoturma --sem-falha
+
+Para cada ModelAdmin registrado, renderiza:
+    - a changelist
+    - o formulario de edicao de um registro com muitos filhos
+    - cada endpoint de autocomplete dos autocomplete_fields
+
+As telas sao medidas duas vezes: com --linhas-base registros sinteticos
+por model e depois de crescer para --linhas registros. Uma tela cujo
+numero de consultas aumenta com o volume tem N+1 (ex: __str__ que segue
+FKs sem select_related). O tempo (mediana de --repeticoes) e gravado no
+relatorio JSON para comparar versoes.
+
+Caracteristicas:
+    - Nao altera o banco: tudo roda numa transacao desfeita ao final
+    - Falha (exit code != 0) se alguma tela crescer em consultas,
+      salvo com --sem-falha; o relatorio e gravado antes
+    - Dados sinteticos gerados com bulk_create, relacionados a um
+      registro "central" por model para que os formularios crescam junto
+"""
+
+import json
+import statistics
+import time
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.contrib import admin
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import NoReverseMatch, reverse
+from django.utils import timezone
+
+from academic.models import (
+    AnoLetivo,
+    Disciplina,
+    Turma,
+    ProfessorDisciplina,
+    AlunoTurma,
+    Matricula,
+    MovimentacaoAluno,
+)
+from accounts.models import Usuario
+from core.models import Escola
+from library.models import Assunto, Autor, Editora, Emprestimo, Exemplar, Obra
+from library.services import BibliotecaService, CatalogoService
+from people.models import (
+    Pessoa,
+    Aluno,
+    Professor,
+    Funcionario,
+    Responsavel,
+    AlunoResponsavel,
+)
+
+
+class _Desfazer(Exception):
+    """Sinaliza o fim do benchmark para desfazer a transacao."""
+
+
+# ─────────────────────────────────────────────────────────────
+# Dados sinteticos
+# ─────────────────────────────────────────────────────────────
+
+class _VolumeSintetico:
+    """Cria registros sinteticos em todos os models do admin.
+
+    Os registros filhos apontam para o primeiro registro criado de cada
+    model (o "central"), de forma que inlines e listas relacionadas
+    crescem junto com o volume.
+    """
+
+    def __init__(self):
+        self.criados = 0
+        self.centrais = {}
+
+    def crescer_ate(self, total):
+        inicio, self.criados = self.criados, max(self.criados, total)
+        indices = range(inicio, self.criados)
+        if indices:
+            self._criar(indices)
+
+    def _central(self, model, objetos):
+        return self.centrais.setdefault(model, objetos[0])
+
+    def _criar(self, indices):
+        hoje = timezone.localdate()
+
+        escolas = Escola.objects.bulk_create([
+            Escola(nome=f'Escola benchmark {i}', cnpj=f'BENCH-{i:012d}')
+            for i in indices
+        ])
+        escola = self._central(Escola, escolas)
+
+        anos = AnoLetivo.objects.bulk_create([
+            AnoLetivo(
+                nome=f'BENCH-{i}',
+                data_inicio=date(2000, 2, 1),
+                data_fim=date(2000, 12, 15),
+                ativo=False,
+            )
+            for i in indices
+        ])
+        ano = self._central(AnoLetivo, anos)
+
+        turmas = Turma.objects.bulk_create([
+            Turma(nome=f'Turma benchmark {i}', ano_letivo=ano, escola=escola)
+            for i in indices
+        ])
+        turma = self._central(Turma, turmas)
+
+        disciplinas = Disciplina.objects.bulk_create([
+            Disciplina(nome=f'Disciplina benchmark {i}', codigo=f'BENCH{i}',
+                       carga_horaria=80)
+            for i in indices
+        ])
+        disciplina = self._central(Disciplina, disciplinas)
+
+        pessoas = Pessoa.objects.bulk_create([
+            Pessoa(
+                nome=f'Pessoa Benchmark {papel} {i}',
+                nome_normalizado=f'pessoa benchmark {papel} {i}',
+                cpf=f'9{n:010d}',
+                cpf_digitos=f'9{n:010d}',
+            )
+            for i in indices
+            for n, papel in enumerate(
+                ('aluno', 'professor', 'funcionario', 'responsavel'),
+                start=i * 4,
+            )
+        ])
+        por_papel = [pessoas[p::4] for p in range(4)]
+
+        alunos = Aluno.objects.bulk_create([
+            Aluno(pessoa=pessoa, nome_ordenacao=pessoa.nome_normalizado,
+                  matricula=f'BENCH{i}', data_ingresso=hoje)
+            for i, pessoa in zip(indices, por_papel[0])
+        ])
+        self._central(Aluno, alunos)
+        professores = Professor.objects.bulk_create([
+            Professor(pessoa=pessoa, nome_ordenacao=pessoa.nome_normalizado,
+                      formacao='Licenciatura')
+            for pessoa in por_papel[1]
+        ])
+        self._central(Professor, professores)
+        funcionarios = Funcionario.objects.bulk_create([
+            Funcionario(pessoa=pessoa, nome_ordenacao=pessoa.nome_normalizado,
+                        cargo='Auxiliar')
+            for pessoa in por_papel[2]
+        ])
+        self._central(Funcionario, funcionarios)
+        responsaveis = Responsavel.objects.bulk_create([
+            Responsavel(pessoa=pessoa, nome_ordenacao=pessoa.nome_normalizado,
+                        tipo=Responsavel.Tipo.RESPONSAVEL_LEGAL)
+            for pessoa in por_papel[3]
+        ])
+        responsavel = self._central(Responsavel, responsaveis)
+        self._central(Pessoa, por_papel[0])
+
+        Usuario.objects.bulk_create([
+            Usuario(username=f'bench-{i}', pessoa=pessoa, password='!')
+            for i, pessoa in zip(indices, por_papel[2])
+        ])
+
+        AlunoResponsavel.objects.bulk_create([
+            AlunoResponsavel(
+                aluno=aluno,
+                responsavel=responsavel,
+                tipo_vinculo=AlunoResponsavel.TipoVinculo.TUTOR,
+            )
+            for aluno in alunos
+        ])
+        ProfessorDisciplina.objects.bulk_create([
+            ProfessorDisciplina(professor=professor, disciplina=disciplina,
+                                ano_letivo=ano)
+            for professor in professores
+        ])
+        AlunoTurma.objects.bulk_create([
+            AlunoTurma(aluno=aluno, turma=turma, data_matricula=hoje)
+            for aluno in alunos
+        ])
+        matriculas = Matricula.objects.bulk_create([
+            Matricula(aluno=aluno, turma=turma, ano_letivo=ano,
+                      data_matricula=hoje)
+            for aluno in alunos
+        ])
+        MovimentacaoAluno.objects.bulk_create([
+            MovimentacaoAluno(
+                aluno=matricula.aluno,
+                tipo_evento=MovimentacaoAluno.TipoEvento.MATRICULA_INICIAL,
+                data=hoje,
+                descricao='Benchmark',
+                matricula=matricula,
+            )
+            for matricula in matriculas
+        ])
+
+        autores = Autor.objects.bulk_create([
+            Autor(nome=f'Autor benchmark {i}') for i in indices
+        ])
+        autor = self._central(Autor, autores)
+        editoras = Editora.objects.bulk_create([
+            Editora(nome=f'Editora benchmark {i}') for i in indices
+        ])
+        editora = self._central(Editora, editoras)
+        assuntos = Assunto.objects.bulk_create([
+            Assunto(nome=f'Assunto benchmark {i}') for i in indices
+        ])
+        assunto = self._central(Assunto, assuntos)
+        obras = Obra.objects.bulk_create([
+            Obra(titulo=f'Obra benchmark {i}', editora=editora, assunto=assunto)
+            for i in indices
+        ])
+        obra = self._central(Obra, obras)
+        Obra.autores.through.objects.bulk_create([
+            Obra.autores.through(obra=o, autor=autor) for o in obras
+        ])
+        exemplares = Exemplar.objects.bulk_create([
+            Exemplar(
+                obra=obra,
+                codigo_patrimonio=f'BENCH-{i}',
+                situacao=Exemplar.Situacao.EMPRESTADO,
+            )
+            for i in indices
+        ])
+        self._central(Exemplar, exemplares)
+        emprestimos = Emprestimo.objects.bulk_create([
+            Emprestimo(
+                exemplar=exemplar,
+                aluno=aluno,
+                data_emprestimo=hoje,
+                data_prevista_devolucao=hoje + timedelta(days=14),
+            )
+            for exemplar, aluno in zip(exemplares, alunos)
+        ])
+        self._central(Emprestimo, emprestimos)
+
+        obra_ids = [o.pk for o in obras]
+        CatalogoService.indexar_obras(obra_ids)
+        BibliotecaService.recalcular_contadores_obras(obra_ids)
+
+
+# ─────────────────────────────────────────────────────────────
+# Telas medidas
+# ─────────────────────────────────────────────────────────────
+
+def _telas(centrais, somente):
+    """Lista (nome, url) de todas as telas do admin a medir."""
+    telas = []
+    for model, model_admin in admin.site._registry.items():
+        opts = model._meta
+        chave = f'{opts.app_label}.{opts.model_name}'
+        if somente and chave not in somente:
+            continue
+        info = (opts.app_label, opts.model_name)
+
+        telas.append((f'{chave}:changelist',
+                      reverse('admin:%s_%s_changelist' % info)))
+
+        objeto = centrais.get(model) or model._default_manager.order_by('pk').first()
+        if objeto is not None:
+            try:
+                telas.append((f'{chave}:change', reverse(
+                    'admin:%s_%s_change' % info, args=[objeto.pk],
+                )))
+            except NoReverseMatch:
+                pass
+
+        for campo in model_admin.get_autocomplete_fields(None):
+            telas.append((
+                f'{chave}:autocomplete:{campo}',
+                f'{reverse("admin:autocomplete")}?app_label={opts.app_label}'
+                f'&model_name={opts.model_name}&field_name={campo}&term=',
+            ))
+    return telas
+
+
+def _medir(cliente, url, repeticoes):
+    """Retorna (status, consultas, mediana_ms) de uma tela."""
+    tempos = []
+    for _ in range(repeticoes):
+        with CaptureQueriesContext(connection) as consultas:
+            inicio = time.perf_counter()
+            resposta = cliente.get(url)
+            tempos.append((time.perf_counter() - inicio) * 1000)
+    return resposta.status_code, len(consultas), round(statistics.median(tempos), 2)
+
+
+class Command(BaseCommand):
+    help = (
+        'Mede consultas SQL e tempo de changelists, formularios e '
+        'autocompletes do admin em dois volumes de dados, apontando as '
+        'telas cujo numero de consultas cresce com o volume.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--linhas-base',
+            type=int,
+            default=5,
+            help='Registros sinteticos por model na primeira medicao (padrao: 5).',
+        )
+        parser.add_argument(
+            '--linhas',
+            type=int,
+            default=50,
+            help='Registros sinteticos por model na segunda medicao (padrao: 50).',
+        )
+        parser.add_argument(
+            '--repeticoes',
+            type=int,
+            default=3,
+            help='Requisicoes por tela; o tempo gravado e a mediana (padrao: 3).',
+        )
+        parser.add_argument(
+            '--somente',
+            action='append',
+            default=[],
+            metavar='APP.MODEL',
+            help='Mede apenas o admin do model informado (repetivel).',
+        )
+        parser.add_argument(
+            '--saida',
+            default='benchmark-admin.json',
+            help='Arquivo do relatorio JSON (padrao: benchmark-admin.json).',
+        )
+        parser.add_argument(
+            '--sem-falha',
+            action='store_true',
+            help='Nao falha quando alguma tela crescer em consultas.',
+        )
+
+    def handle(self, *args, **options):
+        if options['linhas'] <= options['linhas_base']:
+            raise CommandError('--linhas deve ser maior que --linhas-base.')
+
+        relatorio = None
+        try:
+            with transaction.atomic():
+                relatorio = self._executar(options)
+                raise _Desfazer
+        except _Desfazer:
+            pass
+
+        with open(options['saida'], 'w', encoding='utf-8') as arquivo:
+            json.dump(relatorio, arquivo, ensure_ascii=False, indent=2)
+
+        crescem = [t for t in relatorio['telas'] if t['cresce']]
+        falhas = [t for t in relatorio['telas'] if t['status'] >= 400]
+        self.stdout.write('')
+        self.stdout.write(f'Relatorio gravado em {options["saida"]}.')
+        if falhas:
+            self.stdout.write(self.style.WARNING(
+                f'{len(falhas)} tela(s) responderam com erro.'
+            ))
+        if not crescem:
+            self.stdout.write(self.style.SUCCESS(
+                f'{len(relatorio["telas"])} tela(s) medida(s), nenhuma cresce '
+                f'em consultas com o volume.'
+            ))
+            return
+
+        mensagem = (
+            f'{len(crescem)} tela(s) com consultas crescendo com o volume: '
+            f'{", ".join(t["tela"] for t in crescem)}.'
+        )
+        if options['sem_falha']:
+            self.stdout.write(self.style.WARNING(mensagem))
+            return
+        raise CommandError(mensagem)
+
+    def _executar(self, options):
+        volume = _VolumeSintetico()
+        usuario = Usuario.objects.create(
+            username='__benchmark_admin__',
+            is_staff=True,
+            is_superuser=True,
+            password='!',
+        )
+        cliente = Client()
+        cliente.force_login(usuario)
+        repeticoes = options['repeticoes']
+
+        medicoes = {}
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+            for etapa, linhas in (('base', options['linhas_base']),
+                                  ('volume', options['linhas'])):
+                volume.crescer_ate(linhas)
+                self.stdout.write(f'Medindo com {linhas} registro(s) por model...')
+                for nome, url in _telas(volume.centrais, set(options['somente'])):
+                    medicoes.setdefault(nome, {'tela': nome, 'url': url})
+                    status, consultas, tempo_ms = _medir(cliente, url, repeticoes)
+                    medicoes[nome]['status'] = status
+                    medicoes[nome][f'consultas_{etapa}'] = consultas
+                    medicoes[nome][f'tempo_ms_{etapa}'] = tempo_ms
+
+        telas = []
+        for medicao in medicoes.values():
+            medicao['cresce'] = (
+                medicao['consultas_volume'] > medicao['consultas_base']
+            )
+            telas.append(medicao)
+            estilo = self.style.WARNING if medicao['cresce'] else str
+            self.stdout.write(estilo(
+                f'  {medicao["tela"]}: {medicao["consultas_base"]} -> '
+                f'{medicao["consultas_volume"]} consulta(s), '
+                f'{medicao["tempo_ms_volume"]} ms'
+            ))
+
+        return {
+            'gerado_em': timezone.now().isoformat(),
+            'banco': connection.vendor,
+            'linhas_base': options['linhas_base'],
+            'linhas': options['linhas'],
+            'repeticoes': repeticoes,
+            'telas': telas,
+        }
@@ -0,0 +1,234 @@
+"""
+Management command para comparar o mesmo endpoint servido em WSGI e ASGI.
+
+Uso:
+    python manage.py benchmark_concorrencia
+    python manage.py benchmark_concorrencia --url /api/painel/biblioteca/ \\
+        --requests 400 --concorrencia 50
+    python manage.py benchmark_concorrencia --modo asgi --saida concorrencia.json
+
+Dispara --requests requisicoes GET ao --url com --concorrencia
+requisicoes simultaneas, dentro do proprio processo:
+
+    - wsgi: um pool de threads, cada requisicao pelo handler WSGI
+      (django.test.Client) — uma thread ocupada por requisicao
+    - asgi: um unico event loop, as requisicoes pelo handler ASGI
+      (django.test.AsyncClient) com asyncio.gather — views async
+      esperam o banco sem ocupar uma thread do servidor
+
+Para cada modo informa vazao (requisicoes/s), latencia (p50, p95, p99
+e maxima), respostas por status e o pico de threads do processo.
+
+Caracteristicas:
+    - Autentica como um usuario staff temporario (as APIs do painel
+      exigem staff), removido ao final
+    - Nao depende de uvicorn/gunicorn: mede o custo da pilha do Django
+      (middlewares, view, ORM), nao o do servidor
+    - Os numeros absolutos dependem do banco e da maquina; compare os
+      modos na mesma execucao
+"""
+
+import asyncio
+import json
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient, Client
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from accounts.models import Usuario
+
+
+USUARIO_BENCHMARK = '__benchmark_concorrencia__'
+
+
+class _PicoThreads:
+    """Amostra threading.active_count() enquanto o bloco executa."""
+
+    def __init__(self, intervalo=0.005):
+        self.intervalo = intervalo
+        self.pico = 0
+        self._parar = threading.Event()
+
+    def _amostrar(self):
+        while not self._parar.is_set():
+            self.pico = max(self.pico, threading.active_count())
+            self._parar.wait(self.intervalo)
+
+    def __enter__(self):
+        self._monitor = threading.Thread(target=self._amostrar, daemon=True)
+        self._monitor.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._parar.set()
+        self._monitor.join()
+        # Desconta a propria thread de amostragem
+        self.pico -= 1
+
+
+def _percentil(valores, fracao):
+    ordenados = sorted(valores)
+    indice = min(len(ordenados) - 1, round(fracao * (len(ordenados) - 1)))
+    return ordenados[indice]
+
+
+def _resumo(modo, latencias, status, duracao, pico_threads):
+    return {
+        'modo': modo,
+        'requests': len(latencias),
+        'duracao_s': round(duracao, 3),
+        'vazao_rps': round(len(latencias) / duracao, 1) if duracao else None,
+        'latencia_ms': {
+            'p50': round(statistics.median(latencias), 2),
+            'p95': round(_percentil(latencias, 0.95), 2),
+            'p99': round(_percentil(latencias, 0.99), 2),
+            'max': round(max(latencias), 2),
+        },
+        'status': {str(codigo): status.count(codigo) for codigo in sorted(set(status))},
+        'pico_threads': pico_threads,
+    }
+
+
+def _medir_wsgi(usuario, url, total, concorrencia):
+    locais = threading.local()
+
+    def requisitar(_):
+        cliente = getattr(locais, 'cliente', None)
+        if cliente is None:
+            cliente = locais.cliente = Client()
+            cliente.force_login(usuario)
+        inicio = time.perf_counter()
+        resposta = cliente.get(url)
+        return (time.perf_counter() - inicio) * 1000, resposta.status_code
+
+    with _PicoThreads() as pico:
+        inicio = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concorrencia) as executor:
+            resultados = list(executor.map(requisitar, range(total)))
+        duracao = time.perf_counter() - inicio
+    return resultados, duracao, pico.pico
+
+
+def _medir_asgi(usuario, url, total, concorrencia):
+    cliente = AsyncClient()
+    cliente.force_login(usuario)
+
+    async def executar():
+        limite = asyncio.Semaphore(concorrencia)
+
+        async def requisitar():
+            async with limite:
+                inicio = time.perf_counter()
+                resposta = await cliente.get(url)
+                return (time.perf_counter() - inicio) * 1000, resposta.status_code
+
+        return await asyncio.gather(*(requisitar() for _ in range(total)))
+
+    with _PicoThreads() as pico:
+        inicio = time.perf_counter()
+        resultados = asyncio.run(executar())
+        duracao = time.perf_counter() - inicio
+    return resultados, duracao, pico.pico
+
+
+MODOS = {
+    'wsgi': _medir_wsgi,
+    'asgi': _medir_asgi,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Compara vazao, latencia e threads de um endpoint servido pelos '
+        'handlers WSGI e ASGI do Django com requisicoes concorrentes.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--url',
+            default='/api/painel/biblioteca/',
+            help='Caminho requisitado (padrao: /api/painel/biblioteca/).',
+        )
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=200,
+            help='Requisicoes por modo (padrao: 200).',
+        )
+        parser.add_argument(
+            '--concorrencia',
+            type=int,
+            default=20,
+            help='Requisicoes simultaneas (padrao: 20).',
+        )
+        parser.add_argument(
+            '--modo',
+            choices=[*MODOS, 'ambos'],
+            default='ambos',
+            help='Handler medido (padrao: ambos).',
+        )
+        parser.add_argument(
+            '--saida',
+            help='Grava o relatorio JSON neste arquivo.',
+        )
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1 or options['concorrencia'] < 1:
+            raise CommandError('--requests e --concorrencia devem ser positivos.')
+
+        modos = list(MODOS) if options['modo'] == 'ambos' else [options['modo']]
+        usuario, _ = Usuario.objects.get_or_create(
+            username=USUARIO_BENCHMARK,
+            defaults={'is_staff': True, 'password': '!'},
+        )
+        resultados = []
+        try:
+            with override_settings(
+                ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'],
+            ):
+                for modo in modos:
+                    self.stdout.write(
+                        f'Medindo {modo}: {options["requests"]} requisicao(oes), '
+                        f'{options["concorrencia"]} simultanea(s)...'
+                    )
+                    medidas, duracao, pico = MODOS[modo](
+                        usuario, options['url'],
+                        options['requests'], options['concorrencia'],
+                    )
+                    latencias = [latencia for latencia, _ in medidas]
+                    status = [codigo for _, codigo in medidas]
+                    resultados.append(
+                        _resumo(modo, latencias, status, duracao, pico)
+                    )
+        finally:
+            usuario.delete()
+
+        for resultado in resultados:
+            latencia = resultado['latencia_ms']
+            self.stdout.write(
+                f'  {resultado["modo"]}: {resultado["vazao_rps"]} req/s, '
+                f'p50 {latencia["p50"]} ms, p95 {latencia["p95"]} ms, '
+                f'p99 {latencia["p99"]} ms, max {latencia["max"]} ms, '
+                f'pico de {resultado["pico_threads"]} thread(s), '
+                f'status {resultado["status"]}'
+            )
+            if any(int(codigo) >= 400 for codigo in resultado['status']):
+                self.stdout.write(self.style.WARNING(
+                    f'  {resultado["modo"]}: houve respostas com erro.'
+                ))
+
+        if options['saida']:
+            with open(options['saida'], 'w', encoding='utf-8') as arquivo:
+                json.dump({
+                    'gerado_em': timezone.now().isoformat(),
+                    'url': options['url'],
+                    'concorrencia': options['concorrencia'],
+                    'modos': resultados,
+                }, arquivo, ensure_ascii=False, indent=2)
+            self.stdout.write(f'Relatorio gravado em {options["saida"]}.')
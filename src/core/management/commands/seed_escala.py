@@ -0,0 +1,750 @@
+"""
+Management command para gerar um volume grande de dados sinteticos.
+
+Uso:
+    python manage.py seed_escala
+    python manage.py seed_escala --escolas 20 --alunos-por-escola 5000
+    python manage.py seed_escala --escolas 40 --alunos-por-escola 5000 \\
+        --obras 20000 --workers 8 --seed 7
+    python manage.py seed_escala --ano-atual 2027 --data-referencia 2027-05-15
+
+Diferente dos seeds das Etapas 1 a 4 (poucos registros fixos, criados um
+a um), este comando gera dados para teste de carga:
+    - N escolas, cada uma com alunos, familias de responsaveis (irmaos
+      compartilham os mesmos responsaveis), professores e funcionarios
+    - Turmas por serie (1o ao 9o ano) em cada ano letivo do historico
+    - Matriculas, AlunoTurma e MovimentacaoAluno de todos os anos, com
+      encerramentos nos anos anteriores e algumas transferencias no atual
+    - Acervo da biblioteca (autores, editoras, assuntos, obras, exemplares)
+      e historico de emprestimos dos alunos, com alguns ativos e atrasados
+
+Ordem de grandeza: --escolas 40 --alunos-por-escola 5000 gera por volta
+de 1 milhao de linhas.
+
+Caracteristicas:
+    - Deterministico: os mesmos argumentos (--seed, --ano-atual,
+      --data-referencia...) geram exatamente os mesmos dados, em
+      qualquer dia; nada depende da data corrente
+    - bulk_create em lotes de --lote linhas; uma transacao por escola
+    - Idempotente/retomavel: escolas ja geradas (pelo CNPJ) sao puladas
+    - --workers N gera escolas em paralelo em N processos (PostgreSQL;
+      no SQLite, que nao aceita escritas concorrentes, roda com 1 worker)
+    - Reaproveita anos letivos existentes com o mesmo nome
+"""
+
+import itertools
+import multiprocessing
+import random
+import time
+from datetime import date, timedelta
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections, transaction
+
+from academic.models import (
+    AnoLetivo,
+    Disciplina,
+    Turma,
+    ProfessorDisciplina,
+    AlunoTurma,
+    Matricula,
+    MovimentacaoAluno,
+)
+from core.dados_referencia import invalidar
+from core.models import Escola
+from core.texto import normalizar_texto, somente_digitos
+from library.models import Assunto, Autor, Editora, Emprestimo, Exemplar, Obra
+from library.services import BibliotecaService, CatalogoService
+from people.models import (
+    Pessoa,
+    Aluno,
+    Professor,
+    Funcionario,
+    Responsavel,
+    AlunoResponsavel,
+)
+
+
+# ─────────────────────────────────────────────────────────────
+# Vocabulario para nomes ficticios
+# ─────────────────────────────────────────────────────────────
+
+PRIMEIROS_NOMES = [
+    'Ana', 'Beatriz', 'Camila', 'Daniela', 'Eduarda', 'Fernanda', 'Gabriela',
+    'Helena', 'Isabela', 'Julia', 'Larissa', 'Mariana', 'Natalia', 'Patricia',
+    'Rafaela', 'Sofia', 'Valentina', 'Alice', 'Laura', 'Manuela',
+    'Arthur', 'Bernardo', 'Carlos', 'Davi', 'Eduardo', 'Felipe', 'Gabriel',
+    'Heitor', 'Igor', 'Joao', 'Lucas', 'Mateus', 'Miguel', 'Nicolas', 'Pedro',
+    'Rafael', 'Samuel', 'Thiago', 'Vinicius', 'Enzo',
+]
+
+SOBRENOMES = [
+    'Silva', 'Santos', 'Oliveira', 'Souza', 'Rodrigues', 'Ferreira', 'Alves',
+    'Pereira', 'Lima', 'Gomes', 'Costa', 'Ribeiro', 'Martins', 'Carvalho',
+    'Almeida', 'Lopes', 'Soares', 'Fernandes', 'Vieira', 'Barbosa', 'Rocha',
+    'Dias', 'Nascimento', 'Andrade', 'Moreira', 'Nunes', 'Marques', 'Machado',
+    'Mendes', 'Freitas', 'Cardoso', 'Ramos', 'Goncalves', 'Santana', 'Teixeira',
+]
+
+PALAVRAS_TITULO = [
+    'Aventura', 'Historia', 'Segredo', 'Jardim', 'Viagem', 'Cidade', 'Mar',
+    'Floresta', 'Estrela', 'Caminho', 'Memorias', 'Contos', 'Lendas', 'Rio',
+    'Montanha', 'Sonho', 'Tempo', 'Escola', 'Ilha', 'Castelo', 'Noite', 'Sol',
+]
+
+DISCIPLINAS = [
+    ('SE-LP', 'Lingua Portuguesa', 200),
+    ('SE-MAT', 'Matematica', 200),
+    ('SE-CIE', 'Ciencias', 120),
+    ('SE-HIS', 'Historia', 80),
+    ('SE-GEO', 'Geografia', 80),
+    ('SE-ING', 'Lingua Inglesa', 80),
+    ('SE-ART', 'Arte', 40),
+    ('SE-EDF', 'Educacao Fisica', 80),
+]
+
+ASSUNTOS = [
+    'Literatura infantil', 'Literatura juvenil', 'Poesia', 'Romance',
+    'Ciencias', 'Historia do Brasil', 'Geografia', 'Matematica', 'Artes',
+    'Biografias', 'Contos', 'Folclore', 'Meio ambiente', 'Quadrinhos',
+]
+
+SERIES = [f'{n}o Ano' for n in range(1, 10)]
+
+TAMANHO_TURMA = 30
+
+# Fracao dos alunos do ano atual transferidos de turma
+FRACAO_TRANSFERENCIAS = 0.03
+
+# Fracao dos alunos com um emprestimo em aberto (ativo ou atrasado)
+FRACAO_EMPRESTIMOS_ABERTOS = 0.1
+
+# Pessoas por escola: limitado pela faixa de CPFs reservada a cada escola
+MAXIMO_PESSOAS_POR_ESCOLA = 100_000
+
+# Ano letivo atual padrao. Fixo (e nao o ano corrente) para que os dados
+# dependam apenas dos argumentos; use --ano-atual para outro ano
+ANO_ATUAL_PADRAO = 2026
+
+# "Hoje" dos dados gerados (emprestimos devolvidos, em aberto e atrasados),
+# quando --data-referencia nao e informada: (mes, dia) do ano atual
+DIA_REFERENCIA_PADRAO = (9, 30)
+
+
+# ─────────────────────────────────────────────────────────────
+# Documentos (CPF, CNPJ, ISBN) com digitos verificadores validos
+# ─────────────────────────────────────────────────────────────
+
+def _cpf(numero):
+    digitos = [int(d) for d in f'{numero:09d}']
+    for tamanho in (9, 10):
+        soma = sum(d * peso for d, peso in zip(digitos, range(tamanho + 1, 1, -1)))
+        digitos.append(soma * 10 % 11 % 10)
+    texto = ''.join(map(str, digitos))
+    return f'{texto[:3]}.{texto[3:6]}.{texto[6:9]}-{texto[9:]}'
+
+
+def _cnpj(numero):
+    digitos = [int(d) for d in f'{numero:08d}0001']
+    for pesos in ([5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2],
+                  [6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]):
+        resto = sum(d * p for d, p in zip(digitos, pesos)) % 11
+        digitos.append(0 if resto < 2 else 11 - resto)
+    texto = ''.join(map(str, digitos))
+    return f'{texto[:2]}.{texto[2:5]}.{texto[5:8]}/{texto[8:12]}-{texto[12:]}'
+
+
+def _isbn(numero):
+    digitos = [int(d) for d in f'978{numero:09d}']
+    soma = sum(d * (3 if i % 2 else 1) for i, d in enumerate(digitos))
+    return ''.join(map(str, digitos)) + str((10 - soma % 10) % 10)
+
+
+# CPFs sinteticos: 8XXYYYYYY — escola XX(X) e sequencia na escola
+def _numero_cpf(indice_escola, sequencia):
+    return 800_000_000 + indice_escola * MAXIMO_PESSOAS_POR_ESCOLA + sequencia
+
+
+def _cnpj_escola(indice_escola):
+    return _cnpj(90_000_000 + indice_escola)
+
+
+# ─────────────────────────────────────────────────────────────
+# Geracao por escola (roda no processo principal ou em workers)
+# ─────────────────────────────────────────────────────────────
+
+_exemplares_cache = None
+
+
+def _exemplares_acervo():
+    """IDs dos exemplares do acervo sintetico (carregados uma vez por processo)."""
+    global _exemplares_cache
+    if _exemplares_cache is None:
+        _exemplares_cache = list(
+            Exemplar.objects.filter(
+                codigo_patrimonio__startswith='SE-',
+            ).order_by('pk').values_list('pk', flat=True)
+        )
+    return _exemplares_cache
+
+
+def _inicializar_worker():
+    django.setup()
+    connections.close_all()
+
+
+def _nome(rng):
+    return (
+        f'{rng.choice(PRIMEIROS_NOMES)} {rng.choice(SOBRENOMES)} '
+        f'{rng.choice(SOBRENOMES)}'
+    )
+
+
+class _GeradorEscola:
+    """Gera todos os dados de uma escola a partir de um indice e da seed."""
+
+    def __init__(self, indice, opcoes):
+        self.indice = indice
+        self.opcoes = opcoes
+        self.lote = opcoes['lote']
+        self.rng = random.Random(f'{opcoes["seed"]}-escola-{indice}')
+        self.sequencia_pessoa = itertools.count()
+        self.contagem = {}
+
+    def _gravar(self, model, objetos):
+        model.objects.bulk_create(objetos, batch_size=self.lote)
+        chave = model._meta.verbose_name_plural
+        self.contagem[chave] = self.contagem.get(chave, 0) + len(objetos)
+        return objetos
+
+    def _pessoa(self, idade_min, idade_max, ano_referencia):
+        rng = self.rng
+        nome = _nome(rng)
+        cpf = _cpf(_numero_cpf(self.indice, next(self.sequencia_pessoa)))
+        nascimento = date(ano_referencia - rng.randint(idade_min, idade_max),
+                          rng.randint(1, 12), rng.randint(1, 28))
+        usuario_email = normalizar_texto(nome).replace(' ', '.')
+        return Pessoa(
+            nome=nome,
+            nome_normalizado=normalizar_texto(nome),
+            cpf=cpf,
+            cpf_digitos=somente_digitos(cpf),
+            data_nascimento=nascimento,
+            telefone=f'(11) 9{rng.randint(1000, 9999)}-{rng.randint(1000, 9999)}',
+            email=f'{usuario_email}{rng.randint(1, 999)}@exemplo.com',
+        )
+
+    def gerar(self):
+        cnpj = _cnpj_escola(self.indice)
+        if Escola.objects.filter(cnpj=cnpj).exists():
+            return None
+
+        anos = list(AnoLetivo.objects.filter(
+            nome__in=self.opcoes['anos'],
+        ).order_by('data_inicio'))
+        disciplinas = list(Disciplina.objects.filter(
+            codigo__in=[codigo for codigo, _, _ in DISCIPLINAS],
+        ))
+
+        with transaction.atomic():
+            escola = Escola.objects.create(
+                nome=f'Escola Municipal {self.rng.choice(SOBRENOMES)} {self.indice + 1}',
+                cnpj=cnpj,
+                telefone=f'(11) 3{self.indice:03d}-{self.rng.randint(1000, 9999)}',
+            )
+            alunos = self._gerar_pessoas(anos[-1])
+            turmas = self._gerar_turmas(escola, anos, alunos)
+            self._gerar_matriculas(anos, alunos, turmas)
+            self._gerar_vinculos_professores(anos, disciplinas)
+            self._gerar_emprestimos(anos, alunos)
+        return self.contagem
+
+    # ── Pessoas e perfis ───────────────────────────────────
+
+    def _gerar_pessoas(self, ano_atual):
+        rng = self.rng
+        ano = ano_atual.data_inicio.year
+        total_alunos = self.opcoes['alunos_por_escola']
+
+        pessoas_alunos, pessoas_responsaveis, familias = [], [], []
+        while len(pessoas_alunos) < total_alunos:
+            filhos = min(rng.choice((1, 1, 1, 2, 2, 3)),
+                         total_alunos - len(pessoas_alunos))
+            responsaveis = rng.choice((1, 2, 2))
+            familias.append((
+                range(len(pessoas_alunos), len(pessoas_alunos) + filhos),
+                range(len(pessoas_responsaveis),
+                      len(pessoas_responsaveis) + responsaveis),
+            ))
+            pessoas_alunos.extend(self._pessoa(6, 14, ano) for _ in range(filhos))
+            pessoas_responsaveis.extend(
+                self._pessoa(28, 55, ano) for _ in range(responsaveis)
+            )
+        pessoas_professores = [
+            self._pessoa(25, 60, ano) for _ in range(max(1, total_alunos // 25))
+        ]
+        pessoas_funcionarios = [
+            self._pessoa(20, 60, ano) for _ in range(max(1, total_alunos // 50))
+        ]
+        self._gravar(Pessoa, pessoas_alunos + pessoas_responsaveis
+                     + pessoas_professores + pessoas_funcionarios)
+
+        alunos = self._gravar(Aluno, [
+            Aluno(
+                pessoa=pessoa,
+                nome_ordenacao=pessoa.nome_normalizado,
+                matricula=f'SE{self.indice:03d}{i:06d}',
+                data_ingresso=ano_atual.data_inicio,
+            )
+            for i, pessoa in enumerate(pessoas_alunos)
+        ])
+        responsaveis = self._gravar(Responsavel, [
+            Responsavel(
+                pessoa=pessoa,
+                nome_ordenacao=pessoa.nome_normalizado,
+                tipo=rng.choice((Responsavel.Tipo.MAE, Responsavel.Tipo.PAI)),
+            )
+            for pessoa in pessoas_responsaveis
+        ])
+        self.professores = self._gravar(Professor, [
+            Professor(pessoa=pessoa, nome_ordenacao=pessoa.nome_normalizado,
+                      formacao='Licenciatura',
+                      carga_horaria_max=rng.choice((20, 30, 40)))
+            for pessoa in pessoas_professores
+        ])
+        self._gravar(Funcionario, [
+            Funcionario(pessoa=pessoa, nome_ordenacao=pessoa.nome_normalizado,
+                        cargo=rng.choice(('Secretaria', 'Apoio')),
+                        setor='Administrativo')
+            for pessoa in pessoas_funcionarios
+        ])
+
+        vinculos = []
+        for filhos, pais in familias:
+            for posicao, r in enumerate(pais):
+                responsavel = responsaveis[r]
+                for a in filhos:
+                    vinculos.append(AlunoResponsavel(
+                        aluno=alunos[a],
+                        responsavel=responsavel,
+                        tipo_vinculo=responsavel.tipo,
+                        responsavel_principal=posicao == 0,
+                    ))
+        self._gravar(AlunoResponsavel, vinculos)
+        return alunos
+
+    # ── Turmas ─────────────────────────────────────────────
+
+    def _gerar_turmas(self, escola, anos, alunos):
+        """Cria as turmas e retorna {(ano_pk, serie): [turmas]}.
+
+        A serie de cada aluno no ano atual e sorteada; nos anos anteriores
+        ele estava uma serie abaixo por ano (quem estaria abaixo do 1o ano
+        ainda nao estava na escola).
+        """
+        rng = self.rng
+        self.serie_atual = [rng.randrange(len(SERIES)) for _ in alunos]
+        atraso = len(anos) - 1
+        por_serie = {}
+        for posicao, ano in enumerate(anos):
+            for i, serie_atual in enumerate(self.serie_atual):
+                serie = serie_atual - (atraso - posicao)
+                if serie >= 0:
+                    por_serie.setdefault((ano.pk, serie), []).append(i)
+        self.alunos_por_serie = por_serie
+
+        turmas = []
+        chaves = []
+        for (ano_pk, serie), indices in sorted(por_serie.items()):
+            quantidade = -(-len(indices) // TAMANHO_TURMA)
+            for letra in range(quantidade):
+                turmas.append(Turma(
+                    nome=f'{SERIES[serie]} {chr(ord("A") + letra % 26)}'
+                         f'{letra // 26 or ""}',
+                    ano_letivo_id=ano_pk,
+                    escola=escola,
+                    ativa=ano_pk == anos[-1].pk,
+                ))
+                chaves.append((ano_pk, serie))
+        self._gravar(Turma, turmas)
+
+        turmas_por_serie = {}
+        for chave, turma in zip(chaves, turmas):
+            turmas_por_serie.setdefault(chave, []).append(turma)
+        return turmas_por_serie
+
+    # ── Matriculas e historico ─────────────────────────────
+
+    def _gerar_matriculas(self, anos, alunos, turmas_por_serie):
+        rng = self.rng
+        ano_atual = anos[-1]
+        anos_por_pk = {ano.pk: ano for ano in anos}
+        matriculas, vinculos, eventos = [], [], []
+
+        def registrar(aluno, turma, ano, tipo, status, data, evento):
+            matricula = Matricula(
+                aluno=aluno, turma=turma, ano_letivo=ano, data_matricula=data,
+                tipo=tipo, status=status,
+            )
+            matriculas.append(matricula)
+            eventos.append((matricula, evento, data))
+            return matricula
+
+        for (ano_pk, serie), indices in sorted(self.alunos_por_serie.items()):
+            ano = anos_por_pk[ano_pk]
+            turmas = turmas_por_serie[(ano_pk, serie)]
+            atual = ano_pk == ano_atual.pk
+            for posicao, i in enumerate(indices):
+                aluno = alunos[i]
+                turma = turmas[posicao // TAMANHO_TURMA]
+                transferir = (
+                    atual and len(turmas) > 1
+                    and rng.random() < FRACAO_TRANSFERENCIAS
+                )
+                status = (
+                    Matricula.Status.ATIVA if atual and not transferir
+                    else Matricula.Status.ENCERRADA
+                )
+                matricula = registrar(
+                    aluno, turma, ano, Matricula.Tipo.INICIAL, status,
+                    ano.data_inicio,
+                    MovimentacaoAluno.TipoEvento.MATRICULA_INICIAL,
+                )
+                vinculos.append(AlunoTurma(
+                    aluno=aluno, turma=turma, data_matricula=ano.data_inicio,
+                    ativo=status == Matricula.Status.ATIVA,
+                ))
+                if not atual:
+                    eventos.append((
+                        matricula, MovimentacaoAluno.TipoEvento.ENCERRAMENTO,
+                        ano.data_fim,
+                    ))
+                    continue
+                if transferir:
+                    data = ano.data_inicio + timedelta(days=rng.randint(20, 90))
+                    destino = rng.choice([t for t in turmas if t is not turma])
+                    eventos.append((
+                        matricula,
+                        MovimentacaoAluno.TipoEvento.TRANSFERENCIA_SAIDA, data,
+                    ))
+                    registrar(
+                        aluno, destino, ano, Matricula.Tipo.TRANSFERENCIA,
+                        Matricula.Status.ATIVA, data,
+                        MovimentacaoAluno.TipoEvento.TRANSFERENCIA_ENTRADA,
+                    )
+                    vinculos.append(AlunoTurma(
+                        aluno=aluno, turma=destino, data_matricula=data,
+                    ))
+
+        self._gravar(Matricula, matriculas)
+        self._gravar(AlunoTurma, vinculos)
+        self._gravar(MovimentacaoAluno, [
+            MovimentacaoAluno(
+                aluno_id=matricula.aluno_id,
+                tipo_evento=evento,
+                data=data,
+                descricao=(
+                    f'{MovimentacaoAluno.TipoEvento(evento).label} — turma '
+                    f'{matricula.turma.nome} ({anos_por_pk[matricula.ano_letivo_id]}).'
+                ),
+                matricula=matricula,
+            )
+            for matricula, evento, data in eventos
+        ])
+
+        # Data de ingresso: inicio do primeiro ano em que estudou na escola
+        primeiro_ano = {}
+        for matricula in matriculas:
+            primeiro_ano.setdefault(matricula.aluno_id, matricula.data_matricula)
+            primeiro_ano[matricula.aluno_id] = min(
+                primeiro_ano[matricula.aluno_id], matricula.data_matricula,
+            )
+        for aluno in alunos:
+            aluno.data_ingresso = primeiro_ano.get(aluno.pk, aluno.data_ingresso)
+        Aluno.objects.bulk_update(alunos, ['data_ingresso'], batch_size=self.lote)
+
+    def _gerar_vinculos_professores(self, anos, disciplinas):
+        rng = self.rng
+        self._gravar(ProfessorDisciplina, [
+            ProfessorDisciplina(professor=professor, disciplina=disciplina,
+                                ano_letivo=ano)
+            for ano in anos
+            for professor in self.professores
+            for disciplina in rng.sample(disciplinas, min(2, len(disciplinas)))
+        ])
+
+    # ── Emprestimos ────────────────────────────────────────
+
+    def _gerar_emprestimos(self, anos, alunos):
+        exemplares = _exemplares_acervo()
+        media = self.opcoes['emprestimos_por_aluno']
+        if not exemplares or not media:
+            return
+        rng = self.rng
+        hoje = self.opcoes['data_referencia']
+        total_escolas = self.opcoes['escolas']
+
+        # Exemplares reservados a esta escola para emprestimos em aberto:
+        # evita que duas escolas (em workers paralelos) emprestem o mesmo
+        # exemplar ao mesmo tempo
+        livres = iter(exemplares[self.indice::total_escolas])
+
+        emprestimos = []
+        for aluno in alunos:
+            for _ in range(rng.randint(0, 2 * media)):
+                ano = rng.choice(anos)
+                inicio = ano.data_inicio + timedelta(days=rng.randint(0, 250))
+                if inicio >= hoje:
+                    continue
+                devolucao = inicio + timedelta(days=rng.randint(3, 20))
+                emprestimos.append(Emprestimo(
+                    exemplar_id=rng.choice(exemplares),
+                    aluno=aluno,
+                    data_emprestimo=inicio,
+                    data_prevista_devolucao=inicio + timedelta(days=14),
+                    data_devolucao=min(devolucao, hoje),
+                    status=Emprestimo.Status.DEVOLVIDO,
+                ))
+            if rng.random() < FRACAO_EMPRESTIMOS_ABERTOS:
+                exemplar_id = next(livres, None)
+                if exemplar_id is None:
+                    continue
+                inicio = hoje - timedelta(days=rng.randint(1, 30))
+                prevista = inicio + timedelta(days=14)
+                emprestimos.append(Emprestimo(
+                    exemplar_id=exemplar_id,
+                    aluno=aluno,
+                    data_emprestimo=inicio,
+                    data_prevista_devolucao=prevista,
+                    status=(
+                        Emprestimo.Status.ATRASADO if prevista < hoje
+                        else Emprestimo.Status.ATIVO
+                    ),
+                ))
+        self._gravar(Emprestimo, emprestimos)
+
+
+def _gerar_escola(argumentos):
+    indice, opcoes = argumentos
+    inicio = time.monotonic()
+    contagem = _GeradorEscola(indice, opcoes).gerar()
+    return indice, contagem, time.monotonic() - inicio
+
+
+# ─────────────────────────────────────────────────────────────
+# Command
+# ─────────────────────────────────────────────────────────────
+
+class Command(BaseCommand):
+    help = (
+        'Gera um volume grande e deterministico de dados sinteticos '
+        '(escolas, pessoas, turmas, matriculas, historico e biblioteca) '
+        'para testes de carga.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--escolas', type=int, default=2,
+                            help='Numero de escolas (padrao: 2).')
+        parser.add_argument('--alunos-por-escola', type=int, default=1000,
+                            help='Alunos por escola (padrao: 1000).')
+        parser.add_argument('--anos', type=int, default=3,
+                            help='Anos letivos de historico, incluindo o '
+                                 'atual (padrao: 3).')
+        parser.add_argument('--ano-atual', type=int, default=ANO_ATUAL_PADRAO,
+                            help=f'Ano letivo atual (padrao: {ANO_ATUAL_PADRAO}).')
+        parser.add_argument('--data-referencia', type=date.fromisoformat,
+                            help='Data "de hoje" dos emprestimos, AAAA-MM-DD '
+                                 '(padrao: 30/09 do --ano-atual).')
+        parser.add_argument('--obras', type=int, default=2000,
+                            help='Obras do acervo (padrao: 2000).')
+        parser.add_argument('--exemplares-por-obra', type=int, default=3,
+                            help='Exemplares por obra (padrao: 3).')
+        parser.add_argument('--emprestimos-por-aluno', type=int, default=2,
+                            help='Media de emprestimos devolvidos por aluno '
+                                 '(padrao: 2).')
+        parser.add_argument('--seed', type=int, default=42,
+                            help='Semente do gerador (padrao: 42).')
+        parser.add_argument('--lote', type=int, default=2000,
+                            help='Linhas por INSERT (padrao: 2000).')
+        parser.add_argument('--workers', type=int, default=1,
+                            help='Processos gerando escolas em paralelo '
+                                 '(padrao: 1).')
+
+    def handle(self, *args, **options):
+        pessoas_por_escola = options['alunos_por_escola'] * 3
+        if pessoas_por_escola >= MAXIMO_PESSOAS_POR_ESCOLA:
+            raise CommandError(
+                f'--alunos-por-escola deve ser menor que '
+                f'{MAXIMO_PESSOAS_POR_ESCOLA // 3}.'
+            )
+        if not 1 <= options['escolas'] <= 999:
+            raise CommandError('--escolas deve estar entre 1 e 999.')
+
+        workers = options['workers']
+        if workers > 1 and connection.vendor == 'sqlite':
+            self.stdout.write(self.style.WARNING(
+                'SQLite nao aceita escritas concorrentes; usando 1 worker.'
+            ))
+            workers = 1
+
+        inicio = time.monotonic()
+        anos = self._criar_anos_letivos(options['ano_atual'], options['anos'])
+        self._criar_disciplinas()
+        self._criar_acervo(options)
+
+        opcoes = {
+            'seed': options['seed'],
+            'lote': options['lote'],
+            'escolas': options['escolas'],
+            'alunos_por_escola': options['alunos_por_escola'],
+            'emprestimos_por_aluno': options['emprestimos_por_aluno'],
+            'anos': [ano.nome for ano in anos],
+            'data_referencia': (
+                options['data_referencia']
+                or date(options['ano_atual'], *DIA_REFERENCIA_PADRAO)
+            ),
+        }
+        tarefas = [(indice, opcoes) for indice in range(options['escolas'])]
+
+        self.stdout.write(
+            f'\n--- Escolas ({options["escolas"]}, {workers} worker(s)) ---'
+        )
+        total = {}
+        if workers > 1:
+            connections.close_all()
+            with multiprocessing.Pool(workers, _inicializar_worker) as pool:
+                for resultado in pool.imap_unordered(_gerar_escola, tarefas):
+                    self._reportar_escola(resultado, total)
+        else:
+            for tarefa in tarefas:
+                self._reportar_escola(_gerar_escola(tarefa), total)
+
+        self._finalizar_acervo()
+        # bulk_create nao dispara sinais: invalida o cache de referencia
+        invalidar(Escola, Editora, Assunto)
+
+        self.stdout.write('\n--- Resumo ---')
+        for nome, quantidade in sorted(total.items()):
+            self.stdout.write(f'  {nome}: {quantidade}')
+        self.stdout.write(self.style.SUCCESS(
+            f'\n{sum(total.values())} linha(s) geradas em '
+            f'{time.monotonic() - inicio:.1f}s.'
+        ))
+
+    def _reportar_escola(self, resultado, total):
+        indice, contagem, duracao = resultado
+        if contagem is None:
+            self.stdout.write(f'  Escola {indice + 1}: ja existe (pulada)')
+            return
+        for nome, quantidade in contagem.items():
+            total[nome] = total.get(nome, 0) + quantidade
+        self.stdout.write(self.style.SUCCESS(
+            f'  Escola {indice + 1}: {sum(contagem.values())} linha(s) '
+            f'em {duracao:.1f}s'
+        ))
+
+    # ── Dados compartilhados ───────────────────────────────
+
+    def _criar_anos_letivos(self, ano_atual, quantidade):
+        self.stdout.write('--- Anos letivos ---')
+        anos = []
+        for ano in range(ano_atual - quantidade + 1, ano_atual + 1):
+            ano_letivo, criado = AnoLetivo.objects.get_or_create(
+                nome=str(ano),
+                defaults={
+                    'data_inicio': date(ano, 2, 1),
+                    'data_fim': date(ano, 12, 15),
+                    'ativo': ano == ano_atual,
+                },
+            )
+            status = 'criado' if criado else 'ja existe'
+            self.stdout.write(f'  {ano_letivo} ({status})')
+            anos.append(ano_letivo)
+        return anos
+
+    def _criar_disciplinas(self):
+        for codigo, nome, carga in DISCIPLINAS:
+            Disciplina.objects.get_or_create(
+                codigo=codigo,
+                defaults={'nome': nome, 'carga_horaria': carga},
+            )
+
+    @transaction.atomic
+    def _criar_acervo(self, options):
+        self.stdout.write('\n--- Acervo ---')
+        total_obras = options['obras']
+        if not total_obras:
+            self.stdout.write('  Nenhuma obra solicitada.')
+            return
+        if Obra.objects.filter(isbn=_isbn(0)).exists():
+            self.stdout.write('  Acervo sintetico ja existe (pulado).')
+            return
+
+        rng = random.Random(f'{options["seed"]}-acervo')
+        lote = options['lote']
+        autores = Autor.objects.bulk_create([
+            Autor(nome=_nome(rng)) for _ in range(max(1, total_obras // 5))
+        ], batch_size=lote)
+        editoras = Editora.objects.bulk_create([
+            Editora(nome=f'Editora {rng.choice(SOBRENOMES)} {i + 1}')
+            for i in range(max(1, total_obras // 100))
+        ], batch_size=lote)
+        assuntos = []
+        for nome in ASSUNTOS:
+            assunto, _ = Assunto.objects.get_or_create(nome=nome)
+            assuntos.append(assunto)
+
+        obras = Obra.objects.bulk_create([
+            Obra(
+                titulo=(
+                    f'{rng.choice(PALAVRAS_TITULO)} '
+                    f'{rng.choice(("do", "da", "de"))} '
+                    f'{rng.choice(PALAVRAS_TITULO)} {i + 1}'
+                ),
+                isbn=_isbn(i),
+                ano_publicacao=rng.randint(1950, options['ano_atual']),
+                editora=rng.choice(editoras),
+                assunto=rng.choice(assuntos),
+            )
+            for i in range(total_obras)
+        ], batch_size=lote)
+        Obra.autores.through.objects.bulk_create([
+            Obra.autores.through(obra=obra, autor=autor)
+            for obra in obras
+            for autor in rng.sample(autores, min(len(autores), rng.choice((1, 1, 2))))
+        ], batch_size=lote)
+        codigo = itertools.count()
+        exemplares = Exemplar.objects.bulk_create([
+            Exemplar(
+                obra=obra,
+                codigo_patrimonio=f'SE-{next(codigo):07d}',
+                estado_fisico=rng.choice(Exemplar.EstadoFisico.values),
+            )
+            for obra in obras
+            for _ in range(options['exemplares_por_obra'])
+        ], batch_size=lote)
+        self.stdout.write(self.style.SUCCESS(
+            f'  {len(obras)} obra(s), {len(exemplares)} exemplar(es), '
+            f'{len(autores)} autor(es), {len(editoras)} editora(s)'
+        ))
+
+    def _finalizar_acervo(self):
+        """Situacao dos exemplares, contadores das obras e indice de busca."""
+        self.stdout.write('\n--- Acervo: situacao, contadores e indice ---')
+        with transaction.atomic():
+            em_aberto = Exemplar.objects.filter(
+                codigo_patrimonio__startswith='SE-',
+                emprestimos__status__in=[
+                    Emprestimo.Status.ATIVO, Emprestimo.Status.ATRASADO,
+                ],
+            )
+            emprestados = Exemplar.objects.filter(pk__in=em_aberto.values('pk')).update(
+                situacao=Exemplar.Situacao.EMPRESTADO,
+            )
+            obras = BibliotecaService.recalcular_contadores_obras()
+        indexadas = CatalogoService.indexar_obras()
+        self.stdout.write(
+            f'  {emprestados} exemplar(es) emprestado(s), {obras} obra(s) '
+            f'recalculada(s), {indexadas} obra(s) indexada(s)'
+        )
@@ -0,0 +1,227 @@
+"""
+Management command para verificar a validacao dos cursores de paginacao.
+
+Uso:
+    python manage.py verificar_cursores
+    python manage.py verificar_cursores --somente library.emprestimo
+
+Envia cursores adulterados a todas as listas paginadas por cursor
+(core.paginacao): a API do acervo (obras e exemplares), o historico de
+matriculas da turma e as changelists do admin com PaginacaoKeysetMixin.
+Um cursor invalido deve ser recusado — 400 nas views, redirecionamento
+para ?e=1 no admin — e nunca virar erro 500 na consulta.
+
+Cursores enviados a cada lista:
+    - malformados: base64 invalido, JSON que nao e lista, tamanho errado
+    - com todos os valores nulos ou do tipo errado (texto, objeto,
+      lista, data invalida): sempre recusados, a pk nao os aceita
+    - validos com um valor trocado por vez: aceitos ou recusados
+      conforme o campo, mas nunca 500
+    - um cursor valido (primeiro registro da lista), que deve responder 200
+
+Caracteristicas:
+    - Nao altera o banco: roda numa transacao desfeita ao final (so cria
+      o usuario do admin usado nas requisicoes)
+    - Falha (exit code != 0) se algum cursor invalido for aceito ou
+      alguma requisicao responder com erro 500
+"""
+
+import base64
+import json
+import logging
+
+from django.conf import settings
+from django.contrib import admin
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import Client, RequestFactory
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from academic.models import Matricula
+from academic.views.turma_views import ORDENACAO_HISTORICO
+from accounts.models import Usuario
+from core.admin_mixins import ANTES_VAR, APOS_VAR, PaginacaoKeysetMixin
+from core.paginacao import codificar_cursor
+from library.models import Exemplar, Obra
+from library.views.acervo_views import ORDENACAO_EXEMPLAR, ORDENACAO_OBRA
+
+
+# Valores que nenhuma pk aceita
+VALORES_INVALIDOS = (None, 'abc', {'a': 1}, [1], 'nao-data')
+
+
+class _Desfazer(Exception):
+    """Sinaliza o fim da verificacao para desfazer a transacao."""
+
+
+def _cursor_bruto(texto):
+    return base64.urlsafe_b64encode(texto.encode()).decode().rstrip('=')
+
+
+def _cursores(validos):
+    """(descricao, cursor, sempre_recusado) para uma lista de n campos."""
+    tamanho = len(validos)
+    cursores = [
+        ('base64 invalido', '!!!', True),
+        ('JSON que nao e lista', _cursor_bruto('{"a":1}'), True),
+        ('tamanho errado', codificar_cursor(validos + [1]), True),
+    ]
+    for valor in VALORES_INVALIDOS:
+        cursores.append((
+            f'todos {json.dumps(valor)}',
+            codificar_cursor([valor] * tamanho),
+            True,
+        ))
+    for posicao in range(tamanho):
+        for valor in VALORES_INVALIDOS:
+            trocados = list(validos)
+            trocados[posicao] = valor
+            cursores.append((
+                f'posicao {posicao} = {json.dumps(valor)}',
+                codificar_cursor(trocados),
+                posicao == tamanho - 1,
+            ))
+    return cursores
+
+
+def _valores(objeto, ordenacao):
+    return [getattr(objeto, campo.lstrip('-')) for campo in ordenacao]
+
+
+def _listas(somente):
+    """(nome, url, parametro, valores validos, recusa) de cada lista."""
+    listas = []
+    if not somente:
+        obra = Obra.objects.filter(ativa=True).order_by('titulo', 'pk').first()
+        if obra is not None:
+            listas.append((
+                'api:obras', reverse('library:api_obras'), 'cursor',
+                _valores(obra, ORDENACAO_OBRA), 'status',
+            ))
+        exemplar = Exemplar.objects.filter(
+            ativo=True, obra__ativa=True,
+        ).order_by('obra_id', 'codigo_patrimonio', 'pk').first()
+        if exemplar is not None:
+            listas.append((
+                'api:exemplares',
+                reverse('library:api_exemplares', args=[exemplar.obra_id]),
+                'cursor', _valores(exemplar, ORDENACAO_EXEMPLAR), 'status',
+            ))
+        matricula = Matricula.objects.exclude(
+            status=Matricula.Status.ATIVA,
+        ).order_by('pk').first()
+        if matricula is not None:
+            listas.append((
+                'academic:historico_turma',
+                reverse('academic:historico_turma', args=[matricula.turma_id]),
+                'cursor', _valores(matricula, ORDENACAO_HISTORICO), 'status',
+            ))
+
+    requisicao = RequestFactory().get('/')
+    for model, model_admin in admin.site._registry.items():
+        opts = model._meta
+        chave = f'{opts.app_label}.{opts.model_name}'
+        if not isinstance(model_admin, PaginacaoKeysetMixin):
+            continue
+        if somente and chave not in somente:
+            continue
+        ordenacao = model_admin.ordenacao_keyset(requisicao)
+        objeto = model._default_manager.order_by(*ordenacao).first()
+        if objeto is None:
+            continue
+        url = reverse(f'admin:{opts.app_label}_{opts.model_name}_changelist')
+        for parametro in (APOS_VAR, ANTES_VAR):
+            listas.append((
+                f'{chave}:{parametro}', url, parametro,
+                _valores(objeto, ordenacao), 'admin',
+            ))
+    return listas
+
+
+def _recusado(resposta, recusa):
+    if recusa == 'admin':
+        return resposta.status_code == 302 and 'e=1' in resposta['Location']
+    return resposta.status_code == 400
+
+
+class Command(BaseCommand):
+    help = (
+        'Envia cursores adulterados as listas paginadas por cursor e '
+        'falha se algum for aceito ou causar erro 500.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--somente',
+            action='append',
+            default=[],
+            metavar='APP.MODEL',
+            help='Verifica apenas a changelist do model informado (repetivel).',
+        )
+
+    def handle(self, *args, **options):
+        falhas = []
+        try:
+            with transaction.atomic():
+                falhas = self._executar(set(options['somente']))
+                raise _Desfazer
+        except _Desfazer:
+            pass
+
+        self.stdout.write('')
+        if falhas:
+            for falha in falhas:
+                self.stdout.write(self.style.ERROR(f'  {falha}'))
+            raise CommandError(f'{len(falhas)} cursor(es) com resposta incorreta.')
+        self.stdout.write(self.style.SUCCESS(
+            'Todos os cursores invalidos foram recusados sem erro 500.'
+        ))
+
+    def _executar(self, somente):
+        usuario = Usuario.objects.create(
+            username='__verificar_cursores__',
+            is_staff=True,
+            is_superuser=True,
+            password='!',
+        )
+        cliente = Client(raise_request_exception=False)
+        cliente.force_login(usuario)
+
+        falhas = []
+        # Cada cursor recusado geraria um aviso "Bad Request" no log
+        logger = logging.getLogger('django.request')
+        nivel = logger.level
+        logger.setLevel(logging.ERROR)
+        try:
+            self._verificar(cliente, somente, falhas)
+        finally:
+            logger.setLevel(nivel)
+        return falhas
+
+    def _verificar(self, cliente, somente, falhas):
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+            for nome, url, parametro, validos, recusa in _listas(somente):
+                validos = json.loads(json.dumps(validos, default=str))
+                enviados = 0
+
+                resposta = cliente.get(url, {parametro: codificar_cursor(validos)})
+                if resposta.status_code != 200:
+                    falhas.append(
+                        f'{nome}: cursor valido -> {resposta.status_code}'
+                    )
+
+                for descricao, cursor, sempre_recusado in _cursores(validos):
+                    resposta = cliente.get(url, {parametro: cursor})
+                    enviados += 1
+                    if resposta.status_code >= 500:
+                        falhas.append(
+                            f'{nome}: {descricao} -> {resposta.status_code}'
+                        )
+                    elif sempre_recusado and not _recusado(resposta, recusa):
+                        falhas.append(
+                            f'{nome}: {descricao} aceito '
+                            f'({resposta.status_code})'
+                        )
+
+                self.stdout.write(f'  {nome}: {enviados} cursor(es) invalido(s)')
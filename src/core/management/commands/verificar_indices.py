@@ -0,0 +1,395 @@
+"""
+Management command para verificar se as consultas dos repositories usam indices.
+
+Uso:
+    python manage.py verificar_indices
+    python manage.py verificar_indices --linhas-minimas 10000 --planos
+    python manage.py verificar_indices --somente AlunoRepository.listar_ativos \\
+        --saida verificacao-indices.json
+
+Executa cada metodo publico dos repositories (<app>.repositories) com
+argumentos de exemplo tirados do proprio banco, captura as consultas
+geradas (querysets sao avaliados como a primeira pagina, --limite
+linhas) e roda EXPLAIN em cada uma. Falha se alguma consulta fizer
+varredura sequencial (PostgreSQL: Seq Scan; SQLite: SCAN sem indice)
+em uma tabela com pelo menos --linhas-minimas linhas.
+
+Rodar depois de um seed_escala: em tabelas pequenas o planejador
+prefere a varredura sequencial mesmo com o indice certo, e o resultado
+nao diz nada. Os planos do SQLite sao apenas indicativos; a referencia
+e o PostgreSQL.
+
+Caracteristicas:
+    - Somente leitura: as consultas rodam no banco primario (default),
+      sem passar pela replica nem pelos caches de dados de referencia
+    - Metodos com um parametro sem exemplo conhecido sao ignorados (e
+      listados); metodos async sao ignorados (usam as mesmas consultas)
+    - VARREDURAS_ESPERADAS lista as consultas que leem a tabela inteira
+      por natureza, com o motivo
+    - Falha (exit code != 0) com --sem-falha desligado; o relatorio e
+      gravado antes
+"""
+
+import importlib
+import inspect
+import json
+import re
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Count, QuerySet
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from academic.models import AnoLetivo, Turma
+from accounts.models import Usuario
+from core.models import Escola
+from core.replicas import primario
+from library.models import Assunto, Autor, Exemplar, Obra
+from people.models import Aluno, Funcionario, Pessoa, Professor, Responsavel
+
+
+# Consultas que leem a tabela inteira por natureza: 'Classe.metodo' -> motivo
+VARREDURAS_ESPERADAS = {
+    'ObraRepository.versao_acervo': (
+        'agrega (count/max) todas as obras ativas; no PostgreSQL vira '
+        'Index Only Scan em obra_ativa_titulo_idx com o visibility map em dia'
+    ),
+}
+
+_PADROES_VARREDURA = {
+    # "Seq Scan on library_obra u0" / "Parallel Seq Scan on ..."
+    'postgresql': re.compile(r'Seq Scan on (\w+)'),
+    # "SCAN library_obra" ou "SCAN U0"; "SCAN x USING INDEX" percorre o indice
+    'sqlite': re.compile(
+        r'\bSCAN (\w+)\b(?! USING (?:COVERING )?INDEX)(?! VIRTUAL TABLE)'
+    ),
+}
+
+
+# ─────────────────────────────────────────────────────────────
+# Argumentos de exemplo
+# ─────────────────────────────────────────────────────────────
+
+def _primeiro(queryset):
+    return queryset.order_by('pk').first()
+
+
+def _com_mais(model, relacao):
+    """Registro com mais filhos em `relacao` (caso mais pesado)."""
+    return model.objects.annotate(
+        _filhos=Count(relacao),
+    ).order_by('-_filhos', 'pk').first()
+
+
+def _atributo(obter, nome):
+    def valor():
+        objeto = obter()
+        return getattr(objeto, nome) if objeto is not None else None
+    return valor
+
+
+EXEMPLOS = {
+    'turma': lambda: _com_mais(Turma, 'alunos_matriculados'),
+    'turma_id': _atributo(lambda: _com_mais(Turma, 'matriculas'), 'pk'),
+    'faixa_alunos': lambda: (0, 50),
+    'faixa_matriculas': lambda: (0, 50),
+    'aluno': lambda: _com_mais(Aluno, 'emprestimos'),
+    'obra': lambda: _com_mais(Obra, 'exemplares'),
+    'obra_id': _atributo(lambda: _com_mais(Obra, 'exemplares'), 'pk'),
+    'obra_ids': lambda: list(
+        Obra.objects.order_by('pk').values_list('pk', flat=True)[:25]
+    ),
+    'autor': lambda: _com_mais(Autor, 'obras'),
+    'assunto': lambda: _com_mais(Assunto, 'obras'),
+    'ano_letivo': lambda: _primeiro(AnoLetivo.objects.filter(ativo=True))
+    or _primeiro(AnoLetivo.objects.all()),
+    'escola': lambda: _primeiro(Escola.objects.all()),
+    'professor': lambda: _primeiro(Professor.objects.all()),
+    'responsavel': lambda: _primeiro(Responsavel.objects.all()),
+    'pessoa': lambda: _primeiro(Pessoa.objects.all()),
+    'papel': _atributo(lambda: _primeiro(Usuario.objects.all()), 'papel'),
+    'username': _atributo(lambda: _primeiro(Usuario.objects.all()), 'username'),
+    'setor': _atributo(
+        lambda: _primeiro(Funcionario.objects.exclude(setor='')), 'setor',
+    ),
+    'cnpj': _atributo(lambda: _primeiro(Escola.objects.all()), 'cnpj'),
+    'cpf': _atributo(lambda: _primeiro(Pessoa.objects.all()), 'cpf'),
+    'matricula': _atributo(lambda: _primeiro(Aluno.objects.all()), 'matricula'),
+    'isbn': _atributo(lambda: _primeiro(Obra.objects.exclude(isbn='')), 'isbn'),
+    'codigo': lambda: 'VERIFICAR-INDICES',
+    'codigo_patrimonio': _atributo(
+        lambda: _primeiro(Exemplar.objects.all()), 'codigo_patrimonio',
+    ),
+    'nome': lambda: 'silva',
+    'q': lambda: 'historia',
+    'campos': lambda: ('id',),
+}
+
+
+class _Exemplos:
+    """Calcula cada argumento de exemplo uma vez."""
+
+    def __init__(self):
+        self._valores = {}
+
+    def obter(self, nome):
+        if nome not in self._valores:
+            self._valores[nome] = EXEMPLOS[nome]()
+        return self._valores[nome]
+
+
+# ─────────────────────────────────────────────────────────────
+# Repositories
+# ─────────────────────────────────────────────────────────────
+
+def _repositories():
+    """(nome 'Classe.metodo', funcao) de todos os repositories do projeto."""
+    raiz = str(settings.SRC_DIR)
+    metodos = []
+    for app_config in apps.get_app_configs():
+        if not app_config.path.startswith(raiz):
+            continue
+        try:
+            modulo = importlib.import_module(f'{app_config.name}.repositories')
+        except ModuleNotFoundError:
+            continue
+        for nome_classe in getattr(modulo, '__all__', ()):
+            classe = getattr(modulo, nome_classe)
+            for nome, atributo in vars(classe).items():
+                if nome.startswith('_') or not isinstance(atributo, staticmethod):
+                    continue
+                # Sem o cache de dados de referencia (@dado_de_referencia)
+                funcao = inspect.unwrap(atributo.__func__)
+                metodos.append((f'{nome_classe}.{nome}', funcao))
+    return metodos
+
+
+def _argumentos(funcao, exemplos):
+    """kwargs de exemplo, ou (None, parametro sem exemplo)."""
+    argumentos = {}
+    for parametro in inspect.signature(funcao).parameters.values():
+        if parametro.default is not inspect.Parameter.empty:
+            continue
+        if parametro.name not in EXEMPLOS:
+            return None, parametro.name
+        valor = exemplos.obter(parametro.name)
+        if valor is None:
+            return None, parametro.name
+        argumentos[parametro.name] = valor
+    return argumentos, None
+
+
+# ─────────────────────────────────────────────────────────────
+# EXPLAIN
+# ─────────────────────────────────────────────────────────────
+
+def _explicar(conexao, sql):
+    with conexao.cursor() as cursor:
+        if conexao.vendor == 'sqlite':
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            return '\n'.join(str(linha[-1]) for linha in cursor.fetchall())
+        cursor.execute(f'EXPLAIN {sql}')
+        return '\n'.join(linha[0] for linha in cursor.fetchall())
+
+
+def _apelidos(sql):
+    """{apelido: tabela} dos aliases gerados pelo ORM ("tabela" U0)."""
+    return {
+        apelido: tabela
+        for tabela, apelido in re.findall(r'"(\w+)" ([A-Z]\d+)\b', sql)
+    }
+
+
+class _TamanhoTabelas:
+    """Numero de linhas (estimado no PostgreSQL) de cada tabela."""
+
+    def __init__(self, conexao):
+        self.conexao = conexao
+        self._tabelas = None
+        self._linhas = {}
+
+    def linhas(self, tabela):
+        if self._tabelas is None:
+            self._tabelas = set(self.conexao.introspection.table_names())
+        if tabela not in self._tabelas:
+            # Nao e tabela (ex: "SCAN CONSTANT ROW" do SQLite)
+            return 0
+        if tabela not in self._linhas:
+            self._linhas[tabela] = self._contar(tabela)
+        return self._linhas[tabela]
+
+    def _contar(self, tabela):
+        with self.conexao.cursor() as cursor:
+            if self.conexao.vendor == 'postgresql':
+                cursor.execute(
+                    'SELECT reltuples FROM pg_class WHERE relname = %s', [tabela],
+                )
+                linha = cursor.fetchone()
+                # -1: nunca analisada (ou tabela particionada)
+                if linha and linha[0] >= 0:
+                    return int(linha[0])
+            cursor.execute(
+                f'SELECT COUNT(*) FROM {self.conexao.ops.quote_name(tabela)}'
+            )
+            return cursor.fetchone()[0]
+
+
+class Command(BaseCommand):
+    help = (
+        'Roda EXPLAIN nas consultas de cada metodo dos repositories e '
+        'falha se alguma fizer varredura sequencial em tabela grande.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--linhas-minimas',
+            type=int,
+            default=5000,
+            help='Tamanho a partir do qual uma varredura sequencial e falha '
+                 '(padrao: 5000).',
+        )
+        parser.add_argument(
+            '--limite',
+            type=int,
+            default=25,
+            help='Linhas lidas de cada queryset, como uma pagina (padrao: 25).',
+        )
+        parser.add_argument(
+            '--somente',
+            action='append',
+            default=[],
+            metavar='CLASSE.METODO',
+            help='Verifica apenas o metodo informado (repetivel).',
+        )
+        parser.add_argument(
+            '--planos',
+            action='store_true',
+            help='Mostra o plano de cada consulta.',
+        )
+        parser.add_argument(
+            '--saida',
+            help='Grava o relatorio JSON neste arquivo.',
+        )
+        parser.add_argument(
+            '--sem-falha',
+            action='store_true',
+            help='Nao falha quando houver varreduras sequenciais.',
+        )
+
+    def handle(self, *args, **options):
+        conexao = connections[DEFAULT_DB_ALIAS]
+        if conexao.vendor not in _PADROES_VARREDURA:
+            raise CommandError(
+                f'Banco {conexao.vendor} nao suportado (PostgreSQL ou SQLite).'
+            )
+
+        with primario():
+            relatorio = self._verificar(conexao, options)
+
+        if options['saida']:
+            with open(options['saida'], 'w', encoding='utf-8') as arquivo:
+                json.dump(relatorio, arquivo, ensure_ascii=False, indent=2)
+            self.stdout.write(f'Relatorio gravado em {options["saida"]}.')
+
+        falhas = [m for m in relatorio['metodos'] if m['varreduras']]
+        self.stdout.write('')
+        if relatorio['ignorados']:
+            self.stdout.write(
+                f'{len(relatorio["ignorados"])} metodo(s) ignorado(s) '
+                f'(sem argumento de exemplo).'
+            )
+        if not falhas:
+            self.stdout.write(self.style.SUCCESS(
+                f'{len(relatorio["metodos"])} metodo(s) verificado(s), nenhuma '
+                f'varredura sequencial em tabela com {options["linhas_minimas"]} '
+                f'linha(s) ou mais.'
+            ))
+            return
+
+        mensagem = (
+            f'{len(falhas)} metodo(s) com varredura sequencial: '
+            f'{", ".join(m["metodo"] for m in falhas)}.'
+        )
+        if options['sem_falha']:
+            self.stdout.write(self.style.WARNING(mensagem))
+            return
+        raise CommandError(mensagem)
+
+    def _verificar(self, conexao, options):
+        padrao = _PADROES_VARREDURA[conexao.vendor]
+        tamanhos = _TamanhoTabelas(conexao)
+        exemplos = _Exemplos()
+        somente = set(options['somente'])
+        resultados = []
+        ignorados = []
+
+        for nome, funcao in _repositories():
+            if somente and nome not in somente:
+                continue
+            if inspect.iscoroutinefunction(funcao):
+                continue
+            argumentos, faltando = _argumentos(funcao, exemplos)
+            if argumentos is None:
+                ignorados.append({'metodo': nome, 'parametro': faltando})
+                self.stdout.write(f'  {nome}: ignorado (sem exemplo para "{faltando}")')
+                continue
+
+            with CaptureQueriesContext(conexao) as capturadas:
+                resultado = funcao(**argumentos)
+                if isinstance(resultado, QuerySet):
+                    if not resultado.query.is_sliced:
+                        resultado = resultado[:options['limite']]
+                    list(resultado)
+
+            consultas = []
+            varreduras = []
+            for capturada in capturadas.captured_queries:
+                sql = capturada['sql']
+                if not sql.lstrip().upper().startswith('SELECT'):
+                    continue
+                plano = _explicar(conexao, sql)
+                apelidos = _apelidos(sql)
+                grandes = sorted({
+                    tabela
+                    for tabela in (
+                        apelidos.get(nome_plano, nome_plano)
+                        for nome_plano in padrao.findall(plano)
+                    )
+                    if tamanhos.linhas(tabela) >= options['linhas_minimas']
+                })
+                consultas.append({'sql': sql, 'plano': plano, 'varreduras': grandes})
+                varreduras.extend(grandes)
+                if options['planos']:
+                    self.stdout.write(f'  {nome}:\n    {sql}\n    ' + plano.replace('\n', '\n    '))
+
+            esperada = VARREDURAS_ESPERADAS.get(nome)
+            if esperada:
+                varreduras = []
+            varreduras = sorted(set(varreduras))
+            resultados.append({
+                'metodo': nome,
+                'consultas': consultas,
+                'varreduras': varreduras,
+                'esperada': esperada,
+            })
+
+            if varreduras:
+                self.stdout.write(self.style.WARNING(
+                    f'  {nome}: varredura sequencial em {", ".join(varreduras)}'
+                ))
+            else:
+                observacao = ' (varredura esperada)' if esperada else ''
+                self.stdout.write(
+                    f'  {nome}: {len(consultas)} consulta(s), ok{observacao}'
+                )
+
+        return {
+            'gerado_em': timezone.now().isoformat(),
+            'banco': conexao.vendor,
+            'linhas_minimas': options['linhas_minimas'],
+            'metodos': resultados,
+            'ignorados': ignorados,
+        }
@@ -0,0 +1,120 @@
+"""
+core.metricas
+
+Metricas de acesso ao banco por request.
+
+MetricasBancoMiddleware mede, para cada request:
+
+- conexao_ms: tempo para obter a conexao do 'default' (do pool, ou uma
+  conexao nova sem pool)
+- consultas: numero de consultas SQL (todos os aliases)
+- db_ms: tempo total gasto nas consultas
+- total_ms: tempo total do request
+
+e acumula os valores por view em AGREGADO (em memoria, por processo),
+consultavel em /admin/metricas/banco/. Com METRICAS_BANCO_HEADERS
+(padrao: DEBUG), os valores tambem vao nos headers da resposta
+(Server-Timing e X-DB-Consultas).
+
+Respostas em streaming (exportacoes) sao medidas ate o inicio do
+streaming: as consultas feitas durante a iteracao nao entram.
+"""
+
+import threading
+import time
+from contextlib import ExitStack
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class MedicaoRequest:
+    """Contadores de um request; usado como execute_wrapper."""
+
+    def __init__(self):
+        self.conexao_ms = 0.0
+        self.consultas = 0
+        self.db_ms = 0.0
+        self.total_ms = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.consultas += 1
+            self.db_ms += (time.perf_counter() - inicio) * 1000
+
+    def medir_conexao(self, alias=DEFAULT_DB_ALIAS):
+        """Obtem a conexao do alias (se ainda nao aberta) medindo o tempo."""
+        conexao = connections[alias]
+        if conexao.connection is not None:
+            return
+        inicio = time.perf_counter()
+        conexao.ensure_connection()
+        self.conexao_ms += (time.perf_counter() - inicio) * 1000
+
+    def medir_consultas(self):
+        """Context manager que instala a medicao em todos os aliases."""
+        pilha = ExitStack()
+        for alias in connections:
+            pilha.enter_context(connections[alias].execute_wrapper(self))
+        return pilha
+
+    def como_dict(self):
+        return {
+            'conexao_ms': round(self.conexao_ms, 2),
+            'consultas': self.consultas,
+            'db_ms': round(self.db_ms, 2),
+            'total_ms': round(self.total_ms, 2),
+        }
+
+
+class Agregado:
+    """Soma, maximo e numero de requests por view (thread-safe)."""
+
+    CAMPOS = ('conexao_ms', 'consultas', 'db_ms', 'total_ms')
+
+    def __init__(self):
+        self._trava = threading.Lock()
+        self._por_view = {}
+        self.desde = time.time()
+
+    def registrar(self, view, medicao):
+        valores = medicao.como_dict()
+        with self._trava:
+            estatistica = self._por_view.setdefault(view, {
+                'requests': 0,
+                **{f'{campo}_soma': 0 for campo in self.CAMPOS},
+                **{f'{campo}_max': 0 for campo in self.CAMPOS},
+            })
+            estatistica['requests'] += 1
+            for campo in self.CAMPOS:
+                estatistica[f'{campo}_soma'] += valores[campo]
+                estatistica[f'{campo}_max'] = max(
+                    estatistica[f'{campo}_max'], valores[campo],
+                )
+
+    def resumo(self):
+        """{view: {requests, <campo>_media, <campo>_max}}, mais lentas primeiro."""
+        with self._trava:
+            copia = {view: dict(e) for view, e in self._por_view.items()}
+        resumo = {}
+        for view, estatistica in copia.items():
+            requests = estatistica['requests']
+            resumo[view] = {'requests': requests}
+            for campo in self.CAMPOS:
+                resumo[view][f'{campo}_media'] = round(
+                    estatistica[f'{campo}_soma'] / requests, 2,
+                )
+                resumo[view][f'{campo}_max'] = estatistica[f'{campo}_max']
+        return dict(sorted(
+            resumo.items(), key=lambda item: -item[1]['db_ms_media'],
+        ))
+
+    def zerar(self):
+        with self._trava:
+            self._por_view.clear()
+            self.desde = time.time()
+
+
+AGREGADO = Agregado()
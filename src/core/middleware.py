@@ -0,0 +1,169 @@
+"""
+core.middleware
+
+Middlewares do projeto AQNUS.
+"""
+
+import time
+from contextlib import ExitStack, contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.urls import Resolver404, resolve
+
+from core import replicas
+from core.metricas import AGREGADO, MedicaoRequest
+
+
+# Views do admin que so leem: rodam em leitura() (replica)
+VIEWS_ADMIN_LEITURA = ('autocomplete',)
+SUFIXO_CHANGELIST = '_changelist'
+
+# Chave da sessao com o instante (time.time()) da ultima escrita
+CHAVE_SESSAO_ESCRITA = '_replicas_ultima_escrita'
+
+
+class ReplicaLeituraMiddleware:
+    """
+    Aplica o roteamento de core.replicas a cada request.
+
+    - Restaura da sessao o instante da ultima escrita do usuario, para
+      que a janela apos escrita mantenha as leituras no primario ao
+      longo dos proximos requests; grava-o de volta se o request
+      escreveu.
+    - Executa changelists e autocompletes do admin (GET/HEAD) dentro de
+      replicas.leitura().
+
+    Deve ficar depois do SessionMiddleware. Sem replica configurada nao
+    faz nada. Funciona em WSGI e ASGI.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.assincrono = iscoroutinefunction(get_response)
+        if self.assincrono:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.assincrono:
+            return self.__acall__(request)
+        if replicas.alias_replica() is None:
+            return self.get_response(request)
+
+        anterior = self._escrita_da_sessao(request)
+        with self._roteamento(request, anterior):
+            response = self.get_response(request)
+            instante = replicas.ultima_escrita()
+        if instante != anterior and hasattr(request, 'session'):
+            request.session[CHAVE_SESSAO_ESCRITA] = instante
+        return response
+
+    async def __acall__(self, request):
+        if replicas.alias_replica() is None:
+            return await self.get_response(request)
+
+        anterior = None
+        if settings.SESSION_COOKIE_NAME in request.COOKIES:
+            anterior = await request.session.aget(CHAVE_SESSAO_ESCRITA)
+        with self._roteamento(request, anterior):
+            response = await self.get_response(request)
+            instante = replicas.ultima_escrita()
+        if instante != anterior and hasattr(request, 'session'):
+            await request.session.aset(CHAVE_SESSAO_ESCRITA, instante)
+        return response
+
+    @contextmanager
+    def _roteamento(self, request, anterior):
+        token = replicas.restaurar_ultima_escrita(anterior)
+        try:
+            with ExitStack() as pilha:
+                if self._view_de_leitura(request):
+                    pilha.enter_context(replicas.leitura())
+                yield
+        finally:
+            replicas.resetar_ultima_escrita(token)
+
+    @staticmethod
+    def _view_de_leitura(request):
+        if request.method not in ('GET', 'HEAD'):
+            return False
+        try:
+            match = resolve(request.path_info, getattr(request, 'urlconf', None))
+        except Resolver404:
+            return False
+        if match.namespace != 'admin':
+            return False
+        nome = match.url_name or ''
+        return nome in VIEWS_ADMIN_LEITURA or nome.endswith(SUFIXO_CHANGELIST)
+
+    @staticmethod
+    def _escrita_da_sessao(request):
+        # So le a sessao se ela ja existe (evita consulta em paginas publicas)
+        if settings.SESSION_COOKIE_NAME not in request.COOKIES:
+            return None
+        session = getattr(request, 'session', None)
+        return session.get(CHAVE_SESSAO_ESCRITA) if session is not None else None
+
+
+class MetricasBancoMiddleware:
+    """
+    Mede conexao, consultas e tempo de banco de cada request (ver
+    core.metricas) e acumula por view.
+
+    Deve ser o primeiro da lista, para medir tambem as consultas dos
+    outros middlewares (sessao, usuario). Em ASGI a medicao e instalada
+    na thread em que o ORM assincrono executa as consultas do request.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.headers = getattr(settings, 'METRICAS_BANCO_HEADERS', settings.DEBUG)
+        self.assincrono = iscoroutinefunction(get_response)
+        if self.assincrono:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.assincrono:
+            return self.__acall__(request)
+        medicao = MedicaoRequest()
+        inicio = time.perf_counter()
+        medicao.medir_conexao()
+        with medicao.medir_consultas():
+            response = self.get_response(request)
+        medicao.total_ms = (time.perf_counter() - inicio) * 1000
+        return self._registrar(request, response, medicao)
+
+    async def __acall__(self, request):
+        medicao = MedicaoRequest()
+        inicio = time.perf_counter()
+        pilha = await sync_to_async(self._instalar)(medicao)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(pilha.close)()
+        medicao.total_ms = (time.perf_counter() - inicio) * 1000
+        return self._registrar(request, response, medicao)
+
+    @staticmethod
+    def _instalar(medicao):
+        medicao.medir_conexao()
+        return medicao.medir_consultas()
+
+    def _registrar(self, request, response, medicao):
+        match = request.resolver_match
+        AGREGADO.registrar(match.view_name if match else '(sem view)', medicao)
+        if self.headers:
+            valores = medicao.como_dict()
+            response['Server-Timing'] = (
+                f'conexao;dur={valores["conexao_ms"]}, '
+                f'db;dur={valores["db_ms"]};desc="{valores["consultas"]} consultas", '
+                f'total;dur={valores["total_ms"]}'
+            )
+            response['X-DB-Consultas'] = str(valores['consultas'])
+        return response
@@ -14,7 +14,13 @@ class ModeloBase(models.Model):
     Campos:
         criado_em: data/hora de criação do registro (preenchido automaticamente)
         atualizado_em: data/hora da última atualização (atualizado automaticamente)
+
+    Atributos:
+        relacionados_str: FKs seguidas pelo __str__ do model. Usado pelo
+            ConsultaOtimizadaMixin para montar o select_related do admin.
     """
+    relacionados_str = ()
+
     criado_em = models.DateTimeField('criado em', auto_now_add=True)
     atualizado_em = models.DateTimeField('atualizado em', auto_now=True)
 
@@ -0,0 +1,244 @@
+"""
+core.paginacao
+
+Paginacao por cursor (keyset) e contagem estimada, para as APIs JSON e
+as changelists grandes do admin (ver core.admin_mixins).
+
+Em vez de OFFSET (que le e descarta todas as linhas anteriores, e
+"pula" ou repete registros quando a lista muda entre as paginas), a
+pagina seguinte e pedida a partir dos valores de ordenacao do ultimo
+item recebido: WHERE (titulo, id) > (:titulo, :id) ORDER BY titulo, id
+LIMIT n. Com um indice na ordenacao, o custo de cada pagina independe
+da posicao.
+
+O cursor devolvido ao cliente e opaco: os valores de ordenacao em JSON,
+codificados em base64 (URL-safe).
+
+Uso:
+    ordenacao = ('titulo', 'pk')
+    pagina = paginar(queryset, ordenacao, request.GET.get('cursor'), 50)
+    pagina.itens, pagina.proximo_cursor
+
+Campos com '-' na ordenacao sao decrescentes (ex: ('-data', '-id')).
+Os campos nao podem ser nulos (NULL nao se compara com > / <). Os
+valores do cursor sao convertidos pelos campos da ordenacao
+(to_python/get_prep_value): cursor com null ou com valor do tipo errado
+gera CursorInvalido, nunca um erro na consulta.
+
+estimar_contagem(queryset) le a quantidade de linhas das estatisticas do
+planner do PostgreSQL (pg_class.reltuples sem filtros; estimativa do
+EXPLAIN com filtros), sem percorrer a tabela como o COUNT(*).
+"""
+
+import base64
+import binascii
+import json
+from collections import namedtuple
+
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.db.models import Q
+from django.db.models.constants import LOOKUP_SEP
+
+
+class CursorInvalido(ValueError):
+    """Cursor malformado ou incompativel com a ordenacao."""
+
+
+def codificar_cursor(valores):
+    texto = json.dumps(list(valores), separators=(',', ':'), default=str)
+    return base64.urlsafe_b64encode(texto.encode()).decode().rstrip('=')
+
+
+def decodificar_cursor(cursor, tamanho):
+    """Valores de ordenacao do cursor; CursorInvalido se malformado."""
+    try:
+        preenchido = cursor + '=' * (-len(cursor) % 4)
+        valores = json.loads(base64.urlsafe_b64decode(preenchido.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as erro:
+        raise CursorInvalido('Cursor invalido.') from erro
+    if not isinstance(valores, list) or len(valores) != tamanho:
+        raise CursorInvalido('Cursor invalido.')
+    return valores
+
+
+def _campo_e_direcao(campo):
+    """('-data') -> ('data', True): nome do campo e se e decrescente."""
+    return campo.lstrip('-'), campo.startswith('-')
+
+
+def _campo_ordenacao(queryset, nome):
+    """Field do model (ou output_field da anotacao) ordenado por `nome`."""
+    if nome in queryset.query.annotations:
+        return queryset.query.annotations[nome].output_field
+    opts = queryset.model._meta
+    for parte in nome.split(LOOKUP_SEP):
+        campo = opts.pk if parte == 'pk' else opts.get_field(parte)
+        if campo.is_relation:
+            opts = campo.related_model._meta
+            campo = campo.target_field
+    return campo
+
+
+def valores_do_cursor(queryset, ordenacao, cursor):
+    """
+    Valores do cursor convertidos pelos campos da ordenacao.
+
+    Cada valor passa pelo to_python e pelo get_prep_value do seu campo.
+    null, texto num campo inteiro, data invalida ou objeto JSON geram
+    CursorInvalido (ValueError), que quem chama responde com 400.
+    """
+    convertidos = []
+    for campo, valor in zip(ordenacao, decodificar_cursor(cursor, len(ordenacao))):
+        if valor is None:
+            raise CursorInvalido('Cursor invalido.')
+        field = _campo_ordenacao(queryset, _campo_e_direcao(campo)[0])
+        try:
+            convertidos.append(field.get_prep_value(field.to_python(valor)))
+        except (TypeError, ValueError, ValidationError) as erro:
+            raise CursorInvalido('Cursor invalido.') from erro
+    return convertidos
+
+
+def inverter_ordenacao(ordenacao):
+    """('-data', '-id') -> ('data', 'id'); usado para voltar paginas."""
+    return tuple(
+        nome if decrescente else f'-{nome}'
+        for nome, decrescente in map(_campo_e_direcao, ordenacao)
+    )
+
+
+def filtro_apos(campos, valores):
+    """
+    Q equivalente a (campo1, campo2, ...) > (valor1, valor2, ...).
+
+    Campos com '-' sao decrescentes (comparados com <). O ultimo deve
+    ser unico (normalmente a pk) para que o cursor aponte um registro so.
+
+    O limite redundante no primeiro campo (>= / <=) vira condicao de
+    indice: sem ele o PostgreSQL pode percorrer o indice desde o inicio
+    aplicando o OR como filtro, o que custa o mesmo que o OFFSET.
+    """
+    filtro = Q()
+    for posicao, campo in enumerate(campos):
+        nome, decrescente = _campo_e_direcao(campo)
+        iguais = {
+            _campo_e_direcao(anterior)[0]: valor
+            for anterior, valor in zip(campos[:posicao], valores)
+        }
+        filtro |= Q(**iguais, **{
+            f'{nome}__{"lt" if decrescente else "gt"}': valores[posicao],
+        })
+    nome, decrescente = _campo_e_direcao(campos[0])
+    return Q(**{f'{nome}__{"lte" if decrescente else "gte"}': valores[0]}) & filtro
+
+
+Pagina = namedtuple(
+    'Pagina', ['itens', 'proximo_cursor', 'anterior_cursor'], defaults=[None],
+)
+
+
+def _valores_padrao(ordenacao):
+    def valores_do_item(item):
+        return [
+            item['id' if nome == 'pk' else nome]
+            for nome, _ in map(_campo_e_direcao, ordenacao)
+        ]
+    return valores_do_item
+
+
+def paginar(queryset, ordenacao, cursor, limite, valores_do_item=None):
+    """
+    Pagina de ate `limite` itens do queryset, apos o `cursor`.
+
+    `ordenacao` sao os campos usados no ORDER BY e no cursor.
+    `valores_do_item(item)` extrai esses valores de um item; por padrao,
+    item[campo] (querysets de .values()) com 'pk' lido de item['id'].
+
+    anterior_cursor (para paginar_anterior) so e preenchido quando a
+    pagina nao e a primeira.
+    """
+    valores_do_item = valores_do_item or _valores_padrao(ordenacao)
+    if cursor:
+        queryset = queryset.filter(
+            filtro_apos(ordenacao, valores_do_cursor(queryset, ordenacao, cursor)),
+        )
+    # Um item a mais indica se ha proxima pagina
+    itens = list(queryset.order_by(*ordenacao)[:limite + 1])
+    proximo = None
+    if len(itens) > limite:
+        itens = itens[:limite]
+        proximo = codificar_cursor(valores_do_item(itens[-1]))
+    anterior = codificar_cursor(valores_do_item(itens[0])) if cursor and itens else None
+    return Pagina(itens, proximo, anterior)
+
+
+def paginar_anterior(queryset, ordenacao, cursor, limite, valores_do_item=None):
+    """
+    Pagina de ate `limite` itens imediatamente antes do `cursor`.
+
+    Le na ordenacao invertida (a mesma faixa de indice, ao contrario) e
+    devolve os itens na ordenacao original.
+    """
+    valores_do_item = valores_do_item or _valores_padrao(ordenacao)
+    invertida = inverter_ordenacao(ordenacao)
+    queryset = queryset.filter(
+        filtro_apos(invertida, valores_do_cursor(queryset, ordenacao, cursor)),
+    )
+    itens = list(queryset.order_by(*invertida)[:limite + 1])
+    anterior = None
+    if len(itens) > limite:
+        itens = itens[:limite]
+        anterior = codificar_cursor(valores_do_item(itens[-1]))
+    itens.reverse()
+    proximo = codificar_cursor(valores_do_item(itens[-1])) if itens else None
+    return Pagina(itens, proximo, anterior)
+
+
+# ───────────────────────────────────────────────
+# Contagem estimada
+# ───────────────────────────────────────────────
+
+def _linhas_tabela(conexao, tabela):
+    """
+    pg_class.reltuples da tabela (soma das particoes, se particionada).
+
+    None se a tabela nunca foi analisada (reltuples = -1).
+    """
+    with conexao.cursor() as cursor:
+        cursor.execute(
+            'SELECT c.reltuples, ('
+            '    SELECT SUM(p.reltuples) FROM pg_inherits i'
+            '    JOIN pg_class p ON p.oid = i.inhrelid'
+            '    WHERE i.inhparent = c.oid AND p.reltuples >= 0'
+            ') FROM pg_class c WHERE c.oid = %s::regclass',
+            [conexao.ops.quote_name(tabela)],
+        )
+        proprias, particoes = cursor.fetchone()
+    if particoes is not None:
+        return int(particoes)
+    return int(proprias) if proprias >= 0 else None
+
+
+def estimar_contagem(queryset):
+    """
+    Quantidade de linhas do queryset estimada pelo planner.
+
+    Sem filtros, le reltuples do catalogo; com filtros, a estimativa de
+    linhas do EXPLAIN da consulta. None fora do PostgreSQL ou sem
+    estatisticas — quem chama deve recorrer ao COUNT(*).
+    """
+    conexao = connections[queryset.db]
+    if conexao.vendor != 'postgresql':
+        return None
+    if not queryset.query.where:
+        return _linhas_tabela(conexao, queryset.model._meta.db_table)
+
+    consulta = queryset.order_by().values('pk').query
+    sql, params = consulta.get_compiler(using=queryset.db).as_sql()
+    with conexao.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plano = cursor.fetchone()[0]
+    if isinstance(plano, str):
+        plano = json.loads(plano)
+    return int(plano[0]['Plan']['Plan Rows'])
@@ -0,0 +1,252 @@
+"""
+core.particoes
+
+Particionamento de tabelas por ano (PARTITION BY RANGE) no PostgreSQL.
+
+Usado por tabelas de historico que so crescem (ex: MovimentacaoAluno):
+uma particao por ano da coluna de data, mais uma particao padrao
+(DEFAULT) que recebe datas de anos ainda sem particao. Consultas que
+filtram pela data so leem as particoes dos anos envolvidos (partition
+pruning), e anos antigos podem ser desanexados e arquivados.
+
+Convencoes de nome:
+- particao do ano: <tabela>_p<ano> (ex: academic_movimentacaoaluno_p2025)
+- particao padrao: <tabela>_padrao
+
+A chave primaria da tabela particionada e (id, <coluna>) — o PostgreSQL
+exige a coluna de particionamento na PK. Para o Django o model continua
+com PK simples em id (unico pela sequence).
+
+Em outros bancos (SQLite, testes locais) a tabela continua simples e as
+funcoes que consultam o catalogo retornam vazio.
+"""
+
+from datetime import date
+
+
+def nome_particao(tabela, ano):
+    return f'{tabela}_p{ano}'
+
+
+def nome_particao_padrao(tabela):
+    return f'{tabela}_padrao'
+
+
+def limites_ano(ano):
+    """Intervalo [inicio, fim) de datas de um ano."""
+    return date(ano, 1, 1), date(ano + 1, 1, 1)
+
+
+def particionada(connection, tabela):
+    """Indica se a tabela e particionada (sempre False fora do PostgreSQL)."""
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT EXISTS (SELECT 1 FROM pg_partitioned_table p '
+            'JOIN pg_class c ON c.oid = p.partrelid WHERE c.relname = %s)',
+            [tabela],
+        )
+        return cursor.fetchone()[0]
+
+
+def listar_particoes(connection, tabela):
+    """Particoes anuais anexadas a tabela: {ano: nome}."""
+    if not particionada(connection, tabela):
+        return {}
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT c.relname FROM pg_inherits i '
+            'JOIN pg_class c ON c.oid = i.inhrelid '
+            'JOIN pg_class p ON p.oid = i.inhparent '
+            'WHERE p.relname = %s',
+            [tabela],
+        )
+        nomes = [nome for (nome,) in cursor.fetchall()]
+    prefixo = f'{tabela}_p'
+    return {
+        int(nome[len(prefixo):]): nome
+        for nome in nomes
+        if nome.startswith(prefixo) and nome[len(prefixo):].isdigit()
+    }
+
+
+def tabela_existe(connection, nome):
+    with connection.cursor() as cursor:
+        return nome in connection.introspection.table_names(cursor)
+
+
+def criar_particao_anual(connection, tabela, coluna, ano):
+    """
+    Cria (se ainda nao existir) a particao de um ano.
+
+    Linhas do ano que ja estejam na particao padrao sao movidas para a
+    nova particao. Indices, PK e FKs da tabela sao replicados pelo
+    PostgreSQL no ATTACH. Deve rodar dentro de uma transacao.
+
+    Retorna True se a particao foi criada.
+    """
+    if ano in listar_particoes(connection, tabela):
+        return False
+
+    q = connection.ops.quote_name
+    particao = nome_particao(tabela, ano)
+    padrao = nome_particao_padrao(tabela)
+    inicio, fim = limites_ano(ano)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'CREATE TABLE {q(particao)} (LIKE {q(tabela)} INCLUDING DEFAULTS)'
+        )
+        if tabela_existe(connection, padrao):
+            cursor.execute(
+                f'WITH movidas AS (DELETE FROM {q(padrao)} '
+                f'WHERE {q(coluna)} >= %s AND {q(coluna)} < %s RETURNING *) '
+                f'INSERT INTO {q(particao)} SELECT * FROM movidas',
+                [inicio, fim],
+            )
+        cursor.execute(
+            f'ALTER TABLE {q(tabela)} ATTACH PARTITION {q(particao)} '
+            f'FOR VALUES FROM (%s) TO (%s)',
+            [inicio, fim],
+        )
+    return True
+
+
+def desanexar_particao(connection, tabela, ano):
+    """
+    Desanexa a particao de um ano, que vira uma tabela comum.
+
+    Retorna o nome da tabela desanexada (None se o ano nao tem particao).
+    """
+    particao = listar_particoes(connection, tabela).get(ano)
+    if particao is None:
+        return None
+    q = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'ALTER TABLE {q(tabela)} DETACH PARTITION {q(particao)}'
+        )
+    return particao
+
+
+def _recriar_indices_e_fks(schema_editor, tabela, constraints):
+    """Recria na tabela nova os indices e FKs introspectados da antiga."""
+    q = schema_editor.quote_name
+    for nome, info in constraints.items():
+        if info['primary_key'] or info['check']:
+            continue
+        colunas = info['columns']
+        if info['foreign_key']:
+            tabela_ref, coluna_ref = info['foreign_key']
+            schema_editor.execute(
+                f'ALTER TABLE {q(tabela)} ADD CONSTRAINT {q(nome)} '
+                f'FOREIGN KEY ({q(colunas[0])}) '
+                f'REFERENCES {q(tabela_ref)} ({q(coluna_ref)}) '
+                f'DEFERRABLE INITIALLY DEFERRED'
+            )
+        elif info['index'] and not info['unique']:
+            ordens = info.get('orders') or ['ASC'] * len(colunas)
+            campos = ', '.join(
+                f'{q(coluna)} {ordem}' for coluna, ordem in zip(colunas, ordens)
+            )
+            schema_editor.execute(
+                f'CREATE INDEX {q(nome)} ON {q(tabela)} ({campos})'
+            )
+
+
+def converter_em_particionada(schema_editor, tabela, coluna, anos_extras=1):
+    """
+    Converte uma tabela simples em particionada por ano de `coluna`.
+
+    Para uso em migrations (RunPython). Cria uma particao para cada ano
+    presente nos dados ate o ano atual + anos_extras, mais a particao
+    padrao; copia as linhas e recria sequence, indices e FKs com os
+    mesmos nomes. Nao faz nada fora do PostgreSQL.
+    """
+    connection = schema_editor.connection
+    if connection.vendor != 'postgresql' or particionada(connection, tabela):
+        return
+
+    q = schema_editor.quote_name
+    antiga = f'{tabela}_simples'
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(cursor, tabela)
+        cursor.execute(
+            f'SELECT MIN({q(coluna)}), MAX({q(coluna)}) FROM {q(tabela)}'
+        )
+        menor, maior = cursor.fetchone()
+
+    ano_atual = date.today().year
+    primeiro = menor.year if menor else ano_atual
+    ultimo = max(maior.year if maior else ano_atual, ano_atual) + anos_extras
+
+    schema_editor.execute(f'ALTER TABLE {q(tabela)} RENAME TO {q(antiga)}')
+    schema_editor.execute(
+        f'CREATE TABLE {q(tabela)} (LIKE {q(antiga)}, '
+        f'PRIMARY KEY ("id", {q(coluna)})) PARTITION BY RANGE ({q(coluna)})'
+    )
+    schema_editor.execute(
+        f'CREATE TABLE {q(nome_particao_padrao(tabela))} '
+        f'PARTITION OF {q(tabela)} DEFAULT'
+    )
+    for ano in range(primeiro, ultimo + 1):
+        inicio, fim = limites_ano(ano)
+        schema_editor.execute(
+            f'CREATE TABLE {q(nome_particao(tabela, ano))} PARTITION OF '
+            f'{q(tabela)} FOR VALUES FROM (%s) TO (%s)',
+            [inicio, fim],
+        )
+    schema_editor.execute(
+        f'INSERT INTO {q(tabela)} SELECT * FROM {q(antiga)}'
+    )
+    schema_editor.execute(f'DROP TABLE {q(antiga)}')
+
+    sequence = f'{tabela}_id_seq'
+    schema_editor.execute(
+        f'CREATE SEQUENCE {q(sequence)} OWNED BY {q(tabela)}."id"'
+    )
+    schema_editor.execute(
+        f"ALTER TABLE {q(tabela)} ALTER COLUMN \"id\" "
+        f"SET DEFAULT nextval('{sequence}')"
+    )
+    schema_editor.execute(
+        f"SELECT setval('{sequence}', "
+        f'COALESCE((SELECT MAX("id") FROM {q(tabela)}), 0) + 1, false)'
+    )
+    _recriar_indices_e_fks(schema_editor, tabela, constraints)
+
+
+def converter_em_tabela_simples(schema_editor, tabela):
+    """
+    Reverte converter_em_particionada: volta a uma tabela simples.
+
+    Copia apenas as linhas das particoes anexadas (anos ja arquivados
+    continuam nos arquivos). Nao faz nada fora do PostgreSQL.
+    """
+    connection = schema_editor.connection
+    if not particionada(connection, tabela):
+        return
+
+    q = schema_editor.quote_name
+    antiga = f'{tabela}_particionada'
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(cursor, tabela)
+
+    schema_editor.execute(f'ALTER TABLE {q(tabela)} RENAME TO {q(antiga)}')
+    schema_editor.execute(
+        f'CREATE TABLE {q(tabela)} (LIKE {q(antiga)}, PRIMARY KEY ("id"))'
+    )
+    schema_editor.execute(
+        f'INSERT INTO {q(tabela)} SELECT * FROM {q(antiga)}'
+    )
+    # DROP da tabela particionada remove particoes e a sequence (OWNED BY)
+    schema_editor.execute(f'DROP TABLE {q(antiga)}')
+    schema_editor.execute(
+        f'ALTER TABLE {q(tabela)} ALTER COLUMN "id" '
+        f'ADD GENERATED BY DEFAULT AS IDENTITY'
+    )
+    schema_editor.execute(
+        f"SELECT setval(pg_get_serial_sequence('{tabela}', 'id'), "
+        f'COALESCE((SELECT MAX("id") FROM {q(tabela)}), 0) + 1, false)'
+    )
+    _recriar_indices_e_fks(schema_editor, tabela, constraints)
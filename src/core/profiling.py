@@ -0,0 +1,241 @@
+"""
+core.profiling
+
+Perfil de SQL por request, guardado em memoria e exibido em /admin/perfil/.
+
+PerfilMiddleware sorteia os requests perfilados (PERFIL_AMOSTRAGEM:
+fracao de 0 a 1; 0 desliga). Em um request sorteado, um
+connection.execute_wrapper registra cada consulta com o tempo e a
+origem — o primeiro frame do codigo do projeto na pilha (repository,
+service, metodo do admin). Ao fim do request o perfil e resumido:
+
+- consultas e tempo total de banco
+- duplicadas: mesma consulta com os mesmos parametros mais de uma vez
+- repetidas: mesmo SQL com parametros diferentes (suspeita de N+1)
+- as PERFIL_CONSULTAS_LENTAS consultas mais lentas
+- tempo de renderizacao do template (TemplateResponse, como as telas do
+  admin; consultas de querysets avaliados no template contam aqui)
+
+Os perfis ficam em um buffer circular (PERFIL_CAPACIDADE) por processo;
+os mais antigos sao descartados. Com a amostragem desligada o custo por
+request e uma comparacao.
+"""
+
+import itertools
+import random
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import ExitStack
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+
+
+# Tamanho maximo do SQL guardado por consulta
+TAMANHO_MAXIMO_SQL = 2000
+
+# Arquivos ignorados ao procurar a origem (a propria instrumentacao)
+_DIRETORIO_CORE = Path(__file__).resolve().parent
+ARQUIVOS_IGNORADOS = {
+    str(_DIRETORIO_CORE / 'profiling.py'),
+    str(_DIRETORIO_CORE / 'metricas.py'),
+    str(_DIRETORIO_CORE / 'middleware.py'),
+}
+
+
+def amostragem():
+    return getattr(settings, 'PERFIL_AMOSTRAGEM', 0.0)
+
+
+def _origem(frame):
+    """Primeiro frame do codigo do projeto: 'app/arquivo.py:linha funcao'."""
+    raiz = str(settings.SRC_DIR)
+    while frame is not None:
+        arquivo = frame.f_code.co_filename
+        if arquivo.startswith(raiz) and arquivo not in ARQUIVOS_IGNORADOS:
+            relativo = Path(arquivo).relative_to(raiz)
+            return f'{relativo}:{frame.f_lineno} {frame.f_code.co_name}'
+        frame = frame.f_back
+    return ''
+
+
+class PerfilRequest:
+    """Coleta as consultas de um request; usado como execute_wrapper."""
+
+    def __init__(self):
+        self.consultas = []
+        self.template_ms = None
+        self._inicio_template = None
+
+    def __call__(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.consultas.append((
+                sql[:TAMANHO_MAXIMO_SQL],
+                repr(params)[:TAMANHO_MAXIMO_SQL],
+                (time.perf_counter() - inicio) * 1000,
+                _origem(sys._getframe(1)),
+            ))
+
+    def instalar(self):
+        """Context manager que instala o wrapper em todos os aliases."""
+        pilha = ExitStack()
+        for alias in connections:
+            pilha.enter_context(connections[alias].execute_wrapper(self))
+        return pilha
+
+    def iniciar_template(self):
+        self._inicio_template = time.perf_counter()
+
+    def concluir_template(self, response):
+        if self._inicio_template is not None:
+            self.template_ms = (time.perf_counter() - self._inicio_template) * 1000
+        return response
+
+    def resumo(self, limite_lentas):
+        """Resumo serializavel das consultas coletadas."""
+        por_consulta = Counter((sql, params) for sql, params, _, _ in self.consultas)
+        por_sql = Counter(sql for sql, _, _, _ in self.consultas)
+        variacoes = Counter(sql for sql, _ in por_consulta)
+        origens = {}
+        for sql, _, _, origem in self.consultas:
+            origens.setdefault(sql, origem)
+
+        duplicadas = [
+            {'sql': sql, 'params': params, 'vezes': vezes, 'origem': origens[sql]}
+            for (sql, params), vezes in por_consulta.most_common()
+            if vezes > 1
+        ]
+        repetidas = [
+            {'sql': sql, 'vezes': vezes, 'origem': origens[sql]}
+            for sql, vezes in por_sql.most_common()
+            if variacoes[sql] > 1
+        ]
+        lentas = [
+            {'sql': sql, 'params': params, 'ms': round(ms, 2), 'origem': origem}
+            for sql, params, ms, origem in sorted(
+                self.consultas, key=lambda consulta: -consulta[2],
+            )[:limite_lentas]
+        ]
+        return {
+            'consultas': len(self.consultas),
+            'db_ms': round(sum(ms for _, _, ms, _ in self.consultas), 2),
+            'template_ms': (
+                round(self.template_ms, 2) if self.template_ms is not None else None
+            ),
+            'duplicadas': duplicadas,
+            'repetidas': repetidas,
+            'lentas': lentas,
+        }
+
+
+class BufferPerfis:
+    """Buffer circular (thread-safe) dos ultimos perfis."""
+
+    def __init__(self, capacidade):
+        self._trava = threading.Lock()
+        self._perfis = deque(maxlen=capacidade)
+        self._ids = itertools.count(1)
+
+    def adicionar(self, perfil):
+        with self._trava:
+            perfil['id'] = next(self._ids)
+            self._perfis.append(perfil)
+        return perfil['id']
+
+    def listar(self):
+        """Perfis do mais recente ao mais antigo."""
+        with self._trava:
+            return list(reversed(self._perfis))
+
+    def obter(self, perfil_id):
+        with self._trava:
+            return next((p for p in self._perfis if p['id'] == perfil_id), None)
+
+    def limpar(self):
+        with self._trava:
+            self._perfis.clear()
+
+
+BUFFER = BufferPerfis(getattr(settings, 'PERFIL_CAPACIDADE', 200))
+
+
+class PerfilMiddleware:
+    """
+    Perfila uma amostra dos requests (ver modulo).
+
+    Fica logo depois do MetricasBancoMiddleware, para ver as consultas
+    dos demais middlewares. Em ASGI o wrapper e instalado na thread do
+    ORM assincrono do request; a origem das consultas feitas por views
+    async fica vazia (a pilha da thread nao inclui a view).
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.limite_lentas = getattr(settings, 'PERFIL_CONSULTAS_LENTAS', 10)
+        self.assincrono = iscoroutinefunction(get_response)
+        if self.assincrono:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.assincrono:
+            return self.__acall__(request)
+        if not self._sortear():
+            return self.get_response(request)
+
+        perfil = PerfilRequest()
+        request._perfil = perfil
+        inicio = time.perf_counter()
+        with perfil.instalar():
+            response = self.get_response(request)
+        return self._registrar(request, response, perfil, inicio)
+
+    async def __acall__(self, request):
+        if not self._sortear():
+            return await self.get_response(request)
+
+        perfil = PerfilRequest()
+        request._perfil = perfil
+        inicio = time.perf_counter()
+        pilha = await sync_to_async(perfil.instalar)()
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(pilha.close)()
+        return self._registrar(request, response, perfil, inicio)
+
+    @staticmethod
+    def _sortear():
+        taxa = amostragem()
+        return bool(taxa) and random.random() < taxa
+
+    def _registrar(self, request, response, perfil, inicio):
+        total_ms = (time.perf_counter() - inicio) * 1000
+        match = request.resolver_match
+        BUFFER.adicionar({
+            'quando': timezone.now(),
+            'metodo': request.method,
+            'caminho': request.get_full_path()[:500],
+            'view': match.view_name if match else '',
+            'status': response.status_code,
+            'total_ms': round(total_ms, 2),
+            **perfil.resumo(self.limite_lentas),
+        })
+        return response
+
+    def process_template_response(self, request, response):
+        perfil = getattr(request, '_perfil', None)
+        if perfil is not None:
+            perfil.iniciar_template()
+            response.add_post_render_callback(perfil.concluir_template)
+        return response
@@ -0,0 +1,143 @@
+"""
+core.replicas
+
+Roteamento de leituras para uma replica do banco (alias REPLICA_ALIAS).
+
+Escritas vao sempre para o primario ('default'). Uma leitura vai para a
+replica quando:
+
+- roda dentro de um bloco `with leitura():` (ex: changelists e
+  autocompletes do admin, via ReplicaLeituraMiddleware), ou
+- vem de uma consulta de repository montada com para_leitura(Model)
+
+e nenhuma destas condicoes obriga o primario:
+
+- bloco `with primario():`
+- transacao aberta no primario (services com transaction.atomic leem
+  o que acabaram de gravar)
+- escrita recente no mesmo contexto: depois de gravar, as leituras
+  ficam no primario por REPLICA_JANELA_APOS_ESCRITA segundos. O
+  middleware guarda o instante da ultima escrita na sessao, entao a
+  janela vale para os proximos requests do mesmo usuario (evita ler da
+  replica, ainda atrasada, o que acabou de ser salvo).
+
+Sem o alias de replica em DATABASES o roteador nao interfere: tudo vai
+para o 'default', como antes.
+
+O estado fica em ContextVars: vale por thread/tarefa e o middleware o
+restaura ao fim de cada request.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+# Hint das consultas de repository que podem ir para a replica
+HINT_LEITURA = 'leitura'
+
+_leitura = ContextVar('replicas_leitura', default=False)
+_primario = ContextVar('replicas_primario', default=False)
+_ultima_escrita = ContextVar('replicas_ultima_escrita', default=None)
+
+
+def alias_replica():
+    """Alias da replica, ou None se nao estiver configurada."""
+    alias = getattr(settings, 'REPLICA_ALIAS', 'replica')
+    return alias if alias in settings.DATABASES else None
+
+
+def janela_apos_escrita():
+    return getattr(settings, 'REPLICA_JANELA_APOS_ESCRITA', 5)
+
+
+@contextmanager
+def leitura():
+    """Leituras do bloco vao para a replica (se permitido, ver modulo)."""
+    token = _leitura.set(True)
+    try:
+        yield
+    finally:
+        _leitura.reset(token)
+
+
+@contextmanager
+def primario():
+    """Leituras do bloco vao sempre para o primario."""
+    token = _primario.set(True)
+    try:
+        yield
+    finally:
+        _primario.reset(token)
+
+
+def para_leitura(model):
+    """
+    Manager do model cujas consultas podem ir para a replica.
+
+    Uso nos repositories: para_leitura(Aluno).filter(...). O banco e
+    decidido na execucao da consulta, entao a janela apos escrita e as
+    transacoes abertas sao respeitadas mesmo com querysets montados
+    antes.
+    """
+    return model._default_manager.db_manager(hints={HINT_LEITURA: True})
+
+
+def registrar_escrita(instante=None):
+    _ultima_escrita.set(time.time() if instante is None else instante)
+
+
+def ultima_escrita():
+    return _ultima_escrita.get()
+
+
+def restaurar_ultima_escrita(instante):
+    """Define o instante da ultima escrita; retorna o token para reset."""
+    return _ultima_escrita.set(instante)
+
+
+def resetar_ultima_escrita(token):
+    _ultima_escrita.reset(token)
+
+
+def deve_usar_primario():
+    if _primario.get() or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+        return True
+    instante = _ultima_escrita.get()
+    return instante is not None and time.time() - instante < janela_apos_escrita()
+
+
+class RoteadorReplica:
+    """Database router: leituras elegiveis na replica, escritas no primario."""
+
+    def db_for_read(self, model, **hints):
+        replica = alias_replica()
+        if replica is None:
+            return None
+        if deve_usar_primario():
+            return DEFAULT_DB_ALIAS
+        if _leitura.get() or hints.get(HINT_LEITURA):
+            return replica
+        return None
+
+    def db_for_write(self, model, **hints):
+        if alias_replica() is None:
+            return None
+        registrar_escrita()
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Primario e replica tem os mesmos dados
+        aliases = {DEFAULT_DB_ALIAS, alias_replica()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # A replica recebe o schema por replicacao, nunca por migrate
+        if db == alias_replica():
+            return False
+        return None
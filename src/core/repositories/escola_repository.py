@@ -5,14 +5,17 @@ Acesso a dados da entidade Escola.
 """
 
 from core.models import Escola
+from core.dados_referencia import dado_de_referencia
+from core.replicas import para_leitura
 
 
 class EscolaRepository:
 
     @staticmethod
+    @dado_de_referencia(Escola)
     def listar_ativas():
-        return Escola.objects.filter(ativo=True)
+        return para_leitura(Escola).filter(ativo=True)
 
     @staticmethod
     def buscar_por_cnpj(cnpj):
-        return Escola.objects.filter(cnpj=cnpj).first()
+        return para_leitura(Escola).filter(cnpj=cnpj).first()
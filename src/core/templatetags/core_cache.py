@@ -0,0 +1,61 @@
+"""
+core.templatetags.core_cache
+
+Tag {% cached_fragment %}: cache de fragmentos de template nas duas
+camadas de core.cache (L1 por processo + L2 compartilhado).
+
+    {% load core_cache %}
+    {% cached_fragment "painel_turma" 300 turma.pk turma.atualizado_em %}
+        ...
+    {% endcached_fragment %}
+
+O primeiro argumento e o nome do fragmento, o segundo o timeout em
+segundos; os demais sao as variaveis das quais o conteudo depende.
+"""
+
+from django import template
+
+from core.cache import cached_fragment
+
+register = template.Library()
+
+
+class CachedFragmentNode(template.Node):
+
+    def __init__(self, nodelist, nome, timeout, variaveis):
+        self.nodelist = nodelist
+        self.nome = nome
+        self.timeout = timeout
+        self.variaveis = variaveis
+
+    def render(self, context):
+        timeout = self.timeout.resolve(context)
+        try:
+            timeout = int(timeout)
+        except (TypeError, ValueError):
+            raise template.TemplateSyntaxError(
+                f'cached_fragment: timeout invalido ({timeout!r}).'
+            )
+        return cached_fragment(
+            self.nome.resolve(context),
+            lambda: self.nodelist.render(context),
+            timeout,
+            [variavel.resolve(context) for variavel in self.variaveis],
+        )
+
+
+@register.tag('cached_fragment')
+def do_cached_fragment(parser, token):
+    partes = token.split_contents()
+    if len(partes) < 3:
+        raise template.TemplateSyntaxError(
+            f'{partes[0]} exige ao menos o nome do fragmento e o timeout.'
+        )
+    nodelist = parser.parse(('endcached_fragment',))
+    parser.delete_first_token()
+    return CachedFragmentNode(
+        nodelist,
+        parser.compile_filter(partes[1]),
+        parser.compile_filter(partes[2]),
+        [parser.compile_filter(parte) for parte in partes[3:]],
+    )
@@ -0,0 +1,31 @@
+"""
+core.texto
+
+Normalizacao de texto para busca.
+
+Nomes, titulos e documentos sao comparados sempre na forma normalizada:
+minusculas, sem acentos e com espacos colapsados. Assim "Joao", "JOÃO"
+e "joão" caem na mesma chave, tanto na gravacao quanto na consulta.
+"""
+
+import re
+import unicodedata
+
+
+def normalizar_texto(valor):
+    """Retorna o texto em minusculas, sem acentos e com espacos colapsados."""
+    if not valor:
+        return ''
+    decomposto = unicodedata.normalize('NFKD', str(valor))
+    sem_acentos = ''.join(c for c in decomposto if not unicodedata.combining(c))
+    return ' '.join(sem_acentos.lower().split())
+
+
+def somente_digitos(valor):
+    """Remove tudo que nao for digito (ex: CPF, ISBN)."""
+    return re.sub(r'\D', '', valor or '')
+
+
+def termos_busca(valor):
+    """Quebra o texto normalizado em termos alfanumericos."""
+    return re.findall(r'[a-z0-9]+', normalizar_texto(valor))
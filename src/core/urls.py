@@ -0,0 +1,12 @@
+from django.urls import path
+
+from . import views
+
+app_name = 'core'
+
+urlpatterns = [
+    path('metricas/banco/', views.metricas_banco, name='metricas_banco'),
+    path('metricas/cache/', views.metricas_cache, name='metricas_cache'),
+    path('perfil/', views.perfil_lista, name='perfil_lista'),
+    path('perfil/<int:perfil_id>/', views.perfil_detalhe, name='perfil_detalhe'),
+]
@@ -0,0 +1,4 @@
+from .metricas_views import metricas_banco, metricas_cache
+from .perfil_views import perfil_detalhe, perfil_lista
+
+__all__ = ['metricas_banco', 'metricas_cache', 'perfil_detalhe', 'perfil_lista']
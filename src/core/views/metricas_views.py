@@ -0,0 +1,46 @@
+"""
+core.views.metricas_views
+
+Consulta das metricas acumuladas no processo: banco
+(MetricasBancoMiddleware) e cache (core.cache).
+"""
+
+from datetime import datetime, timezone as dt_timezone
+
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import JsonResponse
+from django.views.decorators.http import require_http_methods
+
+from core import cache
+from core.metricas import AGREGADO
+
+
+@staff_member_required
+@require_http_methods(['GET', 'POST'])
+def metricas_banco(request):
+    """
+    GET: metricas por view deste processo desde o ultimo zeramento.
+    POST (superusuario): zera os acumulados.
+    """
+    if request.method == 'POST':
+        if not request.user.is_superuser:
+            return JsonResponse({'erro': 'Apenas superusuarios.'}, status=403)
+        AGREGADO.zerar()
+    return JsonResponse({
+        'desde': datetime.fromtimestamp(AGREGADO.desde, dt_timezone.utc).isoformat(),
+        'views': AGREGADO.resumo(),
+    })
+
+
+@staff_member_required
+@require_http_methods(['GET', 'POST'])
+def metricas_cache(request):
+    """
+    GET: acertos e faltas do cache (L1/L2) deste processo.
+    POST (superusuario): zera os contadores.
+    """
+    if request.method == 'POST':
+        if not request.user.is_superuser:
+            return JsonResponse({'erro': 'Apenas superusuarios.'}, status=403)
+        cache.zerar_estatisticas()
+    return JsonResponse(cache.estatisticas())
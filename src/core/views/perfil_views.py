@@ -0,0 +1,49 @@
+"""
+core.views.perfil_views
+
+Tela do admin com os perfis de SQL coletados pelo PerfilMiddleware
+(core.profiling).
+"""
+
+from django.contrib import admin
+from django.contrib.admin.views.decorators import staff_member_required
+from django.contrib.auth.decorators import user_passes_test
+from django.http import Http404
+from django.shortcuts import redirect
+from django.template.response import TemplateResponse
+from django.views.decorators.http import require_http_methods
+
+from core.profiling import BUFFER, amostragem
+
+
+def _apenas_superusuario(view):
+    return staff_member_required(
+        user_passes_test(lambda usuario: usuario.is_superuser)(view)
+    )
+
+
+@_apenas_superusuario
+@require_http_methods(['GET', 'POST'])
+def perfil_lista(request):
+    """Ultimos perfis; POST limpa o buffer."""
+    if request.method == 'POST':
+        BUFFER.limpar()
+        return redirect('core:perfil_lista')
+    return TemplateResponse(request, 'admin/perfil/lista.html', {
+        **admin.site.each_context(request),
+        'title': 'Perfil de requests',
+        'perfis': BUFFER.listar(),
+        'amostragem': amostragem(),
+    })
+
+
+@_apenas_superusuario
+def perfil_detalhe(request, perfil_id):
+    perfil = BUFFER.obter(perfil_id)
+    if perfil is None:
+        raise Http404('Perfil descartado ou inexistente.')
+    return TemplateResponse(request, 'admin/perfil/detalhe.html', {
+        **admin.site.each_context(request),
+        'title': f'Perfil #{perfil_id}',
+        'perfil': perfil,
+    })
@@ -1,7 +1,14 @@
 from django.contrib import admin, messages
 from django.core.exceptions import ValidationError
 
-from core.admin_mixins import SemIconesRelacionaisMixin
+from core.admin_mixins import (
+    ConsultaOtimizadaMixin,
+    InlineOtimizadoMixin,
+    PaginacaoKeysetMixin,
+    SemIconesRelacionaisMixin,
+)
+from people.admin_mixins import BuscaPorPerfilAdminMixin
+
 from .forms import (
     AutorForm,
     EditoraForm,
@@ -17,15 +24,22 @@ from .models import (
     Obra,
     Exemplar,
     Emprestimo,
+    ProcessamentoAtrasos,
 )
-from .services import BibliotecaService
+from .repositories import ObraRepository
+from .services import BibliotecaService, CatalogoService
+
+
+# Ids de emprestimos ignorados listados na mensagem da acao de devolucao
+IGNORADOS_EXIBIDOS = 20
 
 
 # ───────────────────────────────────────────────
 # Inlines
 # ───────────────────────────────────────────────
 
-class ExemplarInline(SemIconesRelacionaisMixin, admin.TabularInline):
+class ExemplarInline(SemIconesRelacionaisMixin, InlineOtimizadoMixin,
+                     admin.TabularInline):
     """Mostra exemplares vinculados a uma obra."""
     model = Exemplar
     form = ExemplarForm
@@ -33,12 +47,57 @@ class ExemplarInline(SemIconesRelacionaisMixin, admin.TabularInline):
     readonly_fields = ('situacao',)
 
 
+# ───────────────────────────────────────────────
+# Filtros
+# ───────────────────────────────────────────────
+
+class DisponibilidadeFilter(admin.SimpleListFilter):
+    """Filtra obras pelos contadores desnormalizados de exemplares."""
+    title = 'disponibilidade'
+    parameter_name = 'disponibilidade'
+
+    def lookups(self, request, model_admin):
+        return (
+            ('disponivel', 'Com exemplar disponivel'),
+            ('esgotada', 'Todos emprestados'),
+            ('atrasada', 'Com emprestimo atrasado'),
+            ('sem_exemplares', 'Sem exemplares'),
+        )
+
+    def queryset(self, request, queryset):
+        if self.value() == 'disponivel':
+            return queryset.filter(exemplares_disponiveis__gt=0)
+        if self.value() == 'esgotada':
+            return queryset.filter(
+                total_exemplares__gt=0, exemplares_disponiveis=0,
+            )
+        if self.value() == 'atrasada':
+            return queryset.filter(exemplares_atrasados__gt=0)
+        if self.value() == 'sem_exemplares':
+            return queryset.filter(total_exemplares=0)
+        return queryset
+
+
+# ───────────────────────────────────────────────
+# Mixins
+# ───────────────────────────────────────────────
+
+class ReindexaCatalogoMixin:
+    """Reindexa as obras vinculadas quando o nome do cadastro muda."""
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if change and 'nome' in form.changed_data:
+            CatalogoService.indexar_obras(obj.obras.values('pk'))
+
+
 # ───────────────────────────────────────────────
 # Cadastro
 # ───────────────────────────────────────────────
 
 @admin.register(Autor)
-class AutorAdmin(SemIconesRelacionaisMixin, admin.ModelAdmin):
+class AutorAdmin(SemIconesRelacionaisMixin, ConsultaOtimizadaMixin,
+                 ReindexaCatalogoMixin, admin.ModelAdmin):
     form = AutorForm
     list_display = ('nome', 'ativo')
     list_filter = ('ativo',)
@@ -56,7 +115,8 @@ class AutorAdmin(SemIconesRelacionaisMixin, admin.ModelAdmin):
 
 
 @admin.register(Editora)
-class EditoraAdmin(SemIconesRelacionaisMixin, admin.ModelAdmin):
+class EditoraAdmin(SemIconesRelacionaisMixin, ConsultaOtimizadaMixin,
+                   ReindexaCatalogoMixin, admin.ModelAdmin):
     form = EditoraForm
     list_display = ('nome', 'ativo')
     list_filter = ('ativo',)
@@ -74,7 +134,8 @@ class EditoraAdmin(SemIconesRelacionaisMixin, admin.ModelAdmin):
 
 
 @admin.register(Assunto)
-class AssuntoAdmin(SemIconesRelacionaisMixin, admin.ModelAdmin):
+class AssuntoAdmin(SemIconesRelacionaisMixin, ConsultaOtimizadaMixin,
+                   ReindexaCatalogoMixin, admin.ModelAdmin):
     form = AssuntoForm
     list_display = ('nome', 'ativo')
     list_filter = ('ativo',)
@@ -92,15 +153,21 @@ class AssuntoAdmin(SemIconesRelacionaisMixin, admin.ModelAdmin):
 
 
 @admin.register(Obra)
-class ObraAdmin(SemIconesRelacionaisMixin, admin.ModelAdmin):
+class ObraAdmin(SemIconesRelacionaisMixin, ConsultaOtimizadaMixin,
+                admin.ModelAdmin):
     form = ObraForm
-    list_display = ('titulo', 'editora', 'assunto', 'ano_publicacao', 'ativa')
-    list_filter = ('ativa', 'assunto', 'editora')
+    list_display = ('titulo', 'editora', 'assunto', 'ano_publicacao',
+                    'disponibilidade', 'exemplares_atrasados', 'ativa')
+    list_filter = ('ativa', DisponibilidadeFilter, 'assunto', 'editora')
     search_fields = ('titulo', 'isbn')
     list_editable = ('ativa',)
     list_per_page = 25
     autocomplete_fields = ('editora', 'assunto')
     filter_horizontal = ('autores',)
+    readonly_fields = (
+        'total_exemplares', 'exemplares_disponiveis',
+        'exemplares_emprestados', 'exemplares_atrasados',
+    )
     inlines = [ExemplarInline]
     fieldsets = (
         ('Identificacao', {
@@ -109,6 +176,12 @@ class ObraAdmin(SemIconesRelacionaisMixin, admin.ModelAdmin):
         ('Classificacao', {
             'fields': ('autores', 'editora', 'assunto'),
         }),
+        ('Exemplares', {
+            'fields': (
+                'total_exemplares', 'exemplares_disponiveis',
+                'exemplares_emprestados', 'exemplares_atrasados',
+            ),
+        }),
         ('Observacao', {
             'fields': ('observacao',),
             'classes': ('collapse',),
@@ -118,9 +191,55 @@ class ObraAdmin(SemIconesRelacionaisMixin, admin.ModelAdmin):
         }),
     )
 
+    @admin.display(description='disponiveis', ordering='exemplares_disponiveis')
+    def disponibilidade(self, obj):
+        return f'{obj.exemplares_disponiveis} de {obj.total_exemplares}'
+
+    def get_search_results(self, request, queryset, search_term):
+        # Busca pelo indice do catalogo em vez de ILIKE em titulo/ISBN
+        if not search_term:
+            return super().get_search_results(request, queryset, search_term)
+        encontradas = ObraRepository.buscar_catalogo(
+            search_term, apenas_ativas=False,
+        )
+        return queryset.filter(pk__in=encontradas.values('pk')), False
+
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        # Autores (M2M) so estao gravados depois do save_related
+        CatalogoService.indexar_obras([form.instance.pk])
+
+    def save_model(self, request, obj, form, change):
+        if not change:
+            return super().save_model(request, obj, form, change)
+        # Grava so os campos do formulario: os contadores de exemplares
+        # sao mantidos pelo BibliotecaService e nao podem ser sobrescritos
+        # com os valores lidos ao abrir a tela (inclusive via list_editable)
+        concretos = {f.name for f in Obra._meta.concrete_fields}
+        obj.save(update_fields=[
+            *(campo for campo in form.changed_data if campo in concretos),
+            'atualizado_em',
+        ])
+
+    def save_formset(self, request, form, formset, change):
+        if formset.model is not Exemplar:
+            return super().save_formset(request, form, formset, change)
+        # Exemplares criados/alterados/excluidos pelo inline ajustam os
+        # contadores da obra
+        existentes = [f.instance.pk for f in formset.initial_forms]
+        antes = BibliotecaService.contribuicao_exemplares(existentes)
+        super().save_formset(request, form, formset, change)
+        BibliotecaService.ajustar_contadores_obras(
+            antes,
+            BibliotecaService.contribuicao_exemplares(
+                existentes + [obj.pk for obj in formset.new_objects]
+            ),
+        )
+
 
 @admin.register(Exemplar)
-class ExemplarAdmin(SemIconesRelacionaisMixin, admin.ModelAdmin):
+class ExemplarAdmin(SemIconesRelacionaisMixin, ConsultaOtimizadaMixin,
+                    admin.ModelAdmin):
     form = ExemplarForm
     list_display = ('codigo_patrimonio', 'obra', 'estado_fisico', 'situacao', 'ativo')
     list_filter = ('situacao', 'estado_fisico', 'ativo')
@@ -141,13 +260,29 @@ class ExemplarAdmin(SemIconesRelacionaisMixin, admin.ModelAdmin):
         }),
     )
 
+    def save_model(self, request, obj, form, change):
+        # Criacao e (des)ativacao mantem os contadores da obra
+        BibliotecaService.salvar_exemplar(obj)
+
+    def delete_model(self, request, obj):
+        antes = BibliotecaService.contribuicao_exemplares([obj.pk])
+        super().delete_model(request, obj)
+        BibliotecaService.ajustar_contadores_obras(antes, {})
+
+    def delete_queryset(self, request, queryset):
+        antes = BibliotecaService.contribuicao_exemplares(queryset.values('pk'))
+        super().delete_queryset(request, queryset)
+        BibliotecaService.ajustar_contadores_obras(antes, {})
+
 
 # ───────────────────────────────────────────────
 # Operacao
 # ───────────────────────────────────────────────
 
 @admin.register(Emprestimo)
-class EmprestimoAdmin(SemIconesRelacionaisMixin, admin.ModelAdmin):
+class EmprestimoAdmin(SemIconesRelacionaisMixin, PaginacaoKeysetMixin,
+                      ConsultaOtimizadaMixin, BuscaPorPerfilAdminMixin,
+                      admin.ModelAdmin):
     form = EmprestimoForm
     list_display = (
         'aluno', 'exemplar', 'data_emprestimo',
@@ -160,8 +295,11 @@ class EmprestimoAdmin(SemIconesRelacionaisMixin, admin.ModelAdmin):
         'exemplar__codigo_patrimonio',
         'exemplar__obra__titulo',
     )
+    perfis_busca = ('aluno',)
     autocomplete_fields = ('exemplar', 'aluno', 'turma')
     list_per_page = 25
+    # Cursor da paginacao keyset (indice emprestimo_data_id_idx)
+    ordering = ('-data_emprestimo', '-id')
     fieldsets = (
         ('Exemplar e aluno', {
             'fields': ('exemplar', 'aluno', 'turma'),
@@ -199,25 +337,24 @@ class EmprestimoAdmin(SemIconesRelacionaisMixin, admin.ModelAdmin):
 
     @admin.action(description='Devolver exemplar(es) selecionado(s)')
     def devolver_exemplar(self, request, queryset):
-        devolvidos = 0
-        erros = 0
-        for emprestimo in queryset:
-            try:
-                BibliotecaService.devolver_exemplar(emprestimo)
-                devolvidos += 1
-            except ValidationError:
-                erros += 1
+        resultado = BibliotecaService.devolver_em_lote(queryset)
 
-        if devolvidos:
+        if resultado.devolvidos:
             messages.success(
                 request,
-                f'{devolvidos} emprestimo(s) devolvido(s) com sucesso.',
+                f'{len(resultado.devolvidos)} emprestimo(s) devolvido(s) '
+                f'com sucesso.',
+            )
+        if resultado.ignorados:
+            exibidos = ', '.join(
+                f'#{pk}' for pk in resultado.ignorados[:IGNORADOS_EXIBIDOS]
             )
-        if erros:
+            if len(resultado.ignorados) > IGNORADOS_EXIBIDOS:
+                exibidos += ', ...'
             messages.warning(
                 request,
-                f'{erros} emprestimo(s) nao puderam ser devolvidos '
-                f'(ja devolvidos ou invalidos).',
+                f'{len(resultado.ignorados)} emprestimo(s) nao puderam ser '
+                f'devolvidos (ja devolvidos): {exibidos}.',
             )
 
     def has_change_permission(self, request, obj=None):
@@ -229,3 +366,30 @@ class EmprestimoAdmin(SemIconesRelacionaisMixin, admin.ModelAdmin):
         if obj and obj.status == Emprestimo.Status.DEVOLVIDO:
             return False
         return super().has_delete_permission(request, obj)
+
+
+@admin.register(ProcessamentoAtrasos)
+class ProcessamentoAtrasosAdmin(SemIconesRelacionaisMixin,
+                                ConsultaOtimizadaMixin, admin.ModelAdmin):
+    """Auditoria das execucoes de processar_atrasos (somente leitura)."""
+    list_display = (
+        'criado_em', 'data_referencia', 'watermark_anterior', 'status',
+        'lotes', 'atualizados', 'duracao_ms',
+    )
+    list_filter = ('status',)
+    date_hierarchy = 'criado_em'
+    list_per_page = 25
+    readonly_fields = (
+        'data_referencia', 'watermark_anterior', 'status', 'lotes',
+        'atualizados', 'obras_recalculadas', 'duracao_ms', 'erro',
+        'criado_em', 'atualizado_em',
+    )
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,32 @@
+"""
+Management command para reconstruir o indice de busca do catalogo.
+
+Uso:
+    python manage.py indexar_catalogo
+
+Recalcula o documento de busca (titulo, autores, editora, assunto e ISBN
+normalizados) de todas as obras do acervo, em lotes. No SQLite tambem
+reconstroi a tabela FTS5.
+
+Caracteristicas:
+    - Idempotente: pode rodar varias vezes
+    - Atomico: roda dentro de transaction.atomic
+"""
+
+from django.core.management.base import BaseCommand
+
+from library.services import CatalogoService
+
+
+class Command(BaseCommand):
+    help = (
+        'Reconstroi o indice de busca do catalogo da biblioteca '
+        '(documento normalizado de cada obra).'
+    )
+
+    def handle(self, *args, **options):
+        self.stdout.write('Reindexando o catalogo...')
+        total = CatalogoService.indexar_obras()
+        self.stdout.write(self.style.SUCCESS(
+            f'{total} obra(s) reindexada(s).'
+        ))
@@ -0,0 +1,83 @@
+"""
+Management command para marcar os emprestimos atrasados.
+
+Uso:
+    python manage.py processar_atrasos
+    python manage.py processar_atrasos --completo
+    python manage.py processar_atrasos --data 2025-06-30 --lote 1000 -v 2
+
+Para agendar (cron), uma vez por dia logo apos a meia-noite:
+    5 0 * * * cd /caminho/do/projeto && python manage.py processar_atrasos
+
+Marca como 'atrasado' os emprestimos ativos com data prevista de
+devolucao no passado e ajusta os contadores das obras afetadas
+(ver AtrasosService).
+
+Caracteristicas:
+    - Incremental: so examina os emprestimos vencidos desde a ultima
+      execucao concluida (watermark); --completo examina todos
+    - Em lotes, um por transacao; com -v 2 lista os ids de cada lote
+    - Auditado: cada execucao grava um ProcessamentoAtrasos (visivel no
+      admin) com a janela, as contagens e a duracao
+    - Idempotente: rodar de novo no mesmo dia nao altera nada
+"""
+
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from library.services import AtrasosService
+from library.services.biblioteca_service import TAMANHO_LOTE
+
+
+class Command(BaseCommand):
+    help = (
+        'Marca como atrasados os emprestimos vencidos desde a ultima '
+        'execucao e registra a execucao para auditoria.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--data',
+            type=date.fromisoformat,
+            help='Data de referencia (padrao: hoje).',
+        )
+        parser.add_argument(
+            '--completo',
+            action='store_true',
+            help='Ignora o watermark e examina todos os emprestimos ativos.',
+        )
+        parser.add_argument(
+            '--lote',
+            type=int,
+            default=TAMANHO_LOTE,
+            help=f'Emprestimos por transacao (padrao: {TAMANHO_LOTE}).',
+        )
+
+    def handle(self, *args, **options):
+        verbosidade = options['verbosity']
+
+        def lote_concluido(ids):
+            if verbosidade >= 2:
+                self.stdout.write(
+                    f'  Lote: {len(ids)} emprestimo(s) — ids '
+                    f'{", ".join(map(str, ids))}'
+                )
+
+        processamento = AtrasosService.processar(
+            data_referencia=options['data'],
+            completo=options['completo'],
+            tamanho_lote=options['lote'],
+            ao_concluir_lote=lote_concluido,
+        )
+
+        janela = (
+            f'desde {processamento.watermark_anterior:%d/%m/%Y}'
+            if processamento.watermark_anterior else 'varredura completa'
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'{processamento.atualizados} emprestimo(s) marcado(s) como '
+            f'atrasado(s) em {processamento.lotes} lote(s) ({janela}, '
+            f'referencia {processamento.data_referencia:%d/%m/%Y}, '
+            f'{processamento.duracao_ms} ms).'
+        ))
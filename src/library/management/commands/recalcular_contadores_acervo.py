@@ -0,0 +1,69 @@
+"""
+Management command para reconstruir os contadores de exemplares das obras.
+
+Uso:
+    python manage.py recalcular_contadores_acervo
+    python manage.py recalcular_contadores_acervo --dry-run
+
+Os contadores de Obra (total de exemplares, disponiveis, emprestados e
+atrasados) sao mantidos incrementalmente pelo BibliotecaService. Este
+comando audita o acervo inteiro, informa as obras com divergencia (drift)
+e reconstroi todos os contadores com um unico UPDATE.
+
+Caracteristicas:
+    - Idempotente: pode rodar varias vezes
+    - Atomico: roda dentro de transaction.atomic
+    - --dry-run apenas reporta as divergencias, sem gravar
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from library.services import BibliotecaService
+from library.services.biblioteca_service import CAMPOS_CONTADORES_OBRA
+
+
+class Command(BaseCommand):
+    help = (
+        'Audita e reconstroi os contadores de exemplares das obras do '
+        'acervo, informando as divergencias encontradas.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Apenas reporta as divergencias, sem gravar.',
+        )
+
+    @transaction.atomic
+    def handle(self, *args, **options):
+        self.stdout.write('Auditando contadores do acervo...\n')
+
+        divergentes = 0
+        for obra in BibliotecaService.auditar_contadores_acervo().iterator():
+            divergentes += 1
+            diferencas = ', '.join(
+                f'{campo}: {getattr(obra, campo)} -> '
+                f'{getattr(obra, f"esperado_{campo}")}'
+                for campo in CAMPOS_CONTADORES_OBRA
+                if getattr(obra, campo) != getattr(obra, f'esperado_{campo}')
+            )
+            self.stdout.write(self.style.WARNING(
+                f'  {obra.titulo} — {diferencas}'
+            ))
+
+        if not divergentes:
+            self.stdout.write(self.style.SUCCESS('  Nenhuma divergencia.'))
+
+        if options['dry_run']:
+            self.stdout.write(
+                f'\n{divergentes} obra(s) com divergencia (dry-run, nada gravado).'
+            )
+            return
+
+        atualizadas = BibliotecaService.recalcular_contadores_obras()
+        self.stdout.write('')
+        self.stdout.write(self.style.SUCCESS(
+            f'{atualizadas} obra(s) com divergencia corrigida.'
+        ))
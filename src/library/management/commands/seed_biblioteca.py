@@ -34,7 +34,7 @@ from django.db import transaction
 
 from people.models import Aluno
 from library.models import Autor, Editora, Assunto, Obra, Exemplar, Emprestimo
-from library.services import BibliotecaService
+from library.services import BibliotecaService, CatalogoService
 
 
 # ─────────────────────────────────────────────────────────────
@@ -167,6 +167,8 @@ class Command(BaseCommand):
         self._criar_obras()
         self._criar_exemplares()
         self._criar_emprestimos()
+        BibliotecaService.recalcular_contadores_obras()
+        CatalogoService.indexar_obras()
         self._imprimir_resumo()
 
     # ── Validacao ──────────────────────────────────────────
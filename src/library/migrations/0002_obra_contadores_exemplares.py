@@ -0,0 +1,63 @@
+# Generated by Django 6.0.2 on 2026-10-18 11:16
+
+from django.db import migrations, models
+from django.db.models import F, Func, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def preencher_contadores(apps, schema_editor):
+    """Calcula os contadores iniciais de todas as obras ja cadastradas."""
+    Obra = apps.get_model('library', 'Obra')
+    Exemplar = apps.get_model('library', 'Exemplar')
+
+    ativos = Exemplar.objects.filter(obra=OuterRef('pk'), ativo=True)
+
+    def contagem(queryset):
+        return Coalesce(
+            Subquery(
+                queryset.order_by().annotate(
+                    total=Func(F('pk'), function='COUNT'),
+                ).values('total')
+            ),
+            0,
+        )
+
+    Obra.objects.update(
+        total_exemplares=contagem(ativos.exclude(situacao='baixado')),
+        exemplares_disponiveis=contagem(ativos.filter(situacao='disponivel')),
+        exemplares_emprestados=contagem(ativos.filter(situacao='emprestado')),
+        exemplares_atrasados=contagem(
+            ativos.filter(emprestimos__status='atrasado'),
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('library', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='obra',
+            name='exemplares_atrasados',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='atrasados'),
+        ),
+        migrations.AddField(
+            model_name='obra',
+            name='exemplares_disponiveis',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='disponiveis'),
+        ),
+        migrations.AddField(
+            model_name='obra',
+            name='exemplares_emprestados',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='emprestados'),
+        ),
+        migrations.AddField(
+            model_name='obra',
+            name='total_exemplares',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='exemplares'),
+        ),
+        migrations.RunPython(preencher_contadores, migrations.RunPython.noop),
+    ]
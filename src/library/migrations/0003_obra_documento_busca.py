@@ -0,0 +1,72 @@
+# Generated by Django 6.0.2 on 2026-10-18 11:18
+
+from django.db import migrations, models
+
+from core.texto import normalizar_texto, somente_digitos
+
+
+TABELA_FTS = 'library_obra_fts'
+INDICE_GIN = 'library_obra_documento_busca_gin'
+
+
+def criar_indice_busca(apps, schema_editor):
+    """Cria o indice de busca conforme o banco e preenche os documentos."""
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute(
+            f'CREATE INDEX {INDICE_GIN} ON library_obra USING gin '
+            f"(to_tsvector('simple'::regconfig, COALESCE(documento_busca, '')))"
+        )
+    elif vendor == 'sqlite':
+        schema_editor.execute(
+            f'CREATE VIRTUAL TABLE {TABELA_FTS} USING fts5('
+            f"documento, tokenize='unicode61 remove_diacritics 2')"
+        )
+
+    Obra = apps.get_model('library', 'Obra')
+    obras = list(
+        Obra.objects.select_related('editora', 'assunto')
+        .prefetch_related('autores')
+    )
+    for obra in obras:
+        partes = [obra.titulo]
+        partes.extend(autor.nome for autor in obra.autores.all())
+        if obra.editora_id:
+            partes.append(obra.editora.nome)
+        if obra.assunto_id:
+            partes.append(obra.assunto.nome)
+        if obra.isbn:
+            partes.extend([obra.isbn, somente_digitos(obra.isbn)])
+        obra.documento_busca = normalizar_texto(' '.join(partes))
+    Obra.objects.bulk_update(obras, ['documento_busca'], batch_size=500)
+
+    if vendor == 'sqlite':
+        for obra in obras:
+            schema_editor.execute(
+                f'INSERT INTO {TABELA_FTS} (rowid, documento) VALUES (%s, %s)',
+                (obra.pk, obra.documento_busca),
+            )
+
+
+def remover_indice_busca(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute(f'DROP INDEX IF EXISTS {INDICE_GIN}')
+    elif vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {TABELA_FTS}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('library', '0002_obra_contadores_exemplares'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='obra',
+            name='documento_busca',
+            field=models.TextField(blank=True, editable=False, verbose_name='documento de busca'),
+        ),
+        migrations.RunPython(criar_indice_busca, remover_indice_busca),
+    ]
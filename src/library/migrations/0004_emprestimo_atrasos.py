@@ -0,0 +1,38 @@
+# Generated by Django 6.0.2 on 2026-10-18 11:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('library', '0003_obra_documento_busca'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProcessamentoAtrasos',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('criado_em', models.DateTimeField(auto_now_add=True, verbose_name='criado em')),
+                ('atualizado_em', models.DateTimeField(auto_now=True, verbose_name='atualizado em')),
+                ('data_referencia', models.DateField(help_text='Emprestimos com devolucao prevista antes desta data ficam atrasados.', verbose_name='data de referencia')),
+                ('watermark_anterior', models.DateField(blank=True, help_text='Inicio da janela examinada (vazio: varredura completa).', null=True, verbose_name='watermark anterior')),
+                ('status', models.CharField(choices=[('em_andamento', 'Em andamento'), ('concluido', 'Concluido'), ('falha', 'Falha')], default='em_andamento', max_length=20, verbose_name='status')),
+                ('lotes', models.PositiveIntegerField(default=0, verbose_name='lotes')),
+                ('atualizados', models.PositiveIntegerField(default=0, verbose_name='emprestimos atrasados')),
+                ('obras_recalculadas', models.PositiveIntegerField(default=0, verbose_name='obras recalculadas')),
+                ('duracao_ms', models.PositiveIntegerField(default=0, verbose_name='duracao (ms)')),
+                ('erro', models.TextField(blank=True, verbose_name='erro')),
+            ],
+            options={
+                'verbose_name': 'processamento de atrasos',
+                'verbose_name_plural': 'processamentos de atrasos',
+                'ordering': ['-criado_em'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='emprestimo',
+            index=models.Index(condition=models.Q(('status', 'ativo')), fields=['data_prevista_devolucao', 'id'], name='emprestimo_ativo_prevista_idx'),
+        ),
+    ]
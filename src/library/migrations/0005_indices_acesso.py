@@ -0,0 +1,63 @@
+# Generated by Django 6.0.2 on 2026-10-18 11:57
+
+from django.db import migrations, models
+
+
+# Busca por nome com icontains (AutorRepository/EditoraRepository/
+# AssuntoRepository.buscar_por_nome): UPPER(nome) LIKE UPPER('%termo%')
+TABELAS_BUSCA_NOME = ('library_autor', 'library_editora', 'library_assunto')
+
+
+def criar_indices_trigrama(apps, schema_editor):
+    """Indices GIN de trigramas para o icontains (somente PostgreSQL)."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for tabela in TABELAS_BUSCA_NOME:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {tabela}_nome_trgm ON {tabela} '
+            f'USING gin ((UPPER(nome::text)) gin_trgm_ops)'
+        )
+
+
+def remover_indices_trigrama(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for tabela in TABELAS_BUSCA_NOME:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {tabela}_nome_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academic', '0005_indices_acesso'),
+        ('library', '0004_emprestimo_atrasos'),
+        ('people', '0004_indices_acesso'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='emprestimo',
+            index=models.Index(fields=['status', '-data_emprestimo'], name='emprestimo_status_data_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='emprestimo',
+            index=models.Index(fields=['aluno', '-data_emprestimo'], name='emprestimo_aluno_data_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='exemplar',
+            index=models.Index(condition=models.Q(('ativo', True)), fields=['situacao', 'obra'], name='exemplar_situacao_ativo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='exemplar',
+            index=models.Index(condition=models.Q(('ativo', True)), fields=['obra', 'codigo_patrimonio', 'id'], include=('atualizado_em',), name='exemplar_obra_ativo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='obra',
+            index=models.Index(condition=models.Q(('ativa', True)), fields=['titulo', 'id'], include=('atualizado_em',), name='obra_ativa_titulo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='obra',
+            index=models.Index(condition=models.Q(('ativa', True)), fields=['assunto', 'titulo'], name='obra_assunto_ativa_idx'),
+        ),
+        migrations.RunPython(criar_indices_trigrama, remover_indices_trigrama),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 6.0.2 on 2026-10-18 12:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academic', '0006_indices_keyset'),
+        ('library', '0005_indices_acesso'),
+        ('people', '0005_perfil_nome_ordenacao'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='emprestimo',
+            index=models.Index(fields=['-data_emprestimo', '-id'], name='emprestimo_data_id_idx'),
+        ),
+    ]
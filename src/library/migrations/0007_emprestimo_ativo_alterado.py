@@ -0,0 +1,19 @@
+# Generated by Django 6.0.2 on 2026-10-18 12:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academic', '0006_indices_keyset'),
+        ('library', '0006_indices_keyset'),
+        ('people', '0005_perfil_nome_ordenacao'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='emprestimo',
+            index=models.Index(condition=models.Q(('status', 'ativo')), fields=['atualizado_em', 'id'], name='emprestimo_ativo_alterado_idx'),
+        ),
+    ]
@@ -4,6 +4,7 @@ from .assunto import Assunto
 from .obra import Obra
 from .exemplar import Exemplar
 from .emprestimo import Emprestimo
+from .processamento_atrasos import ProcessamentoAtrasos
 
 __all__ = [
     'Autor',
@@ -12,4 +13,5 @@ __all__ = [
     'Obra',
     'Exemplar',
     'Emprestimo',
+    'ProcessamentoAtrasos',
 ]
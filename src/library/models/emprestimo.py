@@ -18,7 +18,9 @@ class Emprestimo(ModeloBase):
     BibliotecaService.
 
     Constraint parcial garante que cada exemplar so pode ter um
-    emprestimo ativo por vez.
+    emprestimo ativo por vez. Os indices parciais sobre os ativos, por
+    data prevista de devolucao e por data de alteracao, atendem a
+    deteccao de atrasos (AtrasosService).
     """
 
     class Status(models.TextChoices):
@@ -63,6 +65,9 @@ class Emprestimo(ModeloBase):
     )
     observacao = models.TextField('observacao', blank=True)
 
+    # FKs usadas no __str__ (ver ConsultaOtimizadaMixin)
+    relacionados_str = ('exemplar', 'aluno')
+
     class Meta:
         verbose_name = 'emprestimo'
         verbose_name_plural = 'emprestimos'
@@ -74,6 +79,34 @@ class Emprestimo(ModeloBase):
                 name='unique_emprestimo_ativo_por_exemplar',
             ),
         ]
+        indexes = [
+            models.Index(
+                fields=['data_prevista_devolucao', 'id'],
+                condition=models.Q(status='ativo'),
+                name='emprestimo_ativo_prevista_idx',
+            ),
+            # AtrasosService: ativos alterados desde a ultima execucao
+            models.Index(
+                fields=['atualizado_em', 'id'],
+                condition=models.Q(status='ativo'),
+                name='emprestimo_ativo_alterado_idx',
+            ),
+            # EmprestimoRepository.listar_ativos / listar_atrasados
+            models.Index(
+                fields=['status', '-data_emprestimo'],
+                name='emprestimo_status_data_idx',
+            ),
+            # EmprestimoRepository.listar_por_aluno (mais recentes primeiro)
+            models.Index(
+                fields=['aluno', '-data_emprestimo'],
+                name='emprestimo_aluno_data_idx',
+            ),
+            # Ordenacao padrao: paginacao keyset do admin
+            models.Index(
+                fields=['-data_emprestimo', '-id'],
+                name='emprestimo_data_id_idx',
+            ),
+        ]
 
     def __str__(self):
         aluno_nome = self.aluno if self.aluno else 'Sem aluno'
@@ -57,10 +57,28 @@ class Exemplar(ModeloBase):
     )
     ativo = models.BooleanField('ativo', default=True)
 
+    # FKs usadas no __str__ (ver ConsultaOtimizadaMixin)
+    relacionados_str = ('obra',)
+
     class Meta:
         verbose_name = 'exemplar'
         verbose_name_plural = 'exemplares'
         ordering = ['codigo_patrimonio']
+        indexes = [
+            # ExemplarRepository.listar_disponiveis
+            models.Index(
+                fields=['situacao', 'obra'],
+                condition=models.Q(ativo=True),
+                name='exemplar_situacao_ativo_idx',
+            ),
+            # listar_por_obra e API do acervo (ordem + versao sem heap)
+            models.Index(
+                fields=['obra', 'codigo_patrimonio', 'id'],
+                condition=models.Q(ativo=True),
+                include=['atualizado_em'],
+                name='exemplar_obra_ativo_idx',
+            ),
+        ]
 
     def __str__(self):
         return f'{self.codigo_patrimonio} — {self.obra.titulo}'
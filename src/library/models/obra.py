@@ -17,6 +17,10 @@ class Obra(ModeloBase):
     multiplos exemplares fisicos (modelo Exemplar). Diferente de Exemplar,
     a Obra nao e emprestada diretamente — o emprestimo e feito sobre o
     exemplar fisico.
+
+    Os contadores de exemplares (total ativo, disponiveis, emprestados e
+    atrasados) sao desnormalizados para que as listagens exibam
+    "X de Y disponiveis" sem agregar Exemplar a cada linha.
     """
 
     titulo = models.CharField('titulo', max_length=300)
@@ -55,6 +59,30 @@ class Obra(ModeloBase):
     observacao = models.TextField('observacao', blank=True)
     ativa = models.BooleanField('ativa', default=True)
 
+    # Contadores desnormalizados do acervo — mantidos pelo BibliotecaService
+    # (nunca editados manualmente). Reconstruidos em massa pelo comando
+    # recalcular_contadores_acervo.
+    total_exemplares = models.PositiveIntegerField(
+        'exemplares', default=0, editable=False,
+    )
+    exemplares_disponiveis = models.PositiveIntegerField(
+        'disponiveis', default=0, editable=False,
+    )
+    exemplares_emprestados = models.PositiveIntegerField(
+        'emprestados', default=0, editable=False,
+    )
+    exemplares_atrasados = models.PositiveIntegerField(
+        'atrasados', default=0, editable=False,
+    )
+
+    # Documento de busca do catalogo — titulo, autores, editora, assunto e
+    # ISBN normalizados (minusculas, sem acentos). Mantido pelo
+    # CatalogoService e indexado por tsvector/GIN (PostgreSQL) ou FTS5
+    # (SQLite).
+    documento_busca = models.TextField(
+        'documento de busca', blank=True, editable=False,
+    )
+
     class Meta:
         verbose_name = 'obra'
         verbose_name_plural = 'obras'
@@ -66,6 +94,21 @@ class Obra(ModeloBase):
                 name='unique_isbn_quando_preenchido',
             ),
         ]
+        indexes = [
+            # listar_ativas e API do acervo (ordem + versao sem heap)
+            models.Index(
+                fields=['titulo', 'id'],
+                condition=models.Q(ativa=True),
+                include=['atualizado_em'],
+                name='obra_ativa_titulo_idx',
+            ),
+            # ObraRepository.listar_por_assunto
+            models.Index(
+                fields=['assunto', 'titulo'],
+                condition=models.Q(ativa=True),
+                name='obra_assunto_ativa_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.titulo
@@ -0,0 +1,63 @@
+"""
+library.models.processamento_atrasos
+
+Modelo da entidade ProcessamentoAtrasos.
+"""
+
+from django.db import models
+
+from core.models import ModeloBase
+
+
+class ProcessamentoAtrasos(ModeloBase):
+    """
+    Registro (auditoria) de uma execucao da deteccao de atrasos.
+
+    Cada execucao de AtrasosService.processar grava uma linha com a
+    janela de datas examinada, as contagens e a duracao. A data de
+    referencia da ultima execucao concluida e a marca d'agua (watermark)
+    da proxima: so os emprestimos vencidos depois dela sao examinados.
+    """
+
+    class Status(models.TextChoices):
+        EM_ANDAMENTO = 'em_andamento', 'Em andamento'
+        CONCLUIDO = 'concluido', 'Concluido'
+        FALHA = 'falha', 'Falha'
+
+    data_referencia = models.DateField(
+        'data de referencia',
+        help_text='Emprestimos com devolucao prevista antes desta data '
+                  'ficam atrasados.',
+    )
+    watermark_anterior = models.DateField(
+        'watermark anterior',
+        null=True,
+        blank=True,
+        help_text='Inicio da janela examinada (vazio: varredura completa).',
+    )
+    status = models.CharField(
+        'status',
+        max_length=20,
+        choices=Status.choices,
+        default=Status.EM_ANDAMENTO,
+    )
+    lotes = models.PositiveIntegerField('lotes', default=0)
+    atualizados = models.PositiveIntegerField(
+        'emprestimos atrasados', default=0,
+    )
+    obras_recalculadas = models.PositiveIntegerField(
+        'obras recalculadas', default=0,
+    )
+    duracao_ms = models.PositiveIntegerField('duracao (ms)', default=0)
+    erro = models.TextField('erro', blank=True)
+
+    class Meta:
+        verbose_name = 'processamento de atrasos'
+        verbose_name_plural = 'processamentos de atrasos'
+        ordering = ['-criado_em']
+
+    def __str__(self):
+        return (
+            f'Atrasos em {self.data_referencia:%d/%m/%Y} '
+            f'({self.get_status_display()})'
+        )
@@ -4,15 +4,18 @@ library.repositories.assunto_repository
 Acesso a dados da entidade Assunto.
 """
 
+from core.dados_referencia import dado_de_referencia
+from core.replicas import para_leitura
 from library.models import Assunto
 
 
 class AssuntoRepository:
 
     @staticmethod
+    @dado_de_referencia(Assunto)
     def listar_ativos():
-        return Assunto.objects.filter(ativo=True)
+        return para_leitura(Assunto).filter(ativo=True)
 
     @staticmethod
     def buscar_por_nome(nome):
-        return Assunto.objects.filter(nome__icontains=nome, ativo=True)
+        return para_leitura(Assunto).filter(nome__icontains=nome, ativo=True)
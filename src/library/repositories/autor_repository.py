@@ -4,6 +4,7 @@ library.repositories.autor_repository
 Acesso a dados da entidade Autor.
 """
 
+from core.replicas import para_leitura
 from library.models import Autor
 
 
@@ -11,8 +12,8 @@ class AutorRepository:
 
     @staticmethod
     def listar_ativos():
-        return Autor.objects.filter(ativo=True)
+        return para_leitura(Autor).filter(ativo=True)
 
     @staticmethod
     def buscar_por_nome(nome):
-        return Autor.objects.filter(nome__icontains=nome, ativo=True)
+        return para_leitura(Autor).filter(nome__icontains=nome, ativo=True)
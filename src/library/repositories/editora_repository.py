@@ -4,15 +4,18 @@ library.repositories.editora_repository
 Acesso a dados da entidade Editora.
 """
 
+from core.dados_referencia import dado_de_referencia
+from core.replicas import para_leitura
 from library.models import Editora
 
 
 class EditoraRepository:
 
     @staticmethod
+    @dado_de_referencia(Editora)
     def listar_ativas():
-        return Editora.objects.filter(ativo=True)
+        return para_leitura(Editora).filter(ativo=True)
 
     @staticmethod
     def buscar_por_nome(nome):
-        return Editora.objects.filter(nome__icontains=nome, ativo=True)
+        return para_leitura(Editora).filter(nome__icontains=nome, ativo=True)
@@ -4,6 +4,7 @@ library.repositories.emprestimo_repository
 Acesso a dados da entidade Emprestimo.
 """
 
+from core.replicas import para_leitura
 from library.models import Emprestimo
 
 
@@ -11,18 +12,32 @@ class EmprestimoRepository:
 
     @staticmethod
     def listar_ativos():
-        return Emprestimo.objects.filter(
+        return para_leitura(Emprestimo).filter(
             status__in=[Emprestimo.Status.ATIVO, Emprestimo.Status.ATRASADO],
         ).select_related('exemplar__obra', 'aluno__pessoa', 'turma')
 
     @staticmethod
     def listar_por_aluno(aluno):
-        return Emprestimo.objects.filter(
+        return para_leitura(Emprestimo).filter(
             aluno=aluno,
         ).select_related('exemplar__obra', 'turma').order_by('-data_emprestimo')
 
     @staticmethod
     def listar_atrasados():
-        return Emprestimo.objects.filter(
+        return para_leitura(Emprestimo).filter(
             status=Emprestimo.Status.ATRASADO,
         ).select_related('exemplar__obra', 'aluno__pessoa', 'turma')
+
+    # ── Variantes async (views ASGI) ───────────────────────
+
+    @staticmethod
+    async def alistar_ativos():
+        return [e async for e in EmprestimoRepository.listar_ativos()]
+
+    @staticmethod
+    async def alistar_por_aluno(aluno):
+        return [e async for e in EmprestimoRepository.listar_por_aluno(aluno)]
+
+    @staticmethod
+    async def alistar_atrasados():
+        return [e async for e in EmprestimoRepository.listar_atrasados()]
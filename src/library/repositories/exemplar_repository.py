@@ -4,6 +4,9 @@ library.repositories.exemplar_repository
 Acesso a dados da entidade Exemplar.
 """
 
+from django.db.models import Count, Max
+
+from core.replicas import para_leitura
 from library.models import Exemplar
 
 
@@ -11,20 +14,58 @@ class ExemplarRepository:
 
     @staticmethod
     def listar_por_obra(obra):
-        return Exemplar.objects.filter(
+        return para_leitura(Exemplar).filter(
             obra=obra,
             ativo=True,
         ).select_related('obra')
 
     @staticmethod
     def listar_disponiveis():
-        return Exemplar.objects.filter(
+        return para_leitura(Exemplar).filter(
             situacao=Exemplar.Situacao.DISPONIVEL,
             ativo=True,
         ).select_related('obra')
 
     @staticmethod
     def buscar_por_codigo(codigo_patrimonio):
-        return Exemplar.objects.filter(
+        return para_leitura(Exemplar).filter(
             codigo_patrimonio=codigo_patrimonio,
         ).select_related('obra').first()
+
+    # ── API do acervo (somente colunas necessarias) ────────
+
+    @staticmethod
+    def valores_por_obra(obra_id, campos):
+        """Exemplares ativos da obra como dicts com apenas os `campos`."""
+        return para_leitura(Exemplar).filter(
+            obra_id=obra_id,
+            ativo=True,
+        ).values(*campos)
+
+    @staticmethod
+    def versao_por_obra(obra_id):
+        """(quantidade, ultima atualizacao) dos exemplares ativos da obra."""
+        versao = para_leitura(Exemplar).filter(
+            obra_id=obra_id,
+            ativo=True,
+        ).aggregate(
+            quantidade=Count('pk'),
+            atualizado_em=Max('atualizado_em'),
+        )
+        return versao['quantidade'], versao['atualizado_em']
+
+    # ── Variantes async (views ASGI) ───────────────────────
+
+    @staticmethod
+    async def alistar_por_obra(obra):
+        return [e async for e in ExemplarRepository.listar_por_obra(obra)]
+
+    @staticmethod
+    async def alistar_disponiveis():
+        return [e async for e in ExemplarRepository.listar_disponiveis()]
+
+    @staticmethod
+    async def abuscar_por_codigo(codigo_patrimonio):
+        return await para_leitura(Exemplar).filter(
+            codigo_patrimonio=codigo_patrimonio,
+        ).select_related('obra').afirst()
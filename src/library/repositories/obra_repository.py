@@ -4,33 +4,162 @@ library.repositories.obra_repository
 Acesso a dados da entidade Obra.
 """
 
+from django.db import connections
+from django.db.models import Count, FloatField, Max, Q
+from django.db.models.expressions import RawSQL
+
+from core.replicas import para_leitura
+from core.texto import somente_digitos, termos_busca
 from library.models import Obra
 
 
+TABELA_FTS = 'library_obra_fts'
+
+
 class ObraRepository:
 
     @staticmethod
     def listar_ativas():
-        return Obra.objects.filter(
+        return para_leitura(Obra).filter(
             ativa=True,
         ).select_related('editora', 'assunto').prefetch_related('autores')
 
     @staticmethod
     def listar_por_assunto(assunto):
-        return Obra.objects.filter(
+        return para_leitura(Obra).filter(
             assunto=assunto,
             ativa=True,
         ).select_related('editora').prefetch_related('autores')
 
     @staticmethod
     def listar_por_autor(autor):
-        return Obra.objects.filter(
+        return para_leitura(Obra).filter(
             autores=autor,
             ativa=True,
         ).select_related('editora', 'assunto')
 
     @staticmethod
     def buscar_por_isbn(isbn):
-        return Obra.objects.filter(
+        # exclude(isbn=''): condicao do indice unico parcial, para que o
+        # planejador possa usa-lo
+        return para_leitura(Obra).filter(
+            isbn=isbn,
+        ).exclude(isbn='').select_related('editora', 'assunto').first()
+
+    # ── API do acervo (somente colunas necessarias) ────────
+
+    @staticmethod
+    def valores_acervo(campos):
+        """Obras ativas como dicts com apenas os `campos` (para a API)."""
+        return para_leitura(Obra).filter(ativa=True).values(*campos)
+
+    @staticmethod
+    def buscar_valores_acervo(obra_id, campos):
+        return ObraRepository.valores_acervo(campos).filter(pk=obra_id).first()
+
+    @staticmethod
+    def versao_acervo():
+        """
+        (quantidade, ultima atualizacao) das obras ativas.
+
+        Muda sempre que uma obra ativa e criada, alterada (inclusive os
+        contadores de exemplares) ou desativada.
+        """
+        versao = para_leitura(Obra).filter(ativa=True).aggregate(
+            quantidade=Count('pk'),
+            atualizado_em=Max('atualizado_em'),
+        )
+        return versao['quantidade'], versao['atualizado_em']
+
+    @staticmethod
+    def autores_por_obra(obra_ids):
+        """{obra_id: [nomes dos autores]} em uma unica consulta."""
+        autores = {}
+        relacoes = para_leitura(Obra.autores.through).filter(
+            obra_id__in=obra_ids,
+        ).order_by('autor__nome').values_list('obra_id', 'autor__nome')
+        for obra_id, nome in relacoes:
+            autores.setdefault(obra_id, []).append(nome)
+        return autores
+
+    # ── Variantes async (views ASGI) ───────────────────────
+
+    @staticmethod
+    async def alistar_ativas():
+        return [obra async for obra in ObraRepository.listar_ativas()]
+
+    @staticmethod
+    async def abuscar_por_isbn(isbn):
+        return await para_leitura(Obra).filter(
             isbn=isbn,
-        ).select_related('editora', 'assunto').first()
+        ).exclude(isbn='').select_related('editora', 'assunto').afirst()
+
+    # ── Busca no catalogo ──────────────────────────────────
+
+    @staticmethod
+    def buscar_catalogo(q, apenas_ativas=True):
+        """
+        Busca no catalogo por titulo, autores, editora, assunto ou ISBN.
+
+        Usa o documento de busca normalizado da obra (sem acentos), com
+        casamento por prefixo de cada termo. Resultado ordenado por
+        relevancia (anotada como `relevancia`):
+
+        - PostgreSQL: tsvector + indice GIN, ranqueado por ts_rank
+        - SQLite: tabela FTS5, ranqueada por bm25
+        - outros bancos: filtro simples no documento, por titulo
+        """
+        obras = para_leitura(Obra).select_related(
+            'editora', 'assunto',
+        ).prefetch_related('autores')
+        if apenas_ativas:
+            obras = obras.filter(ativa=True)
+
+        termos = ObraRepository._termos_catalogo(q)
+        if not termos:
+            return obras.none()
+
+        vendor = connections[obras.db].vendor
+        if vendor == 'postgresql':
+            from django.contrib.postgres.search import (
+                SearchQuery, SearchRank, SearchVector,
+            )
+            vetor = SearchVector('documento_busca', config='simple')
+            consulta = SearchQuery(
+                ' & '.join(f'{termo}:*' for termo in termos),
+                config='simple',
+                search_type='raw',
+            )
+            return obras.alias(busca=vetor).filter(busca=consulta).annotate(
+                relevancia=SearchRank(vetor, consulta),
+            ).order_by('-relevancia', 'titulo')
+
+        if vendor == 'sqlite':
+            expressao = ' '.join(f'"{termo}"*' for termo in termos)
+            return obras.filter(
+                pk__in=RawSQL(
+                    f'SELECT rowid FROM {TABELA_FTS} WHERE {TABELA_FTS} MATCH %s',
+                    [expressao],
+                ),
+            ).annotate(
+                relevancia=RawSQL(
+                    f'SELECT -bm25({TABELA_FTS}) FROM {TABELA_FTS} '
+                    f'WHERE {TABELA_FTS} MATCH %s '
+                    f'AND rowid = "{Obra._meta.db_table}"."id"',
+                    [expressao],
+                    output_field=FloatField(),
+                ),
+            ).order_by('-relevancia', 'titulo')
+
+        filtro = Q()
+        for termo in termos:
+            filtro &= Q(documento_busca__contains=termo)
+        return obras.filter(filtro).order_by('titulo')
+
+    @staticmethod
+    def _termos_catalogo(q):
+        """Termos de busca; ISBN digitado com hifens vira um termo so."""
+        digitos = somente_digitos(q)
+        if len(digitos) >= 10 and not q.strip(' -0123456789xX'):
+            return [digitos]
+        return termos_busca(q)
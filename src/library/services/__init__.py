@@ -1,3 +1,5 @@
 from .biblioteca_service import BibliotecaService
+from .catalogo_service import CatalogoService
+from .atrasos_service import AtrasosService
 
-__all__ = ['BibliotecaService']
+__all__ = ['BibliotecaService', 'CatalogoService', 'AtrasosService']
@@ -0,0 +1,147 @@
+"""
+library.services.atrasos_service
+
+Deteccao incremental de emprestimos atrasados.
+
+BibliotecaService.atualizar_emprestimos_atrasados varre todos os
+emprestimos ativos a cada chamada. Este service faz o mesmo trabalho de
+forma incremental, para rodar periodicamente (cron) em acervos grandes:
+
+- Marca d'agua (watermark): a data de referencia da ultima execucao
+  concluida. Cada execucao so examina os emprestimos ativos com data
+  prevista entre o watermark e hoje — os anteriores ja foram marcados
+- Alteracoes retroativas: emprestimos ativos alterados desde a ultima
+  execucao (ex: data prevista movida para antes do watermark) sao
+  examinados numa segunda consulta, separada da janela
+- Indices parciais so com os ativos: emprestimo_ativo_prevista_idx
+  (data prevista, id) le a janela e emprestimo_ativo_alterado_idx
+  (atualizado_em, id) le os alterados, cada um na ordem dos seus lotes
+- Lotes: cada lote e marcado em uma transacao e os ids afetados sao
+  entregues ao callback ao_concluir_lote (ex: enviar notificacoes)
+- Auditoria: cada execucao grava um ProcessamentoAtrasos com a janela,
+  as contagens e a duracao
+"""
+
+import time
+
+from django.db import transaction
+from django.utils import timezone
+
+from library.models import Emprestimo, ProcessamentoAtrasos
+from library.services.biblioteca_service import BibliotecaService, TAMANHO_LOTE
+
+
+class AtrasosService:
+    """Marca como atrasados os emprestimos vencidos desde a ultima execucao."""
+
+    @staticmethod
+    def ultima_execucao():
+        """Ultimo ProcessamentoAtrasos concluido (ou None)."""
+        return ProcessamentoAtrasos.objects.filter(
+            status=ProcessamentoAtrasos.Status.CONCLUIDO,
+        ).order_by('-data_referencia', '-criado_em').first()
+
+    @staticmethod
+    def consultas_vencidos(data_referencia, desde=None):
+        """
+        Consultas dos emprestimos ativos vencidos antes de data_referencia.
+
+        Sem desde, uma unica consulta com todos os ativos vencidos. Com
+        desde (a ultima execucao concluida), duas consultas, cada uma
+        lida por um indice parcial e ordenada por ele:
+            - janela: data prevista a partir do watermark
+            - alterados: data prevista anterior ao watermark, mas
+              alterados depois da ultima execucao
+        Um OR das duas condicoes nao usaria nenhum dos indices.
+        """
+        vencidos = Emprestimo.objects.filter(
+            status=Emprestimo.Status.ATIVO,
+            data_prevista_devolucao__lt=data_referencia,
+        )
+        if desde is None:
+            return [vencidos.order_by('data_prevista_devolucao', 'pk')]
+        return [
+            vencidos.filter(
+                data_prevista_devolucao__gte=desde.data_referencia,
+            ).order_by('data_prevista_devolucao', 'pk'),
+            vencidos.filter(
+                data_prevista_devolucao__lt=desde.data_referencia,
+                atualizado_em__gte=desde.criado_em,
+            ).order_by('atualizado_em', 'pk'),
+        ]
+
+    @staticmethod
+    def processar(data_referencia=None, completo=False,
+                  tamanho_lote=TAMANHO_LOTE, ao_concluir_lote=None):
+        """
+        Marca como atrasados os emprestimos vencidos, em lotes.
+
+        Args:
+            data_referencia: emprestimos com data prevista anterior a ela
+                ficam atrasados (padrao: hoje).
+            completo: ignora o watermark e examina todos os ativos.
+            tamanho_lote: emprestimos por lote (uma transacao por lote).
+            ao_concluir_lote: callable opcional chamado com a lista de ids
+                marcados em cada lote, depois do commit.
+
+        Retorna o ProcessamentoAtrasos da execucao. Em caso de erro, o
+        registro fica com status 'falha' (os lotes ja concluidos
+        permanecem gravados) e a excecao e propagada.
+        """
+        data_referencia = data_referencia or timezone.localdate()
+        ultima = None if completo else AtrasosService.ultima_execucao()
+        processamento = ProcessamentoAtrasos.objects.create(
+            data_referencia=data_referencia,
+            watermark_anterior=ultima.data_referencia if ultima else None,
+        )
+        inicio = time.monotonic()
+
+        try:
+            consultas = AtrasosService.consultas_vencidos(
+                data_referencia, desde=ultima,
+            )
+            for vencidos in consultas:
+                AtrasosService._processar_lotes(
+                    vencidos, processamento, tamanho_lote, ao_concluir_lote,
+                )
+        except Exception as e:
+            processamento.status = ProcessamentoAtrasos.Status.FALHA
+            processamento.erro = repr(e)
+            raise
+        else:
+            processamento.status = ProcessamentoAtrasos.Status.CONCLUIDO
+        finally:
+            processamento.duracao_ms = round((time.monotonic() - inicio) * 1000)
+            processamento.save()
+
+        return processamento
+
+    @staticmethod
+    def _processar_lotes(vencidos, processamento, tamanho_lote,
+                         ao_concluir_lote):
+        """Marca os emprestimos de uma consulta, um lote por transacao."""
+        while True:
+            with transaction.atomic():
+                lote = list(
+                    vencidos.select_for_update(of=('self',))
+                    .values_list(
+                        'pk', 'exemplar__obra_id', 'exemplar__ativo',
+                    )[:tamanho_lote]
+                )
+                if not lote:
+                    return
+                ids = [pk for pk, _, _ in lote]
+                Emprestimo.objects.filter(pk__in=ids).update(
+                    status=Emprestimo.Status.ATRASADO,
+                    atualizado_em=timezone.now(),
+                )
+                processamento.obras_recalculadas += (
+                    BibliotecaService.contar_atrasos(
+                        (obra_id, ativo) for _, obra_id, ativo in lote
+                    )
+                )
+
+            processamento.lotes += 1
+            processamento.atualizados += len(ids)
+            if ao_concluir_lote is not None:
+                ao_concluir_lote(ids)
@@ -8,12 +8,62 @@ passar por este service. Admin e views NUNCA devem manipular Emprestimo
 ou Exemplar.situacao diretamente.
 """
 
+from collections import namedtuple
 from datetime import date
 
 from django.core.exceptions import ValidationError
 from django.db import transaction
+from django.db.models import (
+    Count, Exists, F, FilteredRelation, Func, OuterRef, Q, QuerySet, Subquery,
+)
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 
-from library.models import Emprestimo, Exemplar
+from academic.services import LinhaDoTempoService
+from library.models import Emprestimo, Exemplar, Obra
+
+
+# Tamanho dos lotes de INSERT usados nas operacoes em massa
+TAMANHO_LOTE = 500
+
+STATUS_ABERTOS = [Emprestimo.Status.ATIVO, Emprestimo.Status.ATRASADO]
+
+# Resultado de devolver_em_lote: ids devolvidos e ids ignorados (ja
+# devolvidos ou inexistentes), na ordem dos ids
+DevolucaoEmLote = namedtuple('DevolucaoEmLote', ['devolvidos', 'ignorados'])
+
+CAMPOS_CONTADORES_OBRA = [
+    'total_exemplares',
+    'exemplares_disponiveis',
+    'exemplares_emprestados',
+    'exemplares_atrasados',
+]
+
+
+def _contribuicao(ativo, situacao, atrasados=0):
+    """Quanto um exemplar soma a cada contador da sua obra."""
+    if not ativo:
+        return dict.fromkeys(CAMPOS_CONTADORES_OBRA, 0)
+    return {
+        'total_exemplares': int(situacao != Exemplar.Situacao.BAIXADO),
+        'exemplares_disponiveis': int(situacao == Exemplar.Situacao.DISPONIVEL),
+        'exemplares_emprestados': int(situacao == Exemplar.Situacao.EMPRESTADO),
+        'exemplares_atrasados': atrasados,
+    }
+
+
+def _acumular(deltas, obra_id, antes, depois):
+    """Soma em deltas[obra_id] a diferenca entre duas contribuicoes."""
+    delta = deltas.setdefault(obra_id, dict.fromkeys(CAMPOS_CONTADORES_OBRA, 0))
+    for campo in CAMPOS_CONTADORES_OBRA:
+        delta[campo] += depois.get(campo, 0) - antes.get(campo, 0)
+
+
+def _anexar_observacao(atual, observacao):
+    """Observacao do emprestimo com a nova observacao em uma linha a mais."""
+    if not observacao:
+        return atual
+    return f'{atual}\n{observacao}'.strip() if atual else observacao
 
 
 class BibliotecaService:
@@ -33,6 +83,12 @@ class BibliotecaService:
             ValidationError: se o exemplar nao esta disponivel.
             ValidationError: se o exemplar nao esta ativo.
         """
+        # Situacao relida sob bloqueio: os contadores da obra sao
+        # ajustados a partir dela
+        exemplar.ativo, exemplar.situacao = (
+            Exemplar.objects.select_for_update().filter(pk=exemplar.pk)
+            .values_list('ativo', 'situacao').get()
+        )
         if not exemplar.ativo:
             raise ValidationError(
                 f'O exemplar {exemplar.codigo_patrimonio} nao esta ativo.'
@@ -55,6 +111,7 @@ class BibliotecaService:
         )
 
         BibliotecaService._atualizar_situacao_exemplar(exemplar)
+        LinhaDoTempoService.registrar_emprestimos([emprestimo.pk])
 
         return emprestimo
 
@@ -67,32 +124,206 @@ class BibliotecaService:
         Atualiza o status do emprestimo para 'devolvido', registra a
         data de devolucao e atualiza a situacao do exemplar.
 
+        Bloqueia exemplar e emprestimo (na mesma ordem de
+        devolver_em_lote) e confere o status relido do banco, de modo que
+        duas devolucoes concorrentes do mesmo emprestimo nao passam ambas.
+
         Raises:
             ValidationError: se o emprestimo nao esta ativo nem atrasado.
         """
-        if emprestimo.status not in (
-            Emprestimo.Status.ATIVO,
-            Emprestimo.Status.ATRASADO,
-        ):
+        bloqueado = (
+            Emprestimo.objects.select_for_update(of=('self', 'exemplar'))
+            .select_related('exemplar')
+            .only(
+                'status', 'observacao', 'exemplar__obra_id',
+                'exemplar__ativo', 'exemplar__situacao',
+            )
+            .get(pk=emprestimo.pk)
+        )
+        emprestimo.status = bloqueado.status
+        emprestimo.observacao = bloqueado.observacao
+        if emprestimo.status not in STATUS_ABERTOS:
             raise ValidationError(
                 f'O emprestimo do exemplar {emprestimo.exemplar.codigo_patrimonio} '
                 f'nao esta ativo (status atual: {emprestimo.get_status_display()}).'
             )
 
+        atrasado = emprestimo.status == Emprestimo.Status.ATRASADO
         emprestimo.data_devolucao = data_devolucao or date.today()
         emprestimo.status = Emprestimo.Status.DEVOLVIDO
-        if observacao:
-            emprestimo.observacao = (
-                f'{emprestimo.observacao}\n{observacao}'.strip()
-                if emprestimo.observacao else observacao
-            )
+        emprestimo.observacao = _anexar_observacao(emprestimo.observacao, observacao)
         emprestimo.save(update_fields=[
             'data_devolucao', 'status', 'observacao', 'atualizado_em',
         ])
 
-        BibliotecaService._atualizar_situacao_exemplar(emprestimo.exemplar)
+        BibliotecaService._atualizar_situacao_exemplar(
+            bloqueado.exemplar, atrasos=-1 if atrasado else 0,
+        )
+        if Emprestimo.exemplar.is_cached(emprestimo):
+            emprestimo.exemplar.situacao = bloqueado.exemplar.situacao
+        LinhaDoTempoService.registrar_devolucoes([emprestimo.pk])
 
     @staticmethod
+    @transaction.atomic
+    def emprestar_em_lote(entradas):
+        """
+        Empresta varios exemplares de uma vez (ex: kit de livros da turma).
+
+        Cada entrada e um dict com as mesmas chaves de emprestar_exemplar:
+        exemplar, aluno, data_emprestimo, data_prevista_devolucao e,
+        opcionalmente, turma e observacao.
+
+        Os exemplares envolvidos sao bloqueados (SELECT ... FOR UPDATE)
+        com uma unica consulta, os emprestimos sao gravados com
+        bulk_create e a situacao de todos os exemplares e recalculada
+        num unico UPDATE.
+
+        Retorna uma lista (na ordem das entradas) de dicts com as chaves:
+            linha: indice da entrada (a partir de 0)
+            exemplar: exemplar da entrada
+            emprestimo: Emprestimo criado, ou None em caso de erro
+            erro: motivo da recusa, ou '' em caso de sucesso
+        """
+        entradas = list(entradas)
+        if not entradas:
+            return []
+
+        bloqueados = {
+            e.pk: e
+            for e in Exemplar.objects.select_for_update().filter(
+                pk__in={entrada['exemplar'].pk for entrada in entradas},
+            ).order_by('pk').only('pk', 'codigo_patrimonio', 'situacao', 'ativo')
+        }
+
+        relatorio = []
+        novos = []
+        reservados = set()
+        for linha, entrada in enumerate(entradas):
+            exemplar = entrada['exemplar']
+            atual = bloqueados.get(exemplar.pk, exemplar)
+            item = {
+                'linha': linha, 'exemplar': exemplar,
+                'emprestimo': None, 'erro': '',
+            }
+            relatorio.append(item)
+
+            if not atual.ativo:
+                item['erro'] = (
+                    f'O exemplar {atual.codigo_patrimonio} nao esta ativo.'
+                )
+                continue
+
+            if atual.pk in reservados:
+                item['erro'] = (
+                    f'O exemplar {atual.codigo_patrimonio} aparece mais de uma '
+                    f'vez no lote.'
+                )
+                continue
+
+            if atual.situacao != Exemplar.Situacao.DISPONIVEL:
+                item['erro'] = (
+                    f'O exemplar {atual.codigo_patrimonio} nao esta disponivel '
+                    f'(situacao atual: {atual.get_situacao_display()}).'
+                )
+                continue
+
+            reservados.add(atual.pk)
+            emprestimo = Emprestimo(
+                exemplar=exemplar,
+                aluno=entrada['aluno'],
+                turma=entrada.get('turma'),
+                data_emprestimo=entrada['data_emprestimo'],
+                data_prevista_devolucao=entrada['data_prevista_devolucao'],
+                status=Emprestimo.Status.ATIVO,
+                observacao=entrada.get('observacao', ''),
+            )
+            item['emprestimo'] = emprestimo
+            novos.append(emprestimo)
+
+        if novos:
+            Emprestimo.objects.bulk_create(novos, batch_size=TAMANHO_LOTE)
+            BibliotecaService._recalcular_situacao_exemplares(reservados)
+            for emprestimo in novos:
+                emprestimo.exemplar.situacao = Exemplar.Situacao.EMPRESTADO
+            LinhaDoTempoService.registrar_emprestimos([e.pk for e in novos])
+
+        return relatorio
+
+    @staticmethod
+    @transaction.atomic
+    def devolver_em_lote(emprestimos, data_devolucao=None, observacao=''):
+        """
+        Devolve varios emprestimos de uma vez.
+
+        Recebe um queryset ou uma lista de Emprestimo. Bloqueia numa
+        unica consulta, em ordem de exemplar, os emprestimos e os
+        exemplares envolvidos (SELECT ... FOR UPDATE), le o status ja sob
+        o bloqueio, grava os emprestimos abertos (ativos ou atrasados)
+        como devolvidos com bulk_update e recalcula a situacao dos
+        exemplares num unico UPDATE. Emprestimos ja devolvidos sao
+        ignorados.
+
+        Retorna DevolucaoEmLote(devolvidos, ignorados), listas de ids.
+        """
+        if isinstance(emprestimos, QuerySet):
+            selecionados = emprestimos.values('pk')
+            pedidos = None
+        else:
+            pedidos = [e.pk for e in emprestimos]
+            selecionados = pedidos
+
+        bloqueados = list(
+            Emprestimo.objects.select_for_update(of=('self', 'exemplar'))
+            .select_related('exemplar')
+            .filter(pk__in=selecionados)
+            .order_by('exemplar_id', 'pk')
+            .only(
+                'pk', 'status', 'observacao', 'aluno_id',
+                'exemplar__obra_id', 'exemplar__ativo',
+            )
+        )
+        abertos = [e for e in bloqueados if e.status in STATUS_ABERTOS]
+        encontrados = {e.pk for e in bloqueados}
+        ignorados = sorted(
+            {e.pk for e in bloqueados if e.status not in STATUS_ABERTOS}
+            | {pk for pk in pedidos or () if pk not in encontrados}
+        )
+        if not abertos:
+            return DevolucaoEmLote([], ignorados)
+
+        # Emprestimos atrasados devolvidos saem do contador da obra
+        atrasos = {}
+        for emprestimo in abertos:
+            if (emprestimo.status == Emprestimo.Status.ATRASADO
+                    and emprestimo.exemplar.ativo):
+                _acumular(
+                    atrasos, emprestimo.exemplar.obra_id,
+                    {'exemplares_atrasados': 1}, {},
+                )
+
+        agora = timezone.now()
+        for emprestimo in abertos:
+            emprestimo.data_devolucao = data_devolucao or date.today()
+            emprestimo.status = Emprestimo.Status.DEVOLVIDO
+            emprestimo.observacao = _anexar_observacao(
+                emprestimo.observacao, observacao,
+            )
+            emprestimo.atualizado_em = agora
+        Emprestimo.objects.bulk_update(
+            abertos,
+            ['data_devolucao', 'status', 'observacao', 'atualizado_em'],
+            batch_size=TAMANHO_LOTE,
+        )
+
+        BibliotecaService._recalcular_situacao_exemplares(
+            {e.exemplar_id for e in bloqueados}, atrasos,
+        )
+        LinhaDoTempoService.registrar_devolucoes([e.pk for e in abertos])
+
+        return DevolucaoEmLote(sorted(e.pk for e in abertos), ignorados)
+
+    @staticmethod
+    @transaction.atomic
     def atualizar_emprestimos_atrasados():
         """
         Atualiza emprestimos ativos com data prevista no passado para 'atrasado'.
@@ -100,22 +331,229 @@ class BibliotecaService:
         Pode ser chamado periodicamente (cron, celery, management command).
         """
         hoje = date.today()
-        return Emprestimo.objects.filter(
-            status=Emprestimo.Status.ATIVO,
-            data_prevista_devolucao__lt=hoje,
-        ).update(status=Emprestimo.Status.ATRASADO)
+        vencidos = list(
+            Emprestimo.objects.select_for_update(of=('self',)).filter(
+                status=Emprestimo.Status.ATIVO,
+                data_prevista_devolucao__lt=hoje,
+            ).order_by('pk').values_list('pk', 'exemplar__obra_id', 'exemplar__ativo')
+        )
+        if not vencidos:
+            return 0
+        atualizados = Emprestimo.objects.filter(
+            pk__in=[pk for pk, _, _ in vencidos],
+        ).update(status=Emprestimo.Status.ATRASADO, atualizado_em=timezone.now())
+        BibliotecaService.contar_atrasos(
+            (obra_id, ativo) for _, obra_id, ativo in vencidos
+        )
+        return atualizados
 
     @staticmethod
-    def _atualizar_situacao_exemplar(exemplar):
+    @transaction.atomic
+    def salvar_exemplar(exemplar):
+        """
+        Cria ou altera um exemplar (inclusive ativacao/desativacao).
+
+        Ajusta os contadores de exemplares da obra — e da obra anterior,
+        caso o exemplar tenha sido movido de obra. A situacao e relida
+        sob bloqueio: ela e mantida por este service, nao pelo formulario.
+        """
+        antes = {}
+        if exemplar.pk:
+            exemplar.situacao = Exemplar.objects.select_for_update().filter(
+                pk=exemplar.pk,
+            ).values_list('situacao', flat=True).get()
+            antes = BibliotecaService.contribuicao_exemplares([exemplar.pk])
+        exemplar.save()
+        BibliotecaService.ajustar_contadores_obras(
+            antes, BibliotecaService.contribuicao_exemplares([exemplar.pk]),
+        )
+
+    @staticmethod
+    def contribuicao_exemplares(exemplar_ids):
+        """
+        Quanto os exemplares informados somam aos contadores, por obra.
+
+        Retorna um dict obra_id -> {contador: valor}. Usado em pares —
+        antes e depois de alterar ou excluir exemplares — com
+        ajustar_contadores_obras.
+        """
+        linhas = Exemplar.objects.filter(pk__in=exemplar_ids).order_by().annotate(
+            atrasado=FilteredRelation(
+                'emprestimos',
+                condition=Q(emprestimos__status=Emprestimo.Status.ATRASADO),
+            ),
+        ).values('obra_id').annotate(
+            total_exemplares=Count(
+                'pk', filter=Q(ativo=True) & ~Q(situacao=Exemplar.Situacao.BAIXADO),
+            ),
+            exemplares_disponiveis=Count(
+                'pk', filter=Q(ativo=True, situacao=Exemplar.Situacao.DISPONIVEL),
+            ),
+            exemplares_emprestados=Count(
+                'pk', filter=Q(ativo=True, situacao=Exemplar.Situacao.EMPRESTADO),
+            ),
+            exemplares_atrasados=Count('atrasado', filter=Q(ativo=True)),
+        )
+        return {linha.pop('obra_id'): linha for linha in linhas}
+
+    @staticmethod
+    def ajustar_contadores_obras(antes, depois):
+        """
+        Aplica aos contadores a diferenca entre duas contribuicoes.
+
+        antes e depois sao dicts obra_id -> {contador: valor}, como os de
+        contribuicao_exemplares.
+        """
+        deltas = {}
+        for obra_id in antes.keys() | depois.keys():
+            _acumular(deltas, obra_id, antes.get(obra_id, {}), depois.get(obra_id, {}))
+        return BibliotecaService.incrementar_contadores_obras(deltas)
+
+    @staticmethod
+    def contar_atrasos(exemplares):
+        """
+        Soma 1 ao contador de atrasados da obra de cada exemplar informado.
+
+        Recebe pares (obra_id, ativo) dos exemplares cujo emprestimo
+        acabou de ficar atrasado; exemplares inativos nao contam.
+        """
+        deltas = {}
+        for obra_id, ativo in exemplares:
+            if ativo:
+                _acumular(deltas, obra_id, {}, {'exemplares_atrasados': 1})
+        return BibliotecaService.incrementar_contadores_obras(deltas)
+
+    @staticmethod
+    def incrementar_contadores_obras(deltas):
+        """
+        Soma deltas aos contadores gravados das obras, com F().
+
+        deltas e um dict obra_id -> {contador: incremento}. Obras com o
+        mesmo conjunto de incrementos sao atualizadas no mesmo UPDATE,
+        sem recontar exemplares; obras sem alteracao nao sao gravadas.
+        atualizado_em tambem e atualizado (versao da disponibilidade na
+        API do acervo).
+
+        Retorna o numero de obras atualizadas.
+        """
+        grupos = {}
+        for obra_id, delta in deltas.items():
+            chave = tuple(sorted(
+                (campo, valor) for campo, valor in delta.items() if valor
+            ))
+            if chave and obra_id is not None:
+                grupos.setdefault(chave, []).append(obra_id)
+
+        atualizadas = 0
+        agora = timezone.now()
+        for chave, obra_ids in grupos.items():
+            atualizadas += Obra.objects.filter(pk__in=obra_ids).update(
+                **{campo: F(campo) + valor for campo, valor in chave},
+                atualizado_em=agora,
+            )
+        return atualizadas
+
+    @staticmethod
+    def recalcular_contadores_obras(obra_ids=None):
+        """
+        Recalcula os contadores de exemplares das obras informadas.
+
+        Usa um unico UPDATE com subconsultas correlacionadas, restrito as
+        obras informadas. Com obra_ids=None recalcula o acervo inteiro
+        (comando recalcular_contadores_acervo, seeds). Emprestimos,
+        devolucoes e alteracoes de exemplares nao recontam: ajustam os
+        contadores com incrementar_contadores_obras.
+
+        So grava as obras cujos contadores mudaram, atualizando tambem
+        atualizado_em: a API do acervo usa esse campo como versao
+        (ETag/Last-Modified) da disponibilidade.
+
+        Retorna o numero de obras atualizadas.
+        """
+        obras = Obra.objects.all()
+        if obra_ids is not None:
+            if not isinstance(obra_ids, QuerySet):
+                obra_ids = [pk for pk in obra_ids if pk is not None]
+                if not obra_ids:
+                    return 0
+            obras = obras.filter(pk__in=obra_ids)
+        expressoes = BibliotecaService.expressoes_contadores_obra()
+        divergente = Q()
+        for campo, expressao in expressoes.items():
+            divergente |= ~Q(**{campo: expressao})
+        return obras.filter(divergente).update(
+            **expressoes,
+            atualizado_em=timezone.now(),
+        )
+
+    @staticmethod
+    def auditar_contadores_acervo():
+        """
+        Lista as obras cujos contadores gravados divergem do acervo real.
+
+        Cada obra vem anotada com esperado_<campo> para cada contador.
+        """
+        esperados = {
+            f'esperado_{campo}': expressao
+            for campo, expressao
+            in BibliotecaService.expressoes_contadores_obra().items()
+        }
+        divergente = Q()
+        for campo in CAMPOS_CONTADORES_OBRA:
+            divergente |= ~Q(**{campo: F(f'esperado_{campo}')})
+        return Obra.objects.annotate(**esperados).filter(divergente)
+
+    @staticmethod
+    def expressoes_contadores_obra():
+        """
+        Expressoes que calculam os contadores de exemplares de cada Obra.
+
+        Retorna um dict campo -> expressao, usado tanto para gravar os
+        contadores (UPDATE) quanto para auditar divergencias (annotate).
+        """
+        ativos = Exemplar.objects.filter(obra=OuterRef('pk'), ativo=True)
+
+        def contagem(queryset):
+            return Coalesce(
+                Subquery(
+                    queryset.order_by().annotate(
+                        total=Func(F('pk'), function='COUNT'),
+                    ).values('total')
+                ),
+                0,
+            )
+
+        return {
+            'total_exemplares': contagem(
+                ativos.exclude(situacao=Exemplar.Situacao.BAIXADO),
+            ),
+            'exemplares_disponiveis': contagem(
+                ativos.filter(situacao=Exemplar.Situacao.DISPONIVEL),
+            ),
+            'exemplares_emprestados': contagem(
+                ativos.filter(situacao=Exemplar.Situacao.EMPRESTADO),
+            ),
+            'exemplares_atrasados': contagem(
+                ativos.filter(emprestimos__status=Emprestimo.Status.ATRASADO),
+            ),
+        }
+
+    @staticmethod
+    def _atualizar_situacao_exemplar(exemplar, atrasos=0):
         """
         Atualiza a situacao do exemplar com base nos emprestimos ativos.
 
         - Se tem emprestimo ativo ou atrasado -> emprestado
         - Se nao tem e esta ativo e nao esta baixado -> disponivel
+
+        Ajusta os contadores da obra pela mudanca de situacao e por
+        atrasos (variacao de emprestimos atrasados do exemplar, ex: -1 na
+        devolucao de um atrasado).
         """
+        antes = _contribuicao(exemplar.ativo, exemplar.situacao)
         tem_emprestimo_aberto = Emprestimo.objects.filter(
             exemplar=exemplar,
-            status__in=[Emprestimo.Status.ATIVO, Emprestimo.Status.ATRASADO],
+            status__in=STATUS_ABERTOS,
         ).exists()
 
         if tem_emprestimo_aberto:
@@ -123,8 +561,70 @@ class BibliotecaService:
         elif exemplar.ativo and exemplar.situacao != Exemplar.Situacao.BAIXADO:
             nova_situacao = Exemplar.Situacao.DISPONIVEL
         else:
-            return
+            nova_situacao = exemplar.situacao
 
         if exemplar.situacao != nova_situacao:
             exemplar.situacao = nova_situacao
             exemplar.save(update_fields=['situacao', 'atualizado_em'])
+
+        deltas = {}
+        _acumular(
+            deltas, exemplar.obra_id, antes,
+            _contribuicao(exemplar.ativo, exemplar.situacao, atrasos),
+        )
+        BibliotecaService.incrementar_contadores_obras(deltas)
+
+    @staticmethod
+    def _recalcular_situacao_exemplares(exemplar_ids, atrasos=None):
+        """
+        Versao set-based de _atualizar_situacao_exemplar.
+
+        Aplica a mesma regra a todos os exemplares informados (ja
+        bloqueados pelo chamador): le apenas as linhas cuja situacao
+        muda, grava cada nova situacao com um UPDATE e ajusta os
+        contadores das obras envolvidas, somando os deltas de atrasos
+        (dict obra_id -> {contador: incremento}).
+        """
+        tem_emprestimo_aberto = Exists(
+            Emprestimo.objects.filter(
+                exemplar=OuterRef('pk'),
+                status__in=STATUS_ABERTOS,
+            )
+        )
+        mudam = Exemplar.objects.filter(
+            pk__in=exemplar_ids,
+        ).filter(
+            (tem_emprestimo_aberto & ~Q(situacao=Exemplar.Situacao.EMPRESTADO))
+            | (
+                ~tem_emprestimo_aberto
+                & Q(ativo=True)
+                & ~Q(situacao__in=[
+                    Exemplar.Situacao.BAIXADO,
+                    Exemplar.Situacao.DISPONIVEL,
+                ])
+            )
+        ).annotate(
+            aberto=tem_emprestimo_aberto,
+        ).values_list('pk', 'obra_id', 'ativo', 'situacao', 'aberto')
+
+        deltas = {obra_id: dict(delta) for obra_id, delta in (atrasos or {}).items()}
+        por_situacao = {}
+        for pk, obra_id, ativo, situacao, aberto in mudam:
+            nova_situacao = (
+                Exemplar.Situacao.EMPRESTADO if aberto
+                else Exemplar.Situacao.DISPONIVEL
+            )
+            por_situacao.setdefault(nova_situacao, []).append(pk)
+            _acumular(
+                deltas, obra_id,
+                _contribuicao(ativo, situacao), _contribuicao(ativo, nova_situacao),
+            )
+
+        atualizados = 0
+        agora = timezone.now()
+        for nova_situacao, ids in por_situacao.items():
+            atualizados += Exemplar.objects.filter(pk__in=ids).update(
+                situacao=nova_situacao, atualizado_em=agora,
+            )
+        BibliotecaService.incrementar_contadores_obras(deltas)
+        return atualizados
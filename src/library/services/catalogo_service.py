@@ -0,0 +1,107 @@
+"""
+library.services.catalogo_service
+
+Indice de busca do catalogo (acervo) da biblioteca.
+
+Cada Obra guarda um documento de busca precomputado e normalizado
+(minusculas, sem acentos) com titulo, autores, editora, assunto e ISBN.
+O documento e indexado por:
+
+- PostgreSQL: indice GIN sobre to_tsvector('simple', documento_busca)
+- SQLite (testes locais): tabela virtual FTS5 library_obra_fts
+
+A consulta fica em ObraRepository.buscar_catalogo(). Este service mantem
+o documento atualizado — deve ser chamado sempre que titulo, ISBN,
+autores, editora ou assunto de uma obra mudarem.
+"""
+
+from itertools import islice
+
+from django.core.paginator import Paginator
+from django.db import connections, transaction
+
+from core.texto import normalizar_texto, somente_digitos
+from library.models import Obra
+from library.repositories import ObraRepository
+from library.repositories.obra_repository import TABELA_FTS
+
+
+# Tamanho dos lotes de reindexacao
+TAMANHO_LOTE = 500
+
+
+class CatalogoService:
+    """Mantem e consulta o indice de busca do acervo."""
+
+    @staticmethod
+    def montar_documento(obra):
+        """
+        Monta o documento de busca normalizado de uma obra.
+
+        Espera editora, assunto e autores ja carregados (select_related /
+        prefetch_related) para nao gerar consultas extras.
+        """
+        partes = [obra.titulo]
+        partes.extend(autor.nome for autor in obra.autores.all())
+        if obra.editora_id:
+            partes.append(obra.editora.nome)
+        if obra.assunto_id:
+            partes.append(obra.assunto.nome)
+        if obra.isbn:
+            partes.extend([obra.isbn, somente_digitos(obra.isbn)])
+        return normalizar_texto(' '.join(partes))
+
+    @staticmethod
+    @transaction.atomic
+    def indexar_obras(obra_ids=None):
+        """
+        Recalcula o documento de busca das obras informadas.
+
+        obra_ids pode ser uma lista de ids ou um queryset (subconsulta).
+        Com obra_ids=None reindexa o acervo inteiro. Processa em lotes
+        com bulk_update e, no SQLite, sincroniza a tabela FTS5.
+
+        Retorna o numero de obras reindexadas.
+        """
+        obras = Obra.objects.select_related(
+            'editora', 'assunto',
+        ).prefetch_related('autores').order_by('pk')
+        if obra_ids is not None:
+            obras = obras.filter(pk__in=obra_ids)
+
+        total = 0
+        iterador = obras.iterator(chunk_size=TAMANHO_LOTE)
+        while lote := list(islice(iterador, TAMANHO_LOTE)):
+            for obra in lote:
+                obra.documento_busca = CatalogoService.montar_documento(obra)
+            Obra.objects.bulk_update(lote, ['documento_busca'])
+            CatalogoService._sincronizar_fts(lote)
+            total += len(lote)
+        return total
+
+    @staticmethod
+    def buscar(q, pagina=1, por_pagina=25, apenas_ativas=True):
+        """
+        Busca ranqueada no catalogo, paginada.
+
+        Retorna uma Page do Paginator do Django com as obras ordenadas
+        por relevancia.
+        """
+        obras = ObraRepository.buscar_catalogo(q, apenas_ativas=apenas_ativas)
+        return Paginator(obras, por_pagina).get_page(pagina)
+
+    @staticmethod
+    def _sincronizar_fts(obras):
+        """Espelha os documentos na tabela FTS5 (somente SQLite)."""
+        connection = connections[Obra.objects.db]
+        if connection.vendor != 'sqlite':
+            return
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'DELETE FROM {TABELA_FTS} WHERE rowid = %s',
+                [(obra.pk,) for obra in obras],
+            )
+            cursor.executemany(
+                f'INSERT INTO {TABELA_FTS} (rowid, documento) VALUES (%s, %s)',
+                [(obra.pk, obra.documento_busca) for obra in obras],
+            )
@@ -0,0 +1,14 @@
+from django.urls import path
+
+from . import views
+
+app_name = 'library'
+
+urlpatterns = [
+    path('obras/', views.listar_obras, name='api_obras'),
+    path(
+        'obras/<int:obra_id>/exemplares/',
+        views.listar_exemplares,
+        name='api_exemplares',
+    ),
+]
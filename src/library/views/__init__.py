@@ -0,0 +1,3 @@
+from .acervo_views import listar_exemplares, listar_obras
+
+__all__ = ['listar_obras', 'listar_exemplares']
@@ -0,0 +1,164 @@
+"""
+library.views.acervo_views
+
+API JSON somente leitura do acervo, para os terminais de consulta da
+biblioteca (disponibilidade de exemplares).
+
+- /api/acervo/obras/: obras ativas por titulo
+- /api/acervo/obras/<id>/exemplares/: exemplares ativos da obra
+
+Listas paginadas por cursor (?cursor=...&limite=N; a resposta traz
+`proximo` enquanto houver mais itens). Cada resposta leva ETag e
+Last-Modified calculados a partir de ModeloBase.atualizado_em (uma
+consulta de agregacao); um GET condicional com a versao que o cliente ja
+tem recebe 304 sem que a pagina seja consultada.
+"""
+
+from django.http import Http404, JsonResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from django.views.decorators.http import require_GET
+
+from core.paginacao import CursorInvalido, paginar
+from library.repositories import ExemplarRepository, ObraRepository
+
+
+LIMITE_PADRAO = 50
+LIMITE_MAXIMO = 200
+
+# Colunas lidas do banco (e devolvidas) por recurso
+CAMPOS_OBRA = (
+    'id', 'titulo', 'isbn', 'ano_publicacao', 'editora__nome', 'assunto__nome',
+    'total_exemplares', 'exemplares_disponiveis', 'atualizado_em',
+)
+ORDENACAO_OBRA = ('titulo', 'pk')
+
+CAMPOS_EXEMPLAR = (
+    'id', 'codigo_patrimonio', 'situacao', 'estado_fisico', 'atualizado_em',
+)
+ORDENACAO_EXEMPLAR = ('codigo_patrimonio', 'pk')
+
+
+class ParametroInvalido(ValueError):
+    """Parametro de consulta invalido (ex: limite)."""
+
+
+def _limite(request):
+    try:
+        limite = int(request.GET.get('limite', LIMITE_PADRAO))
+    except ValueError:
+        raise ParametroInvalido('limite deve ser um numero inteiro.')
+    if not 1 <= limite <= LIMITE_MAXIMO:
+        raise ParametroInvalido(f'limite deve estar entre 1 e {LIMITE_MAXIMO}.')
+    return limite
+
+
+def _erro(mensagem, status=400):
+    return JsonResponse({'erro': mensagem}, status=status)
+
+
+def _versao(*partes):
+    """
+    (etag, last_modified) de uma ou mais versoes (quantidade, atualizado_em).
+
+    A quantidade entra no ETag porque remover/desativar um registro nao
+    altera o maior atualizado_em dos que restam.
+    """
+    datas = [atualizado_em for _, atualizado_em in partes if atualizado_em]
+    ultima = max(datas) if datas else None
+    etag = '-'.join(
+        f'{quantidade}.{int(atualizado_em.timestamp() * 1_000_000) if atualizado_em else 0}'
+        for quantidade, atualizado_em in partes
+    )
+    return quote_etag(etag), ultima
+
+
+def _resposta_condicional(request, versao, montar):
+    """304 se o cliente ja tem a versao; senao a resposta de `montar()`."""
+    etag, ultima = versao
+    timestamp = int(ultima.timestamp()) if ultima else None
+    resposta = get_conditional_response(
+        request, etag=etag, last_modified=timestamp,
+    )
+    if resposta is None:
+        try:
+            resposta = montar()
+        except CursorInvalido as erro:
+            return _erro(str(erro))
+    resposta['ETag'] = etag
+    if timestamp is not None:
+        resposta['Last-Modified'] = http_date(timestamp)
+    # Pode guardar, mas deve revalidar sempre (polling dos terminais)
+    patch_cache_control(resposta, no_cache=True)
+    return resposta
+
+
+def _obra_json(obra, autores):
+    return {
+        'id': obra['id'],
+        'titulo': obra['titulo'],
+        'autores': autores.get(obra['id'], []),
+        'isbn': obra['isbn'],
+        'ano_publicacao': obra['ano_publicacao'],
+        'editora': obra['editora__nome'],
+        'assunto': obra['assunto__nome'],
+        'total_exemplares': obra['total_exemplares'],
+        'exemplares_disponiveis': obra['exemplares_disponiveis'],
+        'atualizado_em': obra['atualizado_em'],
+    }
+
+
+@require_GET
+def listar_obras(request):
+    try:
+        limite = _limite(request)
+    except ParametroInvalido as erro:
+        return _erro(str(erro))
+
+    def montar():
+        pagina = paginar(
+            ObraRepository.valores_acervo(CAMPOS_OBRA),
+            ORDENACAO_OBRA,
+            request.GET.get('cursor'),
+            limite,
+        )
+        autores = ObraRepository.autores_por_obra([o['id'] for o in pagina.itens])
+        return JsonResponse({
+            'obras': [_obra_json(obra, autores) for obra in pagina.itens],
+            'proximo': pagina.proximo_cursor,
+        })
+
+    return _resposta_condicional(
+        request, _versao(ObraRepository.versao_acervo()), montar,
+    )
+
+
+@require_GET
+def listar_exemplares(request, obra_id):
+    try:
+        limite = _limite(request)
+    except ParametroInvalido as erro:
+        return _erro(str(erro))
+    obra = ObraRepository.buscar_valores_acervo(obra_id, CAMPOS_OBRA)
+    if obra is None:
+        raise Http404('Obra nao encontrada.')
+
+    def montar():
+        pagina = paginar(
+            ExemplarRepository.valores_por_obra(obra_id, CAMPOS_EXEMPLAR),
+            ORDENACAO_EXEMPLAR,
+            request.GET.get('cursor'),
+            limite,
+        )
+        autores = ObraRepository.autores_por_obra([obra_id])
+        return JsonResponse({
+            'obra': _obra_json(obra, autores),
+            'exemplares': pagina.itens,
+            'proximo': pagina.proximo_cursor,
+        })
+
+    versao = _versao(
+        (1, obra['atualizado_em']),
+        ExemplarRepository.versao_por_obra(obra_id),
+    )
+    return _resposta_condicional(request, versao, montar)
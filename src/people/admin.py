@@ -1,6 +1,15 @@
 from django.contrib import admin
+from django.utils.html import format_html, format_html_join
 
-from core.admin_mixins import SemIconesRelacionaisMixin
+from academic.repositories import LinhaDoTempoRepository
+from academic.services import LinhaDoTempoService
+
+from core.admin_mixins import (
+    ConsultaOtimizadaMixin,
+    InlineOtimizadoMixin,
+    SemIconesRelacionaisMixin,
+)
+from .admin_mixins import BuscaPessoaAdminMixin, BuscaPorPerfilAdminMixin
 from .forms import (
     PessoaForm,
     AlunoForm,
@@ -19,6 +28,47 @@ from .models import (
 )
 
 
+# ───────────────────────────────────────────────
+# Mixins
+# ───────────────────────────────────────────────
+
+class LinhaDoTempoAdminMixin:
+    """Atualiza a linha do tempo dos alunos cujos vinculos com
+    responsaveis foram alterados pelo admin (form, inlines ou exclusao)."""
+
+    def alunos_afetados(self, obj):
+        if isinstance(obj, Aluno):
+            return [obj.pk]
+        if isinstance(obj, Responsavel):
+            return obj.alunos.values_list('aluno_id', flat=True)
+        return [obj.aluno_id]
+
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        # Inclui alunos desvinculados nos inlines
+        removidos = [
+            vinculo.aluno_id
+            for formset in formsets
+            for vinculo in getattr(formset, 'deleted_objects', [])
+            if isinstance(vinculo, AlunoResponsavel)
+        ]
+        LinhaDoTempoService.atualizar_alunos(
+            [*self.alunos_afetados(form.instance), *removidos]
+        )
+
+    def delete_model(self, request, obj):
+        alunos = list(self.alunos_afetados(obj))
+        super().delete_model(request, obj)
+        LinhaDoTempoService.atualizar_alunos(alunos)
+
+    def delete_queryset(self, request, queryset):
+        alunos = [
+            pk for obj in queryset for pk in self.alunos_afetados(obj)
+        ]
+        super().delete_queryset(request, queryset)
+        LinhaDoTempoService.atualizar_alunos(alunos)
+
+
 # ───────────────────────────────────────────────
 # Inlines — permitem editar perfis diretamente na tela de Pessoa
 # ───────────────────────────────────────────────
@@ -55,7 +105,8 @@ class ResponsavelInline(SemIconesRelacionaisMixin, admin.StackedInline):
 # Inlines — vinculos aluno-responsavel
 # ───────────────────────────────────────────────
 
-class AlunoResponsavelInlineParaAluno(SemIconesRelacionaisMixin, admin.TabularInline):
+class AlunoResponsavelInlineParaAluno(SemIconesRelacionaisMixin, InlineOtimizadoMixin,
+                                      admin.TabularInline):
     """Mostra responsaveis do aluno na tela do Aluno."""
     model = AlunoResponsavel
     form = AlunoResponsavelForm
@@ -66,7 +117,9 @@ class AlunoResponsavelInlineParaAluno(SemIconesRelacionaisMixin, admin.TabularIn
     verbose_name_plural = 'responsaveis'
 
 
-class AlunoResponsavelInlineParaResponsavel(SemIconesRelacionaisMixin, admin.TabularInline):
+class AlunoResponsavelInlineParaResponsavel(SemIconesRelacionaisMixin,
+                                            InlineOtimizadoMixin,
+                                            admin.TabularInline):
     """Mostra alunos vinculados na tela do Responsavel."""
     model = AlunoResponsavel
     form = AlunoResponsavelForm
@@ -82,11 +135,14 @@ class AlunoResponsavelInlineParaResponsavel(SemIconesRelacionaisMixin, admin.Tab
 # ───────────────────────────────────────────────
 
 @admin.register(Pessoa)
-class PessoaAdmin(SemIconesRelacionaisMixin, admin.ModelAdmin):
+class PessoaAdmin(SemIconesRelacionaisMixin, ConsultaOtimizadaMixin,
+                  BuscaPessoaAdminMixin, admin.ModelAdmin):
     form = PessoaForm
     list_display = ('nome', 'cpf', 'email', 'telefone', 'ativo')
     list_filter = ('ativo',)
     search_fields = ('nome', 'cpf', 'email')
+    caminho_pessoa = ''
+    campo_matricula = 'aluno__matricula'
     list_editable = ('ativo',)
     list_per_page = 25
     inlines = [AlunoInline, ProfessorInline, FuncionarioInline, ResponsavelInline]
@@ -107,14 +163,21 @@ class PessoaAdmin(SemIconesRelacionaisMixin, admin.ModelAdmin):
 
 
 @admin.register(Aluno)
-class AlunoAdmin(SemIconesRelacionaisMixin, admin.ModelAdmin):
+class AlunoAdmin(SemIconesRelacionaisMixin, ConsultaOtimizadaMixin,
+                 BuscaPessoaAdminMixin, LinhaDoTempoAdminMixin,
+                 admin.ModelAdmin):
     form = AlunoForm
     list_display = ('pessoa', 'matricula', 'data_ingresso', 'situacao')
     list_filter = ('situacao',)
     search_fields = ('pessoa__nome', 'matricula')
+    campo_matricula = 'matricula'
+    campo_nome = 'nome_ordenacao'
     list_per_page = 25
     autocomplete_fields = ('pessoa',)
     inlines = [AlunoResponsavelInlineParaAluno]
+    readonly_fields = ('linha_do_tempo',)
+    # Eventos mais recentes exibidos na tela do aluno
+    eventos_linha_do_tempo = 50
     fieldsets = (
         ('Vinculo', {
             'fields': ('pessoa',),
@@ -122,15 +185,38 @@ class AlunoAdmin(SemIconesRelacionaisMixin, admin.ModelAdmin):
         ('Dados academicos', {
             'fields': ('matricula', 'data_ingresso', 'situacao'),
         }),
+        ('Historico', {
+            'fields': ('linha_do_tempo',),
+            'classes': ('collapse',),
+        }),
     )
 
+    @admin.display(description='linha do tempo')
+    def linha_do_tempo(self, obj):
+        if not obj.pk:
+            return '—'
+        eventos = LinhaDoTempoRepository.listar_por_aluno(
+            obj, limite=self.eventos_linha_do_tempo,
+        )
+        itens = format_html_join(
+            '', '<li><strong>{}</strong> — {}<br><small>{}</small></li>',
+            (
+                (f'{e.data:%d/%m/%Y}', e.titulo, e.detalhes)
+                for e in eventos
+            ),
+        )
+        return format_html('<ul>{}</ul>', itens) if itens else 'Sem eventos.'
+
 
 @admin.register(Professor)
-class ProfessorAdmin(SemIconesRelacionaisMixin, admin.ModelAdmin):
+class ProfessorAdmin(SemIconesRelacionaisMixin, ConsultaOtimizadaMixin,
+                     BuscaPessoaAdminMixin, admin.ModelAdmin):
     form = ProfessorForm
     list_display = ('pessoa', 'formacao', 'carga_horaria_max', 'ativo')
     list_filter = ('ativo',)
     search_fields = ('pessoa__nome', 'formacao')
+    campos_busca_extra = ('formacao',)
+    campo_nome = 'nome_ordenacao'
     list_editable = ('ativo',)
     list_per_page = 25
     autocomplete_fields = ('pessoa',)
@@ -148,11 +234,14 @@ class ProfessorAdmin(SemIconesRelacionaisMixin, admin.ModelAdmin):
 
 
 @admin.register(Funcionario)
-class FuncionarioAdmin(SemIconesRelacionaisMixin, admin.ModelAdmin):
+class FuncionarioAdmin(SemIconesRelacionaisMixin, ConsultaOtimizadaMixin,
+                       BuscaPessoaAdminMixin, admin.ModelAdmin):
     form = FuncionarioForm
     list_display = ('pessoa', 'cargo', 'setor', 'ativo')
     list_filter = ('ativo', 'setor')
     search_fields = ('pessoa__nome', 'cargo', 'setor')
+    campos_busca_extra = ('cargo', 'setor')
+    campo_nome = 'nome_ordenacao'
     list_editable = ('ativo',)
     list_per_page = 25
     autocomplete_fields = ('pessoa',)
@@ -170,11 +259,14 @@ class FuncionarioAdmin(SemIconesRelacionaisMixin, admin.ModelAdmin):
 
 
 @admin.register(Responsavel)
-class ResponsavelAdmin(SemIconesRelacionaisMixin, admin.ModelAdmin):
+class ResponsavelAdmin(SemIconesRelacionaisMixin, ConsultaOtimizadaMixin,
+                       BuscaPessoaAdminMixin, LinhaDoTempoAdminMixin,
+                       admin.ModelAdmin):
     form = ResponsavelForm
     list_display = ('pessoa', 'tipo', 'ativo')
     list_filter = ('ativo', 'tipo')
     search_fields = ('pessoa__nome',)
+    campo_nome = 'nome_ordenacao'
     list_editable = ('ativo',)
     list_per_page = 25
     autocomplete_fields = ('pessoa',)
@@ -193,13 +285,16 @@ class ResponsavelAdmin(SemIconesRelacionaisMixin, admin.ModelAdmin):
 
 
 @admin.register(AlunoResponsavel)
-class AlunoResponsavelAdmin(SemIconesRelacionaisMixin, admin.ModelAdmin):
+class AlunoResponsavelAdmin(SemIconesRelacionaisMixin, ConsultaOtimizadaMixin,
+                            BuscaPorPerfilAdminMixin, LinhaDoTempoAdminMixin,
+                            admin.ModelAdmin):
     form = AlunoResponsavelForm
     list_display = ('aluno', 'responsavel', 'tipo_vinculo',
                     'responsavel_principal', 'autorizado_retirar_aluno')
     list_filter = ('tipo_vinculo', 'responsavel_principal',
                    'autorizado_retirar_aluno')
     search_fields = ('aluno__pessoa__nome', 'responsavel__pessoa__nome')
+    perfis_busca = ('aluno', 'responsavel')
     list_per_page = 25
     autocomplete_fields = ('aluno', 'responsavel')
     fieldsets = (
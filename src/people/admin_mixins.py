@@ -0,0 +1,74 @@
+"""
+people.admin_mixins
+
+Busca de pessoas no Django Admin, pelo BuscaPessoaService em vez de
+ILIKE '%termo%' nos joins ate Pessoa.
+
+- BuscaPessoaAdminMixin: admins de Pessoa e dos perfis (Aluno,
+  Professor, Funcionario, Responsavel) e os autocompletes que apontam
+  para eles
+- BuscaPorPerfilAdminMixin: admins de models que apontam para perfis
+  (matriculas, emprestimos, vinculos); o termo vira a subconsulta de ids
+  dos perfis (aluno__in=...), e so os demais search_fields usam icontains
+"""
+
+from django.db.models import Q
+
+from people.services import BuscaPessoaService
+
+
+class BuscaPessoaAdminMixin:
+    """Roteia a busca (changelist e autocomplete) pelo BuscaPessoaService.
+
+    caminho_pessoa: caminho ate Pessoa a partir do model do admin.
+    campo_matricula: caminho ate Aluno.matricula, quando aplicavel.
+    campos_busca_extra: campos proprios do perfil buscados com icontains.
+    campo_nome: coluna normalizada comparada com o nome; nos perfis,
+        nome_ordenacao (sem JOIN com Pessoa).
+    """
+    caminho_pessoa = 'pessoa'
+    campo_matricula = None
+    campos_busca_extra = ()
+    campo_nome = None
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip():
+            return super().get_search_results(request, queryset, search_term)
+        filtro_extra = Q()
+        for campo in self.campos_busca_extra:
+            filtro_extra |= Q(**{f'{campo}__icontains': search_term.strip()})
+        return BuscaPessoaService.filtrar(
+            queryset,
+            search_term,
+            caminho_pessoa=self.caminho_pessoa,
+            campo_matricula=self.campo_matricula,
+            filtro_extra=filtro_extra,
+            campo_nome=self.campo_nome,
+        ), False
+
+
+class BuscaPorPerfilAdminMixin:
+    """Busca de models que apontam para Aluno/Responsavel pelos perfis.
+
+    perfis_busca: FKs para perfis de pessoa (ex: ('aluno',)). Os
+        search_fields sob essas FKs (aluno__pessoa__nome,
+        aluno__matricula...) sao atendidos pelo BuscaPessoaService — CPF,
+        matricula e nome, com os indices dos perfis — e os demais
+        (ex: turma__nome) com icontains. A ordenacao do admin e mantida.
+    """
+    perfis_busca = ()
+
+    def get_search_results(self, request, queryset, search_term):
+        termo = search_term.strip()
+        if not termo:
+            return super().get_search_results(request, queryset, search_term)
+        filtro = Q()
+        for campo in self.get_search_fields(request):
+            if campo.split('__', 1)[0] not in self.perfis_busca:
+                filtro |= Q(**{f'{campo}__icontains': termo})
+        for caminho in self.perfis_busca:
+            model = self.model._meta.get_field(caminho).related_model
+            filtro |= Q(**{
+                f'{caminho}__in': BuscaPessoaService.ids_perfis(model, termo),
+            })
+        return queryset.filter(filtro), False
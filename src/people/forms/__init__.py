@@ -4,6 +4,7 @@ from .professor_form import ProfessorForm
 from .funcionario_form import FuncionarioForm
 from .responsavel_form import ResponsavelForm
 from .aluno_responsavel_form import AlunoResponsavelForm
+from .importacao_pessoas_form import ImportacaoPessoasForm
 
 __all__ = [
     'PessoaForm',
@@ -12,4 +13,5 @@ __all__ = [
     'FuncionarioForm',
     'ResponsavelForm',
     'AlunoResponsavelForm',
+    'ImportacaoPessoasForm',
 ]
@@ -0,0 +1,19 @@
+"""
+people.forms.importacao_pessoas_form
+
+Formulario de envio do CSV de importacao de alunos e responsaveis.
+"""
+
+from django import forms
+
+
+class ImportacaoPessoasForm(forms.Form):
+    arquivo = forms.FileField(
+        label='arquivo CSV',
+        help_text='Separador ";", codificacao UTF-8, com cabecalho.',
+    )
+    simular = forms.BooleanField(
+        label='apenas validar (nao gravar)',
+        required=False,
+        initial=True,
+    )
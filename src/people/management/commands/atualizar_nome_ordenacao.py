@@ -0,0 +1,64 @@
+"""
+Management command para recalcular nome_ordenacao dos perfis de pessoa.
+
+Uso:
+    python manage.py atualizar_nome_ordenacao
+    python manage.py atualizar_nome_ordenacao --perfil aluno --lote 10000
+
+Aluno, Professor, Funcionario e Responsavel guardam uma copia do nome
+normalizado da pessoa (nome_ordenacao), usada na ordenacao padrao e na
+busca por nome sem JOIN com Pessoa. Ela e mantida pelo save() dos perfis
+e pelo sinal post_save de Pessoa; este comando corrige os perfis
+gravados por outros caminhos (bulk_create, QuerySet.update, SQL direto,
+importacoes).
+
+Caracteristicas:
+    - Set-based: um UPDATE ... = (subconsulta em Pessoa) por faixa de
+      --lote ids, cada faixa em sua transacao
+    - Grava apenas as linhas divergentes; idempotente
+"""
+
+from django.core.management.base import BaseCommand
+
+from people.services import NomeOrdenacaoService
+from people.services.nome_ordenacao_service import PERFIS, TAMANHO_LOTE
+
+
+OPCOES_PERFIL = {model._meta.model_name: model for model in PERFIS}
+
+
+class Command(BaseCommand):
+    help = (
+        'Recalcula nome_ordenacao (copia do nome normalizado da pessoa) '
+        'de alunos, professores, funcionarios e responsaveis.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--perfil',
+            action='append',
+            choices=sorted(OPCOES_PERFIL),
+            help='Perfil a recalcular (repetivel; padrao: todos).',
+        )
+        parser.add_argument(
+            '--lote',
+            type=int,
+            default=TAMANHO_LOTE,
+            help=f'Faixa de ids por UPDATE (padrao: {TAMANHO_LOTE}).',
+        )
+
+    def handle(self, *args, **options):
+        models = [OPCOES_PERFIL[nome] for nome in options['perfil'] or OPCOES_PERFIL]
+        self.stdout.write('Recalculando nome_ordenacao dos perfis...\n')
+
+        resumo = NomeOrdenacaoService.recalcular(
+            models=models, tamanho_lote=options['lote'],
+        )
+        for model in models:
+            self.stdout.write(
+                f'  {model._meta.verbose_name_plural}: '
+                f'{resumo[model._meta.label]} perfil(is) corrigido(s)'
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'\n{sum(resumo.values())} perfil(is) corrigido(s).'
+        ))
@@ -0,0 +1,117 @@
+"""
+Management command para importar alunos e responsaveis de um CSV.
+
+Uso:
+    python manage.py importar_pessoas alunos.csv
+    python manage.py importar_pessoas alunos.csv --dry-run
+    python manage.py importar_pessoas alunos.csv --lote 1000 --erros erros.csv
+
+Formato do arquivo: ver people.services.importacao_pessoas_service (uma
+linha por par aluno/responsavel, separador ';', UTF-8). A mesma
+importacao esta disponivel no admin (Alunos > Importar CSV).
+
+Caracteristicas:
+    - Le o arquivo em streaming, --lote linhas por transacao, com
+      bulk_create/bulk_update por tabela
+    - Upsert pelo CPF: pessoas existentes sao atualizadas, perfis e
+      vinculos existentes nao sao duplicados; pode ser executado de novo
+      com o mesmo arquivo
+    - Linhas invalidas sao puladas; --erros grava linha e motivo em CSV
+    - --dry-run valida e conta tudo sem gravar
+"""
+
+import csv
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from people.services import ImportacaoPessoasService
+from people.services.importacao_pessoas_service import DELIMITADOR, TAMANHO_LOTE
+
+
+# Erros listados na saida (o arquivo de --erros traz todos)
+ERROS_EXIBIDOS = 20
+
+
+class Command(BaseCommand):
+    help = 'Importa alunos, responsaveis e vinculos de um arquivo CSV.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('caminho', help='Arquivo CSV (separador ";").')
+        parser.add_argument(
+            '--lote',
+            type=int,
+            default=TAMANHO_LOTE,
+            help=f'Linhas por transacao (padrao: {TAMANHO_LOTE}).',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Valida e mostra o resultado sem gravar.',
+        )
+        parser.add_argument(
+            '--erros',
+            metavar='CAMINHO',
+            help='Grava as linhas rejeitadas (linha;erro) neste CSV.',
+        )
+
+    def handle(self, *args, **options):
+        caminho = options['caminho']
+        dry_run = options['dry_run']
+        self.stdout.write(
+            f'Importando {caminho}{" (dry-run)" if dry_run else ""}...\n'
+        )
+
+        def progresso(numero, resumo):
+            self.stdout.write(
+                f'  Lote {numero} concluido — {resumo["linhas"]} linha(s) lida(s), '
+                f'{len(resumo["erros"])} erro(s)'
+            )
+
+        try:
+            with open(caminho, newline='', encoding='utf-8-sig') as arquivo:
+                resumo = ImportacaoPessoasService.importar(
+                    arquivo,
+                    tamanho_lote=options['lote'],
+                    simular=dry_run,
+                    ao_concluir_lote=progresso,
+                )
+        except OSError as e:
+            raise CommandError(f'Nao foi possivel ler {caminho}: {e}')
+        except ValidationError as e:
+            raise CommandError(e.messages[0])
+
+        erros = resumo['erros']
+        if erros:
+            self.stdout.write('')
+            for linha, mensagem in erros[:ERROS_EXIBIDOS]:
+                self.stdout.write(self.style.WARNING(f'  Linha {linha}: {mensagem}'))
+            if len(erros) > ERROS_EXIBIDOS:
+                self.stdout.write(f'  ... e mais {len(erros) - ERROS_EXIBIDOS} erro(s).')
+        if options['erros']:
+            self._gravar_erros(options['erros'], erros)
+
+        self.stdout.write('')
+        totais = (
+            f'{resumo["importadas"]} de {resumo["linhas"]} linha(s): '
+            f'{resumo["pessoas_criadas"]} pessoa(s) criada(s), '
+            f'{resumo["pessoas_atualizadas"]} atualizada(s), '
+            f'{resumo["alunos_criados"]} aluno(s), '
+            f'{resumo["responsaveis_criados"]} responsavel(is), '
+            f'{resumo["vinculos_criados"]} vinculo(s), '
+            f'{len(erros)} erro(s)'
+        )
+        if dry_run:
+            self.stdout.write(f'{totais} (dry-run, nada gravado).')
+            return
+        self.stdout.write(self.style.SUCCESS(f'{totais}.'))
+
+    def _gravar_erros(self, caminho, erros):
+        try:
+            with open(caminho, 'w', newline='', encoding='utf-8') as arquivo:
+                escritor = csv.writer(arquivo, delimiter=DELIMITADOR)
+                escritor.writerow(['linha', 'erro'])
+                escritor.writerows(erros)
+        except OSError as e:
+            raise CommandError(f'Nao foi possivel gravar {caminho}: {e}')
+        self.stdout.write(f'Erros gravados em {caminho}.')
@@ -0,0 +1,60 @@
+# Generated by Django 6.0.2 on 2026-10-18 11:19
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+from core.texto import normalizar_texto, somente_digitos
+
+
+INDICE_TRIGRAMA = 'people_pessoa_nome_normalizado_trgm'
+
+
+def preencher_chaves_busca(apps, schema_editor):
+    """Calcula nome_normalizado e cpf_digitos das pessoas ja cadastradas."""
+    Pessoa = apps.get_model('people', 'Pessoa')
+    pessoas = list(Pessoa.objects.only('pk', 'nome', 'cpf'))
+    for pessoa in pessoas:
+        pessoa.nome_normalizado = normalizar_texto(pessoa.nome)
+        pessoa.cpf_digitos = somente_digitos(pessoa.cpf)
+    Pessoa.objects.bulk_update(
+        pessoas, ['nome_normalizado', 'cpf_digitos'], batch_size=500,
+    )
+
+
+def criar_indice_trigrama(apps, schema_editor):
+    """Indice GIN de trigramas no nome (somente PostgreSQL)."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        f'CREATE INDEX {INDICE_TRIGRAMA} ON people_pessoa '
+        f'USING gin (nome_normalizado gin_trgm_ops)'
+    )
+
+
+def remover_indice_trigrama(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(f'DROP INDEX IF EXISTS {INDICE_TRIGRAMA}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('people', '0002_etapa3_operacional'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='pessoa',
+            name='cpf_digitos',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=11, verbose_name='CPF (digitos)'),
+        ),
+        migrations.AddField(
+            model_name='pessoa',
+            name='nome_normalizado',
+            field=models.CharField(blank=True, editable=False, max_length=200, verbose_name='nome normalizado'),
+        ),
+        migrations.RunPython(preencher_chaves_busca, migrations.RunPython.noop),
+        migrations.RunPython(criar_indice_trigrama, remover_indice_trigrama),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 6.0.2 on 2026-10-18 11:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('people', '0003_pessoa_chaves_busca'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='aluno',
+            index=models.Index(condition=models.Q(('situacao', 'ativo')), fields=['pessoa'], name='aluno_ativo_pessoa_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='funcionario',
+            index=models.Index(condition=models.Q(('ativo', True)), fields=['pessoa'], name='funcionario_ativo_pessoa_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='funcionario',
+            index=models.Index(condition=models.Q(('ativo', True)), fields=['setor', 'pessoa'], name='funcionario_setor_ativo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pessoa',
+            index=models.Index(fields=['nome', 'id'], name='pessoa_nome_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='professor',
+            index=models.Index(condition=models.Q(('ativo', True)), fields=['pessoa'], name='professor_ativo_pessoa_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='responsavel',
+            index=models.Index(condition=models.Q(('ativo', True)), fields=['pessoa'], name='responsavel_ativo_pessoa_idx'),
+        ),
+    ]
@@ -0,0 +1,144 @@
+# Generated by Django 6.0.2 on 2026-10-18 12:00
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+PERFIS = ('Aluno', 'Professor', 'Funcionario', 'Responsavel')
+
+# Tabelas dos perfis, para os indices de trigramas (busca por nome)
+TABELAS_PERFIS = (
+    'people_aluno', 'people_professor', 'people_funcionario', 'people_responsavel',
+)
+
+
+def preencher_nome_ordenacao(apps, schema_editor):
+    """Copia Pessoa.nome_normalizado para os perfis ja cadastrados."""
+    Pessoa = apps.get_model('people', 'Pessoa')
+    nome = Subquery(
+        Pessoa.objects.filter(pk=OuterRef('pessoa_id')).values('nome_normalizado')[:1]
+    )
+    for nome_model in PERFIS:
+        apps.get_model('people', nome_model).objects.update(nome_ordenacao=nome)
+
+
+def criar_indices_trigrama(apps, schema_editor):
+    """Indices GIN de trigramas em nome_ordenacao (somente PostgreSQL)."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for tabela in TABELAS_PERFIS:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {tabela}_nome_ordenacao_trgm '
+            f'ON {tabela} USING gin (nome_ordenacao gin_trgm_ops)'
+        )
+
+
+def remover_indices_trigrama(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for tabela in TABELAS_PERFIS:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {tabela}_nome_ordenacao_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('people', '0004_indices_acesso'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='aluno',
+            options={'ordering': ['nome_ordenacao'], 'verbose_name': 'aluno', 'verbose_name_plural': 'alunos'},
+        ),
+        migrations.AlterModelOptions(
+            name='funcionario',
+            options={'ordering': ['nome_ordenacao'], 'verbose_name': 'funcionário', 'verbose_name_plural': 'funcionários'},
+        ),
+        migrations.AlterModelOptions(
+            name='professor',
+            options={'ordering': ['nome_ordenacao'], 'verbose_name': 'professor', 'verbose_name_plural': 'professores'},
+        ),
+        migrations.AlterModelOptions(
+            name='responsavel',
+            options={'ordering': ['nome_ordenacao'], 'verbose_name': 'responsavel', 'verbose_name_plural': 'responsaveis'},
+        ),
+        migrations.RemoveIndex(
+            model_name='aluno',
+            name='aluno_ativo_pessoa_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='funcionario',
+            name='funcionario_ativo_pessoa_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='funcionario',
+            name='funcionario_setor_ativo_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='professor',
+            name='professor_ativo_pessoa_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='responsavel',
+            name='responsavel_ativo_pessoa_idx',
+        ),
+        migrations.AddField(
+            model_name='aluno',
+            name='nome_ordenacao',
+            field=models.CharField(blank=True, editable=False, max_length=200, verbose_name='nome (ordenacao)'),
+        ),
+        migrations.AddField(
+            model_name='funcionario',
+            name='nome_ordenacao',
+            field=models.CharField(blank=True, editable=False, max_length=200, verbose_name='nome (ordenacao)'),
+        ),
+        migrations.AddField(
+            model_name='professor',
+            name='nome_ordenacao',
+            field=models.CharField(blank=True, editable=False, max_length=200, verbose_name='nome (ordenacao)'),
+        ),
+        migrations.AddField(
+            model_name='responsavel',
+            name='nome_ordenacao',
+            field=models.CharField(blank=True, editable=False, max_length=200, verbose_name='nome (ordenacao)'),
+        ),
+        migrations.RunPython(preencher_nome_ordenacao, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='aluno',
+            index=models.Index(fields=['nome_ordenacao', 'id'], name='aluno_nome_ordenacao_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='aluno',
+            index=models.Index(condition=models.Q(('situacao', 'ativo')), fields=['nome_ordenacao', 'id'], name='aluno_ativo_nome_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='funcionario',
+            index=models.Index(fields=['nome_ordenacao', 'id'], name='funcionario_nome_ordenacao_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='funcionario',
+            index=models.Index(condition=models.Q(('ativo', True)), fields=['nome_ordenacao', 'id'], name='funcionario_ativo_nome_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='funcionario',
+            index=models.Index(condition=models.Q(('ativo', True)), fields=['setor', 'nome_ordenacao'], name='funcionario_setor_ativo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='professor',
+            index=models.Index(fields=['nome_ordenacao', 'id'], name='professor_nome_ordenacao_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='professor',
+            index=models.Index(condition=models.Q(('ativo', True)), fields=['nome_ordenacao', 'id'], name='professor_ativo_nome_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='responsavel',
+            index=models.Index(fields=['nome_ordenacao', 'id'], name='responsavel_nome_ordenacao_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='responsavel',
+            index=models.Index(condition=models.Q(('ativo', True)), fields=['nome_ordenacao', 'id'], name='responsavel_ativo_nome_idx'),
+        ),
+        migrations.RunPython(criar_indices_trigrama, remover_indices_trigrama),
+    ]
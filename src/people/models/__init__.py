@@ -1,4 +1,5 @@
 from .pessoa import Pessoa
+from .perfil_pessoa import PerfilPessoa
 from .aluno import Aluno
 from .professor import Professor
 from .funcionario import Funcionario
@@ -7,6 +8,7 @@ from .aluno_responsavel import AlunoResponsavel
 
 __all__ = [
     'Pessoa',
+    'PerfilPessoa',
     'Aluno',
     'Professor',
     'Funcionario',
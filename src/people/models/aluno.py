@@ -6,11 +6,11 @@ Modelo da entidade Aluno.
 
 from django.db import models
 
-from core.models import ModeloBase
+from .perfil_pessoa import PerfilPessoa
 from .pessoa import Pessoa
 
 
-class Aluno(ModeloBase):
+class Aluno(PerfilPessoa):
     """
     Perfil acadêmico de um aluno.
 
@@ -40,10 +40,26 @@ class Aluno(ModeloBase):
         default=Situacao.ATIVO,
     )
 
+    # FKs usadas no __str__ (ver ConsultaOtimizadaMixin)
+    relacionados_str = ('pessoa',)
+
     class Meta:
         verbose_name = 'aluno'
         verbose_name_plural = 'alunos'
-        ordering = ['pessoa__nome']
+        ordering = ['nome_ordenacao']
+        indexes = [
+            # ordering padrao (changelist, autocomplete)
+            models.Index(
+                fields=['nome_ordenacao', 'id'],
+                name='aluno_nome_ordenacao_idx',
+            ),
+            # AlunoRepository.listar_ativos
+            models.Index(
+                fields=['nome_ordenacao', 'id'],
+                condition=models.Q(situacao='ativo'),
+                name='aluno_ativo_nome_idx',
+            ),
+        ]
 
     def __str__(self):
         return f'{self.pessoa.nome} ({self.matricula})'
@@ -52,6 +52,9 @@ class AlunoResponsavel(ModeloBase):
         default=True,
     )
 
+    # FKs usadas no __str__ (ver ConsultaOtimizadaMixin)
+    relacionados_str = ('aluno', 'responsavel')
+
     class Meta:
         verbose_name = 'aluno-responsavel'
         verbose_name_plural = 'alunos-responsaveis'
@@ -6,11 +6,11 @@ Modelo da entidade Funcionário.
 
 from django.db import models
 
-from core.models import ModeloBase
+from .perfil_pessoa import PerfilPessoa
 from .pessoa import Pessoa
 
 
-class Funcionario(ModeloBase):
+class Funcionario(PerfilPessoa):
     """
     Perfil de colaborador / funcionário.
 
@@ -26,10 +26,32 @@ class Funcionario(ModeloBase):
     setor = models.CharField('setor', max_length=100, blank=True)
     ativo = models.BooleanField('ativo', default=True)
 
+    # FKs usadas no __str__ (ver ConsultaOtimizadaMixin)
+    relacionados_str = ('pessoa',)
+
     class Meta:
         verbose_name = 'funcionário'
         verbose_name_plural = 'funcionários'
-        ordering = ['pessoa__nome']
+        ordering = ['nome_ordenacao']
+        indexes = [
+            # ordering padrao (changelist, autocomplete)
+            models.Index(
+                fields=['nome_ordenacao', 'id'],
+                name='funcionario_nome_ordenacao_idx',
+            ),
+            # FuncionarioRepository.listar_ativos
+            models.Index(
+                fields=['nome_ordenacao', 'id'],
+                condition=models.Q(ativo=True),
+                name='funcionario_ativo_nome_idx',
+            ),
+            # FuncionarioRepository.listar_por_setor
+            models.Index(
+                fields=['setor', 'nome_ordenacao'],
+                condition=models.Q(ativo=True),
+                name='funcionario_setor_ativo_idx',
+            ),
+        ]
 
     def __str__(self):
         return f'{self.pessoa.nome} - {self.cargo}'
@@ -0,0 +1,38 @@
+"""
+people.models.perfil_pessoa
+
+Modelo abstrato dos perfis ligados a Pessoa (Aluno, Professor,
+Funcionario e Responsavel).
+"""
+
+from django.db import models
+
+from core.models import ModeloBase
+from core.texto import normalizar_texto
+
+
+class PerfilPessoa(ModeloBase):
+    """
+    Base dos perfis de uma Pessoa.
+
+    nome_ordenacao e uma copia de Pessoa.nome_normalizado guardada no
+    proprio perfil: a ordenacao padrao, as contagens e a busca por nome
+    dos perfis dispensam o JOIN com Pessoa. E preenchido no save() do
+    perfil e propagado pelo NomeOrdenacaoService quando o nome da pessoa
+    muda (sinal post_save de Pessoa). Cargas em massa (bulk_create,
+    update) devem preenche-lo ou rodar o comando atualizar_nome_ordenacao.
+    """
+    nome_ordenacao = models.CharField(
+        'nome (ordenacao)', max_length=200, blank=True, editable=False,
+    )
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        if self.pessoa_id is not None:
+            self.nome_ordenacao = normalizar_texto(self.pessoa.nome)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'nome_ordenacao'}
+        super().save(*args, **kwargs)
@@ -7,6 +7,7 @@ Modelo da entidade Pessoa.
 from django.db import models
 
 from core.models import ModeloBase
+from core.texto import normalizar_texto, somente_digitos
 
 
 class Pessoa(ModeloBase):
@@ -16,6 +17,9 @@ class Pessoa(ModeloBase):
     Centraliza os dados pessoais para evitar duplicação.
     Aluno, Professor e Funcionário apontam para esta entidade via
     OneToOneField, permitindo que uma mesma pessoa tenha múltiplos papéis.
+
+    nome_normalizado e cpf_digitos sao derivados de nome e cpf no save()
+    e nao devem ser editados diretamente.
     """
     nome = models.CharField('nome completo', max_length=200)
     cpf = models.CharField('CPF', max_length=14, unique=True)
@@ -25,10 +29,34 @@ class Pessoa(ModeloBase):
     endereco = models.TextField('endereço', blank=True)
     ativo = models.BooleanField('ativo', default=True)
 
+    # Chaves de busca derivadas — recalculadas a cada save(). Usadas pelo
+    # BuscaPessoaService (indice de trigramas no nome, CPF so com digitos).
+    nome_normalizado = models.CharField(
+        'nome normalizado', max_length=200, blank=True, editable=False,
+    )
+    cpf_digitos = models.CharField(
+        'CPF (digitos)', max_length=11, blank=True, editable=False,
+        db_index=True,
+    )
+
     class Meta:
         verbose_name = 'pessoa'
         verbose_name_plural = 'pessoas'
         ordering = ['nome']
+        indexes = [
+            # ordering por nome, inclusive pessoa__nome dos papeis
+            models.Index(fields=['nome', 'id'], name='pessoa_nome_idx'),
+        ]
 
     def __str__(self):
         return self.nome
+
+    def save(self, *args, **kwargs):
+        self.nome_normalizado = normalizar_texto(self.nome)
+        self.cpf_digitos = somente_digitos(self.cpf)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {
+                *update_fields, 'nome_normalizado', 'cpf_digitos',
+            }
+        super().save(*args, **kwargs)
@@ -6,11 +6,11 @@ Modelo da entidade Professor.
 
 from django.db import models
 
-from core.models import ModeloBase
+from .perfil_pessoa import PerfilPessoa
 from .pessoa import Pessoa
 
 
-class Professor(ModeloBase):
+class Professor(PerfilPessoa):
     """
     Perfil docente de um professor.
 
@@ -30,10 +30,26 @@ class Professor(ModeloBase):
     )
     ativo = models.BooleanField('ativo', default=True)
 
+    # FKs usadas no __str__ (ver ConsultaOtimizadaMixin)
+    relacionados_str = ('pessoa',)
+
     class Meta:
         verbose_name = 'professor'
         verbose_name_plural = 'professores'
-        ordering = ['pessoa__nome']
+        ordering = ['nome_ordenacao']
+        indexes = [
+            # ordering padrao (changelist, autocomplete)
+            models.Index(
+                fields=['nome_ordenacao', 'id'],
+                name='professor_nome_ordenacao_idx',
+            ),
+            # ProfessorRepository.listar_ativos
+            models.Index(
+                fields=['nome_ordenacao', 'id'],
+                condition=models.Q(ativo=True),
+                name='professor_ativo_nome_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.pessoa.nome
@@ -6,11 +6,11 @@ Modelo da entidade Responsavel.
 
 from django.db import models
 
-from core.models import ModeloBase
+from .perfil_pessoa import PerfilPessoa
 from .pessoa import Pessoa
 
 
-class Responsavel(ModeloBase):
+class Responsavel(PerfilPessoa):
     """
     Perfil de responsavel / filiacao.
 
@@ -41,10 +41,26 @@ class Responsavel(ModeloBase):
     )
     ativo = models.BooleanField('ativo', default=True)
 
+    # FKs usadas no __str__ (ver ConsultaOtimizadaMixin)
+    relacionados_str = ('pessoa',)
+
     class Meta:
         verbose_name = 'responsavel'
         verbose_name_plural = 'responsaveis'
-        ordering = ['pessoa__nome']
+        ordering = ['nome_ordenacao']
+        indexes = [
+            # ordering padrao (changelist, autocomplete)
+            models.Index(
+                fields=['nome_ordenacao', 'id'],
+                name='responsavel_nome_ordenacao_idx',
+            ),
+            # ResponsavelRepository.listar_ativos
+            models.Index(
+                fields=['nome_ordenacao', 'id'],
+                condition=models.Q(ativo=True),
+                name='responsavel_ativo_nome_idx',
+            ),
+        ]
 
     def __str__(self):
         return f'{self.pessoa.nome} ({self.get_tipo_display()})'
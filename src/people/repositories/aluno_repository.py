@@ -4,6 +4,7 @@ people.repositories.aluno_repository
 Acesso a dados da entidade Aluno.
 """
 
+from core.replicas import para_leitura
 from people.models import Aluno
 
 
@@ -11,8 +12,20 @@ class AlunoRepository:
 
     @staticmethod
     def listar_ativos():
-        return Aluno.objects.filter(situacao='ativo').select_related('pessoa')
+        return para_leitura(Aluno).filter(situacao='ativo').select_related('pessoa')
 
     @staticmethod
     def buscar_por_matricula(matricula):
-        return Aluno.objects.filter(matricula=matricula).select_related('pessoa').first()
+        return para_leitura(Aluno).filter(matricula=matricula).select_related('pessoa').first()
+
+    # ── Variantes async (views ASGI) ───────────────────────
+
+    @staticmethod
+    async def alistar_ativos():
+        return [aluno async for aluno in AlunoRepository.listar_ativos()]
+
+    @staticmethod
+    async def abuscar_por_matricula(matricula):
+        return await para_leitura(Aluno).filter(
+            matricula=matricula,
+        ).select_related('pessoa').afirst()
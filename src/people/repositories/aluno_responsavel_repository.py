@@ -4,6 +4,7 @@ people.repositories.aluno_responsavel_repository
 Acesso a dados da entidade AlunoResponsavel.
 """
 
+from core.replicas import para_leitura
 from people.models import AlunoResponsavel
 
 
@@ -11,12 +12,12 @@ class AlunoResponsavelRepository:
 
     @staticmethod
     def listar_por_aluno(aluno):
-        return AlunoResponsavel.objects.filter(
+        return para_leitura(AlunoResponsavel).filter(
             aluno=aluno,
         ).select_related('responsavel__pessoa')
 
     @staticmethod
     def listar_por_responsavel(responsavel):
-        return AlunoResponsavel.objects.filter(
+        return para_leitura(AlunoResponsavel).filter(
             responsavel=responsavel,
         ).select_related('aluno__pessoa')
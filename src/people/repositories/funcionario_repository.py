@@ -4,6 +4,7 @@ people.repositories.funcionario_repository
 Acesso a dados da entidade Funcionário.
 """
 
+from core.replicas import para_leitura
 from people.models import Funcionario
 
 
@@ -11,8 +12,8 @@ class FuncionarioRepository:
 
     @staticmethod
     def listar_ativos():
-        return Funcionario.objects.filter(ativo=True).select_related('pessoa')
+        return para_leitura(Funcionario).filter(ativo=True).select_related('pessoa')
 
     @staticmethod
     def listar_por_setor(setor):
-        return Funcionario.objects.filter(setor=setor, ativo=True).select_related('pessoa')
+        return para_leitura(Funcionario).filter(setor=setor, ativo=True).select_related('pessoa')
@@ -4,6 +4,7 @@ people.repositories.pessoa_repository
 Acesso a dados da entidade Pessoa.
 """
 
+from core.replicas import para_leitura
 from people.models import Pessoa
 
 
@@ -11,8 +12,8 @@ class PessoaRepository:
 
     @staticmethod
     def listar_ativas():
-        return Pessoa.objects.filter(ativo=True)
+        return para_leitura(Pessoa).filter(ativo=True)
 
     @staticmethod
     def buscar_por_cpf(cpf):
-        return Pessoa.objects.filter(cpf=cpf).first()
+        return para_leitura(Pessoa).filter(cpf=cpf).first()
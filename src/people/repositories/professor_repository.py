@@ -4,6 +4,7 @@ people.repositories.professor_repository
 Acesso a dados da entidade Professor.
 """
 
+from core.replicas import para_leitura
 from people.models import Professor
 
 
@@ -11,4 +12,4 @@ class ProfessorRepository:
 
     @staticmethod
     def listar_ativos():
-        return Professor.objects.filter(ativo=True).select_related('pessoa')
+        return para_leitura(Professor).filter(ativo=True).select_related('pessoa')
@@ -4,6 +4,7 @@ people.repositories.responsavel_repository
 Acesso a dados da entidade Responsavel.
 """
 
+from core.replicas import para_leitura
 from people.models import Responsavel
 
 
@@ -11,8 +12,8 @@ class ResponsavelRepository:
 
     @staticmethod
     def listar_ativos():
-        return Responsavel.objects.filter(ativo=True).select_related('pessoa')
+        return para_leitura(Responsavel).filter(ativo=True).select_related('pessoa')
 
     @staticmethod
     def buscar_por_pessoa(pessoa):
-        return Responsavel.objects.filter(pessoa=pessoa).select_related('pessoa').first()
+        return para_leitura(Responsavel).filter(pessoa=pessoa).select_related('pessoa').first()
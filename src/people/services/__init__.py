@@ -0,0 +1,5 @@
+from .busca_pessoa_service import BuscaPessoaService
+from .importacao_pessoas_service import ImportacaoPessoasService
+from .nome_ordenacao_service import NomeOrdenacaoService
+
+__all__ = ['BuscaPessoaService', 'ImportacaoPessoasService', 'NomeOrdenacaoService']
@@ -0,0 +1,109 @@
+"""
+people.services.busca_pessoa_service
+
+Busca de pessoas por nome, CPF, matricula ou e-mail.
+
+Usada pelo admin (changelists e autocompletes de Pessoa, Aluno, Professor
+e Responsavel) no lugar de ILIKE '%termo%' em joins com Pessoa. Nos
+admins que apontam para perfis (matriculas, emprestimos, vinculos), o
+termo e resolvido para os ids dos perfis (ids_perfis) e filtrado com
+aluno__in= / responsavel__in=.
+
+- CPF e matricula: caminho rapido por igualdade em coluna indexada
+  (CPF comparado so pelos digitos, com ou sem pontuacao)
+- Nome: comparado pela coluna nome_normalizado (minusculas, sem acentos),
+  ou pela copia nome_ordenacao do proprio perfil, que dispensa o JOIN
+  com Pessoa (campo_nome='nome_ordenacao'). No PostgreSQL usa pg_trgm (indice GIN de trigramas), tolerando erros
+  de digitacao e ranqueando por similaridade. Nos demais bancos exige
+  que todos os termos estejam contidos no nome.
+"""
+
+import re
+
+from django.db import connections
+from django.db.models import Q
+
+from core.texto import normalizar_texto, somente_digitos
+from people.models import Aluno
+
+
+class BuscaPessoaService:
+    """Filtra e ranqueia querysets de Pessoa ou de perfis de Pessoa."""
+
+    @staticmethod
+    def filtrar(queryset, q, caminho_pessoa='', campo_matricula=None,
+                filtro_extra=None, campo_nome=None):
+        """
+        Aplica a busca de pessoas a um queryset.
+
+        Args:
+            queryset: queryset de Pessoa ou de um model ligado a Pessoa.
+            q: termo digitado.
+            caminho_pessoa: caminho ORM ate Pessoa ('' para a propria
+                Pessoa, 'pessoa' para perfis, 'aluno__pessoa' etc.).
+            campo_matricula: caminho ate Aluno.matricula, quando a busca
+                por matricula se aplica ('matricula' em Aluno).
+            filtro_extra: Q adicional combinado com OU (ex: busca em
+                campos proprios do perfil).
+            campo_nome: coluna normalizada comparada com o nome (padrao:
+                <caminho_pessoa>__nome_normalizado).
+        """
+        termo = q.strip()
+        if not termo:
+            return queryset
+
+        prefixo = f'{caminho_pessoa}__' if caminho_pessoa else ''
+        filtro = filtro_extra or Q()
+        if campo_matricula:
+            filtro |= Q(**{campo_matricula: termo})
+
+        # Caminho rapido: CPF ou matricula numerica
+        if re.fullmatch(r'[\d.\-/\s]+', termo):
+            digitos = somente_digitos(termo)
+            if len(digitos) == 11:
+                filtro |= Q(**{f'{prefixo}cpf_digitos': digitos})
+            else:
+                filtro |= Q(**{f'{prefixo}cpf_digitos__startswith': digitos})
+            if campo_matricula:
+                filtro |= Q(**{campo_matricula: digitos})
+            return queryset.filter(filtro)
+
+        if '@' in termo:
+            return queryset.filter(
+                filtro | Q(**{f'{prefixo}email__iexact': termo})
+            )
+
+        nome = normalizar_texto(termo)
+        campo_nome = campo_nome or f'{prefixo}nome_normalizado'
+
+        if connections[queryset.db].vendor == 'postgresql':
+            from django.contrib.postgres.search import TrigramWordSimilarity
+            filtro |= Q(**{f'{campo_nome}__contains': nome})
+            filtro |= Q(**{f'{campo_nome}__trigram_word_similar': nome})
+            return queryset.filter(filtro).annotate(
+                similaridade_busca=TrigramWordSimilarity(nome, campo_nome),
+            ).order_by('-similaridade_busca', campo_nome)
+
+        filtro_nome = Q()
+        for parte in nome.split():
+            filtro_nome &= Q(**{f'{campo_nome}__contains': parte})
+        return queryset.filter(filtro | filtro_nome).order_by(campo_nome)
+
+    @staticmethod
+    def ids_perfis(model, q):
+        """
+        Subconsulta com os ids dos perfis de `model` que casam com `q`.
+
+        Mesmos caminhos de filtrar: CPF e matricula (Aluno) por igualdade,
+        nome pela copia nome_ordenacao do perfil (trigramas no
+        PostgreSQL). Para filtrar models que apontam para o perfil
+        (ex: Matricula.objects.filter(aluno__in=...)).
+        """
+        campo_matricula = 'matricula' if model is Aluno else None
+        return BuscaPessoaService.filtrar(
+            model.objects.all(),
+            q,
+            caminho_pessoa='pessoa',
+            campo_matricula=campo_matricula,
+            campo_nome='nome_ordenacao',
+        ).order_by().values('pk')
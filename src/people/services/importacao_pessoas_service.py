@@ -0,0 +1,446 @@
+"""
+people.services.importacao_pessoas_service
+
+Importacao em lote de alunos e responsaveis a partir de CSV (cadastro
+inicial de uma escola), usada pelo comando importar_pessoas e pela tela
+de importacao do admin.
+
+Formato: CSV com cabecalho, separado por ';', em UTF-8 (com ou sem
+BOM). Uma linha por par aluno/responsavel — um aluno com dois
+responsaveis ocupa duas linhas, repetindo os dados do aluno:
+
+    aluno_nome, aluno_cpf, matricula, data_ingresso    obrigatorias
+    aluno_nascimento                                   opcional
+    responsavel_nome, responsavel_cpf, tipo_vinculo    opcionais (juntas)
+    responsavel_telefone, responsavel_email,
+    responsavel_principal                              opcionais
+
+Datas em dd/mm/aaaa ou aaaa-mm-dd; tipo_vinculo pai, mae ou tutor;
+responsavel_principal sim/nao.
+
+- Streaming: o arquivo e lido em lotes de linhas; cada lote e validado
+  e gravado (bulk_create / bulk_update) na sua propria transacao
+- Unicidade de CPF e matricula verificada em memoria, contra mapas
+  carregados uma vez (uma consulta por mapa) e atualizados a cada lote
+- Upsert pelo CPF: pessoas ja cadastradas sao reaproveitadas e seus
+  dados atualizados com os campos preenchidos no arquivo; perfis e
+  vinculos existentes nao sao duplicados. Rodar de novo o mesmo arquivo
+  (inclusive depois de uma falha no meio) nao duplica nada
+- Linhas invalidas sao puladas e reportadas pelo numero da linha
+"""
+
+import csv
+from contextlib import nullcontext
+from datetime import datetime
+
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+from django.utils import timezone
+
+from academic.services.linha_do_tempo_service import LinhaDoTempoService
+from core.texto import normalizar_texto, somente_digitos
+from people.models import Aluno, AlunoResponsavel, Pessoa, Responsavel
+from people.services.nome_ordenacao_service import NomeOrdenacaoService
+
+
+DELIMITADOR = ';'
+
+# Linhas do arquivo por lote (e por transacao)
+TAMANHO_LOTE = 500
+
+COLUNAS_OBRIGATORIAS = ('aluno_nome', 'aluno_cpf', 'matricula', 'data_ingresso')
+COLUNAS = COLUNAS_OBRIGATORIAS + (
+    'aluno_nascimento',
+    'responsavel_nome',
+    'responsavel_cpf',
+    'tipo_vinculo',
+    'responsavel_telefone',
+    'responsavel_email',
+    'responsavel_principal',
+)
+
+FORMATOS_DATA = ('%d/%m/%Y', '%Y-%m-%d')
+VALORES_SIM = {'sim', 's', 'x', '1', 'true', 'verdadeiro'}
+
+# Tipo do perfil Responsavel criado a partir do vinculo
+TIPO_RESPONSAVEL = {
+    AlunoResponsavel.TipoVinculo.PAI: Responsavel.Tipo.PAI,
+    AlunoResponsavel.TipoVinculo.MAE: Responsavel.Tipo.MAE,
+    AlunoResponsavel.TipoVinculo.TUTOR: Responsavel.Tipo.RESPONSAVEL_LEGAL,
+}
+
+# Campos de Pessoa que o arquivo pode atualizar (upsert)
+CAMPOS_PESSOA = ('nome', 'data_nascimento', 'telefone', 'email')
+
+
+# ───────────────────────────────────────────────
+# Leitura e validacao das linhas
+# ───────────────────────────────────────────────
+
+def _texto(valores, campo, maximo, obrigatorio=False):
+    valor = valores[campo]
+    if obrigatorio and not valor:
+        raise ValidationError(f'{campo} obrigatorio.')
+    if len(valor) > maximo:
+        raise ValidationError(f'{campo} com mais de {maximo} caracteres.')
+    return valor
+
+
+def _cpf(valores, campo):
+    digitos = somente_digitos(valores[campo])
+    if len(digitos) != 11:
+        raise ValidationError(f'{campo} invalido: "{valores[campo]}".')
+    return digitos
+
+
+def _data(valores, campo, obrigatoria=False):
+    valor = valores[campo]
+    if not valor:
+        if obrigatoria:
+            raise ValidationError(f'{campo} obrigatoria.')
+        return None
+    for formato in FORMATOS_DATA:
+        try:
+            return datetime.strptime(valor, formato).date()
+        except ValueError:
+            continue
+    raise ValidationError(f'{campo} invalida: "{valor}".')
+
+
+def formatar_cpf(digitos):
+    return f'{digitos[:3]}.{digitos[3:6]}.{digitos[6:9]}-{digitos[9:]}'
+
+
+def _ler_linha(linha):
+    """(aluno, responsavel ou None) de uma linha; ValidationError se invalida."""
+    valores = {coluna: (linha.get(coluna) or '').strip() for coluna in COLUNAS}
+    aluno = {
+        'nome': _texto(valores, 'aluno_nome', 200, obrigatorio=True),
+        'cpf': _cpf(valores, 'aluno_cpf'),
+        'matricula': _texto(valores, 'matricula', 30, obrigatorio=True),
+        'data_ingresso': _data(valores, 'data_ingresso', obrigatoria=True),
+        'data_nascimento': _data(valores, 'aluno_nascimento'),
+    }
+    if not any(
+        valores[coluna]
+        for coluna in ('responsavel_nome', 'responsavel_cpf', 'tipo_vinculo')
+    ):
+        return aluno, None
+
+    tipo_vinculo = valores['tipo_vinculo'].lower()
+    if tipo_vinculo not in AlunoResponsavel.TipoVinculo.values:
+        raise ValidationError(
+            f'tipo_vinculo invalido: "{valores["tipo_vinculo"]}" '
+            f'(use {", ".join(AlunoResponsavel.TipoVinculo.values)}).'
+        )
+    email = _texto(valores, 'responsavel_email', 254)
+    if email:
+        try:
+            validate_email(email)
+        except ValidationError:
+            raise ValidationError(f'responsavel_email invalido: "{email}".')
+    responsavel = {
+        'nome': _texto(valores, 'responsavel_nome', 200, obrigatorio=True),
+        'cpf': _cpf(valores, 'responsavel_cpf'),
+        'telefone': _texto(valores, 'responsavel_telefone', 20),
+        'email': email,
+        'tipo_vinculo': tipo_vinculo,
+        'principal': valores['responsavel_principal'].lower() in VALORES_SIM,
+    }
+    if responsavel['cpf'] == aluno['cpf']:
+        raise ValidationError('responsavel_cpf igual ao aluno_cpf.')
+    return aluno, responsavel
+
+
+def _linhas_numeradas(leitor):
+    for linha in leitor:
+        yield leitor.line_num, linha
+
+
+def _lotes(linhas, tamanho):
+    lote = []
+    for item in linhas:
+        lote.append(item)
+        if len(lote) == tamanho:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+
+# ───────────────────────────────────────────────
+# Cadastro existente (mapas de unicidade)
+# ───────────────────────────────────────────────
+
+class _Cadastro:
+    """
+    CPFs, matriculas, perfis e vinculos ja gravados, em memoria.
+
+    Uma consulta por mapa na criacao; cada lote acrescenta o que gravou.
+    """
+
+    def __init__(self):
+        self.pessoas = dict(Pessoa.objects.values_list('cpf_digitos', 'pk'))
+        self.alunos = {}
+        self.matriculas = {}
+        for aluno_id, pessoa_id, matricula in Aluno.objects.values_list(
+            'pk', 'pessoa_id', 'matricula',
+        ):
+            self.alunos[pessoa_id] = (aluno_id, matricula)
+            self.matriculas[matricula] = pessoa_id
+        self.responsaveis = dict(Responsavel.objects.values_list('pessoa_id', 'pk'))
+        self.vinculos = set(
+            AlunoResponsavel.objects.values_list('aluno_id', 'responsavel_id')
+        )
+
+    def verificar_aluno(self, aluno, lote):
+        """ValidationError se CPF/matricula conflitam com o cadastro ou o lote."""
+        pessoa_id = self.pessoas.get(aluno['cpf'])
+        existente = self.alunos.get(pessoa_id)
+        if existente and existente[1] != aluno['matricula']:
+            raise ValidationError(
+                f'aluno_cpf ja cadastrado com a matricula {existente[1]}.'
+            )
+        dono = self.matriculas.get(aluno['matricula'])
+        if dono is not None and dono != pessoa_id:
+            raise ValidationError(
+                f'matricula {aluno["matricula"]} ja pertence a outro aluno.'
+            )
+        anterior = lote.alunos.get(aluno['cpf'])
+        if anterior and anterior['matricula'] != aluno['matricula']:
+            raise ValidationError(
+                f'aluno_cpf repetido no arquivo com a matricula '
+                f'{anterior["matricula"]}.'
+            )
+        dono_lote = lote.matriculas.get(aluno['matricula'])
+        if dono_lote and dono_lote != aluno['cpf']:
+            raise ValidationError(
+                f'matricula {aluno["matricula"]} repetida no arquivo para '
+                f'outro CPF.'
+            )
+
+
+class _Lote:
+    """O que um lote de linhas validas vai gravar, indexado por CPF."""
+
+    def __init__(self):
+        self.pessoas = {}         # cpf -> dados do arquivo
+        self.alunos = {}          # cpf -> dados do aluno
+        self.matriculas = {}      # matricula -> cpf
+        self.responsaveis = {}    # cpf -> tipo do perfil
+        self.vinculos = {}        # (cpf aluno, cpf responsavel) -> dados
+
+    def _mesclar_pessoa(self, dados, campos):
+        # A mesma pessoa aparece em varias linhas: celula vazia nao apaga
+        # o valor vindo de uma linha anterior
+        pessoa = self.pessoas.setdefault(dados['cpf'], {})
+        for campo in campos:
+            if dados[campo] not in (None, '') or campo not in pessoa:
+                pessoa[campo] = dados[campo]
+
+    def registrar(self, aluno, responsavel):
+        self._mesclar_pessoa(aluno, ('nome', 'data_nascimento'))
+        self.alunos.setdefault(aluno['cpf'], aluno)
+        self.matriculas[aluno['matricula']] = aluno['cpf']
+        if responsavel is None:
+            return
+        self._mesclar_pessoa(responsavel, ('nome', 'telefone', 'email'))
+        self.responsaveis.setdefault(
+            responsavel['cpf'], TIPO_RESPONSAVEL[responsavel['tipo_vinculo']],
+        )
+        self.vinculos[(aluno['cpf'], responsavel['cpf'])] = responsavel
+
+
+# ───────────────────────────────────────────────
+# Gravacao
+# ───────────────────────────────────────────────
+
+def _criar_pessoas(dados_por_cpf, cadastro):
+    novas = [
+        Pessoa(
+            nome=dados['nome'],
+            cpf=formatar_cpf(cpf),
+            cpf_digitos=cpf,
+            nome_normalizado=normalizar_texto(dados['nome']),
+            **{campo: dados[campo] for campo in CAMPOS_PESSOA[1:] if campo in dados},
+        )
+        for cpf, dados in dados_por_cpf.items()
+    ]
+    Pessoa.objects.bulk_create(novas, batch_size=TAMANHO_LOTE)
+    for pessoa in novas:
+        cadastro.pessoas[pessoa.cpf_digitos] = pessoa.pk
+    return {pessoa.pk: pessoa.nome_normalizado for pessoa in novas}
+
+
+def _atualizar_pessoas(dados_por_id):
+    """
+    Aplica os campos preenchidos do arquivo as pessoas existentes.
+
+    Retorna ({pessoa_id: nome_normalizado}, quantidade alterada).
+    """
+    existentes = Pessoa.objects.in_bulk(dados_por_id)
+    alteradas, renomeadas = [], []
+    agora = timezone.now()
+    for pk, dados in dados_por_id.items():
+        pessoa = existentes[pk]
+        mudancas = {
+            campo: valor for campo, valor in dados.items()
+            if valor not in (None, '') and getattr(pessoa, campo) != valor
+        }
+        if not mudancas:
+            continue
+        for campo, valor in mudancas.items():
+            setattr(pessoa, campo, valor)
+        nome_normalizado = normalizar_texto(pessoa.nome)
+        if nome_normalizado != pessoa.nome_normalizado:
+            pessoa.nome_normalizado = nome_normalizado
+            renomeadas.append(pk)
+        pessoa.atualizado_em = agora
+        alteradas.append(pessoa)
+    Pessoa.objects.bulk_update(
+        alteradas, [*CAMPOS_PESSOA, 'nome_normalizado', 'atualizado_em'],
+        batch_size=TAMANHO_LOTE,
+    )
+    # bulk_update nao dispara o sinal que mantem nome_ordenacao
+    NomeOrdenacaoService.sincronizar_pessoas(renomeadas)
+    return (
+        {pk: pessoa.nome_normalizado for pk, pessoa in existentes.items()},
+        len(alteradas),
+    )
+
+
+def _gravar_lote(lote, cadastro, resumo):
+    existentes = {
+        cadastro.pessoas[cpf]: dados
+        for cpf, dados in lote.pessoas.items() if cpf in cadastro.pessoas
+    }
+    novas = {
+        cpf: dados for cpf, dados in lote.pessoas.items()
+        if cpf not in cadastro.pessoas
+    }
+    nomes, atualizadas = _atualizar_pessoas(existentes)
+    nomes.update(_criar_pessoas(novas, cadastro))
+    resumo['pessoas_criadas'] += len(novas)
+    resumo['pessoas_atualizadas'] += atualizadas
+
+    alunos = [
+        Aluno(
+            pessoa_id=cadastro.pessoas[cpf],
+            nome_ordenacao=nomes[cadastro.pessoas[cpf]],
+            matricula=dados['matricula'],
+            data_ingresso=dados['data_ingresso'],
+        )
+        for cpf, dados in lote.alunos.items()
+        if cadastro.pessoas[cpf] not in cadastro.alunos
+    ]
+    Aluno.objects.bulk_create(alunos, batch_size=TAMANHO_LOTE)
+    for aluno in alunos:
+        cadastro.alunos[aluno.pessoa_id] = (aluno.pk, aluno.matricula)
+        cadastro.matriculas[aluno.matricula] = aluno.pessoa_id
+    resumo['alunos_criados'] += len(alunos)
+
+    responsaveis = [
+        Responsavel(
+            pessoa_id=cadastro.pessoas[cpf],
+            nome_ordenacao=nomes[cadastro.pessoas[cpf]],
+            tipo=tipo,
+        )
+        for cpf, tipo in lote.responsaveis.items()
+        if cadastro.pessoas[cpf] not in cadastro.responsaveis
+    ]
+    Responsavel.objects.bulk_create(responsaveis, batch_size=TAMANHO_LOTE)
+    for responsavel in responsaveis:
+        cadastro.responsaveis[responsavel.pessoa_id] = responsavel.pk
+    resumo['responsaveis_criados'] += len(responsaveis)
+
+    vinculos = []
+    for (cpf_aluno, cpf_responsavel), dados in lote.vinculos.items():
+        chave = (
+            cadastro.alunos[cadastro.pessoas[cpf_aluno]][0],
+            cadastro.responsaveis[cadastro.pessoas[cpf_responsavel]],
+        )
+        if chave in cadastro.vinculos:
+            continue
+        cadastro.vinculos.add(chave)
+        vinculos.append(AlunoResponsavel(
+            aluno_id=chave[0],
+            responsavel_id=chave[1],
+            tipo_vinculo=dados['tipo_vinculo'],
+            responsavel_principal=dados['principal'],
+        ))
+    AlunoResponsavel.objects.bulk_create(vinculos, batch_size=TAMANHO_LOTE)
+    resumo['vinculos_criados'] += len(vinculos)
+
+    # Vinculos novos entram na linha do tempo dos alunos
+    LinhaDoTempoService.atualizar_alunos(vinculo.aluno_id for vinculo in vinculos)
+
+
+class ImportacaoPessoasService:
+    """Importa alunos, responsaveis e vinculos de um CSV (ver modulo)."""
+
+    @staticmethod
+    def importar(arquivo, tamanho_lote=TAMANHO_LOTE, simular=False,
+                 ao_concluir_lote=None):
+        """
+        Importa o CSV de `arquivo` (texto, aberto com newline='').
+
+        Com simular=True tudo e validado e gravado numa transacao desfeita
+        ao final (mesmos numeros, nada persiste). ao_concluir_lote(numero,
+        resumo) e chamado apos cada lote.
+
+        Retorna {'linhas', 'importadas', 'pessoas_criadas',
+        'pessoas_atualizadas', 'alunos_criados', 'responsaveis_criados',
+        'vinculos_criados', 'erros': [(linha, mensagem), ...]}.
+
+        Raises:
+            ValidationError: cabecalho sem as colunas obrigatorias ou
+                arquivo fora de UTF-8.
+        """
+        leitor = csv.DictReader(arquivo, delimiter=DELIMITADOR)
+        resumo = {
+            'linhas': 0,
+            'importadas': 0,
+            'pessoas_criadas': 0,
+            'pessoas_atualizadas': 0,
+            'alunos_criados': 0,
+            'responsaveis_criados': 0,
+            'vinculos_criados': 0,
+            'erros': [],
+        }
+        try:
+            cabecalho = [coluna.strip() for coluna in leitor.fieldnames or ()]
+            faltando = [c for c in COLUNAS_OBRIGATORIAS if c not in cabecalho]
+            if faltando:
+                raise ValidationError(
+                    f'Colunas obrigatorias ausentes: {", ".join(faltando)} '
+                    f'(separador "{DELIMITADOR}").'
+                )
+            leitor.fieldnames = cabecalho
+
+            with transaction.atomic() if simular else nullcontext():
+                cadastro = _Cadastro()
+                lotes = _lotes(_linhas_numeradas(leitor), tamanho_lote)
+                for numero, linhas in enumerate(lotes, start=1):
+                    lote = _Lote()
+                    for linha_numero, linha in linhas:
+                        resumo['linhas'] += 1
+                        try:
+                            aluno, responsavel = _ler_linha(linha)
+                            cadastro.verificar_aluno(aluno, lote)
+                        except ValidationError as erro:
+                            resumo['erros'].append(
+                                (linha_numero, ' '.join(erro.messages)),
+                            )
+                            continue
+                        lote.registrar(aluno, responsavel)
+                        resumo['importadas'] += 1
+                    with transaction.atomic():
+                        _gravar_lote(lote, cadastro, resumo)
+                    if ao_concluir_lote:
+                        ao_concluir_lote(numero, resumo)
+                if simular:
+                    transaction.set_rollback(True)
+        except UnicodeDecodeError:
+            raise ValidationError('O arquivo deve estar em UTF-8.')
+        return resumo
@@ -0,0 +1,91 @@
+"""
+people.services.nome_ordenacao_service
+
+Manutencao de nome_ordenacao nos perfis (Aluno, Professor, Funcionario,
+Responsavel): copia de Pessoa.nome_normalizado usada na ordenacao e na
+busca por nome sem JOIN com Pessoa (ver PerfilPessoa).
+
+- sincronizar_pessoa: chamado pelo sinal post_save de Pessoa; um UPDATE
+  por perfil, pela pessoa_id (unica), que so grava se o valor mudou
+- sincronizar_pessoas: o mesmo para varias pessoas de uma vez (apos
+  bulk_update de Pessoa, que nao dispara o sinal)
+- recalcular: correcao em massa com UPDATE ... = (subconsulta em
+  Pessoa), em faixas de id — comando atualizar_nome_ordenacao
+"""
+
+from django.db import transaction
+from django.db.models import Max, Min, OuterRef, Subquery
+
+from people.models import Aluno, Funcionario, Pessoa, Professor, Responsavel
+
+
+PERFIS = (Aluno, Professor, Funcionario, Responsavel)
+
+# Faixa de ids por UPDATE (e por transacao) na correcao em massa
+TAMANHO_LOTE = 5000
+
+
+def _nome_da_pessoa():
+    """Pessoa.nome_normalizado do perfil, como subconsulta."""
+    return Subquery(
+        Pessoa.objects.filter(
+            pk=OuterRef('pessoa_id'),
+        ).values('nome_normalizado')[:1]
+    )
+
+
+class NomeOrdenacaoService:
+
+    @staticmethod
+    def sincronizar_pessoa(pessoa):
+        """Propaga o nome da pessoa para os seus perfis. Retorna os perfis alterados."""
+        alterados = 0
+        for model in PERFIS:
+            alterados += model.objects.filter(
+                pessoa_id=pessoa.pk,
+            ).exclude(
+                nome_ordenacao=pessoa.nome_normalizado,
+            ).update(nome_ordenacao=pessoa.nome_normalizado)
+        return alterados
+
+    @staticmethod
+    def sincronizar_pessoas(pessoa_ids):
+        """Propaga o nome de varias pessoas para os perfis. Retorna os perfis alterados."""
+        pessoa_ids = list(pessoa_ids)
+        if not pessoa_ids:
+            return 0
+        alterados = 0
+        for model in PERFIS:
+            esperado = _nome_da_pessoa()
+            alterados += model.objects.filter(
+                pessoa_id__in=pessoa_ids,
+            ).exclude(
+                nome_ordenacao=esperado,
+            ).update(nome_ordenacao=esperado)
+        return alterados
+
+    @staticmethod
+    def recalcular(models=PERFIS, tamanho_lote=TAMANHO_LOTE, ao_concluir_lote=None):
+        """
+        Corrige nome_ordenacao de todos os perfis (apenas linhas divergentes).
+
+        Uma transacao por faixa de `tamanho_lote` ids. Retorna
+        {model_label: perfis alterados}.
+        """
+        resumo = {}
+        for model in models:
+            esperado = _nome_da_pessoa()
+            limites = model.objects.aggregate(inicio=Min('pk'), fim=Max('pk'))
+            alterados = 0
+            if limites['inicio'] is not None:
+                for inicio in range(limites['inicio'], limites['fim'] + 1, tamanho_lote):
+                    with transaction.atomic():
+                        alterados += model.objects.filter(
+                            pk__gte=inicio, pk__lt=inicio + tamanho_lote,
+                        ).exclude(
+                            nome_ordenacao=esperado,
+                        ).update(nome_ordenacao=esperado)
+                    if ao_concluir_lote:
+                        ao_concluir_lote(model, inicio, alterados)
+            resumo[model._meta.label] = alterados
+        return resumo
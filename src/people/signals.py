@@ -0,0 +1,21 @@
+"""
+people.signals
+
+Receivers de sinais do app people (conectados em PeopleConfig.ready).
+"""
+
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from people.models import Pessoa
+from people.services import NomeOrdenacaoService
+
+
+@receiver(post_save, sender=Pessoa, dispatch_uid='people-nome-ordenacao')
+def propagar_nome_ordenacao(sender, instance, created, update_fields=None, **kwargs):
+    """Mantem nome_ordenacao dos perfis quando o nome da pessoa muda."""
+    if created or kwargs.get('raw'):
+        return
+    if update_fields is not None and 'nome' not in update_fields:
+        return
+    NomeOrdenacaoService.sincronizar_pessoa(instance)
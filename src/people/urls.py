@@ -0,0 +1,9 @@
+from django.urls import path
+
+from . import views
+
+app_name = 'people'
+
+urlpatterns = [
+    path('importar/', views.importar_pessoas, name='importar_pessoas'),
+]
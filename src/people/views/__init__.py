@@ -0,0 +1,3 @@
+from .importacao_views import importar_pessoas
+
+__all__ = ['importar_pessoas']
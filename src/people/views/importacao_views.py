@@ -0,0 +1,62 @@
+"""
+people.views.importacao_views
+
+Importacao de alunos e responsaveis por CSV no admin (Alunos > Importar
+CSV). Mesma rotina do comando importar_pessoas: o arquivo enviado e lido
+em streaming, sem ser carregado inteiro na memoria.
+"""
+
+import io
+
+from django.contrib import admin
+from django.contrib.admin.views.decorators import staff_member_required
+from django.contrib.auth.decorators import permission_required
+from django.core.exceptions import ValidationError
+from django.template.response import TemplateResponse
+
+from people.forms import ImportacaoPessoasForm
+from people.models import Aluno
+from people.services import ImportacaoPessoasService
+from people.services.importacao_pessoas_service import COLUNAS, COLUNAS_OBRIGATORIAS
+
+
+# Erros listados na pagina de resultado
+ERROS_EXIBIDOS = 200
+
+PERMISSOES = (
+    'people.add_pessoa',
+    'people.change_pessoa',
+    'people.add_aluno',
+    'people.add_responsavel',
+    'people.add_alunoresponsavel',
+)
+
+
+@staff_member_required
+@permission_required(PERMISSOES, raise_exception=True)
+def importar_pessoas(request):
+    resumo = None
+    form = ImportacaoPessoasForm(request.POST or None, request.FILES or None)
+    if request.method == 'POST' and form.is_valid():
+        arquivo = io.TextIOWrapper(
+            form.cleaned_data['arquivo'].file, encoding='utf-8-sig', newline='',
+        )
+        try:
+            resumo = ImportacaoPessoasService.importar(
+                arquivo, simular=form.cleaned_data['simular'],
+            )
+        except ValidationError as erro:
+            form.add_error('arquivo', erro)
+        finally:
+            arquivo.detach()
+    return TemplateResponse(request, 'admin/people/importacao.html', {
+        **admin.site.each_context(request),
+        'title': 'Importar alunos e responsaveis',
+        'opts': Aluno._meta,
+        'form': form,
+        'colunas_obrigatorias': COLUNAS_OBRIGATORIAS,
+        'colunas_opcionais': COLUNAS[len(COLUNAS_OBRIGATORIAS):],
+        'resumo': resumo,
+        'simulado': resumo is not None and form.cleaned_data['simular'],
+        'erros': resumo['erros'][:ERROS_EXIBIDOS] if resumo else [],
+    })
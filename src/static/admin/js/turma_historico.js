@@ -0,0 +1,56 @@
+/*
+ * turma_historico.js — historico de matriculas na visao geral da turma
+ *
+ * O historico (academic:historico_turma) so e consultado quando a secao
+ * e aberta; "Carregar mais antigas" acrescenta as linhas da proxima
+ * pagina (cursor) a mesma tabela. Sem JavaScript, os links abrem o
+ * fragmento diretamente.
+ */
+'use strict';
+
+document.addEventListener('DOMContentLoaded', function () {
+    const secao = document.getElementById('historico-turma');
+    if (!secao) {
+        return;
+    }
+    const conteudo = secao.querySelector('.historico-conteudo');
+    let carregado = false;
+
+    function carregar(url, link) {
+        fetch(url, {credentials: 'same-origin'})
+            .then(function (resposta) {
+                return resposta.text();
+            })
+            .then(function (html) {
+                const modelo = document.createElement('template');
+                modelo.innerHTML = html;
+                const corpo = conteudo.querySelector('tbody');
+                const novas = modelo.content.querySelector('tbody');
+                if (corpo && novas) {
+                    // Proxima pagina: linhas na tabela existente
+                    corpo.append(...novas.children);
+                    novas.closest('.module').remove();
+                    link.closest('p').replaceWith(modelo.content);
+                } else {
+                    conteudo.replaceChildren(modelo.content);
+                }
+            });
+    }
+
+    secao.addEventListener('toggle', function () {
+        const link = conteudo.querySelector('.carregar-historico');
+        if (secao.open && !carregado && link) {
+            carregado = true;
+            carregar(link.href, link);
+        }
+    });
+
+    conteudo.addEventListener('click', function (evento) {
+        const link = evento.target.closest('.carregar-historico');
+        if (link) {
+            evento.preventDefault();
+            carregado = true;
+            carregar(link.href, link);
+        }
+    });
+});
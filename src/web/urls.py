@@ -6,4 +6,14 @@ app_name = 'web'
 
 urlpatterns = [
     path('', views.home, name='home'),
+    path(
+        'api/painel/biblioteca/',
+        views.painel_biblioteca,
+        name='painel_biblioteca',
+    ),
+    path(
+        'api/painel/alunos/<str:matricula>/emprestimos/',
+        views.emprestimos_aluno,
+        name='emprestimos_aluno',
+    ),
 ]
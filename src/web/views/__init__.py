@@ -1,3 +1,4 @@
 from .home_views import home
+from .painel_views import emprestimos_aluno, painel_biblioteca
 
-__all__ = ['home']
+__all__ = ['home', 'painel_biblioteca', 'emprestimos_aluno']
@@ -0,0 +1,76 @@
+"""
+web.views.painel_views
+
+Views JSON assincronas consultadas periodicamente pelos paineis
+(polling). Rodam no event loop quando o projeto e servido via ASGI
+(uvicorn): as consultas usam o ORM assincrono, por meio das variantes
+async dos repositories.
+"""
+
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import Http404, JsonResponse
+from django.utils import timezone
+
+from academic.repositories import AnoLetivoRepository
+from library.models import Emprestimo
+from library.repositories import EmprestimoRepository, ExemplarRepository
+from people.repositories import AlunoRepository
+
+
+# Emprestimos atrasados listados no painel
+LIMITE_ATRASADOS = 20
+
+
+def _emprestimo_json(emprestimo, hoje):
+    atraso = (hoje - emprestimo.data_prevista_devolucao).days
+    return {
+        'id': emprestimo.pk,
+        'obra': emprestimo.exemplar.obra.titulo,
+        'exemplar': emprestimo.exemplar.codigo_patrimonio,
+        'data_emprestimo': emprestimo.data_emprestimo,
+        'data_prevista_devolucao': emprestimo.data_prevista_devolucao,
+        'data_devolucao': emprestimo.data_devolucao,
+        'status': emprestimo.status,
+        'dias_atraso': max(atraso, 0) if not emprestimo.data_devolucao else 0,
+    }
+
+
+@staff_member_required
+async def painel_biblioteca(request):
+    """Contadores da biblioteca e os emprestimos atrasados mais antigos."""
+    hoje = timezone.localdate()
+    ano_letivo = await AnoLetivoRepository.aobter_ativo()
+    atrasados = EmprestimoRepository.listar_atrasados().order_by(
+        'data_prevista_devolucao', 'pk',
+    )
+    return JsonResponse({
+        'ano_letivo': ano_letivo.nome if ano_letivo else None,
+        'emprestimos_ativos': await EmprestimoRepository.listar_ativos().acount(),
+        'emprestimos_atrasados': await atrasados.acount(),
+        'exemplares_disponiveis': await ExemplarRepository.listar_disponiveis().acount(),
+        'atrasados': [
+            {**_emprestimo_json(emprestimo, hoje), 'aluno': emprestimo.aluno.pessoa.nome}
+            async for emprestimo in atrasados[:LIMITE_ATRASADOS]
+        ],
+    })
+
+
+@staff_member_required
+async def emprestimos_aluno(request, matricula):
+    """Emprestimos de um aluno (pela matricula), do mais recente ao mais antigo."""
+    aluno = await AlunoRepository.abuscar_por_matricula(matricula)
+    if aluno is None:
+        raise Http404('Aluno nao encontrado.')
+    hoje = timezone.localdate()
+    emprestimos = await EmprestimoRepository.alistar_por_aluno(aluno)
+    return JsonResponse({
+        'aluno': {
+            'matricula': aluno.matricula,
+            'nome': aluno.pessoa.nome,
+        },
+        'em_aberto': sum(
+            1 for emprestimo in emprestimos
+            if emprestimo.status != Emprestimo.Status.DEVOLVIDO
+        ),
+        'emprestimos': [_emprestimo_json(e, hoje) for e in emprestimos],
+    })